@@ -8,13 +8,14 @@ from collections import Counter
 from typing import Optional
 
 import fastapi
-from fastapi import Depends, HTTPException, Query, Request, status
+from fastapi import Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import bindparam
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.types import Text as TextType
 
+import background_jobs
 from database.dependencies import get_db
 from database.models import (
     AgentCritiqueIssue,
@@ -47,6 +48,7 @@ from models import (
     CritiqueIssueOut,
     CritiqueIssueResolutionRequest,
     CritiqueStorageRequest,
+    JobHandle,
     LexemeCardIn,
     LexemeCardOut,
     LexemeCardPatch,
@@ -58,12 +60,16 @@ from security_routes.utilities import (
     is_user_authorized_for_bible_version,
 )
 from utils.logging_config import setup_logger
+from utils.pagination import decode_cursor, next_cursor, validate_cursor_params
 
 container_id = socket.gethostname()
 logger = setup_logger(__name__, container_id=container_id)
 
 router = fastapi.APIRouter()
 
+# background_jobs kind of a backgrounded /agent/lexeme-card/deduplicate.
+DEDUPLICATE_JOB = "lexeme_card.deduplicate"
+
 
 def _effective_source_version_expr(source_version_id: int, target_version_id: int):
     """SQL expression: pivot bible_version_id for the target's iso, else source_version_id.
@@ -304,10 +310,12 @@ async def add_word_alignments_bulk(
 
 @router.get("/agent/word-alignment/all", response_model=list[AgentWordAlignmentOut])
 async def get_all_word_alignments(
+    response: Response,
     source_version_id: int,
     target_version_id: int,
     page: int | None = None,
     page_size: int | None = None,
+    cursor: str | None = None,
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user),
 ):
@@ -319,18 +327,21 @@ async def get_all_word_alignments(
     - target_version_id: int - Bible version ID for target (required)
     - page: int (optional) - Page number (1-indexed)
     - page_size: int (optional) - Number of results per page
+    - cursor: str (optional) - The X-Next-Cursor header of a previous
+      response; returns the page_size results after it, instead of page
 
-    If both page and page_size are provided, pagination is applied.
-    Otherwise, all results are returned.
+    If both page and page_size (or cursor and page_size) are provided,
+    pagination is applied. Otherwise, all results are returned. Paginated
+    responses carry an X-Next-Cursor header until the last page.
 
-    Results are ordered by score descending.
+    Results are ordered by score descending, then id.
 
     Returns:
     - List[AgentWordAlignmentOut]: List of word alignment entries
     """
     request_start = time.perf_counter()
     try:
-        from sqlalchemy import and_, select
+        from sqlalchemy import and_, or_, select
 
         query = (
             select(AgentWordAlignment)
@@ -340,11 +351,24 @@ async def get_all_word_alignments(
                     AgentWordAlignment.target_version_id == target_version_id,
                 )
             )
-            .order_by(AgentWordAlignment.score.desc())
+            .order_by(AgentWordAlignment.score.desc(), AgentWordAlignment.id)
         )
 
+        validate_cursor_params(cursor, page, page_size)
+        if cursor is not None:
+            # Keyset on (score DESC, id): rows after the cursor's row.
+            last_score, last_id = decode_cursor(cursor, (float, int))
+            query = query.where(
+                or_(
+                    AgentWordAlignment.score < last_score,
+                    and_(
+                        AgentWordAlignment.score == last_score,
+                        AgentWordAlignment.id > last_id,
+                    ),
+                )
+            ).limit(page_size)
         # Apply pagination if both params provided
-        if page is not None and page_size is not None:
+        elif page is not None and page_size is not None:
             if page < 1:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -360,6 +384,9 @@ async def get_all_word_alignments(
 
         result = await db.execute(query)
         alignments = result.scalars().all()
+        cursor_out = next_cursor(alignments, page_size, lambda a: (a.score, a.id))
+        if cursor_out is not None:
+            response.headers["X-Next-Cursor"] = cursor_out
 
         duration = round(time.perf_counter() - request_start, 2)
         logger.info(
@@ -371,6 +398,7 @@ async def get_all_word_alignments(
                 "target_version_id": target_version_id,
                 "page": page,
                 "page_size": page_size,
+                "cursor": cursor,
                 "duration_s": duration,
             },
         )
@@ -2102,11 +2130,12 @@ async def delete_lexeme_card(
         ) from e
 
 
-@router.post("/agent/lexeme-card/deduplicate")
+@router.post("/agent/lexeme-card/deduplicate", responses={202: {"model": JobHandle}})
 async def deduplicate_lexeme_cards(
     source_version_id: int,
     target_version_id: int,
     dry_run: bool = True,
+    background: bool = False,
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user),
 ):
@@ -2117,10 +2146,48 @@ async def deduplicate_lexeme_cards(
     - source_version_id: int (required) - Bible version ID for source
     - target_version_id: int (required) - Bible version ID for target
     - dry_run: bool (optional, default=True) - If True, only report duplicates without merging
+    - background: bool (optional, default=False) - If True, answer 202 with a
+      job handle at once and deduplicate in a background job; poll
+      GET /jobs/{id} for the summary
 
     Returns:
     - Summary with dry_run status, counts, and group details
     """
+    if background:
+        job = await background_jobs.enqueue(
+            db,
+            DEDUPLICATE_JOB,
+            {
+                "source_version_id": source_version_id,
+                "target_version_id": target_version_id,
+                "dry_run": dry_run,
+            },
+            current_user.id,
+        )
+        return background_jobs.accepted(job)
+    return await _deduplicate_lexeme_cards(
+        db, source_version_id, target_version_id, dry_run
+    )
+
+
+@background_jobs.handler(DEDUPLICATE_JOB)
+async def _deduplicate_lexeme_cards_job(db, params, payload, progress):
+    return await _deduplicate_lexeme_cards(
+        db,
+        params["source_version_id"],
+        params["target_version_id"],
+        params["dry_run"],
+        progress,
+    )
+
+
+async def _deduplicate_lexeme_cards(
+    db: AsyncSession,
+    source_version_id: int,
+    target_version_id: int,
+    dry_run: bool,
+    progress: background_jobs.Progress = background_jobs.no_progress,
+) -> dict:
     request_start = time.perf_counter()
     try:
         import json
@@ -2157,7 +2224,8 @@ async def deduplicate_lexeme_cards(
         total_merged = 0
         total_deleted = 0
 
-        for row in dup_groups:
+        for n_done, row in enumerate(dup_groups):
+            await progress(n_done / len(dup_groups), "Merging duplicate cards")
             lower_lemma = row.lower_lemma
 
             # Fetch all cards in this duplicate group
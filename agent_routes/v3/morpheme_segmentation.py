@@ -0,0 +1,161 @@
+"""Viterbi morpheme segmentation for the tokenizer indexers, off the event loop.
+
+/tokenizer/index and /tokenizer/word-index segment every word of a full
+revision (~800k tokens). Inline in the handler, that blocked the worker's
+event loop — and every other request on it — for seconds. This module
+segments each distinct word once and runs the segmenter off the loop:
+
+- Words are deduplicated (on a thread) before segmenting (a Bible has
+  ~10-30k distinct words), and segmentations are memoized per worker, keyed by the language
+  and a digest of its morpheme inventory. A re-index against an unchanged
+  inventory segments nothing; a tokenizer run that adds morphemes changes
+  the digest, so stale segmentations are never read again and age out.
+- Uncached words go to a process pool of ``settings.morpheme_segment_workers``
+  processes (spawned, so they import only ``utils.morpheme_tokenizer``),
+  split into a few chunks per process. Small batches, and every batch when
+  the setting is 0, run on the default thread pool instead, which keeps the
+  loop responsive without the pickling round trip.
+
+``settings.morpheme_segment_cache_mb`` caps the memo (LRU by inventory);
+0 disables it. No lock: concurrent requests for the same inventory may
+segment the same words and store identical values.
+"""
+
+import asyncio
+import hashlib
+import multiprocessing
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from config import settings
+from utils.logging_config import setup_logger
+from utils.morpheme_tokenizer import compile_morphemes, segment_words
+
+container_id = socket.gethostname()
+logger = setup_logger(__name__, container_id=container_id)
+
+# (kind, text) pairs, kind 'morph' or 'gap'; see viterbi_segment_trie.
+Segments = Tuple[Tuple[str, str], ...]
+
+# Below this many uncached words, a thread beats pickling the inventory to
+# the pool and back.
+_POOL_MIN_WORDS = 2000
+# Chunks per pool process: enough to even out long and short words.
+_CHUNKS_PER_WORKER = 4
+# Rough per-word footprint of a memo entry: the word, its segment tuples and
+# their strings, and the dict slot.
+_BYTES_PER_WORD = 300
+
+
+class MorphemeInventory(NamedTuple):
+    iso: str
+    morphemes: frozenset  # NFC-normalized, casefolded
+    trie: dict  # utils.morpheme_tokenizer.compile_morphemes(morphemes)
+    digest: str  # identifies the inventory's contents
+
+
+def inventory(iso: str, morphemes: Iterable[str]) -> MorphemeInventory:
+    """A language's morpheme inventory, as the segmenter and memo need it.
+
+    ``morphemes`` must be already normalized the way the words to segment
+    are.
+    """
+    morpheme_set = frozenset(morphemes)
+    digest = hashlib.sha1("\n".join(sorted(morpheme_set)).encode()).hexdigest()
+    return MorphemeInventory(iso, morpheme_set, compile_morphemes(morpheme_set), digest)
+
+
+# (iso, inventory digest) -> word -> segments, LRU order.
+_SEGMENT_CACHE: Dict[Tuple[str, str], Dict[str, Segments]] = {}
+
+_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _max_words() -> int:
+    return settings.morpheme_segment_cache_mb * 1024 * 1024 // _BYTES_PER_WORD
+
+
+def _store(key: Tuple[str, str], segmented: Dict[str, Segments]) -> None:
+    memo = _SEGMENT_CACHE.pop(key, {})
+    # Evict other inventories, least recently used first, to make room.
+    while _SEGMENT_CACHE and (
+        sum(len(m) for m in _SEGMENT_CACHE.values()) + len(memo) + len(segmented)
+        > _max_words()
+    ):
+        _SEGMENT_CACHE.pop(next(iter(_SEGMENT_CACHE)))
+    room = _max_words() - sum(len(m) for m in _SEGMENT_CACHE.values()) - len(memo)
+    if room < len(segmented):
+        segmented = dict(list(segmented.items())[: max(room, 0)])
+    memo.update(segmented)
+    if memo:
+        _SEGMENT_CACHE[key] = memo
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _POOL
+    if _POOL is None:
+        _POOL = ProcessPoolExecutor(
+            max_workers=settings.morpheme_segment_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _POOL
+
+
+async def _segment_uncached(inv: MorphemeInventory, words: List[str]) -> List[Segments]:
+    loop = asyncio.get_running_loop()
+    workers = settings.morpheme_segment_workers
+    if workers <= 0 or len(words) < _POOL_MIN_WORDS:
+        return await loop.run_in_executor(None, segment_words, words, inv.trie)
+
+    global _POOL
+    n_chunks = workers * _CHUNKS_PER_WORKER
+    size = -(-len(words) // n_chunks)
+    pool = _pool()
+    try:
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    pool,
+                    segment_words,
+                    words[i : i + size],
+                    inv.trie,
+                )
+                for i in range(0, len(words), size)
+            )
+        )
+    except BrokenProcessPool:
+        # A pool process died (e.g. OOM-killed). Start a fresh pool next
+        # time; finish this request on a thread.
+        logger.warning("Morpheme segmentation pool broke; retrying on a thread")
+        if _POOL is pool:
+            _POOL = None
+        pool.shutdown(wait=False)
+        return await loop.run_in_executor(None, segment_words, words, inv.trie)
+    return [segments for chunk in chunks for segments in chunk]
+
+
+async def segment(inv: MorphemeInventory, words: Iterable[str]) -> Dict[str, Segments]:
+    """word -> its segmentation against ``inv``, for each distinct word."""
+    # Deduplicating ~1M tokens takes long enough to stall the loop, too. A
+    # comprehension rather than dict.fromkeys, which holds the GIL (and so
+    # still stalls the loop) for its whole run over a list.
+    unique = await asyncio.to_thread(lambda: list({word: None for word in words}))
+    key = (inv.iso, inv.digest)
+    memo = _SEGMENT_CACHE.get(key, {}) if settings.morpheme_segment_cache_mb > 0 else {}
+    if memo:
+        # Re-insert so dict order tracks recency and eviction drops the LRU.
+        _SEGMENT_CACHE[key] = _SEGMENT_CACHE.pop(key)
+
+    uncached = [word for word in unique if word not in memo]
+    segmented = (
+        dict(zip(uncached, await _segment_uncached(inv, uncached))) if uncached else {}
+    )
+    if segmented and settings.morpheme_segment_cache_mb > 0:
+        _store(key, segmented)
+    return {word: memo[word] if word in memo else segmented[word] for word in unique}
+
+
+def clear() -> None:
+    _SEGMENT_CACHE.clear()
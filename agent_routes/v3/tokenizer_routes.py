@@ -1,5 +1,6 @@
 __version__ = "v3"
 
+import asyncio
 import datetime
 import socket
 import time
@@ -14,6 +15,9 @@ from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+import background_jobs
+import revision_text_cache
+from agent_routes.v3 import morpheme_segmentation
 from database.dependencies import get_db
 from database.models import (
     BibleRevision,
@@ -28,6 +32,7 @@ from database.models import (
 from database.models import UserDB as UserModel
 from database.models import (
     VerseMorphemeIndex,
+    VerseMorphemeIndexBuild,
     VerseText,
     WordMorphemeIndex,
 )
@@ -36,6 +41,7 @@ from models import (
     CooccurrenceResponse,
     IndexRequest,
     IndexResponse,
+    JobHandle,
     LanguageProfileIn,
     LanguageProfileOut,
     MorphemeListOut,
@@ -57,13 +63,17 @@ from security_routes.utilities import (
     is_user_authorized_for_revision,
 )
 from utils.logging_config import setup_logger
-from utils.morpheme_tokenizer import strip_punct, viterbi_segment
+from utils.morpheme_tokenizer import compile_morphemes, contains_morpheme, strip_punct
 
 container_id = socket.gethostname()
 logger = setup_logger(__name__, container_id=container_id)
 
 INDEX_BATCH_SIZE = 5000
 
+# background_jobs kinds.
+INDEX_JOB = "tokenizer.index"
+WORD_INDEX_JOB = "tokenizer.word_index"
+
 router = fastapi.APIRouter()
 
 
@@ -774,16 +784,65 @@ async def commit_tokenizer_run(
     )
 
 
-@router.post("/tokenizer/index", response_model=IndexResponse)
-async def index_morphemes(
-    payload: IndexRequest,
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user),
-):
-    request_start = time.perf_counter()
-    iso = payload.iso_639_3
-    revision_id = payload.revision_id
+def _verse_words(verses):
+    """(verse_text_id, [(surface form, lowered form)]) per verse."""
+    verse_words = []
+    for verse_id, text in verses:
+        words = []
+        for word in text.split():
+            stripped = strip_punct(word)
+            if stripped:
+                words.append(
+                    (stripped, unicodedata.normalize("NFC", stripped).casefold())
+                )
+        verse_words.append((verse_id, words))
+    return verse_words
+
+
+def _verse_index_rows(verse_words, segmentations, morpheme_by_text):
+    """VerseMorphemeIndex rows: (verse_text_id, morpheme_id) -> {count,
+    surface_forms}."""
+    index_rows = []
+    for verse_id, words in verse_words:
+        # morpheme_id -> {count, surface_forms set}
+        hits: dict[int, dict] = {}
+        for stripped, lowered in words:
+            for kind, seg in segmentations[lowered]:
+                if kind == "morph" and seg in morpheme_by_text:
+                    mid = morpheme_by_text[seg]
+                    if mid not in hits:
+                        hits[mid] = {"count": 0, "surface_forms": set()}
+                    hits[mid]["count"] += 1
+                    hits[mid]["surface_forms"].add(stripped)
+
+        for mid, info in hits.items():
+            index_rows.append(
+                {
+                    "verse_text_id": verse_id,
+                    "morpheme_id": mid,
+                    "count": info["count"],
+                    "surface_forms": sorted(info["surface_forms"]),
+                }
+            )
+    return index_rows
+
 
+def _word_counts(texts):
+    """Lowered word -> occurrences across ``texts``."""
+    word_counts: dict[str, int] = defaultdict(int)
+    for text in texts:
+        for raw_word in text.split():
+            stripped = strip_punct(raw_word)
+            if stripped:
+                lowered = unicodedata.normalize("NFC", stripped).casefold()
+                word_counts[lowered] += 1
+    return word_counts
+
+
+async def _authorize_revision_language(
+    db: AsyncSession, current_user: UserModel, iso: str, revision_id: int
+) -> None:
+    """Raise unless the user may read the revision and it is in ``iso``."""
     if not await is_user_authorized_for_revision(current_user.id, revision_id, db):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -811,11 +870,162 @@ async def index_morphemes(
             ),
         )
 
-    # Load all morphemes for the language
-    result = await db.execute(
-        select(LanguageMorpheme.id, LanguageMorpheme.morpheme).where(
-            LanguageMorpheme.iso_639_3 == iso
+
+@router.post(
+    "/tokenizer/index",
+    response_model=IndexResponse,
+    responses={202: {"model": JobHandle}},
+)
+async def index_morphemes(
+    payload: IndexRequest,
+    background: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """Index a revision's verses by the morphemes they contain.
+
+    If the revision's verses haven't changed since its last index build, only
+    the verses containing a morpheme added, removed or re-numbered since then
+    are re-segmented, and only index rows that differ are written;
+    ``full_rebuild`` re-indexes every verse regardless.
+
+    With ``background=true``, answers 202 with a job handle at once and
+    indexes in a background job; poll ``GET /jobs/{id}`` for the result.
+    """
+    await _authorize_revision_language(
+        db, current_user, payload.iso_639_3, payload.revision_id
+    )
+    if background:
+        job = await background_jobs.enqueue(
+            db,
+            INDEX_JOB,
+            {
+                "iso": payload.iso_639_3,
+                "revision_id": payload.revision_id,
+                "full_rebuild": payload.full_rebuild,
+            },
+            current_user.id,
+        )
+        return background_jobs.accepted(job)
+    return await _index_revision(
+        db, payload.iso_639_3, payload.revision_id, payload.full_rebuild
+    )
+
+
+@background_jobs.handler(INDEX_JOB)
+async def _index_revision_job(db, params, payload, progress):
+    return await _index_revision(
+        db,
+        params["iso"],
+        params["revision_id"],
+        params.get("full_rebuild", False),
+        progress,
+    )
+
+
+def _verses_containing(verse_words, morphemes):
+    """The ``_verse_words`` entries with a word containing any of
+    ``morphemes``."""
+    if not morphemes:
+        return []
+    trie = compile_morphemes(morphemes)
+    contains: dict[str, bool] = {}
+    affected = []
+    for verse_id, words in verse_words:
+        for _, lowered in words:
+            hit = contains.get(lowered)
+            if hit is None:
+                hit = contains[lowered] = contains_morpheme(lowered, trie)
+            if hit:
+                affected.append((verse_id, words))
+                break
+    return affected
+
+
+async def _upsert_index_rows(db, index_rows, progress):
+    for i in range(0, len(index_rows), INDEX_BATCH_SIZE):
+        await progress(0.4 + 0.6 * i / len(index_rows), "Writing the index")
+        batch = index_rows[i : i + INDEX_BATCH_SIZE]
+        stmt = pg_insert(VerseMorphemeIndex).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_verse_morpheme",
+            set_={
+                "count": stmt.excluded.count,
+                "surface_forms": stmt.excluded.surface_forms,
+            },
+        )
+        await db.execute(stmt)
+
+
+async def _apply_index_diff(db, verse_ids, index_rows, progress):
+    """Make the index rows of ``verse_ids`` equal ``index_rows``, writing
+    only the rows that differ. Returns (rows deleted, rows upserted)."""
+    await progress(0.2, "Comparing with the previous index")
+    pending = {(row["verse_text_id"], row["morpheme_id"]): row for row in index_rows}
+    stale_ids = []
+    for i in range(0, len(verse_ids), INDEX_BATCH_SIZE):
+        result = await db.execute(
+            select(
+                VerseMorphemeIndex.id,
+                VerseMorphemeIndex.verse_text_id,
+                VerseMorphemeIndex.morpheme_id,
+                VerseMorphemeIndex.count,
+                VerseMorphemeIndex.surface_forms,
+            ).where(
+                VerseMorphemeIndex.verse_text_id.in_(
+                    verse_ids[i : i + INDEX_BATCH_SIZE]
+                )
+            )
         )
+        for row in result:
+            key = (row.verse_text_id, row.morpheme_id)
+            new_row = pending.get(key)
+            if new_row is None:
+                stale_ids.append(row.id)
+            elif (
+                new_row["count"] == row.count
+                and new_row["surface_forms"] == row.surface_forms
+            ):
+                del pending[key]
+
+    for i in range(0, len(stale_ids), INDEX_BATCH_SIZE):
+        await db.execute(
+            delete(VerseMorphemeIndex).where(
+                VerseMorphemeIndex.id.in_(stale_ids[i : i + INDEX_BATCH_SIZE])
+            )
+        )
+    await _upsert_index_rows(db, list(pending.values()), progress)
+    return len(stale_ids), len(pending)
+
+
+async def _index_revision(
+    db: AsyncSession,
+    iso: str,
+    revision_id: int,
+    full_rebuild: bool = False,
+    progress: background_jobs.Progress = background_jobs.no_progress,
+) -> IndexResponse:
+    request_start = time.perf_counter()
+
+    # Read before the verses: if they change after this, the stamp stored
+    # with the build is already stale and the next index rebuilds in full.
+    revision_updated_at = await db.scalar(
+        select(BibleRevision.updated_at).where(BibleRevision.id == revision_id)
+    )
+    # Locked so concurrent index calls for the revision apply their diffs in
+    # turn rather than both against the same previous build.
+    build = await db.scalar(
+        select(VerseMorphemeIndexBuild)
+        .where(VerseMorphemeIndexBuild.revision_id == revision_id)
+        .with_for_update()
+    )
+
+    # Load all morphemes for the language. Ordered, so a text that two
+    # morphemes normalize to maps to the same id from one build to the next.
+    result = await db.execute(
+        select(LanguageMorpheme.id, LanguageMorpheme.morpheme)
+        .where(LanguageMorpheme.iso_639_3 == iso)
+        .order_by(LanguageMorpheme.id)
     )
     morpheme_rows = result.all()
     if not morpheme_rows:
@@ -828,77 +1038,88 @@ async def index_morphemes(
         unicodedata.normalize("NFC", row.morpheme).casefold(): row.id
         for row in morpheme_rows
     }
-    morpheme_set = set(morpheme_by_text.keys())
-    max_morph_len = max(len(m) for m in morpheme_set)
+    inventory = morpheme_segmentation.inventory(iso, morpheme_by_text)
 
     # Load all non-empty verses for the revision
-    result = await db.execute(
-        select(VerseText.id, VerseText.text).where(
-            VerseText.revision_id == revision_id,
-            VerseText.text.isnot(None),
-            VerseText.text != "",
-        )
-    )
-    verses = result.all()
+    revision_text = await revision_text_cache.get(db, revision_id)
+    verses = [(verse_id, text) for verse_id, _, text in revision_text.rows() if text]
     if not verses:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No verses found for revision_id {revision_id}",
         )
 
-    # Segment each verse and collect (verse_text_id, morpheme_id) -> {count, surface_forms}
-    index_rows = []
-    for verse in verses:
-        # morpheme_id -> {count, surface_forms set}
-        hits: dict[int, dict] = {}
-        for word in verse.text.split():
-            stripped = strip_punct(word)
-            if not stripped:
-                continue
-            lowered = unicodedata.normalize("NFC", stripped).casefold()
-            segments = viterbi_segment(lowered, morpheme_set, max_morph_len)
-            for kind, seg in segments:
-                if kind == "morph" and seg in morpheme_by_text:
-                    mid = morpheme_by_text[seg]
-                    if mid not in hits:
-                        hits[mid] = {"count": 0, "surface_forms": set()}
-                    hits[mid]["count"] += 1
-                    hits[mid]["surface_forms"].add(stripped)
+    incremental = (
+        not full_rebuild
+        and build is not None
+        and build.iso_639_3 == iso
+        and build.revision_updated_at == revision_updated_at
+    )
 
-        for mid, info in hits.items():
-            index_rows.append(
-                {
-                    "verse_text_id": verse.id,
-                    "morpheme_id": mid,
-                    "count": info["count"],
-                    "surface_forms": sorted(info["surface_forms"]),
-                }
-            )
+    # Tokenize, segment each distinct word, and build the index rows, all off
+    # the event loop: a full revision is ~1M tokens.
+    await progress(0.0, "Segmenting words")
+    verse_words = await asyncio.to_thread(_verse_words, verses)
+    if incremental:
+        # A word's segmentation can only change if a morpheme added, removed
+        # or re-numbered since the last build occurs in it; the rows of
+        # verses without such a word are already right.
+        changed = {
+            text
+            for text in build.morphemes.keys() | morpheme_by_text.keys()
+            if build.morphemes.get(text) != morpheme_by_text.get(text)
+        }
+        verse_words = await asyncio.to_thread(_verses_containing, verse_words, changed)
+    segmentations = await morpheme_segmentation.segment(
+        inventory, (lowered for _, words in verse_words for _, lowered in words)
+    )
+    index_rows = await asyncio.to_thread(
+        _verse_index_rows, verse_words, segmentations, morpheme_by_text
+    )
 
     try:
-        # Delete stale index rows for this revision before re-indexing,
-        # so morphemes no longer present in verses are cleaned up.
-        verse_ids = [v.id for v in verses]
-        for i in range(0, len(verse_ids), INDEX_BATCH_SIZE):
-            batch_ids = verse_ids[i : i + INDEX_BATCH_SIZE]
-            await db.execute(
-                delete(VerseMorphemeIndex).where(
-                    VerseMorphemeIndex.verse_text_id.in_(batch_ids)
-                )
+        if incremental:
+            n_deleted, n_written = await _apply_index_diff(
+                db, [verse_id for verse_id, _ in verse_words], index_rows, progress
             )
-
-        if index_rows:
-            for i in range(0, len(index_rows), INDEX_BATCH_SIZE):
-                batch = index_rows[i : i + INDEX_BATCH_SIZE]
-                stmt = pg_insert(VerseMorphemeIndex).values(batch)
-                stmt = stmt.on_conflict_do_update(
-                    constraint="uq_verse_morpheme",
-                    set_={
-                        "count": stmt.excluded.count,
-                        "surface_forms": stmt.excluded.surface_forms,
-                    },
+            n_pairs = await db.scalar(
+                select(func.count())
+                .select_from(VerseMorphemeIndex)
+                .join(VerseText, VerseText.id == VerseMorphemeIndex.verse_text_id)
+                .where(VerseText.revision_id == revision_id)
+            )
+        else:
+            # Delete stale index rows for this revision before re-indexing,
+            # so morphemes no longer present in verses are cleaned up.
+            await progress(0.2, "Deleting the previous index")
+            verse_ids = [verse_id for verse_id, _ in verses]
+            for i in range(0, len(verse_ids), INDEX_BATCH_SIZE):
+                batch_ids = verse_ids[i : i + INDEX_BATCH_SIZE]
+                await db.execute(
+                    delete(VerseMorphemeIndex).where(
+                        VerseMorphemeIndex.verse_text_id.in_(batch_ids)
+                    )
                 )
-                await db.execute(stmt)
+            await _upsert_index_rows(db, index_rows, progress)
+            n_deleted, n_written, n_pairs = None, len(index_rows), len(index_rows)
+
+        stmt = pg_insert(VerseMorphemeIndexBuild).values(
+            revision_id=revision_id,
+            iso_639_3=iso,
+            revision_updated_at=revision_updated_at,
+            morphemes=morpheme_by_text,
+            built_at=func.now(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[VerseMorphemeIndexBuild.revision_id],
+            set_={
+                "iso_639_3": stmt.excluded.iso_639_3,
+                "revision_updated_at": stmt.excluded.revision_updated_at,
+                "morphemes": stmt.excluded.morphemes,
+                "built_at": stmt.excluded.built_at,
+            },
+        )
+        await db.execute(stmt)
         await db.commit()
     except SQLAlchemyError as e:
         await db.rollback()
@@ -916,14 +1137,19 @@ async def index_morphemes(
             "path": "/tokenizer/index",
             "iso": iso,
             "revision_id": revision_id,
+            "incremental": incremental,
             "verses_indexed": len(verses),
-            "pairs": len(index_rows),
+            "verses_reindexed": len(verse_words),
+            "rows_deleted": n_deleted,
+            "rows_written": n_written,
+            "pairs": n_pairs,
             "duration_s": duration,
         },
     )
     return IndexResponse(
         verses_indexed=len(verses),
-        unique_morpheme_verse_pairs=len(index_rows),
+        unique_morpheme_verse_pairs=n_pairs,
+        verses_reindexed=len(verse_words),
     )
 
 
@@ -1031,42 +1257,49 @@ async def search_morpheme(
     )
 
 
-@router.post("/tokenizer/word-index", response_model=WordIndexResponse)
+@router.post(
+    "/tokenizer/word-index",
+    response_model=WordIndexResponse,
+    responses={202: {"model": JobHandle}},
+)
 async def build_word_index(
     payload: WordIndexRequest,
+    background: bool = False,
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user),
 ):
-    request_start = time.perf_counter()
-    iso = payload.iso_639_3
-    revision_id = payload.revision_id
+    """Rebuild a language's word -> morpheme index from one revision.
 
-    if not await is_user_authorized_for_revision(current_user.id, revision_id, db):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="User not authorized to access this revision",
-        )
-
-    # Validate revision exists and belongs to the given language
-    rev_result = await db.execute(
-        select(BibleVersion.iso_language)
-        .join(BibleRevision, BibleRevision.bible_version_id == BibleVersion.id)
-        .where(BibleRevision.id == revision_id)
+    With ``background=true``, answers 202 with a job handle at once and
+    builds the index in a background job; poll ``GET /jobs/{id}`` for the
+    result.
+    """
+    await _authorize_revision_language(
+        db, current_user, payload.iso_639_3, payload.revision_id
     )
-    rev_iso = rev_result.scalar_one_or_none()
-    if rev_iso is None:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=f"Unknown revision_id {revision_id}",
-        )
-    if rev_iso != iso:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=(
-                f"Revision {revision_id} belongs to language '{rev_iso}', "
-                f"not '{iso}'"
-            ),
+    if background:
+        job = await background_jobs.enqueue(
+            db,
+            WORD_INDEX_JOB,
+            {"iso": payload.iso_639_3, "revision_id": payload.revision_id},
+            current_user.id,
         )
+        return background_jobs.accepted(job)
+    return await _build_word_index(db, payload.iso_639_3, payload.revision_id)
+
+
+@background_jobs.handler(WORD_INDEX_JOB)
+async def _build_word_index_job(db, params, payload, progress):
+    return await _build_word_index(db, params["iso"], params["revision_id"], progress)
+
+
+async def _build_word_index(
+    db: AsyncSession,
+    iso: str,
+    revision_id: int,
+    progress: background_jobs.Progress = background_jobs.no_progress,
+) -> WordIndexResponse:
+    request_start = time.perf_counter()
 
     # Load morphemes for the language
     result = await db.execute(
@@ -1085,41 +1318,30 @@ async def build_word_index(
         unicodedata.normalize("NFC", row.morpheme).casefold(): row.id
         for row in morpheme_rows
     }
-    morpheme_set = set(morpheme_by_text.keys())
-    max_morph_len = max(len(m) for m in morpheme_set)
+    inventory = morpheme_segmentation.inventory(iso, morpheme_by_text)
 
     # Load all non-empty verses for the revision
-    result = await db.execute(
-        select(VerseText.text).where(
-            VerseText.revision_id == revision_id,
-            VerseText.text.isnot(None),
-            VerseText.text != "",
-        )
-    )
-    verses = result.all()
+    revision_text = await revision_text_cache.get(db, revision_id)
+    verses = [text for _, _, text in revision_text.rows() if text]
     if not verses:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No verses found for revision_id {revision_id}",
         )
 
-    # Collect unique words and their counts across the corpus
-    word_counts: dict[str, int] = defaultdict(int)
-    for verse in verses:
-        for raw_word in verse.text.split():
-            stripped = strip_punct(raw_word)
-            if stripped:
-                lowered = unicodedata.normalize("NFC", stripped).casefold()
-                word_counts[lowered] += 1
+    # Collect unique words and their counts across the corpus (off the event
+    # loop: a full revision is ~1M tokens)
+    await progress(0.0, "Segmenting words")
+    word_counts = await asyncio.to_thread(_word_counts, verses)
 
-    # Segment each unique word and build index rows
+    # Segment each unique word (off the event loop) and build index rows
+    segmentations = await morpheme_segmentation.segment(inventory, word_counts)
     index_rows = []
     words_with_morphemes = 0
     for word, count in word_counts.items():
-        segments = viterbi_segment(word, morpheme_set, max_morph_len)
         morphs = [
             (seg, morpheme_by_text[seg])
-            for kind, seg in segments
+            for kind, seg in segmentations[word]
             if kind == "morph" and seg in morpheme_by_text
         ]
         if not morphs:
@@ -1143,12 +1365,14 @@ async def build_word_index(
         # rebuild replaces the entire language's index with data from the
         # requested revision.  This is intentional: the index reflects the
         # single most-recently-indexed revision for a language.
+        await progress(0.2, "Deleting the previous index")
         await db.execute(
             delete(WordMorphemeIndex).where(WordMorphemeIndex.iso_639_3 == iso)
         )
 
         if index_rows:
             for i in range(0, len(index_rows), INDEX_BATCH_SIZE):
+                await progress(0.4 + 0.6 * i / len(index_rows), "Writing the index")
                 batch = index_rows[i : i + INDEX_BATCH_SIZE]
                 stmt = pg_insert(WordMorphemeIndex).values(batch)
                 stmt = stmt.on_conflict_do_update(
@@ -0,0 +1,55 @@
+"""add assessment_result_rollup table
+
+Revision ID: a3f1d7c9e2b5
+Revises: e7b2c4d9a1f3
+Create Date: 2026-10-17
+
+Chapter/book/text aggregates for /result, written when an assessment
+finishes so the aggregate views stop re-grouping ``assessment_result`` on
+every request. Assessments that finished before this migration have no
+rollup rows and keep using the live query, so no backfill is needed.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3f1d7c9e2b5"
+down_revision: Union[str, None] = "e7b2c4d9a1f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "assessment_result_rollup",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("assessment_id", sa.Integer(), nullable=False),
+        sa.Column("level", sa.Text(), nullable=False),
+        sa.Column("source_not_null", sa.Boolean(), nullable=False),
+        sa.Column("book", sa.Text(), nullable=True),
+        sa.Column("chapter", sa.Integer(), nullable=True),
+        sa.Column("result_id", sa.Integer(), nullable=False),
+        sa.Column("score", sa.Numeric(), nullable=True),
+        sa.Column("flag", sa.Boolean(), nullable=True),
+        sa.Column("hide", sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["assessment_id"], ["assessment.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_assessment_result_rollup_lookup",
+        "assessment_result_rollup",
+        ["assessment_id", "level", "source_not_null", "result_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_assessment_result_rollup_lookup", table_name="assessment_result_rollup"
+    )
+    op.drop_table("assessment_result_rollup")
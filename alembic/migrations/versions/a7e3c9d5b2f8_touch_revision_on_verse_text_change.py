@@ -0,0 +1,90 @@
+"""bump bible_revision.updated_at when the revision's verse_text changes
+
+Revision ID: a7e3c9d5b2f8
+Revises: f2a6c8e4d1b7
+Create Date: 2026-10-17
+
+A revision's verses are its content, but inserting, updating or deleting
+``verse_text`` rows left ``bible_revision.updated_at`` (c8d3f5a1b2e4)
+untouched, so delta-sync mirrors never learned about the change.
+revision_text_cache, the per-worker copy of whole revisions' text, also
+keys its entries on ``updated_at``, and needs it to move whenever the text
+does.
+
+Statement-level triggers with transition tables on ``verse_text`` touch each
+affected revision once per statement; ``set_updated_at`` stamps the value. The
+function and triggers are also created by DDL events in
+``database/models.py`` for ``create_all`` schemas (tests) — keep both in
+sync. No backfill: existing stamps already postdate their revisions' verses
+or are left as they are.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7e3c9d5b2f8"
+down_revision: Union[str, None] = "f2a6c8e4d1b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FUNCTION = """
+    CREATE OR REPLACE FUNCTION touch_revision_on_verse_change()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE bible_revision SET updated_at = clock_timestamp()
+            WHERE id IN (SELECT revision_id FROM new_rows);
+        ELSIF TG_OP = 'UPDATE' THEN
+            UPDATE bible_revision SET updated_at = clock_timestamp()
+            WHERE id IN (
+                SELECT revision_id FROM old_rows
+                UNION
+                SELECT revision_id FROM new_rows
+            );
+        ELSE
+            UPDATE bible_revision SET updated_at = clock_timestamp()
+            WHERE id IN (SELECT revision_id FROM old_rows);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+TRIGGERS = {
+    "trg_verse_text_touch_revision_insert": (
+        "AFTER INSERT ON verse_text "
+        "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT "
+        "EXECUTE FUNCTION touch_revision_on_verse_change()"
+    ),
+    "trg_verse_text_touch_revision_update": (
+        "AFTER UPDATE ON verse_text "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION touch_revision_on_verse_change()"
+    ),
+    "trg_verse_text_touch_revision_delete": (
+        "AFTER DELETE ON verse_text "
+        "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT "
+        "EXECUTE FUNCTION touch_revision_on_verse_change()"
+    ),
+}
+
+
+def upgrade() -> None:
+    op.execute(FUNCTION)
+    # CREATE TRIGGER can queue behind a long upload, and every verse_text
+    # write would then queue behind us; fail fast instead, per c9e7b1f2d3a4.
+    op.execute(sa.text("SET lock_timeout = '5s'"))
+    for trigger, definition in TRIGGERS.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON verse_text")
+        op.execute(f"CREATE TRIGGER {trigger} {definition}")
+    op.execute(sa.text("SET lock_timeout = 0"))
+
+
+def downgrade() -> None:
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON verse_text")
+    op.execute("DROP FUNCTION IF EXISTS touch_revision_on_verse_change()")
@@ -0,0 +1,71 @@
+"""add keyset pagination indexes for alignment scores and agent alignments
+
+Revision ID: b5e8c2a7d4f1
+Revises: a3f1d7c9e2b5
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "b5e8c2a7d4f1"
+down_revision: Union[str, None] = "a3f1d7c9e2b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Cursor pagination walks these tables with `WHERE <scope> AND key >
+    # :last ORDER BY key LIMIT :n`. Each composite lets Postgres serve that
+    # (and the id-ordered OFFSET pages) as a single index walk, like
+    # ix_ngrams_table_assessment_id_id does for /ngrams_result (#650).
+    #
+    # Same mechanics as 1d460bf9ea55: CONCURRENTLY inside an autocommit
+    # block so deploys don't block result inserts, raw IF [NOT] EXISTS DDL,
+    # and a defensive DROP first in case an interrupted run left an INVALID
+    # index. Each replaced index is a prefix of its composite, so it is
+    # dropped to save write amplification.
+    with op.get_context().autocommit_block():
+        for table in ("alignment_top_source_scores", "alignment_threshold_scores"):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_assessment_id_id")
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+                f"ix_{table}_assessment_id_id ON {table} (assessment_id, id)"
+            )
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_assessment_id")
+
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS "
+            "ix_agent_word_alignments_version_score_id"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+            "ix_agent_word_alignments_version_score_id "
+            "ON agent_word_alignments "
+            "(source_version_id, target_version_id, score DESC, id)"
+        )
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_agent_word_alignments_version_score"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+            "ix_agent_word_alignments_version_score "
+            "ON agent_word_alignments "
+            "(source_version_id, target_version_id, score DESC)"
+        )
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS "
+            "ix_agent_word_alignments_version_score_id"
+        )
+        for table in ("alignment_top_source_scores", "alignment_threshold_scores"):
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+                f"ix_{table}_assessment_id ON {table} (assessment_id)"
+            )
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_assessment_id_id")
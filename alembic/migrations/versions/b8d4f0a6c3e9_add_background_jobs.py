@@ -0,0 +1,71 @@
+"""add background_jobs table for queued long-running requests
+
+Revision ID: b8d4f0a6c3e9
+Revises: a7e3c9d5b2f8
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+from alembic import op
+
+revision: str = "b8d4f0a6c3e9"
+down_revision: Union[str, None] = "a7e3c9d5b2f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "background_jobs",
+        sa.Column("id", sa.Text(), nullable=False),
+        sa.Column("kind", sa.Text(), nullable=False),
+        sa.Column("status", sa.Text(), server_default="queued", nullable=False),
+        sa.Column("params", JSONB(), nullable=False),
+        sa.Column("payload", sa.LargeBinary(), nullable=True),
+        sa.Column("progress", sa.Float(), nullable=True),
+        sa.Column("progress_detail", sa.Text(), nullable=True),
+        sa.Column("result", JSONB(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("error_status", sa.Integer(), nullable=True),
+        sa.Column("worker", sa.Text(), nullable=True),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("started_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("heartbeat_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.CheckConstraint(
+            "status IN ('queued', 'running', 'complete', 'failed')",
+            name="ck_background_jobs_status",
+        ),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_background_jobs_queued",
+        "background_jobs",
+        ["created_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'queued'"),
+    )
+    op.create_index(
+        "ix_background_jobs_owner_created",
+        "background_jobs",
+        ["owner_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_background_jobs_owner_created", table_name="background_jobs")
+    op.drop_index("ix_background_jobs_queued", table_name="background_jobs")
+    op.drop_table("background_jobs")
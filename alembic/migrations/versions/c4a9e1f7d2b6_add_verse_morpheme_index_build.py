@@ -0,0 +1,43 @@
+"""add verse_morpheme_index_build for incremental morpheme indexing
+
+Revision ID: c4a9e1f7d2b6
+Revises: b8d4f0a6c3e9
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+from alembic import op
+
+revision: str = "c4a9e1f7d2b6"
+down_revision: Union[str, None] = "b8d4f0a6c3e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "verse_morpheme_index_build",
+        sa.Column("revision_id", sa.Integer(), nullable=False),
+        sa.Column("iso_639_3", sa.String(length=3), nullable=False),
+        sa.Column("revision_updated_at", sa.TIMESTAMP(), nullable=False),
+        sa.Column("morphemes", JSONB(), nullable=False),
+        sa.Column(
+            "built_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["revision_id"], ["bible_revision.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("revision_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("verse_morpheme_index_build")
@@ -0,0 +1,30 @@
+"""store tfidf_svd.components_npy uncompressed, for sliced downloads
+
+GET /assessment/tfidf/artifacts/svd streams the matrix with one
+substring() per slice. Postgres can fetch a slice of an uncompressed
+out-of-line value directly, but has to decompress a compressed one from
+the start up to the slice. Rows written before this keep their storage
+until re-pushed.
+
+Revision ID: d5b7f2c9e4a1
+Revises: c4a9e1f7d2b6
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "d5b7f2c9e4a1"
+down_revision: Union[str, None] = "c4a9e1f7d2b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE tfidf_svd ALTER COLUMN components_npy SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE tfidf_svd ALTER COLUMN components_npy SET STORAGE EXTENDED")
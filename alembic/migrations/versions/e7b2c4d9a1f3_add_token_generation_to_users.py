@@ -0,0 +1,40 @@
+"""Add token_generation to users
+
+Revision ID: e7b2c4d9a1f3
+Revises: c8d3f5a1b2e4
+Create Date: 2026-10-17
+
+Supports resolving the current user from JWT claims without a per-request
+user lookup (opt-in via AUTH_TOKEN_CLAIMS). Tokens carry the user's
+generation as the ``gen`` claim; bumping the column revokes every token
+issued before the bump.
+
+The constant default lets PG take the attmissingval fast path (no table
+rewrite), and ``users`` is tiny regardless.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e7b2c4d9a1f3"
+down_revision = "c8d3f5a1b2e4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "token_generation",
+            sa.Integer(),
+            nullable=False,
+            server_default="0",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_generation")
@@ -0,0 +1,55 @@
+"""add tfidf_svd_variants for downcast TF-IDF components built once
+
+Revision ID: e8c3a6d1f5b9
+Revises: d5b7f2c9e4a1
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "e8c3a6d1f5b9"
+down_revision: Union[str, None] = "d5b7f2c9e4a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tfidf_svd_variants",
+        sa.Column("assessment_id", sa.Integer(), nullable=False),
+        sa.Column("dtype", sa.Text(), nullable=False),
+        sa.Column("run_created_at", sa.TIMESTAMP(), nullable=False),
+        sa.Column("components_npy", sa.LargeBinary(), nullable=False),
+        sa.Column("int8_scale", sa.Float(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(),
+            server_default=sa.func.now(),
+            nullable=True,
+        ),
+        sa.CheckConstraint(
+            "dtype IN ('float32', 'float16', 'int8')",
+            name="ck_tfidf_svd_variant_dtype",
+        ),
+        sa.ForeignKeyConstraint(
+            ["assessment_id"],
+            ["tfidf_artifact_runs.assessment_id"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("assessment_id", "dtype"),
+    )
+    # Served in slices by GET /assessment/tfidf/artifacts/svd, like
+    # tfidf_svd.components_npy.
+    op.execute(
+        "ALTER TABLE tfidf_svd_variants ALTER COLUMN components_npy "
+        "SET STORAGE EXTERNAL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("tfidf_svd_variants")
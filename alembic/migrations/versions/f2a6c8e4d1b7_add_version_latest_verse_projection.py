@@ -0,0 +1,259 @@
+"""add version_latest_verse projection of each version's current verse text
+
+Revision ID: f2a6c8e4d1b7
+Revises: b5e8c2a7d4f1
+Create Date: 2026-10-17
+
+Version-scoped /textsearch picks, per (book, chapter, verse), the latest
+non-deleted revision with non-empty text, and did so with a DISTINCT ON over
+every row of every revision of the version on each request (main side and,
+per result row, the comparison side). ``version_latest_verse`` stores that
+pick — version and verse to verse_text id — so the read is an indexed join.
+
+Triggers keep it current in the writing transaction: inserts into
+verse_text upsert their rows when they supersede the current pick; updates
+and deletes of verse_text, and changes to a revision's ``deleted``,
+``date`` or ``bible_version_id``, recompute the affected verses. They are
+statement-level with transition tables, so a whole-revision COPY costs one
+recompute. The functions and triggers are also created by DDL events in
+``database/models.py`` for ``create_all`` schemas (tests) — keep both in
+sync.
+
+Backfill: one DISTINCT ON pass over verse_text. The triggers are created
+first in the same transaction, and CREATE TRIGGER holds a lock that blocks
+verse_text writes until commit, so no write can slip between the two;
+reads are unaffected. Expect the backfill to take as long as a full scan
+and sort of verse_text, and schedule the deploy outside upload windows.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a6c8e4d1b7"
+down_revision: Union[str, None] = "b5e8c2a7d4f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION refresh_version_latest_verse(
+        version_ids integer[], books text[], chapters integer[], verses integer[]
+    ) RETURNS void AS $$
+    BEGIN
+        DELETE FROM version_latest_verse p
+        USING unnest(version_ids, books, chapters, verses)
+            AS k(version_id, book, chapter, verse)
+        WHERE p.version_id = k.version_id AND p.book = k.book
+          AND p.chapter = k.chapter AND p.verse = k.verse;
+        INSERT INTO version_latest_verse (
+            version_id, book, chapter, verse, verse_reference,
+            verse_text_id, revision_id, revision_date
+        )
+        SELECT DISTINCT ON (br.bible_version_id, vt.book, vt.chapter, vt.verse)
+            br.bible_version_id, vt.book, vt.chapter, vt.verse,
+            vt.verse_reference, vt.id, br.id, br.date
+        FROM (
+            SELECT DISTINCT * FROM unnest(version_ids, books, chapters, verses)
+                AS u(version_id, book, chapter, verse)
+        ) k
+        JOIN bible_revision br
+          ON br.bible_version_id = k.version_id AND br.deleted IS FALSE
+        JOIN verse_text vt
+          ON vt.revision_id = br.id AND vt.book = k.book
+         AND vt.chapter = k.chapter AND vt.verse = k.verse
+        WHERE vt.text <> ''
+        ORDER BY br.bible_version_id, vt.book, vt.chapter, vt.verse,
+                 br.date DESC, br.id DESC;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION version_latest_verse_on_insert()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        INSERT INTO version_latest_verse AS p (
+            version_id, book, chapter, verse, verse_reference,
+            verse_text_id, revision_id, revision_date
+        )
+        SELECT DISTINCT ON (br.bible_version_id, n.book, n.chapter, n.verse)
+            br.bible_version_id, n.book, n.chapter, n.verse,
+            n.verse_reference, n.id, br.id, br.date
+        FROM new_rows n
+        JOIN bible_revision br ON br.id = n.revision_id
+        WHERE br.deleted IS FALSE AND n.text <> ''
+          AND n.book IS NOT NULL AND n.chapter IS NOT NULL
+          AND n.verse IS NOT NULL
+        ORDER BY br.bible_version_id, n.book, n.chapter, n.verse,
+                 br.date DESC, br.id DESC
+        ON CONFLICT (version_id, book, chapter, verse) DO UPDATE SET
+            verse_reference = EXCLUDED.verse_reference,
+            verse_text_id = EXCLUDED.verse_text_id,
+            revision_id = EXCLUDED.revision_id,
+            revision_date = EXCLUDED.revision_date
+        -- DESC sorts NULL dates first, so they rank as the latest.
+        WHERE (EXCLUDED.revision_date IS NULL,
+               COALESCE(EXCLUDED.revision_date, '-infinity'),
+               EXCLUDED.revision_id)
+            > (p.revision_date IS NULL,
+               COALESCE(p.revision_date, '-infinity'),
+               p.revision_id);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION version_latest_verse_on_change()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' THEN
+            PERFORM refresh_version_latest_verse(
+                array_agg(br.bible_version_id), array_agg(c.book),
+                array_agg(c.chapter), array_agg(c.verse)
+            )
+            FROM (
+                SELECT revision_id, book, chapter, verse FROM old_rows
+                UNION
+                SELECT revision_id, book, chapter, verse FROM new_rows
+            ) c
+            JOIN bible_revision br ON br.id = c.revision_id;
+        ELSE
+            PERFORM refresh_version_latest_verse(
+                array_agg(br.bible_version_id), array_agg(c.book),
+                array_agg(c.chapter), array_agg(c.verse)
+            )
+            FROM old_rows c
+            JOIN bible_revision br ON br.id = c.revision_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION version_latest_verse_on_revision_change()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        PERFORM refresh_version_latest_verse(
+            array_agg(v.version_id), array_agg(vt.book),
+            array_agg(vt.chapter), array_agg(vt.verse)
+        )
+        FROM verse_text vt
+        CROSS JOIN (
+            VALUES (OLD.bible_version_id), (NEW.bible_version_id)
+        ) v(version_id)
+        WHERE vt.revision_id = NEW.id AND v.version_id IS NOT NULL;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+TRIGGERS = {
+    ("verse_text", "trg_verse_text_latest_insert"): (
+        "AFTER INSERT ON verse_text "
+        "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT "
+        "EXECUTE FUNCTION version_latest_verse_on_insert()"
+    ),
+    ("verse_text", "trg_verse_text_latest_update"): (
+        "AFTER UPDATE ON verse_text "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION version_latest_verse_on_change()"
+    ),
+    ("verse_text", "trg_verse_text_latest_delete"): (
+        "AFTER DELETE ON verse_text "
+        "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT "
+        "EXECUTE FUNCTION version_latest_verse_on_change()"
+    ),
+    ("bible_revision", "trg_bible_revision_latest_verse"): (
+        "AFTER UPDATE OF deleted, date, bible_version_id ON bible_revision "
+        "FOR EACH ROW WHEN ("
+        "OLD.deleted IS DISTINCT FROM NEW.deleted "
+        "OR OLD.date IS DISTINCT FROM NEW.date "
+        "OR OLD.bible_version_id IS DISTINCT FROM NEW.bible_version_id) "
+        "EXECUTE FUNCTION version_latest_verse_on_revision_change()"
+    ),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "version_latest_verse",
+        sa.Column("version_id", sa.Integer(), nullable=False),
+        sa.Column("book", sa.Text(), nullable=False),
+        sa.Column("chapter", sa.Integer(), nullable=False),
+        sa.Column("verse", sa.Integer(), nullable=False),
+        sa.Column("verse_reference", sa.Text(), nullable=True),
+        sa.Column("verse_text_id", sa.Integer(), nullable=False),
+        sa.Column("revision_id", sa.Integer(), nullable=False),
+        sa.Column("revision_date", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["version_id"], ["bible_version.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["verse_text_id"], ["verse_text.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("version_id", "book", "chapter", "verse"),
+    )
+    op.create_index(
+        "ix_version_latest_verse_verse_reference",
+        "version_latest_verse",
+        ["version_id", "verse_reference"],
+    )
+    op.create_index(
+        "ix_version_latest_verse_verse_text_id",
+        "version_latest_verse",
+        ["verse_text_id"],
+        unique=True,
+    )
+
+    for function in FUNCTIONS:
+        op.execute(function)
+    # Taking the trigger locks can queue behind a long upload, and every new
+    # verse_text write would then queue behind us; fail fast instead, per
+    # c9e7b1f2d3a4, and retry in a quieter window.
+    op.execute(sa.text("SET lock_timeout = '5s'"))
+    for (table, trigger), definition in TRIGGERS.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+        op.execute(f"CREATE TRIGGER {trigger} {definition}")
+    op.execute(sa.text("SET lock_timeout = 0"))
+
+    op.execute(
+        """
+        INSERT INTO version_latest_verse (
+            version_id, book, chapter, verse, verse_reference,
+            verse_text_id, revision_id, revision_date
+        )
+        SELECT DISTINCT ON (br.bible_version_id, vt.book, vt.chapter, vt.verse)
+            br.bible_version_id, vt.book, vt.chapter, vt.verse,
+            vt.verse_reference, vt.id, br.id, br.date
+        FROM verse_text vt
+        JOIN bible_revision br ON br.id = vt.revision_id
+        WHERE br.deleted IS FALSE AND vt.text <> ''
+          AND vt.book IS NOT NULL AND vt.chapter IS NOT NULL
+          AND vt.verse IS NOT NULL
+        ORDER BY br.bible_version_id, vt.book, vt.chapter, vt.verse,
+                 br.date DESC, br.id DESC
+        """
+    )
+
+
+def downgrade() -> None:
+    for table, trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+    for function in (
+        "version_latest_verse_on_revision_change()",
+        "version_latest_verse_on_change()",
+        "version_latest_verse_on_insert()",
+        "refresh_version_latest_verse(integer[], text[], integer[], integer[])",
+    ):
+        op.execute(f"DROP FUNCTION IF EXISTS {function}")
+    op.drop_index(
+        "ix_version_latest_verse_verse_text_id", table_name="version_latest_verse"
+    )
+    op.drop_index(
+        "ix_version_latest_verse_verse_reference", table_name="version_latest_verse"
+    )
+    op.drop_table("version_latest_verse")
@@ -1,5 +1,6 @@
 __version__ = "v3"
 
+import contextlib
 import logging
 
 import fastapi
@@ -8,6 +9,7 @@ from fastapi.openapi.utils import get_openapi
 from fastapi.responses import JSONResponse
 from sqlalchemy import text
 
+import background_jobs
 from agent_routes.v3.affix_routes import router as affix_router_v3
 from agent_routes.v3.agent_routes import router as agent_router_v3
 from agent_routes.v3.pivot_routes import router as pivot_router_v3
@@ -29,6 +31,7 @@ from bible_routes.v3.verse_routes import router as verse_router_v3
 from bible_routes.v3.version_routes import router as version_router_v3
 from config import Settings
 from database.dependencies import engine as async_engine
+from job_routes.v3.job_routes import router as job_router_v3
 from middleware import LoggingMiddleware
 from predict_routes.v3.predict_routes import router as predict_router_v3
 from security_routes.admin_routes import router as admin_router
@@ -37,7 +40,18 @@ from train_routes.v3.train_routes import router as train_router_v3
 
 logger = logging.getLogger(__name__)
 
-app = fastapi.FastAPI()
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # Each worker runs its share of the background job queue.
+    background_jobs.start()
+    try:
+        yield
+    finally:
+        await background_jobs.stop()
+
+
+app = fastapi.FastAPI(lifespan=lifespan)
 
 
 def my_schema():
@@ -133,6 +147,9 @@ def configure_cors(app):
         allow_credentials=allow_credentials,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Cursor for the next page of list-shaped responses
+        # (/agent/word-alignment/all); browsers hide it unless exposed.
+        expose_headers=["X-Next-Cursor"],
     )
 
 
@@ -164,6 +181,7 @@ def configure_routing(app):
     app.include_router(results_write_router_v3, prefix="/v3", tags=["Version 3"])
     app.include_router(predict_router_v3, prefix="/v3", tags=["Version 3"])
     app.include_router(timeout_sweep_router_v3, prefix="/v3", tags=["Version 3"])
+    app.include_router(job_router_v3, prefix="/v3", tags=["Version 3"])
 
     app.include_router(
         language_router_v3, prefix="/latest", tags=["Version 3 / Latest"]
@@ -196,6 +214,7 @@ def configure_routing(app):
     app.include_router(
         timeout_sweep_router_v3, prefix="/latest", tags=["Version 3 / Latest"]
     )
+    app.include_router(job_router_v3, prefix="/latest", tags=["Version 3 / Latest"])
 
     app.include_router(security_router, prefix="/latest", tags=["Latest"])
     app.include_router(admin_router, prefix="/latest", tags=["Latest"])
@@ -17,7 +17,9 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased
 
+from assessment_routes.v3 import baseline_stats
 from assessment_routes.v3.alignment_filters import eflomal_method_clause
+from assessment_routes.v3.results_query_routes import refresh_result_rollups
 from config import settings
 from database.dependencies import get_db
 from database.models import Assessment, BibleRevision, BibleVersion, BibleVersionAccess
@@ -888,7 +890,16 @@ async def update_assessment_status(
     if update.status in ASSESSMENT_TERMINAL_STATUSES:
         assessment.end_time = datetime.utcnow()
 
+    if update.status == AssessmentStatus.finished:
+        # Results are complete; precompute the /result aggregates in the
+        # same transaction as the status change.
+        await refresh_result_rollups(assessment.id, assessment.type, db)
+
     await db.commit()
+    if update.status == AssessmentStatus.finished:
+        # A newer baseline assessment supersedes cached baseline statistics
+        # against this reference.
+        baseline_stats.invalidate_reference(assessment.reference_id)
     await db.refresh(assessment)
     return AssessmentOut.model_validate(assessment)
 
@@ -999,6 +1010,7 @@ async def delete_assessment(
         assessment.deleted = True
         assessment.deletedAt = date.today()
         await db.commit()
+        baseline_stats.invalidate_assessment(assessment_id)
         return {"detail": f"Assessment {assessment_id} deleted successfully"}
 
     else:
@@ -0,0 +1,104 @@
+"""Per-worker cache of the baseline statistics behind /compareresults.
+
+/compareresults scores a revision against the mean and standard deviation of
+its baselines' word-alignment scores per verse/chapter/book. Computing those
+means aggregating every baseline's ``assessment_result`` rows (~31k per
+revision) on every call, although reviewers compare many revisions against
+the same baseline set and that set's statistics only change when one of its
+assessments does. This module keeps the computed statistics in RAM.
+
+Entries hold the statistics for every group in the text and are keyed by
+``BaselineStatsKey``: the reference, the sorted ids of the latest finished
+assessment of each baseline revision, the aggregate level, and the runner
+filter. Book/chapter/verse filters only select groups, so they share one
+entry. The ids are resolved on every call, so when a newer baseline
+assessment finishes the key changes and the old entry is never read again,
+on any worker. ``invalidate_reference`` drops those dead entries when an
+assessment finishes on this worker; ``invalidate_assessment`` drops entries
+built from an assessment whose results were pushed or deleted, or which was
+itself deleted. Writes to a finished assessment's results on another worker are
+policy-forbidden but not enforced, so entries also expire after an hour —
+the same bound as the ngrams count cache in results_query_routes and the
+TF-IDF corpus cache.
+
+``settings.compare_baseline_cache_mb`` caps the cache (LRU); 0 disables it.
+Concurrent cold requests for the same key each compute the statistics and
+store identical values.
+"""
+
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from config import settings
+
+_BASELINE_STATS_TTL_SECONDS = 3600
+# Rough per-group footprint of a stats dict entry: the key tuple and its
+# values, the (mean, stdev) tuple and its floats, and the dict slot.
+_BYTES_PER_GROUP = 250
+
+# Group key (book/chapter/verse values, per the aggregate level) ->
+# (mean, stdev) of the baselines' average scores in that group.
+BaselineStats = Dict[Tuple, Tuple[Optional[float], Optional[float]]]
+
+
+class BaselineStatsKey(NamedTuple):
+    reference_id: int
+    assessment_ids: Tuple[int, ...]  # sorted
+    aggregate: Optional[str]
+    use_eflomal: Optional[bool]
+
+
+# key -> (stored_at, stats), LRU order.
+_STATS_CACHE: Dict[BaselineStatsKey, Tuple[float, BaselineStats]] = {}
+
+
+def _max_bytes() -> int:
+    return settings.compare_baseline_cache_mb * 1024 * 1024
+
+
+def _nbytes(stats: BaselineStats) -> int:
+    return _BYTES_PER_GROUP * max(len(stats), 1)
+
+
+def get(key: BaselineStatsKey) -> Optional[BaselineStats]:
+    """The cached statistics for ``key``, or None if absent, expired, or the
+    cache is disabled."""
+    if settings.compare_baseline_cache_mb <= 0:
+        return None
+    entry = _STATS_CACHE.get(key)
+    if entry is None:
+        return None
+    if time.monotonic() - entry[0] > _BASELINE_STATS_TTL_SECONDS:
+        del _STATS_CACHE[key]
+        return None
+    # Re-insert so dict order tracks recency and eviction drops the LRU.
+    _STATS_CACHE[key] = _STATS_CACHE.pop(key)
+    return entry[1]
+
+
+def store(key: BaselineStatsKey, stats: BaselineStats) -> None:
+    _STATS_CACHE.pop(key, None)
+    if _nbytes(stats) > _max_bytes():
+        return
+    while _STATS_CACHE and (
+        sum(_nbytes(entry[1]) for entry in _STATS_CACHE.values()) + _nbytes(stats)
+        > _max_bytes()
+    ):
+        _STATS_CACHE.pop(next(iter(_STATS_CACHE)), None)
+    _STATS_CACHE[key] = (time.monotonic(), stats)
+
+
+def invalidate_assessment(assessment_id: int) -> None:
+    """Drop every entry computed from ``assessment_id``'s results."""
+    for key in [key for key in _STATS_CACHE if assessment_id in key.assessment_ids]:
+        del _STATS_CACHE[key]
+
+
+def invalidate_reference(reference_id: int) -> None:
+    """Drop every entry for baselines against ``reference_id``."""
+    for key in [key for key in _STATS_CACHE if key.reference_id == reference_id]:
+        del _STATS_CACHE[key]
+
+
+def clear() -> None:
+    _STATS_CACHE.clear()
@@ -10,6 +10,8 @@ from sqlalchemy import delete, insert, select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from assessment_routes.v3 import baseline_stats, tfidf_corpus
+from assessment_routes.v3.results_query_routes import clear_result_rollups
 from database.dependencies import get_db
 from database.models import (
     AlignmentThresholdScores,
@@ -157,7 +159,9 @@ async def push_results(
     rows = _build_score_rows(assessment_id, body)
     try:
         await _batch_insert(db, AssessmentResult, rows)
+        await clear_result_rollups(assessment_id, db)
         await db.commit()
+        baseline_stats.invalidate_assessment(assessment_id)
         return InsertResponse(ids=[])
     except IntegrityError:
         await db.rollback()
@@ -458,6 +462,7 @@ async def push_tfidf_vectors(
     try:
         await _batch_insert(db, TfidfPcaVector, rows)
         await db.commit()
+        tfidf_corpus.invalidate(assessment_id)
         return InsertResponse(ids=[])
     except IntegrityError:
         await db.rollback()
@@ -606,7 +611,9 @@ async def delete_results(
         deleted = await _delete_from_table(
             AssessmentResult, assessment_id, body.ids, db
         )
+        await clear_result_rollups(assessment_id, db)
         await db.commit()
+        baseline_stats.invalidate_assessment(assessment_id)
         return DeleteResponse(deleted=deleted)
     except SQLAlchemyError:
         logger.exception(
@@ -733,6 +740,7 @@ async def delete_tfidf_vectors(
     try:
         deleted = await _delete_from_table(TfidfPcaVector, assessment_id, body.ids, db)
         await db.commit()
+        tfidf_corpus.invalidate(assessment_id)
         return DeleteResponse(deleted=deleted)
     except SQLAlchemyError:
         logger.exception(
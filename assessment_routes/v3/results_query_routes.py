@@ -1,27 +1,32 @@
 __version__ = "v3"
 
 import ast
+import asyncio
 import socket
 import time
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Union
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import Float, Text, case, cast, func, text
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Text, and_, case, delete, exists, func, literal, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased
 from sqlalchemy.sql import select
 
+import revision_text_cache
+from assessment_routes.v3 import baseline_stats, tfidf_corpus
 from assessment_routes.v3.alignment_filters import eflomal_method_clause
 from config import settings
-from database.dependencies import get_db
+from database.dependencies import AsyncSessionLocal, get_db
 from database.models import (
     AlignmentThresholdScores,
     AlignmentTopSourceScores,
     Assessment,
     AssessmentResult,
+    AssessmentResultRollup,
     BibleRevision,
     NgramsTable,
     NgramVrefTable,
@@ -37,7 +42,9 @@ from models import Result_v2 as Result
 from models import TextLengthsResult, TfidfResult, WordAlignment
 from security_routes.auth_routes import get_current_user
 from security_routes.utilities import is_user_authorized_for_assessment
+from utils.export import EXPORT_MEDIA_TYPES, ExportFormat, encode_export
 from utils.logging_config import setup_logger
+from utils.pagination import decode_cursor, next_cursor, validate_cursor_params
 from utils.verse_range_utils import merge_verse_ranges
 
 container_id = socket.gethostname()
@@ -122,16 +129,34 @@ async def validate_parameters(
         )
 
 
-def calculate_z_score(row):
-    if (
-        row["stddev_of_avg_score"]
-        and row["stddev_of_avg_score"] != 0
-        and not pd.isna(row["average_of_avg_score"])
-        and not pd.isna(row["score"])
-    ):
-        return (row["score"] - row["average_of_avg_score"]) / row["stddev_of_avg_score"]
-    else:
+# Columns /compareresults groups (and joins main to baseline) by; verse level
+# when no aggregate is given.
+_COMPARE_GROUP_COLUMNS = {
+    aggType.chapter: ["book", "chapter"],
+    aggType.book: ["book"],
+    aggType.text: [],
+}
+
+
+def _compare_vref(row, aggregate: Optional[aggType]) -> Optional[str]:
+    if aggregate == aggType.chapter:
+        return f"{row.book} {row.chapter}"
+    if aggregate == aggType.book:
+        return f"{row.book}"
+    if aggregate == aggType.text:
         return None
+    return f"{row.book} {row.chapter}:{row.verse}"
+
+
+def _float_or_none(value) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _z_score(score, mean: Optional[float], stdev: Optional[float]):
+    # No z-score without a spread: one baseline, or all baselines equal.
+    if score is None or mean is None or not stdev:
+        return None
+    return (float(score) - mean) / stdev
 
 
 async def execute_query(query, count_query, db):
@@ -143,6 +168,134 @@ async def execute_query(query, count_query, db):
     return result_data, total_count
 
 
+# Assessment types whose /result omits null-source rows unless reverse=True.
+_SOURCE_FILTERED_TYPES = ("question-answering", "word-tests")
+
+_AGGREGATE_GROUP_COLUMNS = {
+    aggType.chapter: ["book", "chapter"],
+    aggType.book: ["book"],
+    aggType.text: [],
+}
+
+
+async def clear_result_rollups(assessment_id: int, db: AsyncSession) -> None:
+    """Drop an assessment's aggregate rollups, so /result groups
+    ``assessment_result`` live again. Call whenever its rows change; the
+    caller commits."""
+    await db.execute(
+        delete(AssessmentResultRollup).where(
+            AssessmentResultRollup.assessment_id == assessment_id
+        )
+    )
+
+
+async def refresh_result_rollups(
+    assessment_id: int, assessment_type: Optional[str], db: AsyncSession
+) -> None:
+    """(Re)write the chapter/book/text rollups `build_results_query` serves
+    for a finished assessment; the caller commits.
+
+    One INSERT ... SELECT per source variant computes all three levels in a
+    single scan of ``assessment_result`` via GROUPING SETS. GROUPING(book,
+    chapter) is 0 for the (book, chapter) set, 1 for (book) and 3 for ().
+    """
+    await clear_result_rollups(assessment_id, db)
+    variants = [False]
+    if assessment_type in _SOURCE_FILTERED_TYPES:
+        variants.append(True)
+    level = case(
+        (
+            func.grouping(AssessmentResult.book, AssessmentResult.chapter) == 0,
+            "chapter",
+        ),
+        (func.grouping(AssessmentResult.book, AssessmentResult.chapter) == 1, "book"),
+        else_="text",
+    )
+    for source_not_null in variants:
+        grouped = select(
+            AssessmentResult.assessment_id,
+            level,
+            literal(source_not_null),
+            AssessmentResult.book,
+            AssessmentResult.chapter,
+            func.min(AssessmentResult.id),
+            func.avg(AssessmentResult.score),
+            func.bool_or(AssessmentResult.flag),
+            func.bool_or(AssessmentResult.hide),
+        ).where(AssessmentResult.assessment_id == assessment_id)
+        if source_not_null:
+            grouped = grouped.where(AssessmentResult.source.isnot(None))
+        grouped = grouped.group_by(
+            AssessmentResult.assessment_id,
+            text("GROUPING SETS ((book, chapter), (book), ())"),
+        )
+        await db.execute(
+            AssessmentResultRollup.__table__.insert().from_select(
+                [
+                    "assessment_id",
+                    "level",
+                    "source_not_null",
+                    "book",
+                    "chapter",
+                    "result_id",
+                    "score",
+                    "flag",
+                    "hide",
+                ],
+                grouped,
+            )
+        )
+
+
+def _build_rollup_query(
+    assessment_id: int,
+    book: Optional[str],
+    chapter: Optional[int],
+    page: Optional[int],
+    page_size: Optional[int],
+    aggregate: aggType,
+    only_non_null: bool,
+    after_id: Optional[int] = None,
+) -> Tuple:
+    """`build_results_query`'s aggregate queries, read from the rollup table.
+    Rows have the same columns and order as the live grouping."""
+    rollup = AssessmentResultRollup
+    conditions = [
+        rollup.assessment_id == assessment_id,
+        rollup.level == aggregate.value,
+    ]
+    if book is not None:
+        conditions.append(func.upper(rollup.book) == book.upper())
+    if chapter is not None:
+        conditions.append(rollup.chapter == chapter)
+
+    query = (
+        select(
+            rollup.result_id.label("id"),
+            rollup.assessment_id,
+            *[getattr(rollup, col) for col in _AGGREGATE_GROUP_COLUMNS[aggregate]],
+            rollup.score,
+            rollup.flag,
+            rollup.hide,
+        )
+        .where(*conditions, rollup.source_not_null == only_non_null)
+        .order_by(rollup.result_id)
+    )
+    if after_id is not None:
+        query = query.where(rollup.result_id > after_id).limit(page_size)
+    elif page is not None and page_size is not None:
+        query = query.offset((page - 1) * page_size).limit(page_size)
+
+    # The live count groups every row, null sources included, so count the
+    # unfiltered variant (always written) whatever ``only_non_null`` is.
+    count_query = (
+        select(func.count())
+        .select_from(rollup)
+        .where(*conditions, rollup.source_not_null.is_(False))
+    )
+    return query, count_query
+
+
 async def build_results_query(
     assessment_id: int,
     book: Optional[str],
@@ -153,7 +306,16 @@ async def build_results_query(
     aggregate: Optional[aggType],
     reverse: Optional[bool],
     db: AsyncSession,
+    after_id: Optional[int] = None,
 ) -> Tuple:
+    """Row and count queries for /result.
+
+    Rows are ordered by ``id`` (the group's ``min(id)``). With ``after_id``
+    (a decoded cursor) the page is the next ``page_size`` rows after it; the
+    rollup path serves that as an index range scan, while the live grouping
+    can only filter whole groups after aggregating (HAVING), since dropping
+    rows before grouping would change the aggregates.
+    """
     # Initialize the base query
     base_query = select(AssessmentResult).where(
         AssessmentResult.assessment_id == assessment_id
@@ -167,30 +329,46 @@ async def build_results_query(
     if verse is not None:
         base_query = base_query.where(AssessmentResult.verse == verse)
 
-    # Apply 'source_null' logic to filter results
-    assessment_type = await db.scalar(
-        select(Assessment.type).where(Assessment.id == assessment_id)
+    # Apply 'source_null' logic to filter results. Aggregate requests also
+    # check, in the same round trip, whether the assessment's rollups exist.
+    use_rollup = aggregate is not None and verse is None
+    rollup_exists = (
+        exists()
+        .where(
+            AssessmentResultRollup.assessment_id == assessment_id,
+            AssessmentResultRollup.level == aggregate.value,
+        )
+        .label("rollup_exists")
+        if use_rollup
+        else literal(False).label("rollup_exists")
     )
+    assessment_row = (
+        await db.execute(
+            select(Assessment.type, rollup_exists).where(Assessment.id == assessment_id)
+        )
+    ).first()
+    assessment_type = assessment_row.type if assessment_row else None
     # For missing words, if not reverse, we only want the non-null source results
-    only_non_null = (
-        assessment_type in ["question-answering", "word-tests"] and not reverse
-    )
+    only_non_null = assessment_type in _SOURCE_FILTERED_TYPES and not reverse
+    if use_rollup and assessment_row and assessment_row.rollup_exists:
+        return _build_rollup_query(
+            assessment_id,
+            book,
+            chapter,
+            page,
+            page_size,
+            aggregate,
+            only_non_null,
+            after_id,
+        )
     if only_non_null:
         base_query = base_query.where(AssessmentResult.source.isnot(None))
 
     subquery = base_query.subquery()
 
-    if aggregate == aggType.chapter:
-        group_by_columns = ["book", "chapter"]
-
-    elif aggregate == aggType.book:
-        group_by_columns = ["book"]
-
-    elif aggregate == aggType.text:
-        group_by_columns = []
-
-    else:
-        group_by_columns = ["book", "chapter", "verse"]
+    group_by_columns = _AGGREGATE_GROUP_COLUMNS.get(
+        aggregate, ["book", "chapter", "verse"]
+    )
 
     base_query = (
         select(
@@ -208,7 +386,11 @@ async def build_results_query(
         .order_by("id")
     )
     # Handling pagination for the base query (applies in non-aggregated scenarios or when explicitly required)
-    if page is not None and page_size is not None:
+    if after_id is not None:
+        base_query = base_query.having(func.min(subquery.c.id) > after_id).limit(
+            page_size
+        )
+    elif page is not None and page_size is not None:
         base_query = base_query.offset((page - 1) * page_size).limit(page_size)
 
     count_query = (
@@ -318,6 +500,7 @@ async def fetch_ngrams_page(
     page: Optional[int],
     page_size: Optional[int],
     db: AsyncSession,
+    after_id: Optional[int] = None,
 ) -> Tuple[List[dict], int]:
     """Return a page of n-gram results for an assessment, plus the total count.
 
@@ -327,6 +510,10 @@ async def fetch_ngrams_page(
     `JOIN ... GROUP BY ... ORDER BY ... LIMIT` forced Postgres to
     aggregate the entire assessment corpus before LIMIT could be
     applied, so every page paid for the whole table — see #648.
+
+    ``after_id`` (a decoded cursor) replaces ``page``: the page starts after
+    that ngram id, so deep pages are an index range scan on
+    ``(assessment_id, id)`` rather than an OFFSET walk.
     """
     ngrams_query = (
         select(
@@ -338,7 +525,9 @@ async def fetch_ngrams_page(
         .where(NgramsTable.assessment_id == assessment_id)
         .order_by(NgramsTable.id)
     )
-    if page is not None and page_size is not None:
+    if after_id is not None:
+        ngrams_query = ngrams_query.where(NgramsTable.id > after_id).limit(page_size)
+    elif page is not None and page_size is not None:
         ngrams_query = ngrams_query.offset((page - 1) * page_size).limit(page_size)
 
     ngram_rows = (await db.execute(ngrams_query)).all()
@@ -585,24 +774,34 @@ async def build_text_lengths_query(
     return base_query, final_count_query
 
 
-def build_vector_literal(query_vector) -> str:
-    values = (
-        query_vector.tolist() if hasattr(query_vector, "tolist") else list(query_vector)
-    )
-    return f"'[{','.join(f'{x:.6f}' for x in values)}]'::vector"
+async def tfidf_similarity_ordering(db: AsyncSession, query_vector) -> Tuple:
+    """(similarity column, ORDER BY clause) ranking corpus rows by inner
+    product with `query_vector`, which binds as a binary vector parameter.
+
+    `<#>` is pgvector's negative inner product, the operator
+    tfidf_pca_vector_ivfflat_idx (vector_ip_ops) serves. By default the rows
+    are ordered by the negated distance, which the index can't serve, so the
+    ranking stays exact; with `settings.tfidf_ivfflat_probes` set they are
+    ordered by the bare distance so the planner may pick the index, probing
+    that many lists (for this transaction).
+    """
+    distance = TfidfPcaVector.vector.max_inner_product(query_vector)
+    similarity_expr = (-distance).label("cosine_similarity")
+    probes = settings.tfidf_ivfflat_probes
+    if probes <= 0:
+        return similarity_expr, similarity_expr.desc()
+    await db.execute(select(func.set_config("ivfflat.probes", str(probes), True)))
+    return similarity_expr, distance
 
 
 async def build_tfidf_similarity_query(
+    db: AsyncSession,
     assessment_id: int,
     vref: str,
     query_vector: np.ndarray,
     limit: int = 10,
 ) -> Tuple:
-    vector_str = build_vector_literal(query_vector)
-
-    similarity_expr = cast(
-        text(f"inner_product(tfidf_pca_vector.vector, {vector_str})"), Float
-    ).label("cosine_similarity")
+    similarity_expr, order_by = await tfidf_similarity_ordering(db, query_vector)
 
     base_query = (
         select(
@@ -612,16 +811,86 @@ async def build_tfidf_similarity_query(
         )
         .where(TfidfPcaVector.assessment_id == assessment_id)
         .where(TfidfPcaVector.vref != vref)
-        .order_by(similarity_expr.desc())
+        .order_by(order_by)
         .limit(limit)
     )
 
     return base_query, None
 
 
+def _result_fields(row) -> dict:
+    """The `Result` fields for one `build_results_query` row."""
+    # Text-level aggregates have no book column, hence no vref.
+    vref = f"{row.book}" if hasattr(row, "book") else None
+    if hasattr(row, "chapter") and row.chapter is not None:
+        vref += f" {row.chapter}"
+        if hasattr(row, "verse") and row.verse is not None:
+            vref += f":{row.verse}"
+
+    return {
+        "id": row.id if hasattr(row, "id") else None,
+        "assessment_id": row.assessment_id if hasattr(row, "assessment_id") else None,
+        "vref": vref,
+        "score": row.score if hasattr(row, "score") else None,
+        "source": row.source if hasattr(row, "source") else None,
+        "target": (
+            ast.literal_eval(row.target)
+            if hasattr(row, "target") and row.target is not None
+            else None
+        ),
+        "flag": row.flag if hasattr(row, "flag") else None,
+        "note": row.note if hasattr(row, "note") else None,
+        "revision_text": row.revision_text if hasattr(row, "revision_text") else None,
+        "reference_text": (
+            row.reference_text if hasattr(row, "reference_text") else None
+        ),
+        "hide": row.hide if hasattr(row, "hide") else None,
+    }
+
+
+async def _stream_batches(query, to_record) -> AsyncIterator[List[dict]]:
+    """Yield ``query``'s rows as lists of ``to_record(row)`` dicts, one list
+    per ``settings.results_export_batch_size`` rows fetched from a
+    server-side cursor.
+
+    Opens its own session: FastAPI closes the request's ``get_db`` session
+    when the handler returns, before a StreamingResponse body is sent.
+    """
+    batch_size = settings.results_export_batch_size
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            query.execution_options(stream_results=True, max_row_buffer=batch_size)
+        )
+        async for rows in result.partitions(batch_size):
+            yield [to_record(row) for row in rows]
+
+
+def _export_response(
+    batches: AsyncIterator[List[dict]],
+    fieldnames: List[str],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    return StreamingResponse(
+        encode_export(batches, fieldnames, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'
+        },
+    )
+
+
+_EXPORT_RESPONSES = {
+    200: {
+        "description": "One record per line (NDJSON), or CSV with a header row.",
+        "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()},
+    }
+}
+
+
 @router.get(
     "/result",
-    response_model=Dict[str, Union[List[Result], int]],
+    response_model=Dict[str, Union[List[Result], int, str, None]],
 )
 async def get_result(
     assessment_id: int,
@@ -632,6 +901,7 @@ async def get_result(
     page_size: Optional[int] = None,
     aggregate: Optional[aggType] = None,
     reverse: Optional[bool] = False,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user),
 ):
@@ -654,6 +924,9 @@ async def get_result(
         The number of results to return per page. If set, page must also be set.
     aggregate : str, optional
         If set to "chapter", results will be aggregated by chapter. Otherwise results will be returned at the verse level.
+    cursor : str, optional
+        The `next_cursor` from a previous response; returns the `page_size` results after it. Use instead of `page` to
+        walk large result sets. `next_cursor` is returned whenever `page_size` is set and is null on the last page.
 
     Notes
     -----
@@ -667,7 +940,12 @@ async def get_result(
     """
     request_start = time.perf_counter()
 
-    await validate_parameters(book, chapter, verse, aggregate, page, page_size)
+    validate_cursor_params(cursor, page, page_size)
+    after_id = decode_cursor(cursor, (int,))[0] if cursor is not None else None
+    if after_id is None:
+        await validate_parameters(book, chapter, verse, aggregate, page, page_size)
+    else:
+        await validate_parameters(book, chapter, verse, aggregate)
 
     authorized = await is_user_authorized_for_assessment(
         current_user.id, assessment_id, db
@@ -689,38 +967,12 @@ async def get_result(
         aggregate,
         reverse,
         db,
+        after_id,
     )
 
     result_data, total_count = await execute_query(query, count_query, db)
 
-    result_list = []
-    for row in result_data:
-        vref = f"{row.book}"
-        if hasattr(row, "chapter") and row.chapter is not None:
-            vref += f" {row.chapter}"
-            if hasattr(row, "verse") and row.verse is not None:
-                vref += f":{row.verse}"
-
-        result_obj = Result(
-            id=row.id if hasattr(row, "id") else None,
-            assessment_id=row.assessment_id if hasattr(row, "assessment_id") else None,
-            vref=vref,
-            score=row.score if hasattr(row, "score") else None,
-            source=row.source if hasattr(row, "source") else None,
-            target=(
-                ast.literal_eval(row.target)
-                if hasattr(row, "target") and row.target is not None
-                else None
-            ),
-            flag=row.flag if hasattr(row, "flag") else None,
-            note=row.note if hasattr(row, "note") else None,
-            revision_text=row.revision_text if hasattr(row, "revision_text") else None,
-            reference_text=(
-                row.reference_text if hasattr(row, "reference_text") else None
-            ),
-            hide=row.hide if hasattr(row, "hide") else None,
-        )
-        result_list.append(result_obj)
+    result_list = [Result(**_result_fields(row)) for row in result_data]
 
     duration = round(time.perf_counter() - request_start, 2)
     logger.info(
@@ -734,6 +986,7 @@ async def get_result(
             "verse": verse,
             "page": page,
             "page_size": page_size,
+            "cursor": cursor,
             "aggregate": aggregate.value if aggregate else None,
             "total_count": total_count,
             "results_returned": len(result_list),
@@ -741,13 +994,86 @@ async def get_result(
         },
     )
 
-    return {"results": result_list, "total_count": total_count}
+    return {
+        "results": result_list,
+        "total_count": total_count,
+        "next_cursor": next_cursor(result_data, page_size, lambda row: (row.id,)),
+    }
+
+
+@router.get(
+    "/result/export", response_class=StreamingResponse, responses=_EXPORT_RESPONSES
+)
+async def export_result(
+    assessment_id: int,
+    book: Optional[str] = None,
+    chapter: Optional[int] = None,
+    verse: Optional[int] = None,
+    aggregate: Optional[aggType] = None,
+    reverse: Optional[bool] = False,
+    format: ExportFormat = ExportFormat.ndjson,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Streams every result for a given assessment, for bulk syncs of large assessments.
+
+    Takes the same filters as `/result` and returns the same results in the same order (by id), but streams them
+    from the database in batches instead of building one JSON response, so memory stays flat however large the
+    assessment is.
+
+    Parameters
+    ----------
+    assessment_id : int
+        The ID of the assessment to export results for.
+    book : str, optional
+        Restrict results to one book.
+    chapter : int, optional
+        Restrict results to one chapter. If set, book must also be set.
+    verse : int, optional
+        Restrict results to one verse. If set, book and chapter must also be set.
+    aggregate : str, optional
+        Aggregate results by "chapter", "book" or "text", as for `/result`.
+    format : str, optional
+        "ndjson" (default): one JSON object per line, with the fields of a `/result` result.
+        "csv": a header row, then one row per result.
+    """
+    await validate_parameters(book, chapter, verse, aggregate)
+
+    if not await is_user_authorized_for_assessment(current_user.id, assessment_id, db):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User not authorized to see this assessment",
+        )
+
+    query, _ = await build_results_query(
+        assessment_id, book, chapter, verse, None, None, aggregate, reverse, db
+    )
+    logger.info(
+        "export_result started",
+        extra={
+            "method": "GET",
+            "path": "/result/export",
+            "assessment_id": assessment_id,
+            "book": book,
+            "chapter": chapter,
+            "verse": verse,
+            "aggregate": aggregate.value if aggregate else None,
+            "format": format.value,
+        },
+    )
+    return _export_response(
+        _stream_batches(query, _result_fields),
+        list(Result.model_fields),
+        format,
+        f"assessment-{assessment_id}-results",
+    )
 
 
 @router.get(
     "/ngrams_result",
     response_model=Dict[
-        str, Union[List[NgramResult], int]
+        str, Union[List[NgramResult], int, str, None]
     ],  # ✅ Use correct response model
 )
 async def get_ngrams_result(
@@ -758,6 +1084,7 @@ async def get_ngrams_result(
     # produce a SQL statement big enough to strain the DB or hit
     # Postgres' bind-parameter limits.
     page_size: Optional[int] = Query(default=None, ge=1, le=10_000),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user),
 ):
@@ -772,16 +1099,21 @@ async def get_ngrams_result(
         The page of results to return. If set, page_size must also be set.
     page_size : int, optional
         The number of results to return per page. If set, page must also be set.
+    cursor : str, optional
+        The `next_cursor` from a previous response; returns the `page_size` results after it, instead of `page`.
     db : Session
         The database session object to execute queries against.
 
     Returns
     -------
-    Dict[str, Union[List[NgramResult], int]]
-        A dictionary containing the list of results and the total count of results.
+    Dict[str, Union[List[NgramResult], int, str, None]]
+        A dictionary containing the list of results, the total count of results and the cursor for the next page.
     """
     request_start = time.perf_counter()
-    await validate_parameters(None, None, None, None, page, page_size)
+    validate_cursor_params(cursor, page, page_size)
+    after_id = decode_cursor(cursor, (int,))[0] if cursor is not None else None
+    if after_id is None:
+        await validate_parameters(None, None, None, None, page, page_size)
     if not await is_user_authorized_for_assessment(current_user.id, assessment_id, db):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -789,7 +1121,7 @@ async def get_ngrams_result(
         )
 
     result_data, total_count = await fetch_ngrams_page(
-        assessment_id, page, page_size, db
+        assessment_id, page, page_size, db, after_id
     )
 
     result_list = [NgramResult(**row) for row in result_data]
@@ -803,13 +1135,18 @@ async def get_ngrams_result(
             "assessment_id": assessment_id,
             "page": page,
             "page_size": page_size,
+            "cursor": cursor,
             "total_count": total_count,
             "results_returned": len(result_list),
             "duration_s": duration,
         },
     )
 
-    return {"results": result_list, "total_count": total_count}
+    return {
+        "results": result_list,
+        "total_count": total_count,
+        "next_cursor": next_cursor(result_data, page_size, lambda row: (row["id"],)),
+    }
 
 
 @router.get(
@@ -1428,12 +1765,17 @@ async def get_tfidf_result(
             detail=f"Assessment {assessment_id} not found",
         )
 
-    query_vector = await db.scalar(
-        select(TfidfPcaVector.vector)
-        .where(TfidfPcaVector.assessment_id == assessment_id)
-        .where(TfidfPcaVector.vref == vref)
-        .limit(1)
-    )
+    # Finished assessments rank against the worker's in-memory corpus.
+    corpus = await tfidf_corpus.get_corpus(db, assessment)
+    if corpus is not None:
+        query_vector = corpus.vector(vref)
+    else:
+        query_vector = await db.scalar(
+            select(TfidfPcaVector.vector)
+            .where(TfidfPcaVector.assessment_id == assessment_id)
+            .where(TfidfPcaVector.vref == vref)
+            .limit(1)
+        )
 
     if query_vector is None:
         raise HTTPException(
@@ -1441,12 +1783,16 @@ async def get_tfidf_result(
             detail=f"No TF-IDF vector found for vref {vref} in assessment {assessment_id}",
         )
 
-    query, _ = await build_tfidf_similarity_query(
-        assessment_id, vref, query_vector, limit
-    )
-
-    result_data = await db.execute(query)
-    result_data = result_data.all()
+    if corpus is not None:
+        (result_data,) = await asyncio.to_thread(
+            corpus.rank, query_vector[np.newaxis, :], limit, [vref]
+        )
+    else:
+        query, _ = await build_tfidf_similarity_query(
+            db, assessment_id, vref, query_vector, limit
+        )
+        result_data = await db.execute(query)
+        result_data = result_data.all()
 
     # Get verse texts for all vrefs in the results
     vrefs_to_fetch = [row.vref for row in result_data]
@@ -1454,26 +1800,14 @@ async def get_tfidf_result(
     # Fetch revision texts
     revision_texts = {}
     if assessment.revision_id:
-        revision_text_query = select(VerseText.verse_reference, VerseText.text).where(
-            VerseText.revision_id == assessment.revision_id,
-            VerseText.verse_reference.in_(vrefs_to_fetch),
-        )
-        revision_text_results = await db.execute(revision_text_query)
-        revision_texts = {
-            row.verse_reference: row.text for row in revision_text_results.all()
-        }
+        revision_text = await revision_text_cache.get(db, assessment.revision_id)
+        revision_texts = revision_text.texts_by_vref(vrefs_to_fetch)
 
     # Fetch reference texts
     reference_texts = {}
     if reference_id:
-        reference_text_query = select(VerseText.verse_reference, VerseText.text).where(
-            VerseText.revision_id == reference_id,
-            VerseText.verse_reference.in_(vrefs_to_fetch),
-        )
-        reference_text_results = await db.execute(reference_text_query)
-        reference_texts = {
-            row.verse_reference: row.text for row in reference_text_results.all()
-        }
+        reference_text = await revision_text_cache.get(db, reference_id)
+        reference_texts = reference_text.texts_by_vref(vrefs_to_fetch)
 
     result_list = [
         TfidfResult(
@@ -1505,23 +1839,19 @@ async def get_tfidf_result(
     return {"results": result_list, "total_count": len(result_list)}
 
 
-async def build_compare_results_baseline_query(
+async def resolve_baseline_assessment_ids(
     reference_id: Optional[int],
     baseline_ids: Optional[List[int]],
-    aggregate: Optional[aggType],
-    book: Optional[str],
-    chapter: Optional[int],
-    verse: Optional[int],
     db: AsyncSession,
     use_eflomal: Optional[bool] = None,
-) -> Tuple:
+) -> Tuple[int, ...]:
+    """The latest finished word-alignment assessment of each baseline
+    revision against ``reference_id``, as sorted ids."""
     if not baseline_ids:
-        baseline_ids = []
-
-    # Fetch the latest assessment IDs for each revision in the baseline.
+        return ()
     # Filter by runner so baselines never mix eflomal with fastalign scores.
-    baseline_assessment_ids = await db.execute(
-        select(Assessment.revision_id, func.max(Assessment.id).label("id"))
+    result = await db.execute(
+        select(func.max(Assessment.id))
         .filter(
             Assessment.revision_id.in_(baseline_ids),
             Assessment.reference_id == reference_id,
@@ -1531,43 +1861,27 @@ async def build_compare_results_baseline_query(
         )
         .group_by(Assessment.revision_id)
     )
-    baseline_assessment_ids = [
-        assessment.id for assessment in baseline_assessment_ids.all()
-    ]
+    return tuple(sorted(result.scalars().all()))
+
+
+def build_compare_results_baseline_query(
+    baseline_assessment_ids: Tuple[int, ...],
+    aggregate: Optional[aggType],
+):
+    group_by_columns = _COMPARE_GROUP_COLUMNS.get(
+        aggregate, ["book", "chapter", "verse"]
+    )
 
     select_columns = [
         func.min(AssessmentResult.id).label("id"),
         func.avg(AssessmentResult.score).label("avg_score"),
     ]
-
-    if aggregate == aggType.chapter:
-        group_by_columns = ["book", "chapter"]
-    elif aggregate == aggType.book:
-        group_by_columns = ["book"]
-    elif aggregate == aggType.text:
-        # No extra grouping needed, just aggregate over the entire text
-        group_by_columns = []
-    else:  # Default case, aggregate by verse
-        group_by_columns = ["book", "chapter", "verse"]
-
     select_columns.extend([getattr(AssessmentResult, col) for col in group_by_columns])
 
     # Finalize the query based on aggregation type
     baseline_assessments_subquery = select(*select_columns).where(
         AssessmentResult.assessment_id.in_(baseline_assessment_ids)
     )
-    if book is not None:
-        baseline_assessments_subquery = baseline_assessments_subquery.where(
-            AssessmentResult.book == book
-        )
-    if chapter is not None:
-        baseline_assessments_subquery = baseline_assessments_subquery.where(
-            AssessmentResult.chapter == chapter
-        )
-    if verse is not None:
-        baseline_assessments_subquery = baseline_assessments_subquery.where(
-            AssessmentResult.verse == verse
-        )
 
     baseline_assessments_subquery = (
         baseline_assessments_subquery.group_by(
@@ -1600,6 +1914,52 @@ async def build_compare_results_baseline_query(
     return baseline_assessments_query
 
 
+async def get_compare_baseline_stats(
+    reference_id: Optional[int],
+    baseline_ids: Optional[List[int]],
+    aggregate: Optional[aggType],
+    db: AsyncSession,
+    use_eflomal: Optional[bool] = None,
+) -> baseline_stats.BaselineStats:
+    """Mean and standard deviation of the baselines' scores per group over
+    the whole text, served from the worker's cache (``baseline_stats``) when
+    possible.
+
+    validate_parameters only allows book/chapter/verse filters on columns
+    the aggregate groups by, so a filtered request just looks up fewer
+    groups in these statistics.
+    """
+    assessment_ids = await resolve_baseline_assessment_ids(
+        reference_id, baseline_ids, db, use_eflomal
+    )
+    if not assessment_ids:
+        return {}
+
+    key = baseline_stats.BaselineStatsKey(
+        reference_id,
+        assessment_ids,
+        aggregate.value if aggregate else None,
+        use_eflomal,
+    )
+    stats = baseline_stats.get(key)
+    if stats is None:
+        group_by_columns = _COMPARE_GROUP_COLUMNS.get(
+            aggregate, ["book", "chapter", "verse"]
+        )
+        rows = await db.execute(
+            build_compare_results_baseline_query(assessment_ids, aggregate)
+        )
+        stats = {
+            tuple(row._mapping[col] for col in group_by_columns): (
+                _float_or_none(row.average_of_avg_score),
+                _float_or_none(row.stddev_of_avg_score),
+            )
+            for row in rows
+        }
+        baseline_stats.store(key, stats)
+    return stats
+
+
 async def build_compare_results_main_query(
     revision_id: Optional[int],
     reference_id: Optional[int],
@@ -1946,80 +2306,31 @@ async def get_compare_results(
             detail="User not authorized to see this assessment",
         )
 
-    baseline_assessments_query = await build_compare_results_baseline_query(
-        reference_id,
-        baseline_ids,
-        aggregate,
-        book,
-        chapter,
-        verse,
-        db,
-        use_eflomal,
-    )
-    main_assessment_results, _ = await execute_query(
-        main_assessments_query, select(func.count()), db
+    stats = await get_compare_baseline_stats(
+        reference_id, baseline_ids, aggregate, db, use_eflomal
     )
-    baseline_assessment_results, _ = await execute_query(
-        baseline_assessments_query, select(func.count()), db
+    group_by_columns = _COMPARE_GROUP_COLUMNS.get(
+        aggregate, ["book", "chapter", "verse"]
     )
-
-    # Handle empty results by creating DataFrame with expected columns
-    if main_assessment_results:
-        df_main = pd.DataFrame(main_assessment_results)
-    else:
-        df_main = pd.DataFrame(columns=["id", "book", "chapter", "verse", "score"])
-
-    if baseline_assessment_results:
-        df_baseline = pd.DataFrame(baseline_assessment_results).drop(columns=["id"])
-    else:
-        df_baseline = pd.DataFrame(
-            columns=[
-                "book",
-                "chapter",
-                "verse",
-                "average_of_avg_score",
-                "stddev_of_avg_score",
-            ]
-        )
-    if aggregate == aggType.chapter:
-        joined_df = pd.merge(df_main, df_baseline, on=["book", "chapter"], how="left")
-    elif aggregate == aggType.book:
-        joined_df = pd.merge(df_main, df_baseline, on=["book"], how="left")
-    elif aggregate == aggType.text:
-        joined_df = pd.concat(
-            [df_main.reset_index(drop=True), df_baseline.reset_index(drop=True)], axis=1
-        )
-    else:
-        joined_df = pd.merge(
-            df_main, df_baseline, on=["book", "chapter", "verse"], how="left"
-        )
-    joined_df["z_score"] = joined_df.apply(calculate_z_score, axis=1)
-    joined_df = joined_df.where(pd.notna(joined_df), None)
+    rows = (await db.execute(main_assessments_query)).all()
 
     result_list = []
-
-    for _, row in joined_df.iterrows():
-        # Constructing the verse reference string
-        if aggregate == aggType.chapter:
-            vref = f"{row['book']} {row['chapter']}"
-        elif aggregate == aggType.book:
-            vref = f"{row['book']}"
-        elif aggregate == aggType.text:
-            vref = None
-        else:
-            vref = f"{row['book']} {row['chapter']}:{row['verse']}"
-
-        result_obj = MultipleResult(
-            id=row["id"],
-            revision_id=revision_id,
-            reference_id=reference_id,
-            vref=vref,
-            score=row["score"],
-            mean_score=row["average_of_avg_score"],
-            stdev_score=row["stddev_of_avg_score"],
-            z_score=row["z_score"],
+    for row in rows:
+        mean_score, stdev_score = stats.get(
+            tuple(row._mapping[col] for col in group_by_columns), (None, None)
+        )
+        result_list.append(
+            MultipleResult(
+                id=row.id,
+                revision_id=revision_id,
+                reference_id=reference_id,
+                vref=_compare_vref(row, aggregate),
+                score=row.score,
+                mean_score=mean_score,
+                stdev_score=stdev_score,
+                z_score=_z_score(row.score, mean_score, stdev_score),
+            )
         )
-        result_list.append(result_obj)
 
     duration = round(time.perf_counter() - request_start, 2)
     logger.info(
@@ -2045,7 +2356,8 @@ async def get_compare_results(
 
 
 @router.get(
-    "/alignmentscores", response_model=Dict[str, Union[List[WordAlignment], int]]
+    "/alignmentscores",
+    response_model=Dict[str, Union[List[WordAlignment], int, str, None]],
 )
 async def get_alignment_scores(
     assessment_id: int,
@@ -2058,6 +2370,7 @@ async def get_alignment_scores(
         AlignmentScoreType.top,
         description="Which alignment score table to read from: 'top' (top-source scores, default) or 'threshold' (threshold scores).",
     ),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user),
 ):
@@ -2081,15 +2394,23 @@ async def get_alignment_scores(
     score_type : AlignmentScoreType, optional
         Which alignment score table to read from. Defaults to ``top`` (top-source
         scores). Pass ``threshold`` to read alignment threshold scores instead.
+    cursor : str, optional
+        The `next_cursor` from a previous response; returns the `page_size` results after it, instead of `page`.
+        Results are ordered by id.
 
     Returns
     -------
-    Dict[str, Union[List[WordAlignment], int]]
-        A dictionary containing the list of results and the total count of results.
+    Dict[str, Union[List[WordAlignment], int, str, None]]
+        A dictionary containing the list of results, the total count of results and the cursor for the next page.
     """
     request_start = time.perf_counter()
 
-    await validate_parameters(book, chapter, verse, None, page, page_size)
+    validate_cursor_params(cursor, page, page_size)
+    after_id = decode_cursor(cursor, (int,))[0] if cursor is not None else None
+    if after_id is None:
+        await validate_parameters(book, chapter, verse, None, page, page_size)
+    else:
+        await validate_parameters(book, chapter, verse)
 
     if not await is_user_authorized_for_assessment(current_user.id, assessment_id, db):
         raise HTTPException(
@@ -2106,13 +2427,22 @@ async def get_alignment_scores(
             if verse is not None:
                 base_query = base_query.where(score_model.verse == verse)
 
-    # Pagination logic
-    if page is not None and page_size is not None:
+    # Pagination logic. Ordered by id so pages are stable and a cursor walk
+    # is a range scan on (assessment_id, id).
+    if after_id is not None:
+        base_query_paginated = (
+            base_query.where(score_model.id > after_id)
+            .order_by(score_model.id)
+            .limit(page_size)
+        )
+    elif page is not None and page_size is not None:
         offset = (page - 1) * page_size
         limit = page_size
-        base_query_paginated = base_query.offset(offset).limit(limit)
+        base_query_paginated = (
+            base_query.order_by(score_model.id).offset(offset).limit(limit)
+        )
     else:
-        base_query_paginated = base_query
+        base_query_paginated = base_query.order_by(score_model.id)
     # Fetch results based on constructed filters
     total_rows_result = await db.execute(
         select(func.count()).select_from(base_query.subquery())
@@ -2134,6 +2464,7 @@ async def get_alignment_scores(
             "verse": verse,
             "page": page,
             "page_size": page_size,
+            "cursor": cursor,
             "score_type": score_type.value,
             "total_count": total_count,
             "results_returned": len(result_data),
@@ -2141,7 +2472,98 @@ async def get_alignment_scores(
         },
     )
 
-    return {"results": result_data, "total_count": total_count}
+    return {
+        "results": result_data,
+        "total_count": total_count,
+        "next_cursor": next_cursor(result_data, page_size, lambda row: (row.id,)),
+    }
+
+
+@router.get(
+    "/alignmentscores/export",
+    response_class=StreamingResponse,
+    responses=_EXPORT_RESPONSES,
+)
+async def export_alignment_scores(
+    assessment_id: int,
+    book: Optional[str] = None,
+    chapter: Optional[int] = None,
+    verse: Optional[int] = None,
+    score_type: AlignmentScoreType = Query(
+        AlignmentScoreType.top,
+        description="Which alignment score table to read from: 'top' (top-source scores, default) or 'threshold' (threshold scores).",
+    ),
+    format: ExportFormat = ExportFormat.ndjson,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """
+    Streams every alignment score for a given word alignment assessment, for bulk syncs of large assessments.
+
+    Takes the same filters as `/alignmentscores` and returns the same scores in the same order (by id), streamed
+    from the database in batches so memory stays flat however large the assessment is.
+
+    Parameters
+    ----------
+    assessment_id : int
+        The ID of the assessment to export scores for.
+    book : str, optional
+        Restrict scores to one book.
+    chapter : int, optional
+        Restrict scores to one chapter. If set, book must also be set.
+    verse : int, optional
+        Restrict scores to one verse. If set, book and chapter must also be set.
+    score_type : AlignmentScoreType, optional
+        Which alignment score table to read from, as for `/alignmentscores`.
+    format : str, optional
+        "ndjson" (default): one JSON object per line, with the fields of an `/alignmentscores` result.
+        "csv": a header row, then one row per score.
+    """
+    await validate_parameters(book, chapter, verse)
+
+    if not await is_user_authorized_for_assessment(current_user.id, assessment_id, db):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User not authorized to see this assessment",
+        )
+
+    score_model = _ALIGNMENT_SCORE_MODELS[score_type]
+    fieldnames = list(WordAlignment.model_fields)
+    # Plain columns rather than ORM entities: nothing to track per row.
+    query = select(
+        *[
+            getattr(score_model, name)
+            for name in fieldnames
+            if hasattr(score_model, name)
+        ]
+    ).where(score_model.assessment_id == assessment_id)
+    if book is not None:
+        query = query.where(score_model.book == book)
+        if chapter is not None:
+            query = query.where(score_model.chapter == chapter)
+            if verse is not None:
+                query = query.where(score_model.verse == verse)
+    query = query.order_by(score_model.id)
+
+    logger.info(
+        "export_alignment_scores started",
+        extra={
+            "method": "GET",
+            "path": "/alignmentscores/export",
+            "assessment_id": assessment_id,
+            "book": book,
+            "chapter": chapter,
+            "verse": verse,
+            "score_type": score_type.value,
+            "format": format.value,
+        },
+    )
+    return _export_response(
+        _stream_batches(query, lambda row: row._mapping),
+        fieldnames,
+        format,
+        f"assessment-{assessment_id}-alignment-scores-{score_type.value}",
+    )
 
 
 @router.get("/missingwords", response_model=Dict[str, Union[List[Result], int]])
@@ -2234,19 +2656,10 @@ async def get_missing_words(
         db,
         use_eflomal,
     )
-    main_assessment_results = await db.execute(main_assessment_query)
-    main_assessment_results = main_assessment_results.all()
-
-    # Handle empty results by creating DataFrame with expected columns
-    if main_assessment_results:
-        df_main = pd.DataFrame(main_assessment_results)
-    else:
-        df_main = pd.DataFrame(
-            columns=["id", "book", "chapter", "verse", "source", "score"]
-        )
-    total_count = len(df_main)
 
     if baseline_ids:
+        # Left-join each missing word to its baseline aggregate and flag it in
+        # the same statement, rather than merging DataFrames in Python.
         baseline_assessment_query = await build_missing_words_baseline_query(
             reference_id,
             baseline_ids,
@@ -2257,68 +2670,57 @@ async def get_missing_words(
             db,
             use_eflomal,
         )
-        baseline_assessment_results = await db.execute(baseline_assessment_query)
-        baseline_assessment_results = baseline_assessment_results.all()
-        if baseline_assessment_results:
-            df_baseline = pd.DataFrame(baseline_assessment_results).drop(columns=["id"])
-        else:
-            df_baseline = pd.DataFrame(
-                columns=[
-                    "book",
-                    "chapter",
-                    "verse",
-                    "source",
-                    "target",
-                    "assessment_id",
-                    "baseline_score",
-                ]
-            )
-        joined_df = pd.merge(
-            df_main, df_baseline, on=["book", "chapter", "verse", "source"], how="left"
+        main = main_assessment_query.subquery()
+        baseline = baseline_assessment_query.subquery()
+        flag = and_(
+            baseline.c.baseline_score > 0.35,
+            baseline.c.baseline_score > 5 * main.c.score,
         )
-        joined_df["flag"] = (joined_df["baseline_score"] > 0.35) & (
-            joined_df["baseline_score"] > 5 * joined_df["score"]
+        main_assessment_query = (
+            select(
+                main,
+                baseline.c.target,
+                func.coalesce(flag, False).label("flag"),
+            )
+            .outerjoin(
+                baseline,
+                and_(
+                    *[
+                        main.c[col] == baseline.c[col]
+                        for col in ["book", "chapter", "verse", "source"]
+                    ]
+                ),
+            )
+            .order_by(main.c.id)
         )
-        df = joined_df.reset_index()
-
-    else:
-        df = df_main
-        if not df.empty:
-            df.loc[:, "flag"] = False
-            df["target"] = df.apply(lambda x: [], axis=1)
-        else:
-            df["flag"] = []
-            df["target"] = []
+    rows = (await db.execute(main_assessment_query)).all()
+    total_count = len(rows)
 
     result_list = []
-
-    for _, row in df.iterrows():
-        # Constructing the verse reference string
-        vref = f"{row['book']} {row['chapter']}:{row['verse']}"
-        target_list = (
-            [
-                {"revision_id": int(id), "target": target}
-                for id, target in row["target"].items()
-            ]
-            if isinstance(row["target"], dict)
-            else []
-        )
-        for id in baseline_ids:
-            if id not in [target.get("revision_id") for target in target_list]:
-                target_list.append({"revision_id": id, "target": None})
-
-        result_obj = Result(
-            id=row["id"],
-            assessment_id=assessment_id,
-            revision_id=revision_id,
-            reference_id=reference_id,
-            vref=vref,
-            source=row["source"],
-            target=target_list,
-            score=row["score"],
-            flag=row["flag"],
+    for row in rows:
+        targets = getattr(row, "target", None) or {}
+        target_list = [
+            {"revision_id": int(id), "target": target} for id, target in targets.items()
+        ]
+        seen_ids = {target["revision_id"] for target in target_list}
+        target_list.extend(
+            {"revision_id": id, "target": None}
+            for id in baseline_ids
+            if id not in seen_ids
+        )
+        result_list.append(
+            Result(
+                id=row.id,
+                assessment_id=assessment_id,
+                revision_id=revision_id,
+                reference_id=reference_id,
+                vref=f"{row.book} {row.chapter}:{row.verse}",
+                source=row.source,
+                target=target_list,
+                score=row.score,
+                flag=getattr(row, "flag", False),
+            )
         )
-        result_list.append(result_obj)
 
     duration = round(time.perf_counter() - request_start, 2)
     logger.info(
@@ -26,6 +26,7 @@ from database.models import UserDB as UserModel
 from database.models import (
     UserGroup,
     VerseText,
+    VersionLatestVerse,
 )
 from security_routes.auth_routes import get_current_user
 from security_routes.utilities import is_user_authorized_for_assessment
@@ -95,13 +96,11 @@ def _main_subquery(
     """Build the main-side subquery: one verse_text row per (book, chapter, verse)
     matching the search term.
 
-    For ``version_id``, picks the latest non-empty revision text per vref
-    *first* (``DISTINCT ON (book, chapter, verse) ORDER BY date DESC``) and
-    only then applies the term filter. This means the search reflects the
-    version's current text only — a verse whose latest revision dropped the
-    term will not appear, even if an older revision contained it. Doing
-    dedup-before-filter keeps the per-row NORMALIZE+ILIKE recheck on the
-    much smaller deduped vref set instead of every row of every revision.
+    For ``version_id``, reads each vref's latest non-empty revision text
+    from ``version_latest_verse`` and only then applies the term filter.
+    This means the search reflects the version's current text only — a
+    verse whose latest revision dropped the term will not appear, even if
+    an older revision contained it.
 
     For ``revision_id``, simply filters by revision id (one row per vref by
     construction). Empty-text rows are excluded in both modes.
@@ -126,28 +125,19 @@ def _main_subquery(
     ]
 
     if version_id is not None:
-        br = aliased(BibleRevision)
-        # br.id.desc() is a stable tie-breaker so the per-vref pick is
-        # deterministic when two revisions share the same date.
-        latest_per_vref = (
+        latest = aliased(VersionLatestVerse)
+        q = (
             select(*select_cols)
-            .join(br, br.id == vt.revision_id)
+            .join(latest, latest.verse_text_id == vt.id)
             .where(
+                latest.version_id == version_id,
+                # Filter verse_text by revision, not the projection, so the
+                # term match runs on the ix_verse_text_revision_id scan (see
+                # enable_bitmapscan below) and only matching rows are joined.
                 vt.revision_id.in_(auth_revs),
-                vt.text != "",
+                _nfc_sql(vt.text).ilike(ilike_pattern),
             )
-            .distinct(vt.book, vt.chapter, vt.verse)
-            .order_by(vt.book, vt.chapter, vt.verse, br.date.desc(), br.id.desc())
-            .subquery()
         )
-        q = select(
-            latest_per_vref.c.id,
-            latest_per_vref.c.book,
-            latest_per_vref.c.chapter,
-            latest_per_vref.c.verse,
-            latest_per_vref.c.verse_reference,
-            latest_per_vref.c.text,
-        ).where(_nfc_sql(latest_per_vref.c.text).ilike(ilike_pattern))
     else:
         q = select(*select_cols).where(
             vt.revision_id.in_(auth_revs),
@@ -168,13 +158,14 @@ def _comp_lateral(
 
     For ``revision_id`` mode, returns at most one row matching the vref
     (zero rows if the comp revision lacks the verse). For ``version_id``
-    mode, performs the per-vref date-DESC pick of the latest non-empty
-    revision text.
+    mode, returns the vref's latest non-empty revision text from
+    ``version_latest_verse``.
 
     Correlates to ``main_vref_col`` (the main row's ``verse_reference``)
     so each main row triggers an indexed lookup against
-    ``ix_verse_text_verse_reference_revision`` instead of materializing the
-    full Bible for the comparison version up-front.
+    ``ix_verse_text_verse_reference_revision`` (or
+    ``ix_version_latest_verse_verse_reference``) instead of materializing
+    the full Bible for the comparison version up-front.
 
     The auth subquery is materialized as a CTE so Postgres evaluates it
     once for the entire statement instead of risking re-evaluation per
@@ -188,19 +179,16 @@ def _comp_lateral(
     vt = aliased(VerseText)
 
     if version_id is not None:
-        br = aliased(BibleRevision)
+        latest = aliased(VersionLatestVerse)
         q = (
             select(vt.text.label("text"))
-            .join(br, br.id == vt.revision_id)
+            .join(latest, latest.verse_text_id == vt.id)
             .where(
-                vt.revision_id.in_(select(auth_revs)),
-                vt.text != "",
-                vt.verse_reference.is_not(None),
-                vt.verse_reference == main_vref_col,
+                latest.version_id == version_id,
+                latest.revision_id.in_(select(auth_revs)),
+                latest.verse_reference.is_not(None),
+                latest.verse_reference == main_vref_col,
             )
-            # br.id.desc() is a stable tie-breaker so the per-vref pick is
-            # deterministic when two revisions share the same date.
-            .order_by(br.date.desc(), br.id.desc())
             .limit(1)
         )
     else:
@@ -595,15 +583,22 @@ async def search_revision_text(
                 version_id=comparison_version_id,
                 revision_id=comparison_revision_id,
             )
-            covered_vrefs = (
-                select(VerseText.verse_reference)
-                .where(
-                    VerseText.revision_id.in_(comp_auth),
-                    VerseText.text != "",
-                    VerseText.verse_reference.is_not(None),
+            if comparison_version_id is not None:
+                covered_vrefs = select(VersionLatestVerse.verse_reference).where(
+                    VersionLatestVerse.version_id == comparison_version_id,
+                    VersionLatestVerse.revision_id.in_(comp_auth),
+                    VersionLatestVerse.verse_reference.is_not(None),
+                )
+            else:
+                covered_vrefs = (
+                    select(VerseText.verse_reference)
+                    .where(
+                        VerseText.revision_id.in_(comp_auth),
+                        VerseText.text != "",
+                        VerseText.verse_reference.is_not(None),
+                    )
+                    .distinct()
                 )
-                .distinct()
-            )
             base_select = base_select.where(
                 main_sub.c.verse_reference.in_(covered_vrefs)
             )
@@ -678,15 +673,6 @@ async def search_revision_text(
         # default; would silently no-op under autocommit-style execution.
         await db.execute(text("SET LOCAL enable_bitmapscan = off"))
 
-        # The DISTINCT ON dedup sorts the version's full verse set (~10 MB for
-        # a whole Bible), which spills to a temp file under the pooled default
-        # work_mem. During the overnight batch, dozens of concurrent searches
-        # spilling at once make temp-file I/O the bottleneck. Give the sort
-        # enough memory to stay in RAM. SET LOCAL scopes it to this
-        # transaction, so the pooled connection isn't left with a raised
-        # work_mem for other callers.
-        await db.execute(text("SET LOCAL work_mem = '32MB'"))
-
         result = await db.execute(search_query)
         rows = result.all()
 
@@ -7,18 +7,42 @@ import io
 import socket
 import time
 import uuid
-from typing import Dict, List, Literal, Union
+from typing import AsyncIterator, Dict, List, Literal, NamedTuple, Union
 
 import fastapi
 import numpy as np
-from fastapi import Depends, HTTPException, Query, status
-from sqlalchemy import Float, cast, delete, desc, func, select, text
+from fastapi import Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import (
+    REAL,
+    Integer,
+    LargeBinary,
+    Text,
+    bindparam,
+    case,
+    cast,
+    delete,
+    desc,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    text,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
+from sqlalchemy.sql.elements import Grouping
 
-from assessment_routes.v3.results_query_routes import build_vector_literal
-from database.dependencies import get_db
+import revision_text_cache
+from assessment_routes.v3 import tfidf_corpus, tfidf_encoder
+from assessment_routes.v3.results_query_routes import tfidf_similarity_ordering
+from database.dependencies import AsyncSessionLocal, get_db
 from database.models import (
     Assessment,
     BibleRevision,
@@ -27,12 +51,11 @@ from database.models import (
     TfidfSvd,
     TfidfSvdChunk,
     TfidfSvdStaging,
+    TfidfSvdVariant,
     TfidfVectorizerArtifact,
 )
 from database.models import UserDB as UserModel
-from database.models import (
-    VerseText,
-)
+from database.vector import Vector
 from models import (
     TFIDF_CORPUS_VECTOR_DIM,
     TFIDF_MAX_BATCH_RESULTS,
@@ -95,50 +118,89 @@ def _parse_upload_id(raw: str) -> uuid.UUID:
         raise HTTPException(status_code=422, detail=f"Invalid upload_id: {raw!r}")
 
 
-async def _rank_against_corpus(
+async def _rank_in_sql(
     db: AsyncSession,
     assessment_id: int,
-    query_vector: List[float],
+    query_vectors: List[List[float]],
     limit: int,
-    exclude_vref: str | None = None,
+    exclude_vrefs: List[str | None] | None = None,
     exclude_book: bool = False,
-) -> List:
-    """Return top-`limit` (id, vref, similarity) rows for a single query vector.
+) -> List[List]:
+    """Top-`limit` (id, vref, similarity) rows per query vector, in one statement.
 
     Ranks by inner product against the stored corpus vectors — the same score
     `by_vector`/`by_vectors` use (corpus vectors are the raw SVD output, so the
-    query must be too; `_encode_texts` honours that).
+    query must be too; `tfidf_encoder` honours that).
+
+    The vectors travel as one flat REAL[] parameter alongside an array of
+    per-vector exclusions; `unnest ... WITH ORDINALITY` yields one row per
+    query, and a LATERAL `ORDER BY ... LIMIT` subquery ranks the corpus
+    against that query's slice of the array, so a batch costs one round trip
+    rather than one per vector.
 
     Exclusion (leakage guard) is pushed into the WHERE clause so `limit` rows
     survive after dropping — same approach as the vref-keyed GET endpoint.
-    When `exclude_book` is set, all verses in `exclude_vref`'s book are dropped
-    (book = the token before the first space); otherwise only the exact verse.
+    When `exclude_book` is set, all verses in the exclude vref's book are
+    dropped (book = the token before the first space); otherwise only the
+    exact verse.
     """
-    similarity_expr = cast(
-        text(
-            f"inner_product(tfidf_pca_vector.vector, {build_vector_literal(query_vector)})"
-        ),
-        Float,
-    ).label("cosine_similarity")
+    if not query_vectors:
+        return []
+    excludes: List[str | None] = [None] * len(query_vectors)
+    if exclude_vrefs:
+        excludes = [
+            (vref.split(" ", 1)[0] if exclude_book else vref) if vref else None
+            for vref in exclude_vrefs
+        ]
+    queries = (
+        func.unnest(
+            cast(bindparam("excludes", excludes, type_=ARRAY(Text)), ARRAY(Text))
+        )
+        .table_valued("exclude", with_ordinality="ord")
+        .render_derived()
+    )
+    flat = [value for vec in query_vectors for value in vec]
+    # Parenthesised so Postgres accepts the subscript on the cast.
+    vectors = Grouping(cast(bindparam("vectors", flat, type_=ARRAY(REAL)), ARRAY(REAL)))
+    dim = TFIDF_CORPUS_VECTOR_DIM
+    query_vector = cast(
+        vectors[(queries.c.ord - 1) * dim + 1 : queries.c.ord * dim],
+        Vector(dim),
+    )
+    similarity_expr, order_by = await tfidf_similarity_ordering(db, query_vector)
 
     conditions = [TfidfPcaVector.assessment_id == assessment_id]
-    if exclude_vref:
+    if exclude_vrefs:
         if exclude_book:
             # Exact book match (token before the first space) rather than a
             # LIKE pattern, so a `_`/`%` in caller-supplied exclude_vref can't
             # act as a SQL wildcard.
-            book = exclude_vref.split(" ", 1)[0]
-            conditions.append(func.split_part(TfidfPcaVector.vref, " ", 1) != book)
+            excluded = func.split_part(TfidfPcaVector.vref, " ", 1) != queries.c.exclude
         else:
-            conditions.append(TfidfPcaVector.vref != exclude_vref)
+            excluded = TfidfPcaVector.vref != queries.c.exclude
+        conditions.append(or_(queries.c.exclude.is_(None), excluded))
 
-    query = (
+    neighbours = (
         select(TfidfPcaVector.id, TfidfPcaVector.vref, similarity_expr)
         .where(*conditions)
-        .order_by(similarity_expr.desc())
+        .order_by(order_by)
         .limit(limit)
+        .lateral()
+    )
+    query = (
+        select(
+            queries.c.ord,
+            neighbours.c.id,
+            neighbours.c.vref,
+            neighbours.c.cosine_similarity,
+        )
+        .select_from(queries.join(neighbours, true()))
+        .order_by(queries.c.ord, neighbours.c.cosine_similarity.desc())
     )
-    return (await db.execute(query)).all()
+    ranked: List[List] = [[] for _ in query_vectors]
+    for row in (await db.execute(query)).all():
+        ranked[row.ord - 1].append(row)
+    return ranked
 
 
 async def _fetch_verse_texts(
@@ -147,15 +209,32 @@ async def _fetch_verse_texts(
     """Map vref → text for a given revision. Returns {} if revision_id is None or vrefs is empty."""
     if not revision_id or not vrefs:
         return {}
-    rows = (
-        await db.execute(
-            select(VerseText.verse_reference, VerseText.text).where(
-                VerseText.revision_id == revision_id,
-                VerseText.verse_reference.in_(vrefs),
-            )
+    revision_text = await revision_text_cache.get(db, revision_id)
+    return revision_text.texts_by_vref(vrefs)
+
+
+async def _rank_many(
+    db: AsyncSession,
+    assessment: Assessment,
+    query_vectors: List[List[float]],
+    limit: int,
+    exclude_vrefs: List[str | None] | None = None,
+    exclude_book: bool = False,
+) -> List[List]:
+    """Top-`limit` rows per query vector, as `_rank_in_sql` returns.
+
+    Finished assessments rank the whole batch in one matrix product against
+    the worker's in-memory corpus (`tfidf_corpus`); otherwise the batch is
+    ranked in SQL in a single statement.
+    """
+    corpus = await tfidf_corpus.get_corpus(db, assessment)
+    if corpus is not None:
+        return await asyncio.to_thread(
+            corpus.rank, query_vectors, limit, exclude_vrefs, exclude_book
         )
-    ).all()
-    return {r.verse_reference: r.text for r in rows}
+    return await _rank_in_sql(
+        db, assessment.id, query_vectors, limit, exclude_vrefs, exclude_book
+    )
 
 
 async def _score_against_corpus(
@@ -168,8 +247,8 @@ async def _score_against_corpus(
     exclude_book: bool = False,
 ) -> List[TfidfResult]:
     """Rank corpus verses by similarity, then hydrate with revision/reference text."""
-    rows = await _rank_against_corpus(
-        db, assessment.id, query_vector, limit, exclude_vref, exclude_book
+    (rows,) = await _rank_many(
+        db, assessment, [query_vector], limit, [exclude_vref], exclude_book
     )
     vrefs = [row.vref for row in rows]
 
@@ -693,6 +772,166 @@ async def upload_tfidf_artifact_chunk(
     )
 
 
+# Leading bytes of a staged chunk read to parse its .npy header. np.save pads
+# the header to a multiple of 64 bytes; a 2-D shape needs 128.
+_NPY_HEADER_PROBE_BYTES = 4096
+
+
+class _ChunkLayout(NamedTuple):
+    """A staged chunk's .npy header, and where its data section starts."""
+
+    chunk_index: int
+    shape: tuple
+    fortran_order: bool
+    dtype: np.dtype
+    data_offset: int
+    size: int
+
+
+def _parse_chunk_layout(chunk_index: int, head: bytes, size: int) -> _ChunkLayout:
+    """Parse a chunk's .npy header from its leading bytes.
+
+    Raises ValueError, as np.load would, for a malformed header or a data
+    section that doesn't hold the bytes the header declares.
+    """
+    fp = io.BytesIO(head)
+    version = np.lib.format.read_magic(fp)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fp)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fp)
+    if dtype.hasobject:
+        raise ValueError("Object arrays cannot be loaded when allow_pickle=False")
+    data_offset = fp.tell()
+    expected = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+    if size - data_offset != expected:
+        raise ValueError(
+            f"data section holds {size - data_offset} bytes; header declares "
+            f"{expected}"
+        )
+    return _ChunkLayout(chunk_index, shape, fortran_order, dtype, data_offset, size)
+
+
+async def _chunk_layouts(db: AsyncSession, upload_id: uuid.UUID) -> List[_ChunkLayout]:
+    """The layouts of an upload's staged chunks, in chunk_index order.
+
+    Reads only each chunk's header bytes and length, never its data.
+    """
+    rows = (
+        await db.execute(
+            select(
+                TfidfSvdChunk.chunk_index,
+                func.substring(
+                    TfidfSvdChunk.components_bytes, 1, _NPY_HEADER_PROBE_BYTES
+                ),
+                func.octet_length(TfidfSvdChunk.components_bytes),
+            )
+            .where(TfidfSvdChunk.upload_id == upload_id)
+            .order_by(TfidfSvdChunk.chunk_index)
+        )
+    ).all()
+    try:
+        return [_parse_chunk_layout(index, head, size) for index, head, size in rows]
+    except (ValueError, OSError) as e:
+        raise HTTPException(
+            status_code=422, detail=f"Chunk is not a valid .npy payload: {e}"
+        )
+
+
+def _is_raw_ready(layout: _ChunkLayout, dtype: np.dtype) -> bool:
+    """Whether a chunk's data section is already C-ordered rows in ``dtype``."""
+    return layout.dtype == dtype and (not layout.fortran_order or layout.shape[0] <= 1)
+
+
+async def _rewrite_chunk(
+    db: AsyncSession, upload_id: uuid.UUID, layout: _ChunkLayout, dtype: np.dtype
+) -> _ChunkLayout:
+    """Re-save a chunk as C-ordered ``dtype`` (e.g. from a big-endian client).
+
+    Only this chunk is decoded, and the rewrite is part of the commit's
+    transaction, so it rolls back with it.
+    """
+    chunk_bytes = await db.scalar(
+        select(TfidfSvdChunk.components_bytes).where(
+            TfidfSvdChunk.upload_id == upload_id,
+            TfidfSvdChunk.chunk_index == layout.chunk_index,
+        )
+    )
+    try:
+        slab = np.load(io.BytesIO(chunk_bytes), allow_pickle=False)
+    except (ValueError, OSError) as e:
+        raise HTTPException(
+            status_code=422, detail=f"Chunk is not a valid .npy payload: {e}"
+        )
+    buf = io.BytesIO()
+    np.save(buf, np.ascontiguousarray(slab, dtype=dtype), allow_pickle=False)
+    chunk_bytes = buf.getvalue()
+    await db.execute(
+        update(TfidfSvdChunk)
+        .where(
+            TfidfSvdChunk.upload_id == upload_id,
+            TfidfSvdChunk.chunk_index == layout.chunk_index,
+        )
+        .values(components_bytes=chunk_bytes)
+        .execution_options(synchronize_session=False)
+    )
+    return _parse_chunk_layout(
+        layout.chunk_index, chunk_bytes[:_NPY_HEADER_PROBE_BYTES], len(chunk_bytes)
+    )
+
+
+def _npy_header(shape: tuple, dtype: np.dtype) -> bytes:
+    """The header np.save writes for a C-ordered array of ``shape``/``dtype``."""
+    buf = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        buf,
+        {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": shape,
+        },
+    )
+    return buf.getvalue()
+
+
+def _insert_reassembled_svd(
+    assessment_id: int,
+    upload_id: uuid.UUID,
+    staging: TfidfSvdStaging,
+    header: bytes,
+    layouts: List[_ChunkLayout],
+):
+    """INSERT the TfidfSvd row with its matrix concatenated in Postgres.
+
+    ``header`` followed by each chunk's data section in chunk_index order is
+    byte-for-byte what np.save writes for the vstacked matrix.
+    """
+    data_start = case(
+        {layout.chunk_index: layout.data_offset + 1 for layout in layouts},
+        value=TfidfSvdChunk.chunk_index,
+    )
+    components_npy = cast(literal(header), LargeBinary).op(
+        "||", return_type=LargeBinary
+    )(
+        func.string_agg(
+            func.substring(TfidfSvdChunk.components_bytes, data_start),
+            aggregate_order_by(
+                cast(literal(b""), LargeBinary), TfidfSvdChunk.chunk_index
+            ),
+        )
+    )
+    return insert(TfidfSvd).from_select(
+        ["assessment_id", "n_components", "n_features", "dtype", "components_npy"],
+        select(
+            cast(literal(assessment_id), Integer),
+            cast(literal(staging.svd_n_components), Integer),
+            cast(literal(staging.svd_n_features), Integer),
+            cast(literal(staging.svd_dtype), Text),
+            components_npy,
+        ).where(TfidfSvdChunk.upload_id == upload_id),
+    )
+
+
 @router.post(
     "/assessment/{assessment_id}/tfidf-artifacts/commit",
     response_model=TfidfArtifactsPushResponse,
@@ -705,9 +944,13 @@ async def commit_tfidf_artifacts_upload(
 ):
     """Reassemble staged chunks and materialise final artifact rows.
 
-    Validates all total_chunks chunks are present, vstacks them into a single
-    components_ matrix, and writes the TfidfArtifactRun + vectorizer + SVD rows
-    in one transaction. Existing artifacts for the assessment are replaced.
+    Validates all total_chunks chunks are present and agree with the declared
+    shape and dtype, reading only their .npy headers. Postgres then
+    concatenates the chunks' data sections, in chunk_index order, behind one
+    header for the full components_ matrix, so the matrix never passes
+    through this worker. The TfidfArtifactRun + vectorizer + SVD rows are
+    written in one transaction. Existing artifacts for the assessment are
+    replaced.
     """
     upload_id = _parse_upload_id(body.upload_id)
 
@@ -732,74 +975,63 @@ async def commit_tfidf_artifacts_upload(
     if staging is None:
         raise HTTPException(status_code=404, detail="Upload not found")
 
-    chunk_rows = (
-        await db.execute(
-            select(TfidfSvdChunk.chunk_index, TfidfSvdChunk.components_bytes)
-            .where(TfidfSvdChunk.upload_id == upload_id)
-            .order_by(TfidfSvdChunk.chunk_index)
-        )
-    ).all()
-    if len(chunk_rows) != staging.total_chunks:
-        present = {row.chunk_index for row in chunk_rows}
+    layouts = await _chunk_layouts(db, upload_id)
+    if len(layouts) != staging.total_chunks:
+        present = {layout.chunk_index for layout in layouts}
         missing = sorted(set(range(staging.total_chunks)) - present)
         raise HTTPException(
             status_code=422,
             detail=(
-                f"expected {staging.total_chunks} chunks, got {len(chunk_rows)} "
+                f"expected {staging.total_chunks} chunks, got {len(layouts)} "
                 f"(missing: {missing})"
             ),
         )
 
-    try:
-        slabs = [
-            np.load(io.BytesIO(row.components_bytes), allow_pickle=False)
-            for row in chunk_rows
-        ]
-    except (ValueError, OSError) as e:
-        raise HTTPException(
-            status_code=422, detail=f"Chunk is not a valid .npy payload: {e}"
-        )
-
     # np.save preserves byte order in the header, so dtype equality rejects
     # big-endian clients even though the numeric type matches. Compare by
-    # kind+itemsize, then normalise to expected_dtype so the persisted .npy
-    # bytes match the declared svd_dtype metadata exactly.
+    # kind+itemsize; chunks that differ from expected_dtype only in byte
+    # order (or are Fortran-ordered) are rewritten below, so the persisted
+    # .npy bytes match the declared svd_dtype metadata exactly.
     expected_dtype = np.dtype(staging.svd_dtype)
-    for idx, slab in enumerate(slabs):
-        if slab.ndim != 2 or slab.shape[1] != staging.svd_n_features:
+    for idx, layout in enumerate(layouts):
+        if len(layout.shape) != 2 or layout.shape[1] != staging.svd_n_features:
             raise HTTPException(
                 status_code=422,
                 detail=(
-                    f"chunk {idx} has shape {slab.shape}; expected "
+                    f"chunk {idx} has shape {layout.shape}; expected "
                     f"(*, {staging.svd_n_features})"
                 ),
             )
-        if (slab.dtype.kind, slab.dtype.itemsize) != (
+        if (layout.dtype.kind, layout.dtype.itemsize) != (
             expected_dtype.kind,
             expected_dtype.itemsize,
         ):
             raise HTTPException(
                 status_code=422,
                 detail=(
-                    f"chunk {idx} has dtype {slab.dtype}; expected " f"{expected_dtype}"
+                    f"chunk {idx} has dtype {layout.dtype}; expected "
+                    f"{expected_dtype}"
                 ),
             )
-        if slab.dtype != expected_dtype:
-            slabs[idx] = slab.astype(expected_dtype, copy=False)
 
-    combined = np.vstack(slabs) if slabs else np.empty((0, staging.svd_n_features))
-    if combined.shape != (staging.svd_n_components, staging.svd_n_features):
+    shape = (sum(layout.shape[0] for layout in layouts), staging.svd_n_features)
+    if shape != (staging.svd_n_components, staging.svd_n_features):
         raise HTTPException(
             status_code=422,
             detail=(
-                f"reassembled shape {combined.shape} does not match declared "
+                f"reassembled shape {shape} does not match declared "
                 f"({staging.svd_n_components}, {staging.svd_n_features})"
             ),
         )
 
-    buf = io.BytesIO()
-    np.save(buf, combined, allow_pickle=False)
-    components_npy = buf.getvalue()
+    for idx, layout in enumerate(layouts):
+        if not _is_raw_ready(layout, expected_dtype):
+            layouts[idx] = await _rewrite_chunk(db, upload_id, layout, expected_dtype)
+
+    header = _npy_header(shape, expected_dtype)
+    components_size = len(header) + sum(
+        layout.size - layout.data_offset for layout in layouts
+    )
 
     n_word_features = len(staging.word_vocabulary)
     n_char_features = len(staging.char_vocabulary)
@@ -840,14 +1072,9 @@ async def commit_tfidf_artifacts_upload(
                 params=staging.char_params,
             )
         )
-        db.add(
-            TfidfSvd(
-                assessment_id=assessment_id,
-                n_components=staging.svd_n_components,
-                n_features=staging.svd_n_features,
-                components_npy=components_npy,
-                dtype=staging.svd_dtype,
-            )
+        await db.flush()
+        await db.execute(
+            _insert_reassembled_svd(assessment_id, upload_id, staging, header, layouts)
         )
         await db.execute(
             delete(TfidfSvdStaging).where(TfidfSvdStaging.upload_id == upload_id)
@@ -867,7 +1094,7 @@ async def commit_tfidf_artifacts_upload(
         assessment_id=assessment_id,
         n_word_features=n_word_features,
         n_char_features=n_char_features,
-        components_bytes=len(components_npy),
+        components_bytes=components_size,
     )
 
 
@@ -929,17 +1156,17 @@ async def abort_tfidf_artifacts_upload(
 # ---------------------------------------------------------------------------
 
 
-def _encode_components_for_response(
+def _downcast_components(
     stored_bytes: bytes, stored_dtype: str, requested_dtype: str
-) -> tuple[bytes, str, str, float | None]:
-    """Build the response components blob in the requested wire dtype.
+) -> tuple[bytes, str, float | None]:
+    """Build the components .npy in the requested wire dtype.
 
-    Returns (components_npy, components_b64, out_dtype, int8_scale). Pure
-    CPU/memory work; call via ``asyncio.to_thread`` so the ~200MB numpy and
-    base64 passes don't block the event loop. Stored matrix is float32 or
-    float64 (per the push contract); the int8 path quantizes from float32
-    precision, so a stored float64 matrix loses ~9 decimal digits before
-    quantization — fine for cosine-sim workloads. The DB row is untouched.
+    Returns (components_npy, out_dtype, int8_scale). Pure CPU/memory work;
+    call via ``asyncio.to_thread`` so the ~200MB numpy pass doesn't block the
+    event loop. Stored matrix is float32 or float64 (per the push contract);
+    the int8 path quantizes from float32 precision, so a stored float64
+    matrix loses ~9 decimal digits before quantization — fine for
+    cosine-sim workloads. The DB row is untouched.
 
     int8 returns the global ``max(|arr|)`` as ``int8_scale`` — clients
     rehydrate via ``arr.astype(float32) * int8_scale / 127`` (i.e. clients
@@ -947,12 +1174,10 @@ def _encode_components_for_response(
     analysis on why a single global scale is sufficient for the predict-
     time cosine-similarity use-case.
     """
-    if requested_dtype == "float32" and stored_dtype == "float32":
+    if _is_stored_as_requested(stored_dtype, requested_dtype):
         # Fast path: stored already matches requested wire dtype, no decode
-        # needed — just base64 the stored bytes.
-        components_npy = stored_bytes
-        components_b64 = base64.b64encode(components_npy).decode("ascii")
-        return components_npy, components_b64, "float32", None
+        # needed.
+        return stored_bytes, "float32", None
 
     arr = np.load(io.BytesIO(stored_bytes), allow_pickle=False)
     int8_scale: float | None = None
@@ -983,36 +1208,136 @@ def _encode_components_for_response(
 
     buf = io.BytesIO()
     np.save(buf, narrowed, allow_pickle=False)
-    components_npy = buf.getvalue()
-    components_b64 = base64.b64encode(components_npy).decode("ascii")
-    return components_npy, components_b64, out_dtype, int8_scale
+    return buf.getvalue(), out_dtype, int8_scale
 
 
-@router.get(
-    "/assessment/tfidf/artifacts",
-    response_model=TfidfArtifactsPullResponse,
-)
-async def pull_tfidf_artifacts(
-    assessment_id: int | None = None,
-    source_version_id: int | None = None,
-    dtype: Literal["float32", "float16", "int8"] = Query(
-        "float32",
-        description=(
-            "Wire format for the SVD components matrix. float32 (default) "
-            "preserves stored precision; float16 halves the response, int8 "
-            "quarters it (with an `int8_scale` for client-side rehydration). "
-            "Stored DB row is unchanged regardless."
-        ),
-    ),
-    current_user: UserModel = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-):
-    """Fetch TF-IDF encoder artifacts by assessment_id or latest by source version.
+def _is_stored_as_requested(stored_dtype: str, requested_dtype: str) -> bool:
+    return requested_dtype == "float32" and stored_dtype == "float32"
 
-    Exactly one of assessment_id or source_version_id must be provided.
+
+# Per-worker tfidf_svd_variants lookups, logged with each pull: a hit serves
+# stored bytes, a miss builds the variant (and stores it for everyone else).
+_VARIANT_CACHE_STATS = {"hits": 0, "misses": 0}
+
+
+async def _components_variant(
+    db: AsyncSession, run: TfidfArtifactRun, stored_dtype: str, dtype: str
+) -> tuple[bytes, float | None, bool]:
+    """The run's components re-encoded in ``dtype``, and whether they were
+    already in tfidf_svd_variants.
+
+    On a miss, builds them from the stored matrix and stores them, so every
+    later pull, on any worker, only reads bytes. For a dtype the matrix
+    isn't stored in; see ``_is_stored_as_requested``.
     """
-    request_start = time.perf_counter()
+    lookup = select(TfidfSvdVariant.components_npy, TfidfSvdVariant.int8_scale).where(
+        TfidfSvdVariant.assessment_id == run.assessment_id,
+        TfidfSvdVariant.dtype == dtype,
+        TfidfSvdVariant.run_created_at == run.created_at,
+    )
+    variant = (await db.execute(lookup)).first()
+    if variant is None:
+        # Bound concurrent downcasts and run the numpy work off the event
+        # loop: a ~200MB matrix takes seconds of CPU and several copies of
+        # itself in memory.
+        async with _DOWNCAST_SEMAPHORE:
+            # Another pull on this worker may have built it while this one
+            # waited.
+            variant = (await db.execute(lookup)).first()
+            if variant is None:
+                _VARIANT_CACHE_STATS["misses"] += 1
+                return (
+                    *await _build_components_variant(db, run, stored_dtype, dtype),
+                    False,
+                )
+    _VARIANT_CACHE_STATS["hits"] += 1
+    return variant.components_npy, variant.int8_scale, True
+
+
+async def _build_components_variant(
+    db: AsyncSession, run: TfidfArtifactRun, stored_dtype: str, dtype: str
+) -> tuple[bytes, float | None]:
+    # Joined on created_at so the variant is built from this run's matrix,
+    # not one a concurrent re-push just replaced it with.
+    stored_bytes = await db.scalar(
+        select(TfidfSvd.components_npy)
+        .join(
+            TfidfArtifactRun,
+            TfidfArtifactRun.assessment_id == TfidfSvd.assessment_id,
+        )
+        .where(
+            TfidfSvd.assessment_id == run.assessment_id,
+            TfidfArtifactRun.created_at == run.created_at,
+        )
+    )
+    if stored_bytes is None:
+        raise HTTPException(
+            status_code=404, detail="No TF-IDF SVD artifact found for this run"
+        )
+    components_npy, _, int8_scale = await asyncio.to_thread(
+        _downcast_components, stored_bytes, stored_dtype, dtype
+    )
+    del stored_bytes
+
+    stmt = pg_insert(TfidfSvdVariant).values(
+        assessment_id=run.assessment_id,
+        dtype=dtype,
+        run_created_at=run.created_at,
+        components_npy=components_npy,
+        int8_scale=int8_scale,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TfidfSvdVariant.assessment_id, TfidfSvdVariant.dtype],
+        set_={
+            "run_created_at": stmt.excluded.run_created_at,
+            "components_npy": stmt.excluded.components_npy,
+            "int8_scale": stmt.excluded.int8_scale,
+            "created_at": func.now(),
+        },
+    )
+    try:
+        await db.execute(stmt)
+        await db.commit()
+    except SQLAlchemyError:
+        # Only the next pull's head start is lost; this one has its bytes.
+        logger.warning(
+            "Failed to store the %s TF-IDF components of assessment %s",
+            dtype,
+            run.assessment_id,
+            exc_info=True,
+        )
+        await db.rollback()
+    return components_npy, int8_scale
+
+
+def _variant_cache_label(cached: bool | None) -> str | None:
+    # None when no variant was involved (stored dtype, or no components).
+    return None if cached is None else ("hit" if cached else "miss")
+
+
+def _b64(components_npy: bytes) -> str:
+    return base64.b64encode(components_npy).decode("ascii")
+
+
+_DTYPE_QUERY = Query(
+    "float32",
+    description=(
+        "Wire format for the SVD components matrix. float32 (default) "
+        "preserves stored precision; float16 halves the response, int8 "
+        "quarters it (with an `int8_scale` for client-side rehydration). "
+        "Stored DB row is unchanged regardless."
+    ),
+)
 
+
+async def _resolve_artifact_run(
+    db: AsyncSession,
+    current_user: UserModel,
+    assessment_id: int | None,
+    source_version_id: int | None,
+) -> TfidfArtifactRun:
+    """The artifact run a pull selects (the assessment's, or the source
+    version's latest), checking the caller may read it."""
     if (assessment_id is None) == (source_version_id is None):
         raise HTTPException(
             status_code=422,
@@ -1041,6 +1366,37 @@ async def pull_tfidf_artifacts(
         raise HTTPException(
             status_code=403, detail="Not authorized for this assessment"
         )
+    return run
+
+
+@router.get(
+    "/assessment/tfidf/artifacts",
+    response_model=TfidfArtifactsPullResponse,
+)
+async def pull_tfidf_artifacts(
+    assessment_id: int | None = None,
+    source_version_id: int | None = None,
+    dtype: Literal["float32", "float16", "int8"] = _DTYPE_QUERY,
+    include_components: bool = Query(
+        True,
+        description=(
+            "Embed the SVD components matrix as base64. Set to false to get "
+            "the vectorizers and shapes only, and download the matrix from "
+            "GET /assessment/tfidf/artifacts/svd."
+        ),
+    ),
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Fetch TF-IDF encoder artifacts by assessment_id or latest by source version.
+
+    Exactly one of assessment_id or source_version_id must be provided.
+    """
+    request_start = time.perf_counter()
+
+    run = await _resolve_artifact_run(
+        db, current_user, assessment_id, source_version_id
+    )
 
     vectorizer_rows = (
         await db.scalars(
@@ -1053,28 +1409,37 @@ async def pull_tfidf_artifacts(
 
     svd_read_start = time.perf_counter()
     svd = await db.scalar(
-        select(TfidfSvd).where(TfidfSvd.assessment_id == run.assessment_id)
+        select(TfidfSvd)
+        .options(defer(TfidfSvd.components_npy))
+        .where(TfidfSvd.assessment_id == run.assessment_id)
     )
-    svd_read_s = time.perf_counter() - svd_read_start
     if svd is None:
         raise HTTPException(
             status_code=404, detail="No TF-IDF SVD artifact found for this run"
         )
 
-    # Bound concurrent encode jobs and run the numpy + base64 work off the
-    # event loop. A single ~200MB blob takes seconds of CPU through both
-    # the numpy decode/re-encode and the base64 pass; either one would
-    # otherwise stall other coroutines on this worker.
-    encode_start = time.perf_counter()
-    async with _DOWNCAST_SEMAPHORE:
-        (
-            components_npy,
-            components_b64,
-            out_dtype,
-            int8_scale,
-        ) = await asyncio.to_thread(
-            _encode_components_for_response, svd.components_npy, svd.dtype, dtype
+    components_npy, components_b64, out_dtype, int8_scale = b"", None, svd.dtype, None
+    variant_cached = None
+    if include_components and _is_stored_as_requested(svd.dtype, dtype):
+        components_npy = await db.scalar(
+            select(TfidfSvd.components_npy).where(
+                TfidfSvd.assessment_id == run.assessment_id
+            )
+        )
+        out_dtype = "float32"
+    elif include_components:
+        components_npy, int8_scale, variant_cached = await _components_variant(
+            db, run, svd.dtype, dtype
         )
+        out_dtype = dtype
+    svd_read_s = time.perf_counter() - svd_read_start
+
+    encode_start = time.perf_counter()
+    if include_components:
+        # The base64 pass over a ~200MB matrix takes long enough to stall
+        # other coroutines on this worker, and briefly doubles its memory.
+        async with _DOWNCAST_SEMAPHORE:
+            components_b64 = await asyncio.to_thread(_b64, components_npy)
     encode_s = time.perf_counter() - encode_start
 
     response = TfidfArtifactsPullResponse(
@@ -1108,19 +1473,26 @@ async def pull_tfidf_artifacts(
     duration_s = round(time.perf_counter() - request_start, 3)
     logger.info(
         "pull_tfidf_artifacts completed in %.3fs (svd_read=%.3fs, encode=%.3fs, "
-        "components_bytes=%d, dtype=%s)",
+        "components_bytes=%d, dtype=%s, variant_cache=%s, hits=%d, misses=%d)",
         duration_s,
         svd_read_s,
         encode_s,
         len(components_npy),
         out_dtype,
+        _variant_cache_label(variant_cached),
+        _VARIANT_CACHE_STATS["hits"],
+        _VARIANT_CACHE_STATS["misses"],
         extra={
             "method": "GET",
             "path": "/assessment/tfidf/artifacts",
             "assessment_id": run.assessment_id,
             "source_version_id": run.source_version_id,
             "dtype": out_dtype,
+            "include_components": include_components,
             "components_bytes": len(components_npy),
+            "variant_cache": _variant_cache_label(variant_cached),
+            "variant_cache_hits": _VARIANT_CACHE_STATS["hits"],
+            "variant_cache_misses": _VARIANT_CACHE_STATS["misses"],
             "svd_read_s": round(svd_read_s, 3),
             "encode_s": round(encode_s, 3),
             "duration_s": duration_s,
@@ -1131,124 +1503,292 @@ async def pull_tfidf_artifacts(
 
 
 # ---------------------------------------------------------------------------
-# Server-side text encoding (TF-IDF → SVD-300), for the by_text endpoints.
-# Ports the encode chain from aqua-assessments' tfidf service so callers can
-# pass raw text instead of a pre-computed vector.
+# GET — the SVD components as a raw, range-capable .npy download
 # ---------------------------------------------------------------------------
 
-# Rehydrating the SVD components matrix + building the two vectorizers is the
-# only real per-request cost (~100-200ms). Cache the rebuilt encoder per
-# assessment, keyed alongside the artifact run's created_at so a re-push
-# (which bumps created_at) transparently invalidates the stale entry. No lock:
-# concurrent writers store identical objects, and nothing iterates the dict.
-_ENCODER_CACHE: Dict[int, tuple] = {}
+# Bytes read from the DB per slice while streaming a stored matrix, so a
+# download holds one slice in memory rather than the whole ~200MB blob.
+_SVD_STREAM_CHUNK_BYTES = 4 * 1024 * 1024
 
-# Cap on cached encoders per worker. Each entry holds two vectorizers plus a
-# 300×n_features components matrix, so an unbounded cache could accumulate one
-# (potentially large) encoder per assessment ever queried. FIFO-evict the
-# oldest once full — encoders are cheap to rebuild on the next request.
-_ENCODER_CACHE_MAXSIZE = 32
+_SVD_DOWNLOAD_RESPONSES = {
+    200: {
+        "description": (
+            "The components matrix as a .npy file. int8 responses carry the "
+            "rehydration scale in X-Int8-Scale."
+        ),
+        "content": {"application/octet-stream": {}},
+    },
+    206: {
+        "description": "The byte range the Range header asked for.",
+        "content": {"application/octet-stream": {}},
+    },
+    304: {"description": "The If-None-Match ETag is still current."},
+    416: {"description": "The Range starts past the end of the file."},
+}
+
+
+def _components_etag(run: TfidfArtifactRun, dtype: str) -> str:
+    # A re-push replaces the run row, so its created_at identifies the
+    # stored matrix.
+    return f'"tfidf-svd-{run.assessment_id}-{run.created_at.isoformat()}-{dtype}"'
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    """Whether an If-None-Match / If-Range header names ``etag`` (weak
+    comparison)."""
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag for candidate in header.split(",")
+    )
 
 
-def _rehydrate_encoder(word, char, svd) -> tuple:
-    """Rebuild (word_vec, char_vec, svd) from stored artifact values.
+def _byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """(start, end) with ``end`` exclusive for a single ``Range: bytes=``
+    range, or None to send the whole file.
 
-    `word`/`char` are (vocabulary, idf, params) tuples; `svd` is
-    (components_npy_bytes, n_components). Pure CPU work — call via
-    asyncio.to_thread. sklearn is imported lazily so workers that never hit
-    this path don't pay the import cost at startup.
-    """
-    from sklearn.decomposition import TruncatedSVD
-    from sklearn.feature_extraction.text import TfidfVectorizer
-
-    def _vectorizer(vocabulary, idf, params):
-        vec = TfidfVectorizer(
-            analyzer=params["analyzer"],
-            ngram_range=tuple(params["ngram_range"]),
-            lowercase=params["lowercase"],
-            max_df=params["max_df"],
-            min_df=params["min_df"],
-            vocabulary=vocabulary,
-        )
-        # The idf_ setter builds the internal TfidfTransformer/_idf_diag that
-        # transform() needs (vocabulary alone isn't enough).
-        vec.idf_ = np.asarray(idf, dtype=float)
-        return vec
-
-    word_vec = _vectorizer(*word)
-    char_vec = _vectorizer(*char)
-
-    components_npy, n_components = svd
-    components = np.load(io.BytesIO(components_npy), allow_pickle=False)
-    truncated = TruncatedSVD(n_components=n_components)
-    truncated.components_ = components
-    return word_vec, char_vec, truncated
-
-
-def _encode_texts(encoder: tuple, texts: List[str]) -> List[List[float]]:
-    """Encode raw texts into the 300-dim SVD space the corpus vectors live in.
-
-    Mirrors aqua-assessments' `_encode_and_query`: word + char TF-IDF, L2-norm
-    of the horizontally-stacked sparse matrix, then SVD projection.
+    Multi-range and malformed headers are ignored, which RFC 9110 allows;
+    a range starting past the end raises 416.
     """
-    from scipy.sparse import hstack
-    from sklearn.preprocessing import normalize
+    if header is None:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if (
+        not dash
+        or not (first or last)
+        or (first and not first.isdigit())
+        or (last and not last.isdigit())
+    ):
+        return None
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        end = min(int(last) + 1, size) if last else size
+    else:
+        start, end = max(size - int(last), 0), size
+    if start >= end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
 
-    word_vec, char_vec, svd = encoder
-    Xw = word_vec.transform(texts)
-    Xc = char_vec.transform(texts)
-    X = normalize(hstack([Xw, Xc]), norm="l2", axis=1)
-    return svd.transform(X).astype(float).tolist()
 
+async def _stream_components(
+    assessment_id: int, created_at, variant: str | None, start: int, end: int
+) -> AsyncIterator[bytes]:
+    """Yield bytes [start, end) of the stored matrix, or of its ``variant``
+    dtype from tfidf_svd_variants, a slice per query.
 
-async def _get_encoder(db: AsyncSession, assessment_id: int) -> tuple:
-    """Load (and cache) the rehydrated encoder for an assessment.
+    Opens its own session: FastAPI closes the request's ``get_db`` session
+    when the handler returns, before a StreamingResponse body is sent. Each
+    slice is read only while the run is still the one the response's ETag
+    names; a re-push mid-download ends the response short rather than
+    splicing two matrices.
+    """
+    async with AsyncSessionLocal() as db:
+        for offset in range(start, end, _SVD_STREAM_CHUNK_BYTES):
+            length = min(_SVD_STREAM_CHUNK_BYTES, end - offset)
+            if variant is None:
+                query = (
+                    select(func.substring(TfidfSvd.components_npy, offset + 1, length))
+                    .join(
+                        TfidfArtifactRun,
+                        TfidfArtifactRun.assessment_id == TfidfSvd.assessment_id,
+                    )
+                    .where(
+                        TfidfSvd.assessment_id == assessment_id,
+                        TfidfArtifactRun.created_at == created_at,
+                    )
+                )
+            else:
+                query = select(
+                    func.substring(TfidfSvdVariant.components_npy, offset + 1, length)
+                ).where(
+                    TfidfSvdVariant.assessment_id == assessment_id,
+                    TfidfSvdVariant.dtype == variant,
+                    TfidfSvdVariant.run_created_at == created_at,
+                )
+            chunk = await db.scalar(query)
+            if chunk is None:
+                raise RuntimeError(
+                    f"TF-IDF artifacts for assessment {assessment_id} were "
+                    "replaced mid-download"
+                )
+            yield chunk
 
-    404s if the assessment has no TF-IDF artifacts (run/vectorizers/svd).
+
+@router.get(
+    "/assessment/tfidf/artifacts/svd",
+    response_class=Response,
+    responses=_SVD_DOWNLOAD_RESPONSES,
+)
+async def download_tfidf_svd_components(
+    assessment_id: int | None = None,
+    source_version_id: int | None = None,
+    dtype: Literal["float32", "float16", "int8"] = _DTYPE_QUERY,
+    range_header: str | None = Header(None, alias="Range"),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
+    if_range: str | None = Header(None, alias="If-Range"),
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Download the SVD components matrix as raw ``.npy`` bytes.
+
+    Selects the artifacts like GET /assessment/tfidf/artifacts and takes the
+    same ``dtype``. The ETag changes whenever the artifacts are re-pushed, so
+    a client can keep the file and revalidate it with If-None-Match (304 if
+    current). A single ``Range: bytes=`` range gets a 206 with just those
+    bytes, to resume an interrupted download; send If-Range with the ETag so
+    a re-pushed matrix comes back whole instead.
     """
-    run = await db.scalar(
-        select(TfidfArtifactRun).where(TfidfArtifactRun.assessment_id == assessment_id)
+    request_start = time.perf_counter()
+
+    run = await _resolve_artifact_run(
+        db, current_user, assessment_id, source_version_id
     )
-    if run is None:
+    etag = _components_etag(run, dtype)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, no-cache",
+    }
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    svd = (
+        await db.execute(
+            select(TfidfSvd.dtype, func.octet_length(TfidfSvd.components_npy)).where(
+                TfidfSvd.assessment_id == run.assessment_id
+            )
+        )
+    ).first()
+    if svd is None:
         raise HTTPException(
-            status_code=404,
-            detail=f"No TF-IDF artifacts found for assessment {assessment_id}",
+            status_code=404, detail="No TF-IDF SVD artifact found for this run"
         )
+    stored_dtype, size = svd
+
+    # Bytes to send from memory, when a variant had to be built for this
+    # request; otherwise they are streamed from the DB.
+    components_npy = None
+    variant, variant_cached = None, None
+    if not _is_stored_as_requested(stored_dtype, dtype):
+        variant = dtype
+        cached = (
+            await db.execute(
+                select(
+                    func.octet_length(TfidfSvdVariant.components_npy),
+                    TfidfSvdVariant.int8_scale,
+                ).where(
+                    TfidfSvdVariant.assessment_id == run.assessment_id,
+                    TfidfSvdVariant.dtype == dtype,
+                    TfidfSvdVariant.run_created_at == run.created_at,
+                )
+            )
+        ).first()
+        if cached is not None:
+            _VARIANT_CACHE_STATS["hits"] += 1
+            (size, int8_scale), variant_cached = cached, True
+        else:
+            components_npy, int8_scale, variant_cached = await _components_variant(
+                db, run, stored_dtype, dtype
+            )
+            size = len(components_npy)
+        if int8_scale is not None:
+            headers["X-Int8-Scale"] = repr(int8_scale)
+
+    # A stale If-Range means the client's partial file is of an older
+    # matrix: send the whole current one.
+    byte_range = None
+    if if_range is None or if_range.strip() == etag:
+        byte_range = _byte_range(range_header, size)
+    start, end = byte_range or (0, size)
+    status_code = 200
+    if byte_range is not None:
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    headers["Content-Length"] = str(end - start)
+
+    logger.info(
+        "download_tfidf_svd_components prepared in %.3fs (bytes=%d-%d/%d, "
+        "dtype=%s, variant_cache=%s, hits=%d, misses=%d)",
+        time.perf_counter() - request_start,
+        start,
+        end,
+        size,
+        dtype,
+        _variant_cache_label(variant_cached),
+        _VARIANT_CACHE_STATS["hits"],
+        _VARIANT_CACHE_STATS["misses"],
+        extra={
+            "method": "GET",
+            "path": "/assessment/tfidf/artifacts/svd",
+            "assessment_id": run.assessment_id,
+            "dtype": dtype,
+            "range_start": start,
+            "range_end": end,
+            "components_bytes": size,
+            "streamed": components_npy is None,
+            "variant_cache": _variant_cache_label(variant_cached),
+            "variant_cache_hits": _VARIANT_CACHE_STATS["hits"],
+            "variant_cache_misses": _VARIANT_CACHE_STATS["misses"],
+        },
+    )
+    if components_npy is not None:
+        return Response(
+            content=components_npy[start:end],
+            status_code=status_code,
+            headers=headers,
+            media_type="application/octet-stream",
+        )
+    return StreamingResponse(
+        _stream_components(run.assessment_id, run.created_at, variant, start, end),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/octet-stream",
+    )
 
-    cached = _ENCODER_CACHE.get(assessment_id)
-    if cached is not None and cached[0] == run.created_at:
-        return cached[1]
 
-    vectorizer_rows = (
-        await db.scalars(
-            select(TfidfVectorizerArtifact).where(
-                TfidfVectorizerArtifact.assessment_id == assessment_id
+# ---------------------------------------------------------------------------
+# Server-side text encoding (TF-IDF → SVD-300), for the by_text endpoints.
+# Ports the encode chain from aqua-assessments' tfidf service so callers can
+# pass raw text instead of a pre-computed vector.
+# ---------------------------------------------------------------------------
+
+
+async def _get_encoder(
+    db: AsyncSession, assessment_id: int
+) -> tfidf_encoder.TfidfEncoder:
+    """The encoder for an assessment's TF-IDF artifacts (tfidf_encoder).
+
+    404s if the assessment has no TF-IDF artifacts (run/vectorizers/svd).
+    """
+    run = (
+        await db.execute(
+            select(TfidfArtifactRun.created_at).where(
+                TfidfArtifactRun.assessment_id == assessment_id
             )
         )
-    ).all()
-    by_kind = {v.kind: v for v in vectorizer_rows}
-    svd = await db.scalar(
-        select(TfidfSvd).where(TfidfSvd.assessment_id == assessment_id)
-    )
-    if "word" not in by_kind or "char" not in by_kind or svd is None:
+    ).first()
+    if run is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No TF-IDF artifacts found for assessment {assessment_id}",
+        )
+    encoder = await tfidf_encoder.get_encoder(assessment_id, run.created_at)
+    if encoder is None:
         raise HTTPException(
             status_code=404,
             detail=f"Incomplete TF-IDF artifacts for assessment {assessment_id}",
         )
-
-    encoder = await asyncio.to_thread(
-        _rehydrate_encoder,
-        (by_kind["word"].vocabulary, by_kind["word"].idf, by_kind["word"].params),
-        (by_kind["char"].vocabulary, by_kind["char"].idf, by_kind["char"].params),
-        (svd.components_npy, svd.n_components),
-    )
-    if (
-        assessment_id not in _ENCODER_CACHE
-        and len(_ENCODER_CACHE) >= _ENCODER_CACHE_MAXSIZE
-    ):
-        # Evict the oldest entry (dicts preserve insertion order).
-        _ENCODER_CACHE.pop(next(iter(_ENCODER_CACHE)), None)
-    _ENCODER_CACHE[assessment_id] = (run.created_at, encoder)
     return encoder
 
 
@@ -1380,16 +1920,10 @@ async def get_tfidf_result_by_vectors(
             ),
         )
 
-    # Rank each vector sequentially (AsyncSession doesn't support concurrent
-    # statements), then hydrate revision/reference text once across the union
-    # of vrefs rather than per-vector. Keeps the query count at N+2 instead
-    # of 3N for N vectors.
-    ranked: List[List] = []
-    all_vrefs: set = set()
-    for vec in body.vectors:
-        rows = await _rank_against_corpus(db, body.assessment_id, vec, body.limit)
-        ranked.append(rows)
-        all_vrefs.update(r.vref for r in rows)
+    # Rank the batch, then hydrate revision/reference text once across the
+    # union of vrefs rather than per-vector.
+    ranked = await _rank_many(db, assessment, body.vectors, body.limit)
+    all_vrefs = {r.vref for rows in ranked for r in rows}
 
     vrefs_list = list(all_vrefs)
     revision_texts = await _fetch_verse_texts(db, assessment.revision_id, vrefs_list)
@@ -1454,7 +1988,7 @@ async def get_tfidf_result_by_text(
         body.assessment_id, current_user, db
     )
     encoder = await _get_encoder(db, body.assessment_id)
-    vector = (await asyncio.to_thread(_encode_texts, encoder, [body.text]))[0]
+    vector = (await tfidf_encoder.encode(encoder, [body.text]))[0]
 
     results = await _score_against_corpus(
         db,
@@ -1514,25 +2048,14 @@ async def get_tfidf_result_by_texts(
         )
 
     encoder = await _get_encoder(db, body.assessment_id)
-    vectors = await asyncio.to_thread(_encode_texts, encoder, body.texts)
-
-    # Rank each vector sequentially (AsyncSession can't run concurrent
-    # statements), then hydrate text once across the union of vrefs — keeping
-    # the query count at N+2 rather than 3N. Mirrors /tfidf_result/by_vectors.
-    ranked: List[List] = []
-    all_vrefs: set = set()
-    for i, vec in enumerate(vectors):
-        exclude_vref = body.exclude_vrefs[i] if body.exclude_vrefs else None
-        rows = await _rank_against_corpus(
-            db,
-            body.assessment_id,
-            vec,
-            body.limit,
-            exclude_vref,
-            body.exclude_book,
-        )
-        ranked.append(rows)
-        all_vrefs.update(r.vref for r in rows)
+    vectors = await tfidf_encoder.encode(encoder, body.texts)
+
+    # Rank the batch, then hydrate text once across the union of vrefs.
+    # Mirrors /tfidf_result/by_vectors.
+    ranked = await _rank_many(
+        db, assessment, vectors, body.limit, body.exclude_vrefs, body.exclude_book
+    )
+    all_vrefs = {r.vref for rows in ranked for r in rows}
 
     vrefs_list = list(all_vrefs)
     revision_texts = await _fetch_verse_texts(db, assessment.revision_id, vrefs_list)
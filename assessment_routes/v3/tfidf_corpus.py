@@ -0,0 +1,217 @@
+"""Per-worker in-memory copy of finished TF-IDF corpora, for exact top-k.
+
+The similarity routes (``/tfidf_result`` and the ``/tfidf_result/by_*``
+family) used to format each query vector into SQL text and run ``ORDER BY
+inner_product(...) LIMIT k`` once per query — a scan of the assessment's
+~31k corpus vectors per vector, sequentially for the batch routes. A corpus
+is only ~31k × 300 float32 (~37MB), so this module keeps it in RAM as one
+contiguous matrix and ranks a whole batch of queries with a single
+matrix product plus ``argpartition``. Scores are the same inner products the
+SQL path computes (float32, so equal to ~1e-6).
+
+Only ``finished`` assessments are cached; anything still being written is
+ranked in SQL. Entries are keyed by the artifact run's ``created_at`` (a
+re-push bumps it), dropped locally when vectors are pushed or deleted
+(``invalidate``), and otherwise expire after an hour — the same bound, and
+for the same reason, as the ngrams count cache in results_query_routes: a
+write against a finished assessment on another worker is policy-forbidden
+but not enforced. ``settings.tfidf_corpus_cache_mb`` caps the cache (LRU);
+0 disables it.
+
+Concurrent cold requests for the same corpus share one load, which runs on
+its own session so a cancelled request can't fail the others' load.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from database.dependencies import AsyncSessionLocal
+from database.models import Assessment, TfidfArtifactRun, TfidfPcaVector
+from models import TFIDF_CORPUS_VECTOR_DIM
+
+_CORPUS_TTL_SECONDS = 3600
+
+
+class RankedVerse(NamedTuple):
+    """One neighbour, shaped like the rows the SQL ranking returns."""
+
+    id: int
+    vref: str
+    cosine_similarity: float
+
+
+class TfidfCorpus(NamedTuple):
+    ids: np.ndarray  # int64 (n,), ascending
+    vrefs: np.ndarray  # object (n,)
+    books: np.ndarray  # object (n,), the token before the first space
+    matrix: np.ndarray  # float32 (n, dim), C-contiguous
+    row_by_vref: Dict[str, int]
+
+    @property
+    def nbytes(self) -> int:
+        # Object arrays hold pointers; count the strings behind them roughly.
+        return self.matrix.nbytes + self.ids.nbytes + 100 * len(self.ids)
+
+    def vector(self, vref: str) -> Optional[np.ndarray]:
+        row = self.row_by_vref.get(vref)
+        return None if row is None else self.matrix[row]
+
+    def rank(
+        self,
+        queries: np.ndarray,
+        limit: int,
+        exclude_vrefs: Optional[Sequence[Optional[str]]] = None,
+        exclude_book: bool = False,
+    ) -> List[List[RankedVerse]]:
+        """Top-``limit`` corpus rows by inner product, one list per query row.
+
+        ``exclude_vrefs[i]`` drops that verse (or, with ``exclude_book``, its
+        whole book) from query ``i``'s neighbours. Ties rank by id, so the
+        order is deterministic. CPU-bound — call via asyncio.to_thread for
+        large batches.
+        """
+        scores = np.asarray(queries, dtype=np.float32) @ self.matrix.T
+        if exclude_vrefs is not None:
+            for i, exclude_vref in enumerate(exclude_vrefs):
+                if not exclude_vref:
+                    continue
+                if exclude_book:
+                    mask = self.books == exclude_vref.split(" ", 1)[0]
+                else:
+                    mask = self.vrefs == exclude_vref
+                scores[i, mask] = -np.inf
+
+        k = max(0, min(limit, scores.shape[1]))
+        if k == 0:
+            return [[] for _ in range(scores.shape[0])]
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row_scores, candidates in zip(scores, top):
+            # lexsort's last key is primary: score descending, then row index
+            # (= id order) ascending.
+            candidates = candidates[np.lexsort((candidates, -row_scores[candidates]))]
+            results.append(
+                [
+                    RankedVerse(int(self.ids[c]), self.vrefs[c], float(row_scores[c]))
+                    for c in candidates
+                    if row_scores[c] != -np.inf
+                ]
+            )
+        return results
+
+
+# assessment id -> (artifact run created_at, loaded_at, corpus), LRU order.
+_CORPUS_CACHE: Dict[int, Tuple[Optional[datetime], float, TfidfCorpus]] = {}
+_INFLIGHT_LOADS: Dict[Tuple[int, Optional[datetime]], asyncio.Future] = {}
+
+
+def _max_bytes() -> int:
+    return settings.tfidf_corpus_cache_mb * 1024 * 1024
+
+
+def _build_corpus(rows: List) -> TfidfCorpus:
+    vrefs = np.array([row.vref for row in rows], dtype=object)
+    return TfidfCorpus(
+        ids=np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows)),
+        vrefs=vrefs,
+        books=np.array([v.split(" ", 1)[0] for v in vrefs], dtype=object),
+        matrix=np.ascontiguousarray(
+            np.array([row.vector for row in rows], dtype=np.float32).reshape(
+                len(rows), TFIDF_CORPUS_VECTOR_DIM
+            )
+        ),
+        row_by_vref={v: i for i, v in reversed(list(enumerate(vrefs)))},
+    )
+
+
+async def _load_corpus(assessment_id: int) -> TfidfCorpus:
+    async with AsyncSessionLocal() as db:
+        # Vectors arrive in pgvector's binary format (database.vector), one
+        # float32 array per row.
+        rows = (
+            await db.execute(
+                select(TfidfPcaVector.id, TfidfPcaVector.vref, TfidfPcaVector.vector)
+                .where(
+                    TfidfPcaVector.assessment_id == assessment_id,
+                    TfidfPcaVector.vector.isnot(None),
+                )
+                .order_by(TfidfPcaVector.id)
+            )
+        ).all()
+    return await asyncio.to_thread(_build_corpus, rows)
+
+
+def _store(
+    assessment_id: int, created_at: Optional[datetime], corpus: TfidfCorpus
+) -> None:
+    _CORPUS_CACHE.pop(assessment_id, None)
+    if corpus.nbytes > _max_bytes():
+        return
+    while _CORPUS_CACHE and (
+        sum(entry[2].nbytes for entry in _CORPUS_CACHE.values()) + corpus.nbytes
+        > _max_bytes()
+    ):
+        _CORPUS_CACHE.pop(next(iter(_CORPUS_CACHE)), None)
+    _CORPUS_CACHE[assessment_id] = (created_at, time.monotonic(), corpus)
+
+
+async def get_corpus(db: AsyncSession, assessment: Assessment) -> Optional[TfidfCorpus]:
+    """The cached corpus for a finished assessment, loading it if needed.
+
+    Returns None when the cache is disabled or the assessment isn't finished;
+    callers then rank in SQL.
+    """
+    if settings.tfidf_corpus_cache_mb <= 0 or assessment.status != "finished":
+        return None
+    created_at = await db.scalar(
+        select(TfidfArtifactRun.created_at).where(
+            TfidfArtifactRun.assessment_id == assessment.id
+        )
+    )
+    entry = _CORPUS_CACHE.get(assessment.id)
+    if (
+        entry is not None
+        and entry[0] == created_at
+        and time.monotonic() - entry[1] <= _CORPUS_TTL_SECONDS
+    ):
+        # Re-insert so dict order tracks recency and eviction drops the LRU.
+        _CORPUS_CACHE[assessment.id] = _CORPUS_CACHE.pop(assessment.id)
+        return entry[2]
+
+    loop = asyncio.get_running_loop()
+    key = (assessment.id, created_at)
+    future = _INFLIGHT_LOADS.get(key)
+    # Futures belong to one event loop; never await one from another loop.
+    if future is None or future.get_loop() is not loop:
+        future = loop.create_task(_load_corpus(assessment.id))
+        _INFLIGHT_LOADS[key] = future
+
+        def _finish(done: asyncio.Future) -> None:
+            if _INFLIGHT_LOADS.get(key) is not done:
+                return  # invalidated while loading; don't cache what it read
+            del _INFLIGHT_LOADS[key]
+            if not done.cancelled() and done.exception() is None:
+                _store(assessment.id, created_at, done.result())
+
+        future.add_done_callback(_finish)
+    # Shield so one cancelled waiter doesn't cancel the shared load.
+    return await asyncio.shield(future)
+
+
+def invalidate(assessment_id: int) -> None:
+    """Drop an assessment's corpus (its vectors changed on this worker)."""
+    _CORPUS_CACHE.pop(assessment_id, None)
+    for key in [key for key in _INFLIGHT_LOADS if key[0] == assessment_id]:
+        del _INFLIGHT_LOADS[key]
+
+
+def clear() -> None:
+    _CORPUS_CACHE.clear()
+    _INFLIGHT_LOADS.clear()
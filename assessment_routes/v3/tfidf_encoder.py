@@ -0,0 +1,367 @@
+"""TF-IDF text encoders shared by a host's workers through memory-mapped files.
+
+``/tfidf_result/by_text`` and ``/by_texts`` encode raw text into an
+assessment's SVD space with its pushed word + char vectorizers and
+components. Rehydrating those into sklearn objects took seconds for a cold
+assessment and was done, and held, once per worker. This module instead
+writes each encoder once per host, under ``settings.tfidf_encoder_dir``, as
+plain ``.npy`` files, and every worker ``np.load``s them with
+``mmap_mode="r"``, so the page cache holds one copy for all of them:
+
+- per vectorizer, its vocabulary as a sorted table of UTF-8 keys (fixed
+  width, ``S<n>``) with the feature index of each, and its idf;
+- the components, transposed to (n_features, n_components), so a text's
+  features are contiguous rows.
+
+Encoding reproduces ``TfidfVectorizer.transform`` (sklearn's own analyzer,
+raw counts times idf, L2 per vectorizer) on both vectorizers, L2-normalises
+the concatenation and projects it onto the components, as the TF-IDF runner
+does. N-grams are looked up for a whole batch with one ``searchsorted``.
+
+A directory is named for the assessment and its artifact run's
+``created_at`` (a re-push bumps it), written to a temporary name and renamed
+into place, so a worker never sees half an encoder; two workers building the
+same one race harmlessly. Building one removes the assessment's older
+directories. If the directory can't be written, the worker keeps the arrays
+in its own memory instead.
+
+``encode`` batches: calls for the same encoder that arrive within
+``settings.tfidf_encode_batch_ms`` are encoded in one pass on one thread.
+0 encodes each call on its own.
+"""
+
+import asyncio
+import io
+import json
+import os
+import shutil
+import socket
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from config import settings
+from database.dependencies import AsyncSessionLocal
+from database.models import TfidfSvd, TfidfVectorizerArtifact
+from utils.logging_config import setup_logger
+
+container_id = socket.gethostname()
+logger = setup_logger(__name__, container_id=container_id)
+
+# Encoders kept open per worker. An entry is a few mapped files, so this only
+# bounds open file handles and address space.
+_MAX_ENCODERS = 32
+# A batch is encoded at once when it reaches this many texts.
+_MAX_BATCH_TEXTS = 1000
+
+_KINDS = ("word", "char")
+
+
+class _Vocabulary(NamedTuple):
+    keys: np.ndarray  # S<n> (n_terms,), ascending
+    features: np.ndarray  # int64 (n_terms,), feature index of each key
+    idf: np.ndarray  # float64 (n_features,)
+    analyzer: Callable[[str], List[str]]
+
+    def rows(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(doc, feature, value) of the texts' L2-normalised tf-idf rows,
+        sorted by doc then feature, as ``TfidfVectorizer.transform``."""
+        grams: List[bytes] = []
+        docs: List[int] = []
+        width = self.keys.dtype.itemsize
+        for doc, text in enumerate(texts):
+            for gram in self.analyzer(text):
+                encoded = gram.encode("utf-8")
+                # Longer than every key: no match (and S<n> would truncate it).
+                if len(encoded) <= width:
+                    grams.append(encoded)
+                    docs.append(doc)
+        if not grams or not len(self.keys):
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0, dtype=np.float64)
+
+        queries = np.array(grams, dtype=self.keys.dtype)
+        slots = np.searchsorted(self.keys, queries)
+        slots[slots == len(self.keys)] = 0
+        hit = self.keys[slots] == queries
+        n_features = len(self.idf)
+        cells = (
+            np.asarray(docs, dtype=np.int64)[hit] * n_features
+            + np.asarray(self.features)[slots[hit]]
+        )
+        cells, counts = np.unique(cells, return_counts=True)
+        doc_of, feature = np.divmod(cells, n_features)
+        values = counts * np.asarray(self.idf)[feature]
+        norms = np.sqrt(np.bincount(doc_of, weights=values**2))
+        return doc_of, feature, values / norms[doc_of]
+
+
+class TfidfEncoder(NamedTuple):
+    word: _Vocabulary
+    char: _Vocabulary
+    components_t: np.ndarray  # (n_features, n_components), C-contiguous
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """float64 (len(texts), n_components): the texts in SVD space.
+
+        CPU-bound — call via asyncio.to_thread (``encode`` below does).
+        """
+        word_docs, word_features, word_values = self.word.rows(texts)
+        char_docs, char_features, char_values = self.char.rows(texts)
+        docs = np.concatenate([word_docs, char_docs])
+        features = np.concatenate([word_features, char_features + len(self.word.idf)])
+        values = np.concatenate([word_values, char_values])
+        order = np.argsort(docs, kind="stable")
+        docs, features, values = docs[order], features[order], values[order]
+        values /= np.sqrt(np.bincount(docs, weights=values**2))[docs]
+
+        out = np.zeros((len(texts), self.components_t.shape[1]), dtype=np.float64)
+        if len(docs):
+            weighted = self.components_t[features] * values[:, None]
+            starts = np.flatnonzero(np.r_[True, docs[1:] != docs[:-1]])
+            out[docs[starts]] = np.add.reduceat(weighted, starts, axis=0)
+        return out
+
+
+def _analyzer(params: dict) -> Callable[[str], List[str]]:
+    # sklearn is imported lazily so workers that never encode don't pay for it.
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    return TfidfVectorizer(
+        analyzer=params["analyzer"],
+        ngram_range=tuple(params["ngram_range"]),
+        lowercase=params["lowercase"],
+    ).build_analyzer()
+
+
+def _encoder_dir() -> Path:
+    return Path(
+        settings.tfidf_encoder_dir
+        or os.path.join(tempfile.gettempdir(), "aqua-tfidf-encoders")
+    )
+
+
+def _entry_name(assessment_id: int, created_at: Optional[datetime]) -> str:
+    stamp = created_at.strftime("%Y%m%dT%H%M%S%f") if created_at else "none"
+    return f"{assessment_id}-{stamp}"
+
+
+def _build_arrays(vectorizers: Dict[str, tuple], components_npy: bytes) -> dict:
+    """The files of an encoder: name -> array, plus params.json's content."""
+    arrays = {}
+    for kind in _KINDS:
+        vocabulary, idf, _ = vectorizers[kind]
+        terms = list(vocabulary)
+        keys = np.array([term.encode("utf-8") for term in terms], dtype=np.bytes_)
+        order = np.argsort(keys, kind="stable")
+        arrays[f"{kind}_keys"] = keys[order]
+        arrays[f"{kind}_features"] = np.fromiter(
+            (vocabulary[term] for term in terms), dtype=np.int64, count=len(terms)
+        )[order]
+        arrays[f"{kind}_idf"] = np.asarray(idf, dtype=np.float64)
+    components = np.load(io.BytesIO(components_npy), allow_pickle=False)
+    arrays["components_t"] = np.ascontiguousarray(
+        components.T, dtype=components.dtype.newbyteorder("=")
+    )
+    params = {kind: vectorizers[kind][2] for kind in _KINDS}
+    return {"arrays": arrays, "params": params}
+
+
+def _encoder(arrays: dict, params: dict) -> TfidfEncoder:
+    def vocabulary(kind):
+        return _Vocabulary(
+            arrays[f"{kind}_keys"],
+            arrays[f"{kind}_features"],
+            arrays[f"{kind}_idf"],
+            _analyzer(params[kind]),
+        )
+
+    return TfidfEncoder(vocabulary("word"), vocabulary("char"), arrays["components_t"])
+
+
+def _open(path: Path) -> Optional[TfidfEncoder]:
+    """Map an encoder a worker of this host wrote, if there is one."""
+    try:
+        params = json.loads((path / "params.json").read_text())
+    except FileNotFoundError:
+        return None
+    arrays = {
+        file.stem: np.load(file, mmap_mode="r", allow_pickle=False)
+        for file in path.glob("*.npy")
+    }
+    return _encoder(arrays, params)
+
+
+def _write(assessment_id: int, path: Path, built: dict) -> Optional[TfidfEncoder]:
+    """Write ``built`` to ``path`` and map it; None if it can't be written."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{path.name}-", dir=path.parent))
+        for name, array in built["arrays"].items():
+            np.save(staging / f"{name}.npy", array, allow_pickle=False)
+        (staging / "params.json").write_text(json.dumps(built["params"]))
+        try:
+            staging.rename(path)
+        except OSError:
+            # Another worker got there first; its files are the same.
+            shutil.rmtree(staging, ignore_errors=True)
+    except OSError:
+        logger.warning(
+            f"Could not write TF-IDF encoder to {path}; keeping it in memory",
+            exc_info=True,
+        )
+        return None
+    for stale in path.parent.glob(f"{assessment_id}-*"):
+        if stale != path:
+            shutil.rmtree(stale, ignore_errors=True)
+    return _open(path)
+
+
+def _build(
+    assessment_id: int, path: Path, vectorizers: Dict[str, tuple], components: bytes
+) -> TfidfEncoder:
+    built = _build_arrays(vectorizers, components)
+    encoder = _write(assessment_id, path, built)
+    if encoder is None:
+        encoder = _encoder(built["arrays"], built["params"])
+    return encoder
+
+
+async def _load(
+    assessment_id: int, created_at: Optional[datetime]
+) -> Optional[TfidfEncoder]:
+    path = _encoder_dir() / _entry_name(assessment_id, created_at)
+    encoder = await asyncio.to_thread(_open, path)
+    if encoder is not None:
+        return encoder
+
+    async with AsyncSessionLocal() as db:
+        rows = (
+            await db.scalars(
+                select(TfidfVectorizerArtifact).where(
+                    TfidfVectorizerArtifact.assessment_id == assessment_id
+                )
+            )
+        ).all()
+        components = await db.scalar(
+            select(TfidfSvd.components_npy).where(
+                TfidfSvd.assessment_id == assessment_id
+            )
+        )
+    vectorizers = {row.kind: (row.vocabulary, row.idf, row.params) for row in rows}
+    if components is None or any(kind not in vectorizers for kind in _KINDS):
+        return None
+    return await asyncio.to_thread(_build, assessment_id, path, vectorizers, components)
+
+
+# assessment id -> (artifact run created_at, encoder), LRU order.
+_ENCODERS: Dict[int, Tuple[Optional[datetime], TfidfEncoder]] = {}
+_INFLIGHT_LOADS: Dict[Tuple[int, Optional[datetime]], asyncio.Future] = {}
+
+
+def _store(
+    assessment_id: int, created_at: Optional[datetime], encoder: TfidfEncoder
+) -> None:
+    _ENCODERS.pop(assessment_id, None)
+    while len(_ENCODERS) >= _MAX_ENCODERS:
+        _ENCODERS.pop(next(iter(_ENCODERS)), None)
+    _ENCODERS[assessment_id] = (created_at, encoder)
+
+
+async def get_encoder(
+    assessment_id: int, created_at: Optional[datetime]
+) -> Optional[TfidfEncoder]:
+    """The encoder of an assessment's artifact run (stamped ``created_at``).
+
+    None if the run's vectorizers or components are missing. Concurrent cold
+    requests on a worker share one load, on its own session.
+    """
+    entry = _ENCODERS.get(assessment_id)
+    if entry is not None and entry[0] == created_at:
+        # Re-insert so dict order tracks recency and eviction drops the LRU.
+        _ENCODERS[assessment_id] = _ENCODERS.pop(assessment_id)
+        return entry[1]
+
+    loop = asyncio.get_running_loop()
+    key = (assessment_id, created_at)
+    future = _INFLIGHT_LOADS.get(key)
+    # Futures belong to one event loop; never await one from another loop.
+    if future is None or future.get_loop() is not loop:
+        future = loop.create_task(_load(assessment_id, created_at))
+        _INFLIGHT_LOADS[key] = future
+
+        def _finish(done: asyncio.Future) -> None:
+            if _INFLIGHT_LOADS.get(key) is not done:
+                return
+            del _INFLIGHT_LOADS[key]
+            if (
+                not done.cancelled()
+                and done.exception() is None
+                and done.result() is not None
+            ):
+                _store(assessment_id, created_at, done.result())
+
+        future.add_done_callback(_finish)
+    # Shield so one cancelled waiter doesn't cancel the shared load.
+    return await asyncio.shield(future)
+
+
+class _Batch:
+    """Texts waiting to be encoded together, and who's waiting for which."""
+
+    def __init__(self, encoder: TfidfEncoder):
+        self.encoder = encoder
+        self.texts: List[str] = []
+        self.waiters: List[Tuple[asyncio.Future, int, int]] = []
+
+
+_PENDING: Dict[int, _Batch] = {}
+
+
+async def _flush(batch: _Batch) -> None:
+    try:
+        vectors = await asyncio.to_thread(batch.encoder.encode, batch.texts)
+    except Exception as exc:
+        for waiter, _, _ in batch.waiters:
+            if not waiter.done():
+                waiter.set_exception(exc)
+        return
+    for waiter, start, end in batch.waiters:
+        if not waiter.done():
+            waiter.set_result(vectors[start:end].tolist())
+
+
+def _dispatch(batch: _Batch) -> None:
+    if _PENDING.get(id(batch.encoder)) is batch:
+        del _PENDING[id(batch.encoder)]
+        asyncio.get_running_loop().create_task(_flush(batch))
+
+
+async def encode(encoder: TfidfEncoder, texts: Sequence[str]) -> List[List[float]]:
+    """Encode ``texts``, together with other calls for ``encoder`` that
+    arrive within ``settings.tfidf_encode_batch_ms``."""
+    window = settings.tfidf_encode_batch_ms / 1000
+    if window <= 0:
+        return (await asyncio.to_thread(encoder.encode, texts)).tolist()
+
+    loop = asyncio.get_running_loop()
+    batch = _PENDING.get(id(encoder))
+    if batch is None or batch.waiters[0][0].get_loop() is not loop:
+        batch = _PENDING[id(encoder)] = _Batch(encoder)
+        loop.call_later(window, _dispatch, batch)
+    waiter = loop.create_future()
+    batch.waiters.append((waiter, len(batch.texts), len(batch.texts) + len(texts)))
+    batch.texts.extend(texts)
+    if len(batch.texts) >= _MAX_BATCH_TEXTS:
+        _dispatch(batch)
+    return await waiter
+
+
+def clear() -> None:
+    _ENCODERS.clear()
+    _INFLIGHT_LOADS.clear()
+    _PENDING.clear()
@@ -0,0 +1,344 @@
+"""Postgres-backed queue for requests that outlast the HTTP timeout.
+
+/tokenizer/index, /tokenizer/word-index, /agent/lexeme-card/deduplicate and
+POST /revision can take minutes on a full Bible — past the 120s ingress
+timeout, with a worker's connection held the whole time. Given
+``background=true``, each of them validates and authorizes the request as
+before, then ``enqueue``s it as a ``background_jobs`` row and answers 202
+with a job handle (``accepted``). The caller polls ``GET /jobs/{id}``
+(job_routes) for progress and, once complete, the body the synchronous call
+would have returned; a failure carries its HTTP status and detail.
+
+Every API worker runs ``settings.background_job_workers`` runners, started
+and stopped with the app (``start``/``stop``). A runner claims the oldest
+queued job with ``FOR UPDATE SKIP LOCKED``, so workers and containers share
+one queue without handing a job out twice, and runs the handler its route
+module registered for the job's kind (``@handler``) on a session of its own.
+While it works it beats ``heartbeat_at``; a job whose heartbeat is older than
+``settings.background_job_stale_s`` lost its worker and is marked failed. A
+runner stopped mid-job (a deploy) puts the job back in the queue: every
+handler does its writes in one transaction, so a re-run starts clean.
+"""
+
+import asyncio
+import os
+import secrets
+import socket
+import time
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from config import settings
+from database.dependencies import AsyncSessionLocal
+from database.models import BackgroundJob
+from models import JobHandle
+from utils.logging_config import setup_logger
+
+container_id = socket.gethostname()
+logger = setup_logger(__name__, container_id=container_id)
+
+# Polling cadence advertised to clients on a queued or running job.
+JOB_POLL_INTERVAL_S = 10
+# Least time between two progress writes for one job.
+_PROGRESS_MIN_INTERVAL_S = 1.0
+
+_WORKER = f"{container_id}:{os.getpid()}"
+
+# progress(fraction done in [0, 1], what the job is doing now)
+Progress = Callable[[float, str], Awaitable[None]]
+# handler(session, params, payload, progress) -> the synchronous response body
+JobHandler = Callable[[AsyncSession, dict, Optional[bytes], Progress], Awaitable[Any]]
+
+_HANDLERS: Dict[str, JobHandler] = {}
+
+
+async def no_progress(fraction: float, detail: str) -> None:
+    """The ``progress`` of a synchronous call: reported nowhere."""
+
+
+def handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register the coroutine that runs jobs of ``kind``."""
+
+    def register(fn: JobHandler) -> JobHandler:
+        _HANDLERS[kind] = fn
+        return fn
+
+    return register
+
+
+async def enqueue(
+    db: AsyncSession,
+    kind: str,
+    params: dict,
+    owner_id: int,
+    payload: Optional[bytes] = None,
+) -> BackgroundJob:
+    """Queue a job of ``kind`` for ``owner_id`` and commit."""
+    job = BackgroundJob(
+        id=f"job_{secrets.token_hex(12)}",
+        kind=kind,
+        status="queued",
+        params=params,
+        payload=payload,
+        owner_id=owner_id,
+    )
+    db.add(job)
+    await db.commit()
+    if _wake is not None:
+        _wake.set()
+    logger.info(
+        "Queued background job",
+        extra={"job_id": job.id, "kind": kind, "owner_id": owner_id},
+    )
+    return job
+
+
+def handle(job: BackgroundJob) -> JobHandle:
+    return JobHandle(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        poll_url=f"/latest/jobs/{job.id}",
+    )
+
+
+def accepted(job: BackgroundJob) -> JSONResponse:
+    """The 202 a route answers ``background=true`` with."""
+    job_handle = handle(job)
+    return JSONResponse(
+        status_code=202,
+        content=job_handle.model_dump(),
+        headers={"Location": job_handle.poll_url},
+    )
+
+
+class _ClaimedJob(NamedTuple):
+    id: str
+    kind: str
+    params: dict
+    payload: Optional[bytes]
+
+
+class _Progress:
+    """Writes a job's progress (and heartbeat), at most once a second."""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self._last = float("-inf")
+
+    async def __call__(self, fraction: float, detail: str) -> None:
+        now = time.monotonic()
+        if now - self._last < _PROGRESS_MIN_INTERVAL_S:
+            return
+        self._last = now
+        await _update(
+            self.job_id,
+            progress=min(max(fraction, 0.0), 1.0),
+            progress_detail=detail,
+            heartbeat_at=func.now(),
+        )
+
+
+async def _update(job_id: str, **values) -> None:
+    # Own session: progress must be visible while the job's transaction is
+    # still open.
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+
+async def _fail_stale(db: AsyncSession) -> None:
+    cutoff = func.now() - timedelta(seconds=settings.background_job_stale_s)
+    result = await db.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.status == "running", BackgroundJob.heartbeat_at < cutoff)
+        .values(
+            status="failed",
+            error="The worker running this job stopped before it finished",
+            error_status=500,
+            payload=None,
+            completed_at=func.now(),
+        )
+        .returning(BackgroundJob.id)
+        .execution_options(synchronize_session=False)
+    )
+    stale = result.scalars().all()
+    if stale:
+        logger.warning("Marked stale background jobs failed", extra={"job_ids": stale})
+
+
+async def _claim() -> Optional[_ClaimedJob]:
+    async with AsyncSessionLocal() as db:
+        await _fail_stale(db)
+        next_id = (
+            select(BackgroundJob.id)
+            .where(BackgroundJob.status == "queued")
+            .order_by(BackgroundJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == next_id)
+            .values(
+                status="running",
+                worker=_WORKER,
+                started_at=func.now(),
+                heartbeat_at=func.now(),
+            )
+            .returning(
+                BackgroundJob.id,
+                BackgroundJob.kind,
+                BackgroundJob.params,
+                BackgroundJob.payload,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        await db.commit()
+    return _ClaimedJob(*row) if row is not None else None
+
+
+async def _heartbeat(job_id: str) -> None:
+    while True:
+        await asyncio.sleep(settings.background_job_stale_s / 3)
+        try:
+            await _update(job_id, heartbeat_at=func.now())
+        except Exception:
+            logger.warning(f"Heartbeat failed for job {job_id}", exc_info=True)
+
+
+async def _run(job: _ClaimedJob) -> None:
+    started = time.perf_counter()
+    heartbeat = asyncio.create_task(_heartbeat(job.id))
+    try:
+        run = _HANDLERS.get(job.kind)
+        if run is None:
+            raise ValueError(f"Unknown job kind '{job.kind}'")
+        async with AsyncSessionLocal() as db:
+            result = await run(db, job.params, job.payload, _Progress(job.id))
+    except asyncio.CancelledError:
+        # Stopped mid-job: the handler's transaction rolled back, so the job
+        # can run again from the start elsewhere.
+        await asyncio.shield(
+            _update(
+                job.id,
+                status="queued",
+                worker=None,
+                progress=None,
+                progress_detail=None,
+            )
+        )
+        raise
+    except HTTPException as exc:
+        await _update(
+            job.id,
+            status="failed",
+            error=str(exc.detail),
+            error_status=exc.status_code,
+            payload=None,
+            completed_at=func.now(),
+        )
+    except Exception as exc:
+        logger.error(
+            f"Background job {job.id} ({job.kind}) failed: {type(exc).__name__}",
+            exc_info=True,
+        )
+        await _update(
+            job.id,
+            status="failed",
+            error=str(exc) if isinstance(exc, ValueError) else type(exc).__name__,
+            error_status=500,
+            payload=None,
+            completed_at=func.now(),
+        )
+    else:
+        await _update(
+            job.id,
+            status="complete",
+            result=jsonable_encoder(result),
+            progress=1.0,
+            payload=None,
+            completed_at=func.now(),
+        )
+    finally:
+        heartbeat.cancel()
+    logger.info(
+        f"Background job {job.id} finished in "
+        f"{round(time.perf_counter() - started, 2)}s",
+        extra={"job_id": job.id, "kind": job.kind},
+    )
+
+
+async def run_pending() -> int:
+    """Run queued jobs here until none are left; how many ran.
+
+    For tests and one-off scripts; the app's runners do this continuously.
+    """
+    ran = 0
+    while (job := await _claim()) is not None:
+        await _run(job)
+        ran += 1
+    return ran
+
+
+_TASKS: List[asyncio.Task] = []
+# Set by enqueue so this worker's idle runners claim at once, not at their
+# next poll.
+_wake: Optional[asyncio.Event] = None
+
+
+async def _runner() -> None:
+    while True:
+        _wake.clear()
+        try:
+            job = await _claim()
+        except Exception:
+            logger.warning("Failed to claim a background job", exc_info=True)
+            job = None
+        if job is not None:
+            try:
+                await _run(job)
+            except Exception:
+                # e.g. writing the outcome failed; the job stays running
+                # until the stale sweep fails it, but this runner goes on.
+                logger.exception(f"Background job {job.id} ({job.kind}) errored")
+            continue
+        try:
+            await asyncio.wait_for(_wake.wait(), settings.background_job_poll_s)
+        except asyncio.TimeoutError:
+            pass
+
+
+def start() -> None:
+    """Start this worker's runners, on the running loop."""
+    global _wake
+    if _TASKS or settings.background_job_workers <= 0:
+        return
+    _wake = asyncio.Event()
+    _TASKS.extend(
+        asyncio.create_task(_runner()) for _ in range(settings.background_job_workers)
+    )
+
+
+async def stop() -> None:
+    """Stop the runners; jobs they were running go back in the queue."""
+    global _wake
+    for task in _TASKS:
+        task.cancel()
+    await asyncio.gather(*_TASKS, return_exceptions=True)
+    _TASKS.clear()
+    _wake = None
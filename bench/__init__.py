@@ -0,0 +1,22 @@
+"""Benchmark suite for the API's hot paths.
+
+``python -m bench.run`` seeds a synthetic full-Bible dataset (``dataset``),
+times each endpoint in ``run.CASES`` through the ASGI app, and writes JSON;
+``python -m bench.compare`` diffs two such files. See ``make bench``.
+
+The other modules compare implementations rather than time endpoints, each
+standalone with ``python -m bench.<name>``:
+
+- ``encoder``: the by_text encoder's memory and latency across several
+  worker processes, without a database;
+- ``auth_middleware``: per-request JWT handling in the middleware and auth;
+- ``login_load``: ``/version`` latency under concurrent ``/token`` logins;
+- ``upload_loaders``: the executemany and COPY revision-upload loaders;
+- ``keyset_pagination``: OFFSET against cursor pages on the results routes;
+- ``results_export``: peak memory of the alignment-score list and exports;
+- ``morpheme_segmentation``: segmenting a full Bible inline, on a thread,
+  on a process pool and from the memo;
+- ``tfidf_vector_binding``: literal against bound query vectors, with plans.
+
+They share ``support`` for their environment, timing and seed rows.
+"""
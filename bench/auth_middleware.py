@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""Measure the per-request JWT overhead of ``LoggingMiddleware`` plus auth.
+
+Drives ``LoggingMiddleware`` directly (no server, no DB) with a request that
+carries a bearer token, wrapped around an inner app that resolves the token
+the way the auth dependency does. Two setups are timed:
+
+- ``before``: the middleware verifies the token and the dependency verifies
+  it again with ``jwt.decode`` (the old behaviour), verified-token cache off;
+- ``after``: the middleware verifies through ``decode_token`` and shares the
+  claims via the scope state; the dependency reuses them, and repeat requests
+  with the same token (a client polling a job) hit the verified-token cache.
+
+The middleware's request log line is silenced in both setups so only the
+token handling and ASGI plumbing are measured.
+
+Usage:
+
+    python -m bench.auth_middleware [--requests N] [--repeat N]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+from bench.support import prepare_standalone_import
+
+
+def _inner_app(mode: str):
+    from jose import jwt
+    from starlette.requests import Request
+
+    from security_routes.utilities import ALGORITHM, SECRET_KEY, request_token_claims
+
+    async def app(scope, receive, send):
+        token = dict(scope["headers"])[b"authorization"].decode()[len("Bearer ") :]
+        if mode == "before":
+            claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        else:
+            claims = request_token_claims(Request(scope), token)
+        assert claims["sub"]
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    return app
+
+
+async def _time_requests(middleware, token: str, count: int) -> float:
+    """Mean microseconds per request over ``count`` requests."""
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(count):
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/latest/predict/jobs/1",
+            "query_string": b"",
+            "headers": headers,
+            "client": ("127.0.0.1", 50000),
+        }
+        await middleware(scope, receive, send)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+async def _bench(requests: int, repeat: int) -> dict:
+    from config import settings
+    from middleware import LoggingMiddleware
+    from security_routes import utilities
+    from security_routes.auth_routes import create_access_token
+
+    token = create_access_token({"sub": "bench-user", "is_admin": False})
+    cache_size = settings.jwt_cache_max_tokens or 4096
+
+    results = {}
+    for mode in ("before", "after"):
+        settings.jwt_cache_max_tokens = 0 if mode == "before" else cache_size
+        utilities._VERIFIED_JWT_CACHE.clear()
+        middleware = LoggingMiddleware(_inner_app(mode))
+        middleware.logger.setLevel(logging.WARNING)
+        await _time_requests(middleware, token, 100)  # warm-up
+        samples = [
+            await _time_requests(middleware, token, requests) for _ in range(repeat)
+        ]
+        results[mode] = {
+            "median_us_per_request": statistics.median(samples),
+            "min_us_per_request": min(samples),
+            "max_us_per_request": max(samples),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    prepare_standalone_import(pooled=True)
+    results = asyncio.run(_bench(args.requests, args.repeat))
+
+    for mode, r in results.items():
+        print(
+            f"{mode:>6}: median {r['median_us_per_request']:.1f}us/request "
+            f"(min {r['min_us_per_request']:.1f}, max {r['max_us_per_request']:.1f})"
+        )
+    print(json.dumps({"requests": args.requests, "results": results}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""Compare two ``bench.run`` reports case by case.
+
+Prints each case's median latency in both reports and the change. With
+``--fail-above PCT``, exits 1 if any case's median grew by more than PCT
+percent, so a CI job can gate on it. Cases present in only one report are
+listed but never fail the comparison.
+
+Usage:
+
+    python -m bench.compare BASELINE.json CANDIDATE.json [--fail-above PCT]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def compare(baseline: dict, candidate: dict) -> list:
+    """(case, baseline median, candidate median, change in percent) rows;
+    a median or change is None when the case is missing from a report."""
+    rows = []
+    for name in list(dict.fromkeys([*baseline["cases"], *candidate["cases"]])):
+        before = baseline["cases"].get(name, {}).get("median_ms")
+        after = candidate["cases"].get(name, {}).get("median_ms")
+        change = None
+        if before and after is not None:
+            change = (after - before) / before * 100
+        rows.append((name, before, after, change))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--fail-above", type=float, metavar="PCT")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+    for label, report in (("baseline", baseline), ("candidate", candidate)):
+        meta = report["meta"]
+        dirty = " (dirty)" if meta["git_dirty"] else ""
+        print(
+            f"{label:>9}: {meta['git_commit'][:12]}{dirty}, {meta['verses']} verses,"
+            f" {meta['baselines']} baselines, {meta['timestamp']}"
+        )
+
+    regressions = []
+    for name, before, after, change in compare(baseline, candidate):
+        if change is None:
+            shown = [f"{v:.1f}ms" if v is not None else "-" for v in (before, after)]
+            print(f"{name:>22}: {shown[0]:>10} -> {shown[1]:>10}")
+            continue
+        print(f"{name:>22}: {before:8.1f}ms -> {after:8.1f}ms  {change:+6.1f}%")
+        if args.fail_above is not None and change > args.fail_above:
+            regressions.append(name)
+    if regressions:
+        print(
+            f"median regressed by more than {args.fail_above}%: "
+            + ", ".join(regressions),
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,689 @@
+"""Synthetic full-Bible dataset for the benchmark suite.
+
+``seed`` builds, and commits, one realistic working set:
+
+- a target and a source revision uploaded through ``POST /v3/revision``,
+  one line per vref slot, drawn from Zipf-distributed pseudo-word
+  vocabularies (two "languages"), and an older draft of the target in the
+  same version;
+- a word-alignment assessment of target against source with verse scores
+  and ``--words-per-verse`` top source scores per verse, plus one
+  word-alignment assessment per baseline revision (verse scores only) for
+  /compareresults;
+- semantic-similarity, ngrams and TF-IDF assessments of the target, the
+  TF-IDF one with a fitted word + char encoder pushed through the artifact
+  route and its corpus vectors stored;
+- a training session linking those four assessments;
+- a morpheme inventory for the target's language, committed through
+  ``POST /v3/tokenizer/runs``: its syllables as affixes plus two- and
+  three-syllable roots, about a thousand morphemes.
+
+Assessments are created ``running`` and moved to ``finished`` through
+``PATCH /v3/assessment/{id}/status``, so the rollups and caches a finish
+maintains are in place as they would be in production. Bulk rows go in
+with COPY.
+
+Everything hangs off versions whose abbreviation starts with ``BENCH-SUITE``
+and one bench user and group; ``cleanup`` removes it all, and also runs
+before seeding in case an interrupted run left rows behind. The verse
+reference tables must already be loaded.
+"""
+
+import base64
+import dataclasses
+import io
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from bench.support import ISO_LANGUAGE, ISO_SCRIPT, REPO_ROOT
+
+VREF_FILE = REPO_ROOT / "fixtures" / "vref.txt"
+
+ABBREVIATION_PREFIX = "BENCH-SUITE"
+USERNAME = "bench-suite"
+PASSWORD = "bench-suite-password"
+GROUP_NAME = "bench-suite"
+SESSION_ID = "bench-suite-session"
+PROFILE_NAME = "bench suite"
+
+_TARGET_SYLLABLES = ["ka", "lo", "mi", "nu", "pe", "ra", "si", "to", "wa", "ye"]
+_SOURCE_SYLLABLES = ["ba", "de", "fi", "go", "hu", "ja", "ke", "li", "mo", "ne"]
+_VOCABULARY_SIZE = 8000
+_N_THREE_SYLLABLE_ROOTS = 900
+_N_NGRAMS = 2000
+_MAX_NGRAM_VREFS = 50
+_ANALYZED_TABLES = (
+    "verse_text",
+    "assessment",
+    "assessment_result",
+    "assessment_result_rollup",
+    "alignment_top_source_scores",
+    "tfidf_pca_vector",
+    "ngrams_table",
+    "ngram_vref_table",
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class Dataset:
+    """Ids and inputs the benchmark cases need."""
+
+    verses: int
+    upload_version_id: int
+    target_version_id: int
+    target_revision_id: int
+    source_revision_id: int
+    baseline_revision_ids: List[int]
+    word_alignment_id: int
+    tfidf_id: int
+    session_id: str
+    search_term: str
+    iso: str
+    sample_texts: List[str]
+    upload_text: bytes
+
+
+def _log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def _vrefs(verses: int) -> Tuple[List[str], List[Tuple[str, int, int]]]:
+    """All vref slots, and (book, chapter, verse) of the first ``verses``."""
+    slots = VREF_FILE.read_text().splitlines()
+    locations = []
+    for vref in slots[:verses]:
+        book, chapter_verse = vref.split(" ")
+        chapter, verse = chapter_verse.split(":")
+        locations.append((book, int(chapter), int(verse)))
+    return slots, locations
+
+
+def _vocabulary(rng, syllables: Sequence[str]) -> List[str]:
+    words: Dict[str, None] = {}
+    while len(words) < _VOCABULARY_SIZE:
+        n = int(rng.integers(1, 5))
+        words["".join(rng.choice(syllables, n))] = None
+    return list(words)
+
+
+def _verse_tokens(rng, vocabulary: List[str], verses: int) -> List[List[str]]:
+    """Token lists of roughly real verse length, Zipf-distributed by rank."""
+    weights = 1.0 / np.arange(1, len(vocabulary) + 1) ** 1.07
+    weights /= weights.sum()
+    lengths = np.clip(rng.poisson(24, verses), 3, 80)
+    ids = rng.choice(len(vocabulary), size=int(lengths.sum()), p=weights)
+    tokens, start = [], 0
+    for length in lengths:
+        tokens.append([vocabulary[i] for i in ids[start : start + length]])
+        start += length
+    return tokens
+
+
+def _morphemes(rng, syllables: Sequence[str]) -> List[dict]:
+    """A tokenizer run's morpheme list for words built from ``syllables``:
+    each syllable as an affix, every two-syllable root, and
+    ``_N_THREE_SYLLABLE_ROOTS`` three-syllable ones."""
+    roots = {a + b: None for a in syllables for b in syllables}
+    n_roots = len(roots) + _N_THREE_SYLLABLE_ROOTS
+    while len(roots) < n_roots:
+        roots["".join(rng.choice(syllables, 3))] = None
+    return [{"morpheme": s, "morpheme_class": "GRAMMATICAL"} for s in syllables] + [
+        {"morpheme": root, "morpheme_class": "LEXICAL"} for root in roots
+    ]
+
+
+def _upload_text(slots: List[str], tokens: List[List[str]]) -> bytes:
+    lines = [" ".join(t) for t in tokens] + [""] * (len(slots) - len(tokens))
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def _copy(db, table: str, columns: Sequence[str], records: Iterable) -> None:
+    """COPY rows into ``table`` in the session's open transaction."""
+    conn = await db.connection()
+    raw_conn = await conn.get_raw_connection()
+    await raw_conn.driver_connection.copy_records_to_table(
+        table, records=list(records), columns=list(columns)
+    )
+
+
+def _fit_encoder(texts: List[str], n_components: int):
+    """A word + char TF-IDF encoder shaped like the ones the TF-IDF runner
+    pushes: the artifact push body, and the corpus vectors (raw SVD output,
+    as the runner stores them)."""
+    import sklearn
+    from scipy.sparse import hstack
+    from sklearn.decomposition import TruncatedSVD
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import normalize
+
+    params = {
+        "word": {"analyzer": "word", "ngram_range": (1, 2), "max_df": 0.12},
+        "char": {"analyzer": "char_wb", "ngram_range": (3, 6), "max_df": 0.3},
+    }
+    vectorizers = {
+        name: TfidfVectorizer(
+            lowercase=True, min_df=2, max_features=10_000, **kwargs
+        ).fit(texts)
+        for name, kwargs in params.items()
+    }
+    X = normalize(
+        hstack([vectorizers[name].transform(texts) for name in params]), norm="l2"
+    )
+    svd = TruncatedSVD(n_components=n_components, random_state=0)
+    vectors = svd.fit_transform(X).astype(np.float32)
+
+    def payload(name):
+        vectorizer = vectorizers[name]
+        return {
+            "vocabulary": {k: int(v) for k, v in vectorizer.vocabulary_.items()},
+            "idf": vectorizer.idf_.tolist(),
+            "params": {
+                **params[name],
+                "ngram_range": list(params[name]["ngram_range"]),
+                "lowercase": True,
+                "min_df": 2,
+            },
+        }
+
+    buf = io.BytesIO()
+    np.save(buf, svd.components_.astype(np.float32), allow_pickle=False)
+    body = {
+        "n_components": n_components,
+        "n_corpus_vrefs": len(texts),
+        "sklearn_version": sklearn.__version__,
+        "word_vectorizer": payload("word"),
+        "char_vectorizer": payload("char"),
+        "svd": {
+            "n_components": n_components,
+            "n_features": int(svd.components_.shape[1]),
+            "dtype": "float32",
+            "components_b64": base64.b64encode(buf.getvalue()).decode("ascii"),
+        },
+    }
+    return body, vectors
+
+
+def _top_ngrams(tokens: List[List[str]], vrefs: List[str]) -> Dict[str, List[str]]:
+    """The most frequent 2- and 3-grams, each with (up to
+    ``_MAX_NGRAM_VREFS``) vrefs it occurs in."""
+    occurrences = defaultdict(list)
+    for verse_tokens, vref in zip(tokens, vrefs):
+        seen = set()
+        for size in (2, 3):
+            for i in range(len(verse_tokens) - size + 1):
+                ngram = " ".join(verse_tokens[i : i + size])
+                if ngram not in seen:
+                    seen.add(ngram)
+                    occurrences[ngram].append(vref)
+    counts = Counter({ngram: len(v) for ngram, v in occurrences.items()})
+    return {
+        ngram: occurrences[ngram][:_MAX_NGRAM_VREFS]
+        for ngram, _ in counts.most_common(_N_NGRAMS)
+    }
+
+
+async def _check_reference_data() -> None:
+    from sqlalchemy import func, select
+
+    from database.dependencies import AsyncSessionLocal
+    from database.models import VerseReference
+
+    async with AsyncSessionLocal() as db:
+        if not await db.scalar(select(func.count()).select_from(VerseReference)):
+            raise SystemExit("verse_reference is empty; load the reference data")
+
+
+async def _create_owner_and_versions(baselines: int) -> Dict[str, int]:
+    """The bench user, its group, and one version per role, all accessible
+    to the group. Returns version ids by role."""
+    from database.dependencies import AsyncSessionLocal
+    from database.models import (
+        BibleVersion,
+        BibleVersionAccess,
+        Group,
+        IsoLanguage,
+        IsoScript,
+        UserDB,
+        UserGroup,
+    )
+    from security_routes.utilities import hash_password
+
+    roles = ["upload", "target", "source"] + [f"baseline{i}" for i in range(baselines)]
+    async with AsyncSessionLocal() as db:
+        await db.merge(IsoLanguage(iso639=ISO_LANGUAGE, name="bench"))
+        await db.merge(IsoScript(iso15924=ISO_SCRIPT, name="bench"))
+        await db.flush()  # no relationship orders these before bible_version
+        user = UserDB(
+            username=USERNAME,
+            email=f"{USERNAME}@example.com",
+            hashed_password=hash_password(PASSWORD),
+            is_admin=False,
+        )
+        group = Group(name=GROUP_NAME, description="benchmark suite")
+        db.add_all([user, group])
+        await db.flush()
+        db.add(UserGroup(user_id=user.id, group_id=group.id))
+        versions = {}
+        for role in roles:
+            version = BibleVersion(
+                name=f"bench suite {role}",
+                iso_language=ISO_LANGUAGE,
+                iso_script=ISO_SCRIPT,
+                abbreviation=f"{ABBREVIATION_PREFIX}-{role}",
+                owner_id=user.id,
+            )
+            db.add(version)
+            await db.flush()
+            db.add(BibleVersionAccess(bible_version_id=version.id, group_id=group.id))
+            versions[role] = version.id
+        await db.commit()
+        return versions
+
+
+async def _upload(client, headers, version_id: int, name: str, text: bytes) -> int:
+    response = await client.post(
+        "/v3/revision",
+        params={"version_id": version_id, "name": name, "published": False},
+        files={"file": (f"{name}.txt", text, "text/plain")},
+        headers=headers,
+    )
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+async def _seed_assessments(
+    rng,
+    revisions: Dict[str, int],
+    versions: Dict[str, int],
+    baselines: int,
+    locations: List[Tuple[str, int, int]],
+    target_tokens: List[List[str]],
+    source_tokens: List[List[str]],
+    words_per_verse: int,
+    tfidf_vectors: np.ndarray,
+) -> Dict[str, int]:
+    """Create the assessments (``running``) and their result rows. Returns
+    assessment ids by role."""
+    from sqlalchemy import insert, select
+
+    from database.dependencies import AsyncSessionLocal
+    from database.models import Assessment, NgramsTable, TrainingJob, UserDB
+
+    vrefs = [f"{b} {c}:{v}" for b, c, v in locations]
+    plan = {
+        "word-alignment": ("word-alignment", "target"),
+        "semantic-similarity": ("semantic-similarity", "target"),
+        "ngrams": ("ngrams", "target"),
+        "tfidf": ("tfidf", "target"),
+        **{
+            f"baseline{i}": ("word-alignment", f"baseline{i}") for i in range(baselines)
+        },
+    }
+    async with AsyncSessionLocal() as db:
+        owner_id = await db.scalar(select(UserDB.id).where(UserDB.username == USERNAME))
+        assessments = {}
+        for role, (kind, revision_role) in plan.items():
+            assessment = Assessment(
+                revision_id=revisions[revision_role],
+                reference_id=revisions["source"],
+                type=kind,
+                status="running",
+                owner_id=owner_id,
+            )
+            db.add(assessment)
+            await db.flush()
+            assessments[role] = assessment.id
+
+        def verse_scores(assessment_id):
+            scores = rng.uniform(0, 1, len(vrefs))
+            return (
+                (assessment_id, vref, float(s), b, c, v, False, False)
+                for vref, s, (b, c, v) in zip(vrefs, scores, locations)
+            )
+
+        result_columns = [
+            "assessment_id",
+            "vref",
+            "score",
+            "book",
+            "chapter",
+            "verse",
+            "flag",
+            "hide",
+        ]
+        for role in ["word-alignment", "semantic-similarity"] + [
+            f"baseline{i}" for i in range(baselines)
+        ]:
+            await _copy(
+                db, "assessment_result", result_columns, verse_scores(assessments[role])
+            )
+
+        def word_scores():
+            for vref, (b, c, v), target, source in zip(
+                vrefs, locations, target_tokens, source_tokens
+            ):
+                words = list(dict.fromkeys(source))[:words_per_verse]
+                targets = rng.choice(target, len(words))
+                scores = rng.beta(2, 2, len(words))
+                for word, target_word, score in zip(words, targets, scores):
+                    yield (
+                        assessments["word-alignment"],
+                        vref,
+                        word,
+                        str(target_word),
+                        float(score),
+                        b,
+                        c,
+                        v,
+                        False,
+                        False,
+                    )
+
+        await _copy(
+            db,
+            "alignment_top_source_scores",
+            [
+                "assessment_id",
+                "vref",
+                "source",
+                "target",
+                "score",
+                "book",
+                "chapter",
+                "verse",
+                "flag",
+                "hide",
+            ],
+            word_scores(),
+        )
+        await _copy(
+            db,
+            "tfidf_pca_vector",
+            ["assessment_id", "vref", "vector"],
+            (
+                (assessments["tfidf"], vref, vector)
+                for vref, vector in zip(vrefs, tfidf_vectors)
+            ),
+        )
+
+        ngrams = _top_ngrams(target_tokens, vrefs)
+        ngram_ids = dict(
+            (
+                await db.execute(
+                    insert(NgramsTable)
+                    .values(
+                        [
+                            {
+                                "assessment_id": assessments["ngrams"],
+                                "ngram": ngram,
+                                "ngram_size": len(ngram.split(" ")),
+                            }
+                            for ngram in ngrams
+                        ]
+                    )
+                    .returning(NgramsTable.ngram, NgramsTable.id)
+                )
+            ).all()
+        )
+        await _copy(
+            db,
+            "ngram_vref_table",
+            ["ngram_id", "vref"],
+            (
+                (ngram_ids[ngram], vref)
+                for ngram, ngram_vrefs in ngrams.items()
+                for vref in ngram_vrefs
+            ),
+        )
+
+        for role in ["word-alignment", "semantic-similarity", "ngrams", "tfidf"]:
+            db.add(
+                TrainingJob(
+                    type=role,
+                    source_revision_id=revisions["source"],
+                    target_revision_id=revisions["target"],
+                    source_version_id=versions["source"],
+                    target_version_id=versions["target"],
+                    session_id=SESSION_ID,
+                    assessment_id=assessments[role],
+                    owner_id=owner_id,
+                )
+            )
+        await db.commit()
+        return assessments
+
+
+async def _analyze() -> None:
+    """Give the planner real row counts, as autovacuum would after a load."""
+    from sqlalchemy import text
+
+    from database.dependencies import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        for table in _ANALYZED_TABLES:
+            await db.execute(text(f"ANALYZE {table}"))
+        await db.commit()
+
+
+async def _token(client) -> Dict[str, str]:
+    response = await client.post(
+        "/latest/token", data={"username": USERNAME, "password": PASSWORD}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def seed(
+    client, verses: int, baselines: int, words_per_verse: int = 8
+) -> Tuple[Dataset, Dict[str, str]]:
+    """Seed the dataset through ``client`` (an httpx client on the app) and
+    the database. Returns it and the bench user's auth headers."""
+    await _check_reference_data()
+    await cleanup()
+    slots, locations = _vrefs(verses)
+    rng = np.random.default_rng(seed=0)
+    target_vocabulary = _vocabulary(rng, _TARGET_SYLLABLES)
+    source_vocabulary = _vocabulary(rng, _SOURCE_SYLLABLES)
+    target_tokens = _verse_tokens(rng, target_vocabulary, len(locations))
+    source_tokens = _verse_tokens(rng, source_vocabulary, len(locations))
+    target_text = _upload_text(slots, target_tokens)
+
+    start = time.perf_counter()
+    _log(f"seeding {len(locations)} verses, {baselines} baselines")
+    versions = await _create_owner_and_versions(baselines)
+    headers = await _token(client)
+    # An earlier draft of the target, so version-scoped reads have more
+    # than one revision to choose from; uploaded first, so it is older.
+    await _upload(
+        client,
+        headers,
+        versions["target"],
+        "target-draft",
+        _upload_text(slots, _verse_tokens(rng, target_vocabulary, len(locations))),
+    )
+    revisions = {
+        "target": await _upload(
+            client, headers, versions["target"], "target", target_text
+        ),
+        "source": await _upload(
+            client,
+            headers,
+            versions["source"],
+            "source",
+            _upload_text(slots, source_tokens),
+        ),
+    }
+    for i in range(baselines):
+        baseline_tokens = _verse_tokens(rng, target_vocabulary, len(locations))
+        revisions[f"baseline{i}"] = await _upload(
+            client,
+            headers,
+            versions[f"baseline{i}"],
+            f"baseline{i}",
+            _upload_text(slots, baseline_tokens),
+        )
+
+    response = await client.post(
+        "/v3/tokenizer/runs",
+        json={
+            "iso_639_3": ISO_LANGUAGE,
+            "revision_id": revisions["target"],
+            "profile": {"name": PROFILE_NAME},
+            # Own generator, so the other rows don't change with it.
+            "morphemes": _morphemes(np.random.default_rng(seed=1), _TARGET_SYLLABLES),
+        },
+        headers=headers,
+    )
+    response.raise_for_status()
+
+    _log("fitting the TF-IDF encoder")
+    target_texts = [" ".join(tokens) for tokens in target_tokens]
+    artifacts, tfidf_vectors = _fit_encoder(target_texts, n_components=300)
+    assessments = await _seed_assessments(
+        rng,
+        revisions,
+        versions,
+        baselines,
+        locations,
+        target_tokens,
+        source_tokens,
+        words_per_verse,
+        tfidf_vectors,
+    )
+    response = await client.post(
+        f"/v3/assessment/{assessments['tfidf']}/tfidf-artifacts",
+        json=artifacts,
+        headers=headers,
+    )
+    response.raise_for_status()
+    await _analyze()
+    for assessment_id in assessments.values():
+        response = await client.patch(
+            f"/v3/assessment/{assessment_id}/status",
+            json={"status": "finished"},
+            headers=headers,
+        )
+        response.raise_for_status()
+    await _analyze()
+    _log(f"seeded in {time.perf_counter() - start:.1f}s")
+
+    # A mid-frequency word, so /textsearch has real work but a bounded result.
+    search_term = target_vocabulary[50]
+    return (
+        Dataset(
+            verses=len(locations),
+            upload_version_id=versions["upload"],
+            target_version_id=versions["target"],
+            target_revision_id=revisions["target"],
+            source_revision_id=revisions["source"],
+            baseline_revision_ids=[revisions[f"baseline{i}"] for i in range(baselines)],
+            word_alignment_id=assessments["word-alignment"],
+            tfidf_id=assessments["tfidf"],
+            session_id=SESSION_ID,
+            search_term=search_term,
+            iso=ISO_LANGUAGE,
+            sample_texts=target_texts[:100],
+            upload_text=target_text,
+        ),
+        headers,
+    )
+
+
+async def cleanup() -> None:
+    """Delete everything ``seed`` creates (also what an interrupted run
+    left)."""
+    from sqlalchemy import delete, exists, or_, select
+
+    from database.dependencies import AsyncSessionLocal
+    from database.models import (
+        AlignmentThresholdScores,
+        AlignmentTopSourceScores,
+        Assessment,
+        AssessmentResult,
+        BibleRevision,
+        BibleVersion,
+        BibleVersionAccess,
+        Group,
+        IsoLanguage,
+        IsoScript,
+        LanguageProfile,
+        NgramsTable,
+        NgramVrefTable,
+        TextLengthsTable,
+        TfidfPcaVector,
+        TrainingJob,
+        UserDB,
+        UserGroup,
+        VerseText,
+    )
+
+    version_ids = select(BibleVersion.id).where(
+        BibleVersion.abbreviation.startswith(ABBREVIATION_PREFIX)
+    )
+    revision_ids = select(BibleRevision.id).where(
+        BibleRevision.bible_version_id.in_(version_ids)
+    )
+    assessment_ids = select(Assessment.id).where(
+        or_(
+            Assessment.revision_id.in_(revision_ids),
+            Assessment.reference_id.in_(revision_ids),
+        )
+    )
+    user_ids = select(UserDB.id).where(UserDB.username == USERNAME)
+    group_ids = select(Group.id).where(Group.name == GROUP_NAME)
+    statements = [
+        delete(NgramVrefTable).where(
+            NgramVrefTable.ngram_id.in_(
+                select(NgramsTable.id).where(
+                    NgramsTable.assessment_id.in_(assessment_ids)
+                )
+            )
+        ),
+        *(
+            delete(table).where(table.assessment_id.in_(assessment_ids))
+            for table in (
+                NgramsTable,
+                TfidfPcaVector,
+                AlignmentTopSourceScores,
+                AlignmentThresholdScores,
+                AssessmentResult,
+                TextLengthsTable,
+                TrainingJob,
+            )
+        ),
+        # Rollups and TF-IDF artifacts cascade with their assessment.
+        delete(Assessment).where(Assessment.id.in_(assessment_ids)),
+        delete(VerseText).where(VerseText.revision_id.in_(revision_ids)),
+        delete(BibleRevision).where(BibleRevision.id.in_(revision_ids)),
+        delete(BibleVersionAccess).where(
+            BibleVersionAccess.bible_version_id.in_(version_ids)
+        ),
+        delete(BibleVersion).where(BibleVersion.id.in_(version_ids)),
+        delete(UserGroup).where(
+            or_(UserGroup.user_id.in_(user_ids), UserGroup.group_id.in_(group_ids))
+        ),
+        delete(Group).where(Group.id.in_(group_ids)),
+        delete(UserDB).where(UserDB.id.in_(user_ids)),
+        # Morphemes, tokenizer runs and word indexes cascade with the
+        # profile; verse morpheme indexes with verse_text.
+        delete(LanguageProfile).where(
+            LanguageProfile.iso_639_3 == ISO_LANGUAGE,
+            LanguageProfile.name == PROFILE_NAME,
+        ),
+        delete(IsoLanguage).where(
+            IsoLanguage.iso639 == ISO_LANGUAGE,
+            ~exists().where(BibleVersion.iso_language == ISO_LANGUAGE),
+        ),
+        delete(IsoScript).where(
+            IsoScript.iso15924 == ISO_SCRIPT,
+            ~exists().where(BibleVersion.iso_script == ISO_SCRIPT),
+        ),
+    ]
+    async with AsyncSessionLocal() as db:
+        for statement in statements:
+            await db.execute(statement.execution_options(synchronize_session=False))
+        await db.commit()
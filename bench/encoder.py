@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+"""Memory and latency of the /tfidf_result/by_text* encoder across workers.
+
+Fits the bench dataset's word + char encoder (``dataset._fit_encoder`` on
+target-language verses drawn as ``dataset.seed`` draws them; no database
+needed), then starts ``--workers`` processes, as uvicorn would, that each
+load it and encode ``--texts`` verses one call at a time, ``--repeat``
+times, in two modes:
+
+- ``rehydrate``: every worker rebuilds sklearn vectorizers and the SVD
+  components from the stored artifact values, as the routes did before
+  ``tfidf_encoder``;
+- ``mmap``: ``tfidf_encoder``; the files are written once (timed as
+  ``build_ms``) and every worker maps them.
+
+For each mode it reports the workers' summed PSS growth from loading and
+encoding (PSS charges a page shared by n processes 1/n to each, so the sum
+is what the host actually spends), the median cold load and the median
+encode call. Last, in one process, ``--concurrent`` single-text encode calls
+are issued at once with ``settings.tfidf_encode_batch_ms`` at 0 and at its
+default, and the time until all of them are answered is reported.
+
+Usage:
+
+    python -m bench.encoder [--workers N] [--verses N] [--texts N]
+                            [--repeat N] [--concurrent N] [--output PATH]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from bench.support import git, prepare_standalone_import
+
+
+def _pss_kb() -> int:
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1])
+    return 0
+
+
+def _rehydrate(artifacts: dict):
+    """(word, char, svd) sklearn objects from the push body, as the routes
+    built them before tfidf_encoder."""
+    import base64
+    import io
+
+    import numpy as np
+    from sklearn.decomposition import TruncatedSVD
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    def vectorizer(payload):
+        params = payload["params"]
+        vec = TfidfVectorizer(
+            analyzer=params["analyzer"],
+            ngram_range=tuple(params["ngram_range"]),
+            lowercase=params["lowercase"],
+            max_df=params["max_df"],
+            min_df=params["min_df"],
+            vocabulary=payload["vocabulary"],
+        )
+        vec.idf_ = np.asarray(payload["idf"], dtype=float)
+        return vec
+
+    svd = TruncatedSVD(n_components=artifacts["svd"]["n_components"])
+    svd.components_ = np.load(
+        io.BytesIO(base64.b64decode(artifacts["svd"]["components_b64"])),
+        allow_pickle=False,
+    )
+    return (
+        vectorizer(artifacts["word_vectorizer"]),
+        vectorizer(artifacts["char_vectorizer"]),
+        svd,
+    )
+
+
+def _encode_rehydrated(encoder, texts: List[str]):
+    from scipy.sparse import hstack
+    from sklearn.preprocessing import normalize
+
+    word, char, svd = encoder
+    X = normalize(hstack([word.transform(texts), char.transform(texts)]), norm="l2")
+    return svd.transform(X)
+
+
+def _worker(mode, artifacts_json, encoder_path, texts, repeat, barrier, results):
+    import numpy as np  # noqa: F401 -- imported before the baseline PSS
+    import sklearn.feature_extraction.text  # noqa: F401
+
+    from assessment_routes.v3 import tfidf_encoder
+
+    barrier.wait()
+    before_kb = _pss_kb()
+    start = time.perf_counter()
+    if mode == "rehydrate":
+        # The artifact rows arrive as JSON (JSONB) from the database.
+        encoder = _rehydrate(json.loads(artifacts_json))
+        encode = _encode_rehydrated
+    else:
+        encoder = tfidf_encoder._open(Path(encoder_path))
+        encode = tfidf_encoder.TfidfEncoder.encode
+    load_ms = (time.perf_counter() - start) * 1000
+    samples = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            encode(encoder, [text])
+            samples.append((time.perf_counter() - start) * 1000)
+    # Measure while every worker still holds its encoder.
+    barrier.wait()
+    results.put(
+        {"load_ms": load_ms, "encode_ms": samples, "pss_kb": _pss_kb() - before_kb}
+    )
+    barrier.wait()
+
+
+def _run_workers(mode, artifacts_json, encoder_path, texts, args) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(args.workers)
+    results = ctx.Queue()
+    workers = [
+        ctx.Process(
+            target=_worker,
+            args=(
+                mode,
+                artifacts_json,
+                encoder_path,
+                texts,
+                args.repeat,
+                barrier,
+                results,
+            ),
+        )
+        for _ in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    reports = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    encode_ms = [sample for report in reports for sample in report["encode_ms"]]
+    return {
+        "workers": args.workers,
+        "pss_mb_total": sum(report["pss_kb"] for report in reports) / 1024,
+        "load_ms_median": statistics.median(report["load_ms"] for report in reports),
+        "encode_ms_median": statistics.median(encode_ms),
+        "encode_ms_p95": sorted(encode_ms)[-(-95 * len(encode_ms) // 100) - 1],
+    }
+
+
+async def _concurrent_calls(encoder, texts: List[str]) -> float:
+    from assessment_routes.v3 import tfidf_encoder
+
+    start = time.perf_counter()
+    await asyncio.gather(*(tfidf_encoder.encode(encoder, [text]) for text in texts))
+    return (time.perf_counter() - start) * 1000
+
+
+def _batching(encoder_path, texts: List[str], repeat: int) -> dict:
+    from assessment_routes.v3 import tfidf_encoder
+    from config import settings
+
+    encoder = tfidf_encoder._open(Path(encoder_path))
+    default_ms = settings.tfidf_encode_batch_ms
+    report = {"calls": len(texts)}
+    for label, window in (("unbatched", 0.0), ("batched", default_ms)):
+        settings.tfidf_encode_batch_ms = window
+        samples = [
+            asyncio.run(_concurrent_calls(encoder, texts)) for _ in range(repeat)
+        ]
+        report[f"{label}_ms_median"] = statistics.median(samples)
+    settings.tfidf_encode_batch_ms = default_ms
+    report["batch_ms"] = default_ms
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--verses", type=int, default=None, help="default: every vref slot"
+    )
+    parser.add_argument("--texts", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--concurrent", type=int, default=100)
+    parser.add_argument("--output", type=Path, help="default: stdout")
+    args = parser.parse_args()
+
+    prepare_standalone_import()
+    import base64
+
+    import numpy as np
+
+    from assessment_routes.v3 import tfidf_encoder
+    from bench import dataset
+
+    rng = np.random.default_rng(seed=0)
+    slots, locations = dataset._vrefs(args.verses)
+    vocabulary = dataset._vocabulary(rng, dataset._TARGET_SYLLABLES)
+    verses = [
+        " ".join(tokens)
+        for tokens in dataset._verse_tokens(rng, vocabulary, len(locations))
+    ]
+    print(f"fitting the encoder on {len(verses)} verses", file=sys.stderr)
+    artifacts, _ = dataset._fit_encoder(verses, n_components=300)
+    texts = verses[: args.texts]
+
+    with tempfile.TemporaryDirectory() as encoder_dir:
+        encoder_path = Path(encoder_dir) / "1-bench"
+        vectorizers = {
+            kind: (payload["vocabulary"], payload["idf"], payload["params"])
+            for kind, payload in (
+                ("word", artifacts["word_vectorizer"]),
+                ("char", artifacts["char_vectorizer"]),
+            )
+        }
+        start = time.perf_counter()
+        tfidf_encoder._build(
+            1,
+            encoder_path,
+            vectorizers,
+            base64.b64decode(artifacts["svd"]["components_b64"]),
+        )
+        build_ms = (time.perf_counter() - start) * 1000
+
+        artifacts_json = json.dumps(artifacts)
+        modes = {}
+        for mode in ("rehydrate", "mmap"):
+            print(f"timing {mode} with {args.workers} workers", file=sys.stderr)
+            modes[mode] = _run_workers(
+                mode, artifacts_json, str(encoder_path), texts, args
+            )
+        modes["mmap"]["build_ms"] = build_ms
+        print("timing concurrent calls", file=sys.stderr)
+        batching = _batching(str(encoder_path), verses[: args.concurrent], args.repeat)
+
+    report = {
+        "meta": {
+            "git_commit": git("rev-parse", "HEAD"),
+            "verses": len(verses),
+            "n_features": artifacts["svd"]["n_features"],
+            "texts": len(texts),
+            "repeat": args.repeat,
+        },
+        "modes": modes,
+        "batching": batching,
+    }
+    for mode, r in modes.items():
+        print(
+            f"{mode:>10}: {r['pss_mb_total']:8.1f}MB PSS over {r['workers']} workers"
+            f"  load {r['load_ms_median']:8.1f}ms"
+            f"  encode median {r['encode_ms_median']:6.2f}ms",
+            file=sys.stderr,
+        )
+    print(
+        f"{args.concurrent} concurrent calls: unbatched "
+        f"{batching['unbatched_ms_median']:.1f}ms, batched "
+        f"{batching['batched_ms_median']:.1f}ms",
+        file=sys.stderr,
+    )
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
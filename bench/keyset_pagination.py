@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+"""Compare OFFSET and cursor pagination on the results endpoints.
+
+Seeds one assessment with ``--rows`` alignment top-source scores and ngrams,
+then times the ``/alignmentscores`` and ``/ngrams_result`` handlers fetching
+page 1 and page ``--deep-page`` (``--page-size`` rows each), once with
+``page`` (OFFSET) and once with the equivalent ``cursor``. The handlers are
+called directly, so the timings cover their SQL (including the total-count
+query both modes share) but no HTTP.
+
+Everything runs inside one transaction that is rolled back, so the database
+is left untouched. Note the seeded rows are not committed, so ``ANALYZE``
+can't see them; on a real table the planner has statistics, which only
+favours the index walks further.
+
+Requires a migrated database reachable at ``AQUA_DB``.
+
+Usage:
+
+    python -m bench.keyset_pagination [--rows N] [--page-size N]
+                                      [--deep-page N] [--repeat N]
+"""
+
+import argparse
+import asyncio
+import json
+
+from bench.support import add_revision, median_ms, prepare_standalone_import
+
+
+async def _seed(db, rows: int):
+    from sqlalchemy import insert
+
+    from database.models import (
+        AlignmentTopSourceScores,
+        Assessment,
+        NgramsTable,
+        UserDB,
+    )
+
+    admin = UserDB(
+        username="bench-pagination-admin", hashed_password="!", is_admin=True
+    )
+    db.add(admin)
+    revision_id = await add_revision(db, "BENCH-PAGINATION")
+    assessment = Assessment(
+        revision_id=revision_id,
+        reference_id=revision_id,
+        type="word-alignment",
+        status="finished",
+    )
+    db.add(assessment)
+    await db.flush()
+
+    batch = 2_000  # asyncpg caps a statement at 32767 bind parameters
+    for start in range(0, rows, batch):
+        n = min(batch, rows - start)
+        await db.execute(
+            insert(AlignmentTopSourceScores).values(
+                [
+                    {
+                        "assessment_id": assessment.id,
+                        "score": 0.5,
+                        "source": f"src{start + i}",
+                        "target": f"tgt{start + i}",
+                        "book": "GEN",
+                        "chapter": 1,
+                        "verse": 1,
+                    }
+                    for i in range(n)
+                ]
+            )
+        )
+        await db.execute(
+            insert(NgramsTable).values(
+                [
+                    {
+                        "assessment_id": assessment.id,
+                        "ngram": f"ngram {start + i}",
+                        "ngram_size": 2,
+                    }
+                    for i in range(n)
+                ]
+            )
+        )
+    return admin, assessment.id
+
+
+async def _cursor_before(db, model, assessment_id: int, skip: int) -> str:
+    """Cursor a client would hold after reading the first ``skip`` rows."""
+    from sqlalchemy import select
+
+    from utils.pagination import encode_cursor
+
+    last_id = await db.scalar(
+        select(model.id)
+        .where(model.assessment_id == assessment_id)
+        .order_by(model.id)
+        .offset(skip - 1)
+        .limit(1)
+    )
+    return encode_cursor(last_id)
+
+
+async def _bench(args) -> dict:
+    from assessment_routes.v3.results_query_routes import (
+        AlignmentScoreType,
+        get_alignment_scores,
+        get_ngrams_result,
+    )
+    from database.dependencies import AsyncSessionLocal
+    from database.models import AlignmentTopSourceScores, NgramsTable
+
+    size = args.page_size
+    skip = (args.deep_page - 1) * size
+
+    endpoints = {
+        "alignmentscores": (
+            AlignmentTopSourceScores,
+            lambda db, user, aid, **kw: get_alignment_scores(
+                assessment_id=aid,
+                book=None,
+                chapter=None,
+                verse=None,
+                score_type=AlignmentScoreType.top,
+                db=db,
+                current_user=user,
+                **kw,
+            ),
+        ),
+        "ngrams_result": (
+            NgramsTable,
+            lambda db, user, aid, **kw: get_ngrams_result(
+                assessment_id=aid, db=db, current_user=user, **kw
+            ),
+        ),
+    }
+
+    results = {}
+    async with AsyncSessionLocal() as db:
+        try:
+            user, assessment_id = await _seed(db, args.rows)
+            for name, (model, handler) in endpoints.items():
+                cursor = await _cursor_before(db, model, assessment_id, skip)
+
+                def run(**kw):
+                    return handler(db, user, assessment_id, page_size=size, **kw)
+
+                calls = {
+                    "offset_page_1_ms": lambda: run(page=1, cursor=None),
+                    f"offset_page_{args.deep_page}_ms": lambda: run(
+                        page=args.deep_page, cursor=None
+                    ),
+                    f"cursor_page_{args.deep_page}_ms": lambda: run(
+                        page=None, cursor=cursor
+                    ),
+                }
+                results[name] = {
+                    label: (await median_ms(call, args.repeat))[0]
+                    for label, call in calls.items()
+                }
+        finally:
+            await db.rollback()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=60_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--deep-page", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    if (args.deep_page - 1) * args.page_size >= args.rows:
+        parser.error("--rows must exceed (--deep-page - 1) * --page-size")
+
+    prepare_standalone_import()
+    results = asyncio.run(_bench(args))
+
+    for name, r in results.items():
+        print(f"{name:>16}: " + ", ".join(f"{k} {v:.1f}" for k, v in r.items()))
+    print(json.dumps({"rows": args.rows, "page_size": args.page_size, **results}))
+
+
+if __name__ == "__main__":
+    main()
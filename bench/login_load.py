@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""Measure ``GET /version`` latency while ``/token`` logins run concurrently.
+
+bcrypt verification takes ~250ms per login. Run inline on the event loop, it
+stalls every other request a worker is serving; run on the password pool in
+``security_routes.utilities`` it only occupies a thread. This drives both kinds
+of traffic at one app instance and reports the ``/version`` latency
+percentiles with and without the login load, so the two can be compared
+(e.g. before/after a change, by running it on each checkout).
+
+By default the app is served in-process through httpx's ASGI transport — one
+event loop, i.e. exactly one uvicorn worker. Pass ``--base-url`` to target a
+running server instead.
+
+Requires a migrated database seeded with the test users (``make project-up``
+or ``python test/conftest.py``) reachable at ``AQUA_DB``.
+
+Usage:
+
+    python -m bench.login_load [--logins N] [--login-concurrency C]
+                               [--reads N] [--base-url URL]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from bench.support import prepare_standalone_import
+
+USERNAME = "testuser1"
+PASSWORD = "password1"
+
+
+def _percentiles(samples_ms: list) -> dict:
+    ordered = sorted(samples_ms)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    return {
+        "n": len(ordered),
+        "p50_ms": pct(50),
+        "p90_ms": pct(90),
+        "p99_ms": pct(99),
+        "max_ms": ordered[-1],
+        "mean_ms": statistics.fmean(ordered),
+    }
+
+
+async def _login(client) -> str:
+    response = await client.post(
+        "/latest/token", data={"username": USERNAME, "password": PASSWORD}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def _timed_reads(client, token: str, count: int, interval_s: float) -> list:
+    """Issue ``count`` sequential ``/version`` GETs, ``interval_s`` apart."""
+    headers = {"Authorization": f"Bearer {token}"}
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.get("/latest/version", headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        await asyncio.sleep(interval_s)
+    return samples
+
+
+async def _login_load(client, total: int, concurrency: int) -> float:
+    """Run ``total`` logins, ``concurrency`` at a time; returns elapsed seconds.
+
+    Each attempt uses a distinct (wrong) password so identical attempts can't
+    coalesce and every request pays for its own bcrypt call.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            await client.post(
+                "/latest/token",
+                data={"username": USERNAME, "password": f"wrong-{i}"},
+            )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return time.perf_counter() - start
+
+
+async def _run(args) -> dict:
+    import httpx
+
+    if args.base_url:
+        transport = None
+        base_url = args.base_url
+    else:
+        from app import app
+
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url=base_url, timeout=120
+    ) as client:
+        token = await _login(client)
+        # Warm up connections / caches so the baseline isn't a cold start.
+        await _timed_reads(client, token, 5, 0)
+
+        idle = await _timed_reads(client, token, args.reads, args.interval_s)
+
+        reads_task = asyncio.create_task(
+            _timed_reads(client, token, args.reads, args.interval_s)
+        )
+        login_s = await _login_load(client, args.logins, args.login_concurrency)
+        under_load = await reads_task
+
+    return {
+        "logins": args.logins,
+        "login_concurrency": args.login_concurrency,
+        "login_seconds": login_s,
+        "version_get_idle": _percentiles(idle),
+        "version_get_under_login_load": _percentiles(under_load),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--login-concurrency", type=int, default=8)
+    parser.add_argument("--reads", type=int, default=100)
+    parser.add_argument("--interval-s", type=float, default=0.02)
+    parser.add_argument("--base-url", default=None)
+    args = parser.parse_args()
+
+    prepare_standalone_import(pooled=True)
+    results = asyncio.run(_run(args))
+
+    for label in ("version_get_idle", "version_get_under_login_load"):
+        r = results[label]
+        print(
+            f"{label:>30}: p50 {r['p50_ms']:.1f}ms  p99 {r['p99_ms']:.1f}ms  "
+            f"max {r['max_ms']:.1f}ms  (n={r['n']})"
+        )
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
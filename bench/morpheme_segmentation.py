@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""Time morpheme segmentation of a full-Bible revision, and the event-loop
+stall it causes.
+
+Builds the bench suite's synthetic target text (``bench/dataset.py``: one
+Zipf-distributed verse per vref slot, ~1M tokens over an 8k-word
+vocabulary) and its morpheme inventory (~1k morphemes), then segments every
+token the way /tokenizer/index does, four ways:
+
+- ``inline``: ``viterbi_segment`` per token inside the coroutine (the old
+  handler's segmentation step);
+- ``thread``: ``morpheme_segmentation.segment`` with no process pool, memo
+  empty;
+- ``pool``: the same with ``--workers`` processes, memo empty (the pool is
+  started beforehand; that is paid once per worker);
+- ``memo``: the same again with the memo filled by the previous run.
+
+For each, the wall time and the longest a 1ms ticker task on the same loop
+was kept waiting — how long every other request on the worker would stall.
+No database is needed.
+
+Usage:
+
+    python -m bench.morpheme_segmentation [--verses N] [--workers N]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import unicodedata
+
+from bench.support import prepare_standalone_import
+
+
+def _corpus(verses: int):
+    """The bench target's tokens (lowered, as the indexer segments them) and
+    the normalized morpheme inventory."""
+    import numpy as np
+
+    from bench import dataset
+    from utils.morpheme_tokenizer import strip_punct
+
+    rng = np.random.default_rng(seed=0)
+    vocabulary = dataset._vocabulary(rng, dataset._TARGET_SYLLABLES)
+    tokens = dataset._verse_tokens(rng, vocabulary, verses)
+    words = [
+        unicodedata.normalize("NFC", strip_punct(token)).casefold()
+        for verse in tokens
+        for token in verse
+    ]
+    morphemes = [
+        unicodedata.normalize("NFC", m["morpheme"]).casefold()
+        for m in dataset._morphemes(
+            np.random.default_rng(seed=1), dataset._TARGET_SYLLABLES
+        )
+    ]
+    return words, morphemes
+
+
+async def _timed(segment) -> dict:
+    """Run ``segment()`` with a 1ms ticker on the loop; wall time and the
+    ticker's longest wait, in ms."""
+    lags = [0.0]
+
+    async def tick():
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await segment()
+    wall = time.perf_counter() - start
+    # Let a tick held up by the last stretch of work report its wait.
+    await asyncio.sleep(0.002)
+    ticker.cancel()
+    return {"wall_ms": wall * 1000, "max_loop_stall_ms": max(lags) * 1000}
+
+
+async def _bench(args) -> dict:
+    from agent_routes.v3 import morpheme_segmentation
+    from config import settings
+    from utils.morpheme_tokenizer import viterbi_segment
+
+    words, morphemes = _corpus(args.verses)
+    inventory = morpheme_segmentation.inventory("zxx", morphemes)
+    print(
+        f"{len(words)} tokens, {len(set(words))} distinct, "
+        f"{len(inventory.morphemes)} morphemes",
+        file=sys.stderr,
+    )
+
+    max_morph_len = max(len(m) for m in inventory.morphemes)
+
+    async def inline():
+        for word in words:
+            viterbi_segment(word, inventory.morphemes, max_morph_len)
+
+    async def engine():
+        await morpheme_segmentation.segment(inventory, words)
+
+    results = {"inline": await _timed(inline)}
+
+    settings.morpheme_segment_workers = 0
+    morpheme_segmentation.clear()
+    results["thread"] = await _timed(engine)
+
+    settings.morpheme_segment_workers = args.workers
+    morpheme_segmentation.clear()
+    # Start the pool processes outside the timing.
+    pool = morpheme_segmentation._pool()
+    await asyncio.gather(
+        *(
+            asyncio.get_running_loop().run_in_executor(pool, len, "")
+            for _ in range(args.workers)
+        )
+    )
+    results["pool"] = await _timed(engine)
+    results["memo"] = await _timed(engine)
+    pool.shutdown()
+    return {
+        "tokens": len(words),
+        "distinct_words": len(set(words)),
+        "morphemes": len(inventory.morphemes),
+        **results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--verses", type=int, default=41_899)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    prepare_standalone_import()
+    results = asyncio.run(_bench(args))
+
+    for mode in ("inline", "thread", "pool", "memo"):
+        r = results[mode]
+        print(
+            f"{mode:>6}: {r['wall_ms']:9.1f}ms, "
+            f"loop stalled up to {r['max_loop_stall_ms']:9.1f}ms"
+        )
+    print(json.dumps({"workers": args.workers, **results}))
+
+
+if __name__ == "__main__":
+    main()
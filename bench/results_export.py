@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+"""Compare peak memory of ``/alignmentscores`` and ``/alignmentscores/export``.
+
+Seeds one assessment with ``--rows`` alignment top-source scores, then drives
+the app's ASGI interface directly (no server, no HTTP client buffering the
+body) for the unpaginated JSON route and for the NDJSON and CSV exports. The
+response body is counted and discarded as it arrives, so the reported peak
+is what the worker itself allocates (traced with ``tracemalloc``, which also
+slows everything down; the times are only comparable with each other).
+
+The export reads through its own session, so the seed is committed; it is
+deleted again afterwards (and at start, in case a run was interrupted). Auth
+is bypassed with a dependency override.
+
+Requires a migrated database reachable at ``AQUA_DB``.
+
+Usage:
+
+    python -m bench.results_export [--rows N] [--batch-size N]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from bench.support import add_revision, prepare_standalone_import, remove_versions
+
+USERNAME = "bench-export-admin"
+ABBREVIATION = "BENCH-EXPORT"
+
+
+async def _seed(rows: int):
+    from sqlalchemy import insert
+
+    from database.dependencies import AsyncSessionLocal
+    from database.models import AlignmentTopSourceScores, Assessment, UserDB
+
+    async with AsyncSessionLocal() as db:
+        admin = UserDB(username=USERNAME, hashed_password="!", is_admin=True)
+        db.add(admin)
+        revision_id = await add_revision(db, ABBREVIATION)
+        assessment = Assessment(
+            revision_id=revision_id,
+            reference_id=revision_id,
+            type="word-alignment",
+            status="finished",
+        )
+        db.add(assessment)
+        await db.flush()
+
+        batch = 2_000  # asyncpg caps a statement at 32767 bind parameters
+        for start in range(0, rows, batch):
+            await db.execute(
+                insert(AlignmentTopSourceScores).values(
+                    [
+                        {
+                            "assessment_id": assessment.id,
+                            "score": 0.5,
+                            "source": f"source word {start + i}",
+                            "target": f"target word {start + i}",
+                            "book": "GEN",
+                            "chapter": 1,
+                            "verse": 1,
+                        }
+                        for i in range(min(batch, rows - start))
+                    ]
+                )
+            )
+        await db.commit()
+        return admin, assessment.id
+
+
+async def _cleanup() -> None:
+    """Delete everything ``_seed`` creates (also what an interrupted run left)."""
+    from database.models import AlignmentTopSourceScores
+
+    await remove_versions(
+        ABBREVIATION, [AlignmentTopSourceScores], usernames=[USERNAME]
+    )
+
+
+async def _request(app, path: str, query: str) -> dict:
+    """GET ``path`` through the ASGI app; returns status, bytes, peak, time."""
+    received = {"status": None, "bytes": 0}
+
+    request_sent = False
+
+    async def receive():
+        # After the (empty) body, block like a client that stays connected;
+        # StreamingResponse polls receive() for a disconnect while sending.
+        nonlocal request_sent
+        if request_sent:
+            await asyncio.Event().wait()
+        request_sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            received["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            received["bytes"] += len(message.get("body", b""))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("bench", 80),
+        "client": ("127.0.0.1", 50000),
+        "root_path": "",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": [],
+    }
+    tracemalloc.start()
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert received["status"] == 200, received
+    return {
+        "bytes": received["bytes"],
+        "peak_mib": peak / 2**20,
+        "seconds": elapsed,
+    }
+
+
+async def _bench(args) -> dict:
+    from app import app
+    from config import settings
+    from security_routes.auth_routes import get_current_user
+
+    settings.results_export_batch_size = args.batch_size
+    await _cleanup()
+    admin, assessment_id = await _seed(args.rows)
+    app.dependency_overrides[get_current_user] = lambda: admin
+    query = f"assessment_id={assessment_id}"
+    try:
+        return {
+            "alignmentscores_json": await _request(app, "/v3/alignmentscores", query),
+            "export_ndjson": await _request(
+                app, "/v3/alignmentscores/export", query + "&format=ndjson"
+            ),
+            "export_csv": await _request(
+                app, "/v3/alignmentscores/export", query + "&format=csv"
+            ),
+        }
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+        await _cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    prepare_standalone_import()
+    results = asyncio.run(_bench(args))
+
+    for name, r in results.items():
+        print(
+            f"{name:>20}: peak {r['peak_mib']:.1f}MiB, {r['bytes'] / 2**20:.1f}MiB "
+            f"sent in {r['seconds']:.1f}s"
+        )
+    print(json.dumps({"rows": args.rows, "batch_size": args.batch_size, **results}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+#!/usr/bin/env python
+"""Time the API's hot paths against a seeded full-Bible dataset.
+
+Seeds the dataset described in ``bench/dataset.py`` (committed, removed
+again at the end and before the next run), then calls each case in
+``CASES`` through the ASGI app with httpx — the full request path
+(routing, auth, validation, handler, serialization) without a network hop —
+``--warmup`` times untimed and ``--repeat`` times timed. The per-case
+latency distribution goes to ``--output`` (default stdout) as JSON that
+``python -m bench.compare`` can diff between runs; a summary table goes to
+stderr.
+
+Requires a migrated database reachable at ``AQUA_DB`` with the verse
+reference tables loaded (``make localdb-up`` provides both).
+
+Usage:
+
+    python -m bench.run [--verses N] [--baselines N] [--repeat N]
+                        [--warmup N] [--cases NAME ...] [--output PATH]
+    python -m bench.run --list
+"""
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import functools
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from bench.support import git, prepare_standalone_import
+
+
+class Case(NamedTuple):
+    description: str
+    # (dataset, iteration) -> keyword arguments for httpx's client.request
+    request: Callable[..., dict]
+    # Same signature: an untimed request sent before each call of ``request``.
+    setup: Optional[Callable[..., dict]] = None
+    # ``config.settings`` overrides in effect while the case runs.
+    settings: Optional[dict] = None
+
+
+def _result(aggregate: str) -> Case:
+    return Case(
+        f"GET /v3/result, word-alignment verse scores by {aggregate}",
+        lambda d, i: {
+            "method": "GET",
+            "url": "/v3/result",
+            "params": {"assessment_id": d.word_alignment_id, "aggregate": aggregate},
+        },
+    )
+
+
+def _new_target_roots(iteration: int) -> List[dict]:
+    """Twenty four-syllable roots of the target language, different for each
+    of the first hundred iterations; the seeded run has none that long."""
+    from bench.dataset import _TARGET_SYLLABLES as syllables
+
+    prefix = syllables[iteration % 10] + syllables[iteration // 10 % 10]
+    return [
+        {
+            "morpheme": prefix + syllables[j % 10] + syllables[j // 10],
+            "morpheme_class": "LEXICAL",
+        }
+        for j in range(20)
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _query_vectors(count: int) -> List[List[float]]:
+    """``count`` fixed random 300-dim vectors, as a predict batch sends."""
+    import numpy as np
+
+    return np.random.default_rng(seed=1).standard_normal((count, 300)).tolist()
+
+
+def _tfidf_by_vectors(description: str, settings: Optional[dict] = None) -> Case:
+    return Case(
+        description,
+        lambda d, i: {
+            "method": "POST",
+            "url": "/v3/tfidf_result/by_vectors",
+            "json": {"assessment_id": d.tfidf_id, "vectors": _query_vectors(40)},
+        },
+        settings=settings,
+    )
+
+
+def _compare_params(d) -> dict:
+    return {
+        "revision_id": d.target_revision_id,
+        "reference_id": d.source_revision_id,
+        "baseline_ids": d.baseline_revision_ids,
+    }
+
+
+CASES: Dict[str, Case] = {
+    "result_chapter": _result("chapter"),
+    "result_book": _result("book"),
+    "result_text": _result("text"),
+    "compareresults": Case(
+        "GET /v3/compareresults, verse level against every baseline",
+        lambda d, i: {
+            "method": "GET",
+            "url": "/v3/compareresults",
+            "params": _compare_params(d),
+        },
+    ),
+    "compareresults_uncached": Case(
+        "GET /v3/compareresults, baseline statistics cache off",
+        lambda d, i: {
+            "method": "GET",
+            "url": "/v3/compareresults",
+            "params": _compare_params(d),
+        },
+        settings={"compare_baseline_cache_mb": 0},
+    ),
+    "missingwords": Case(
+        "GET /v3/missingwords, verse level against every baseline",
+        lambda d, i: {
+            "method": "GET",
+            "url": "/v3/missingwords",
+            "params": _compare_params(d),
+        },
+    ),
+    "textsearch": Case(
+        "GET /v3/textsearch for a mid-frequency word, with alignments",
+        lambda d, i: {
+            "method": "GET",
+            "url": "/v3/textsearch",
+            "params": {
+                "term": d.search_term,
+                "revision_id": d.target_revision_id,
+                "comparison_revision_id": d.source_revision_id,
+                "include_alignments": True,
+                "limit": 100,
+            },
+        },
+    ),
+    "textsearch_version": Case(
+        "GET /v3/textsearch by version_id for a mid-frequency word",
+        lambda d, i: {
+            "method": "GET",
+            "url": "/v3/textsearch",
+            "params": {
+                "term": d.search_term,
+                "version_id": d.target_version_id,
+                "limit": 100,
+            },
+        },
+    ),
+    "tfidf_by_texts": Case(
+        "POST /v3/tfidf_result/by_texts, 100 texts, top 10 each",
+        lambda d, i: {
+            "method": "POST",
+            "url": "/v3/tfidf_result/by_texts",
+            "json": {"assessment_id": d.tfidf_id, "texts": d.sample_texts},
+        },
+    ),
+    "tfidf_by_vectors": _tfidf_by_vectors(
+        "POST /v3/tfidf_result/by_vectors, 40 vectors, in-memory corpus"
+    ),
+    # Unfinished assessments, or a worker over its corpus cache budget.
+    "tfidf_by_vectors_sql": _tfidf_by_vectors(
+        "POST /v3/tfidf_result/by_vectors, 40 vectors, ranked in SQL",
+        settings={"tfidf_corpus_cache_mb": 0},
+    ),
+    "texts": Case(
+        "GET /v3/texts, target and source, every verse",
+        lambda d, i: {
+            "method": "GET",
+            "url": "/v3/texts",
+            "params": {
+                "revision_ids": [d.target_revision_id, d.source_revision_id],
+            },
+        },
+    ),
+    "train_session_results": Case(
+        "GET /v3/train/status/{session_id}/results, first page of 100 vrefs",
+        lambda d, i: {
+            "method": "GET",
+            "url": f"/v3/train/status/{d.session_id}/results",
+            "params": {"page": 1, "page_size": 100},
+        },
+    ),
+    "tokenizer_index": Case(
+        "POST /v3/tokenizer/index, every verse of the target",
+        lambda d, i: {
+            "method": "POST",
+            "url": "/v3/tokenizer/index",
+            "json": {
+                "iso_639_3": d.iso,
+                "revision_id": d.target_revision_id,
+                "full_rebuild": True,
+            },
+        },
+    ),
+    # The first call (a warmup) builds the index in full if tokenizer_index
+    # didn't run before it.
+    "tokenizer_index_incremental": Case(
+        "POST /v3/tokenizer/index after a run adding 20 roots",
+        lambda d, i: {
+            "method": "POST",
+            "url": "/v3/tokenizer/index",
+            "json": {"iso_639_3": d.iso, "revision_id": d.target_revision_id},
+        },
+        setup=lambda d, i: {
+            "method": "POST",
+            "url": "/v3/tokenizer/runs",
+            "json": {
+                "iso_639_3": d.iso,
+                "revision_id": d.target_revision_id,
+                "morphemes": _new_target_roots(i),
+            },
+        },
+    ),
+    "tokenizer_word_index": Case(
+        "POST /v3/tokenizer/word-index, every distinct word of the target",
+        lambda d, i: {
+            "method": "POST",
+            "url": "/v3/tokenizer/word-index",
+            "json": {"iso_639_3": d.iso, "revision_id": d.target_revision_id},
+        },
+    ),
+    # Last: every call adds a revision, which the other cases don't see
+    # (it belongs to its own version) but which grows verse_text.
+    "revision_upload": Case(
+        "POST /v3/revision, a full-Bible upload",
+        lambda d, i: {
+            "method": "POST",
+            "url": "/v3/revision",
+            "params": {"version_id": d.upload_version_id, "name": f"upload{i}"},
+            "files": {"file": ("upload.txt", d.upload_text, "text/plain")},
+        },
+    ),
+}
+
+
+@contextlib.contextmanager
+def _overridden_settings(overrides: Optional[dict]):
+    from config import settings
+
+    saved = {key: getattr(settings, key) for key in overrides or {}}
+    try:
+        for key, value in (overrides or {}).items():
+            setattr(settings, key, value)
+        yield
+    finally:
+        for key, value in saved.items():
+            setattr(settings, key, value)
+
+
+def _summarize(samples: List[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "min_ms": ordered[0],
+        "median_ms": statistics.median(ordered),
+        # Nearest-rank percentile; with few samples this is the max.
+        "p95_ms": ordered[max(0, -(-95 * len(ordered) // 100) - 1)],
+        "max_ms": ordered[-1],
+        "mean_ms": statistics.mean(ordered),
+        "samples_ms": samples,
+    }
+
+
+async def _time_case(client, headers, data, case: Case, warmup: int, repeat: int):
+    samples, response = [], None
+    for i in range(warmup + repeat):
+        if case.setup is not None:
+            setup = case.setup(data, i)
+            setup_response = await client.request(**setup, headers=headers)
+            if setup_response.status_code != 200:
+                raise RuntimeError(
+                    f"{setup['method']} {setup['url']} returned "
+                    f"{setup_response.status_code}: {setup_response.text[:500]}"
+                )
+        request = case.request(data, i)
+        start = time.perf_counter()
+        response = await client.request(**request, headers=headers)
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"{request['method']} {request['url']} returned "
+                f"{response.status_code}: {response.text[:500]}"
+            )
+        if i >= warmup:
+            samples.append(elapsed)
+    return {
+        "description": case.description,
+        **_summarize(samples),
+        "status": response.status_code,
+        "bytes": len(response.content),
+    }
+
+
+async def _bench(args) -> dict:
+    import httpx
+
+    from app import app
+    from bench import dataset
+
+    # The handlers log every request, and python-multipart warns about the
+    # trailing CRLF httpx writes after each upload; keep stderr for progress.
+    logging.disable(logging.WARNING)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        start = time.perf_counter()
+        try:
+            data, headers = await dataset.seed(
+                client, args.verses, args.baselines, args.words_per_verse
+            )
+            seed_s = time.perf_counter() - start
+            results = {}
+            for name in args.cases:
+                print(f"timing {name}", file=sys.stderr, flush=True)
+                with _overridden_settings(CASES[name].settings):
+                    results[name] = await _time_case(
+                        client, headers, data, CASES[name], args.warmup, args.repeat
+                    )
+        finally:
+            await dataset.cleanup()
+
+    return {
+        "meta": {
+            "git_commit": git("rev-parse", "HEAD"),
+            "git_dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "verses": data.verses,
+            "baselines": args.baselines,
+            "words_per_verse": args.words_per_verse,
+            "warmup": args.warmup,
+            "repeat": args.repeat,
+            "seed_s": seed_s,
+        },
+        "cases": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--verses", type=int, default=None, help="default: every vref slot"
+    )
+    parser.add_argument("--baselines", type=int, default=5)
+    parser.add_argument("--words-per-verse", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--output", type=Path, help="default: stdout")
+    parser.add_argument("--list", action="store_true", help="list the cases")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, case in CASES.items():
+            print(f"{name:>22}  {case.description}")
+        return
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    prepare_standalone_import()
+    report = asyncio.run(_bench(args))
+
+    for name, r in report["cases"].items():
+        print(
+            f"{name:>22}: median {r['median_ms']:8.1f}ms  p95 {r['p95_ms']:8.1f}ms"
+            f"  {r['bytes']:>10} bytes",
+            file=sys.stderr,
+        )
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+"""Compare literal and bound query vectors for SQL TF-IDF ranking, with plans.
+
+Seeds ``--assessments`` tfidf assessments with ``--corpus`` random 300-dim
+vectors each (the ivfflat index spans every assessment's rows), runs
+``ANALYZE``, then ranks ``--queries`` random query vectors against the first
+assessment three ways:
+
+- ``literal``: the previous form — the vector rendered as ``'[...]'::vector``
+  text into ``inner_product(...)`` (a new statement per vector);
+- ``bound``: ``tfidf_similarity_ordering`` with ``TFIDF_IVFFLAT_PROBES=0``
+  (binary parameter, exact ranking);
+- ``ivfflat``: the same with ``TFIDF_IVFFLAT_PROBES=--probes``, so the planner
+  may use ``tfidf_pca_vector_ivfflat_idx``; recall is against ``bound``.
+
+Prints each mode's ``EXPLAIN ANALYZE`` plan (vector literals elided) and the
+median latency. Random vectors don't cluster, so the recall reported here is a
+worst case for ivfflat. The seed is committed so ANALYZE and the planner see
+it; it is deleted again afterwards (and at start, in case a run was
+interrupted).
+
+Requires a migrated database reachable at ``AQUA_DB`` with the verse
+reference tables loaded.
+
+Usage:
+
+    python -m bench.tfidf_vector_binding [--assessments N] [--corpus N]
+                                         [--queries N] [--limit K]
+                                         [--probes N]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import time
+
+from bench.support import add_revision, prepare_standalone_import, remove_versions
+
+ABBREVIATION = "BENCH-TFIDF-BIND"
+
+
+async def _seed(assessments: int, corpus: int) -> list:
+    import numpy as np
+    from sqlalchemy import insert, select, text
+
+    from database.dependencies import AsyncSessionLocal
+    from database.models import Assessment, TfidfPcaVector, VerseReference
+
+    rng = np.random.default_rng(seed=0)
+    async with AsyncSessionLocal() as db:
+        vrefs = (
+            await db.scalars(
+                select(VerseReference.full_verse_id)
+                .order_by(VerseReference.full_verse_id)
+                .limit(corpus)
+            )
+        ).all()
+        if not vrefs:
+            raise SystemExit("verse_reference is empty; load the reference data")
+        revision_id = await add_revision(db, ABBREVIATION)
+
+        assessment_ids = []
+        for _ in range(assessments):
+            assessment = Assessment(
+                revision_id=revision_id,
+                reference_id=revision_id,
+                type="tfidf",
+                status="finished",
+            )
+            db.add(assessment)
+            await db.flush()
+            assessment_ids.append(assessment.id)
+            batch = 2_000
+            for start in range(0, corpus, batch):
+                n = min(batch, corpus - start)
+                vectors = rng.standard_normal((n, 300)).astype(np.float32)
+                await db.execute(
+                    insert(TfidfPcaVector).values(
+                        [
+                            {
+                                "assessment_id": assessment.id,
+                                "vref": vrefs[(start + i) % len(vrefs)],
+                                "vector": vectors[i],
+                            }
+                            for i in range(n)
+                        ]
+                    )
+                )
+        await db.commit()
+        # An ivfflat index built before the rows existed has meaningless
+        # centroids; rebuild it so the plan and recall reflect a real one.
+        await db.execute(text("REINDEX INDEX tfidf_pca_vector_ivfflat_idx"))
+        await db.execute(text("ANALYZE tfidf_pca_vector"))
+        await db.commit()
+        return assessment_ids
+
+
+async def _cleanup() -> None:
+    """Delete everything ``_seed`` creates (also what an interrupted run left)."""
+    from database.models import TfidfPcaVector
+
+    await remove_versions(ABBREVIATION, [TfidfPcaVector])
+
+
+def _literal_query(assessment_id: int, query_vector, limit: int):
+    """The ranking query as it was written before vectors were bound."""
+    from sqlalchemy import Float, cast, select, text
+
+    from database.models import TfidfPcaVector
+
+    literal = f"'[{','.join(f'{x:.6f}' for x in query_vector)}]'::vector"
+    similarity = cast(
+        text(f"inner_product(tfidf_pca_vector.vector, {literal})"), Float
+    ).label("cosine_similarity")
+    return (
+        select(TfidfPcaVector.id, similarity)
+        .where(TfidfPcaVector.assessment_id == assessment_id)
+        .order_by(similarity.desc())
+        .limit(limit)
+    )
+
+
+async def _bound_query(db, assessment_id: int, query_vector, limit: int):
+    from sqlalchemy import select
+
+    from assessment_routes.v3.results_query_routes import tfidf_similarity_ordering
+    from database.models import TfidfPcaVector
+
+    similarity, order_by = await tfidf_similarity_ordering(db, query_vector)
+    return (
+        select(TfidfPcaVector.id, similarity)
+        .where(TfidfPcaVector.assessment_id == assessment_id)
+        .order_by(order_by)
+        .limit(limit)
+    )
+
+
+async def _explain(db, query) -> str:
+    from sqlalchemy.ext.compiler import compiles
+    from sqlalchemy.sql.expression import ClauseElement, Executable
+
+    class ExplainAnalyze(Executable, ClauseElement):
+        inherit_cache = False
+
+        def __init__(self, statement):
+            self.statement = statement
+
+    @compiles(ExplainAnalyze)
+    def _compile(element, compiler, **kw):
+        return "EXPLAIN ANALYZE " + compiler.process(element.statement, **kw)
+
+    plan = await db.execute(ExplainAnalyze(query))
+    # Elide the 300 numbers of each vector literal in the printed plan.
+    return re.sub(r"'\[[^\]]*\]'", "'[...]'", "\n".join(row[0] for row in plan))
+
+
+async def _bench(args) -> dict:
+    import numpy as np
+
+    from config import settings
+    from database.dependencies import AsyncSessionLocal
+
+    await _cleanup()
+    assessment_ids = await _seed(args.assessments, args.corpus)
+    assessment_id = assessment_ids[0]
+    rng = np.random.default_rng(seed=1)
+    queries = rng.standard_normal((args.queries, 300)).astype(np.float32)
+
+    modes = {"literal": 0, "bound": 0, "ivfflat": args.probes}
+    results, plans, ids = {}, {}, {}
+    try:
+        for mode, probes in modes.items():
+            settings.tfidf_ivfflat_probes = probes
+            # A fresh session (and transaction) per mode: set_config(...,
+            # true) is transaction-local.
+            async with AsyncSessionLocal() as db:
+
+                async def build(vector):
+                    if mode == "literal":
+                        return _literal_query(assessment_id, vector, args.limit)
+                    return await _bound_query(db, assessment_id, vector, args.limit)
+
+                plans[mode] = await _explain(db, await build(queries[0]))
+                samples, ids[mode] = [], []
+                for vector in queries:
+                    start = time.perf_counter()
+                    rows = (await db.execute(await build(vector))).all()
+                    samples.append((time.perf_counter() - start) * 1000)
+                    ids[mode].append({row.id for row in rows})
+                results[mode] = {"median_ms": statistics.median(samples)}
+    finally:
+        settings.tfidf_ivfflat_probes = 0
+        await _cleanup()
+
+    for mode in results:
+        results[mode]["recall"] = statistics.mean(
+            len(got & exact) / args.limit for got, exact in zip(ids[mode], ids["bound"])
+        )
+    return results, plans
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--assessments", type=int, default=4)
+    parser.add_argument("--corpus", type=int, default=31_000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--probes", type=int, default=10)
+    args = parser.parse_args()
+
+    prepare_standalone_import()
+    results, plans = asyncio.run(_bench(args))
+
+    for mode, plan in plans.items():
+        print(f"--- {mode}\n{plan}\n")
+    for mode, r in results.items():
+        print(f"{mode:>8}: median {r['median_ms']:.1f}ms, recall {r['recall']:.2f}")
+    print(
+        json.dumps(
+            {
+                "assessments": args.assessments,
+                "corpus": args.corpus,
+                "limit": args.limit,
+                "probes": args.probes,
+                **results,
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
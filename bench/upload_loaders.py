@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""Compare the two revision-upload loaders in ``bible_loading``.
+
+Loads one vref-aligned upload into ``verse_text`` with each loader:
+
+- ``executemany``: ``async_text_dataframe`` + ``text_loading`` (per-row dicts,
+  5000-row ``INSERT`` batches);
+- ``copy``: ``copy_verse_rows`` (row tuples streamed over the COPY protocol).
+
+Each run happens inside a transaction that is rolled back, so the database is
+left untouched. Wall time is measured on untraced runs; peak Python heap
+(``tracemalloc``) is measured on one separate traced run per loader, because
+tracing slows the loaders down and would skew the timings.
+
+Requires a migrated database (``make localdb-up`` plus the
+``verse_reference`` rows ``test/conftest.py`` loads) reachable at ``AQUA_DB``.
+
+Usage:
+
+    python -m bench.upload_loaders [--fixture PATH] [--repeat N]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from bench.support import REPO_ROOT, add_revision, prepare_standalone_import
+
+# The largest vref-aligned upload in fixtures/ (2150 verses); pass a full
+# Bible with --fixture for production-sized numbers.
+DEFAULT_FIXTURE = REPO_ROOT / "fixtures" / "ngq-ngq.txt"
+
+
+def _parse_upload(path: Path) -> list:
+    """Split an upload exactly as ``process_and_upload_revision`` does."""
+    text_content = path.read_bytes().decode("utf-8")
+    return [
+        line.replace("\n", "") if line.strip() else None
+        for line in text_content.splitlines()
+    ]
+
+
+async def _run_once(session_factory, loader, verses, traced: bool) -> dict:
+    from bible_loading import async_text_dataframe, copy_verse_rows, text_loading
+
+    async with session_factory() as db:
+        revision_id = await add_revision(db, "BENCH-UPLOAD", "upload")
+
+        if traced:
+            tracemalloc.start()
+        start = time.perf_counter()
+        if loader == "copy":
+            await copy_verse_rows(verses, revision_id, db)
+        else:
+            records = await async_text_dataframe(verses, revision_id)
+            await text_loading(records, db)
+        elapsed = time.perf_counter() - start
+        peak = None
+        if traced:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        await db.rollback()
+    return {"seconds": elapsed, "peak_bytes": peak}
+
+
+async def _bench(fixture: Path, repeat: int) -> dict:
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import NullPool
+
+    engine = create_async_engine(os.environ["AQUA_DB"], poolclass=NullPool)
+    session_factory = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    verses = _parse_upload(fixture)
+
+    results = {}
+    try:
+        for loader in ("executemany", "copy"):
+            timings = [
+                (await _run_once(session_factory, loader, verses, traced=False))[
+                    "seconds"
+                ]
+                for _ in range(repeat)
+            ]
+            traced = await _run_once(session_factory, loader, verses, traced=True)
+            results[loader] = {
+                "median_seconds": statistics.median(timings),
+                "min_seconds": min(timings),
+                "max_seconds": max(timings),
+                "peak_python_heap_bytes": traced["peak_bytes"],
+            }
+    finally:
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fixture", type=Path, default=DEFAULT_FIXTURE)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if not args.fixture.is_file():
+        parser.error(f"no upload file at {args.fixture}; pass one with --fixture")
+
+    prepare_standalone_import()
+    results = asyncio.run(_bench(args.fixture, args.repeat))
+
+    for loader, r in results.items():
+        print(
+            f"{loader:>12}: median {r['median_seconds']:.3f}s "
+            f"(min {r['min_seconds']:.3f}s, max {r['max_seconds']:.3f}s), "
+            f"peak heap {r['peak_python_heap_bytes'] / 2**20:.1f} MiB"
+        )
+    print(json.dumps({"fixture": str(args.fixture), "results": results}))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,11 +13,18 @@ skeleton from disk on every request. Both have been collapsed:
   (6 cols × 5000 = 30k params, leaves headroom). The caller owns the
   transaction boundary so the BibleRevision row and its verses commit
   together (one WAL fsync) and rollback together on error.
+- `copy_verse_rows` is the loader the upload route uses. It streams row
+  tuples straight from the parsed upload into `verse_text` over the COPY
+  protocol (asyncpg `copy_records_to_table`) on the session's own
+  connection, so it joins the same transaction without building 31k
+  per-row dicts or binding 186k parameters. `text_loading` is kept as the
+  executemany reference path; `python -m bench.upload_loaders` compares
+  the two.
 """
 
 import asyncio
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from sqlalchemy.sql import insert
 
@@ -71,21 +78,30 @@ def _parse_vref_skeleton() -> List[_VrefSlot]:
 _VREF_SKELETON: List[_VrefSlot] = _parse_vref_skeleton()
 
 
-def _build_verse_records(verses: Iterable, revision_id: int) -> List[dict]:
-    """Pair the cached vref skeleton with the uploaded verse strings, dropping
-    rows where the verse is empty/whitespace or the vref slot is a non-canonical
-    line (e.g. range marker). Returns a list of dicts ready for executemany.
+# Column order of the tuples yielded by `_iter_verse_rows`, which is also the
+# column list handed to COPY. `id` is omitted so the serial default applies.
+_VERSE_COLUMNS = ("text", "revision_id", "verse_reference", "book", "chapter", "verse")
 
-    `verses` must be the same length as the vref skeleton (41,899 entries) —
-    callers pad missing/empty verses with empty strings or None.
-    """
-    verses = list(verses)
+_VerseRow = Tuple[str, int, str, str, int, int]
+
+
+def _check_upload_length(verses: Sequence) -> None:
+    """Reject uploads that are not exactly one line per vref slot."""
     if len(verses) != len(_VREF_SKELETON):
         raise ValueError(
             f"Expected {len(_VREF_SKELETON)} input lines (one per vref), "
             f"got {len(verses)}"
         )
-    records: List[dict] = []
+
+
+def _iter_verse_rows(verses: Sequence, revision_id: int) -> Iterator[_VerseRow]:
+    """Yield one `_VERSE_COLUMNS`-ordered tuple per non-empty canonical verse.
+
+    Lazy counterpart of `_build_verse_records`: the COPY loader consumes this
+    directly so no intermediate per-row container is ever materialized.
+    Callers must validate the length with `_check_upload_length` first (a
+    generator can't raise until it is iterated).
+    """
     for slot, verse in zip(_VREF_SKELETON, verses):
         if slot is None:
             continue
@@ -102,17 +118,22 @@ def _build_verse_records(verses: Iterable, revision_id: int) -> List[dict]:
         if not text.strip():
             continue
         book, chapter, verse_num, verse_reference = slot
-        records.append(
-            {
-                "text": text,
-                "revision_id": revision_id,
-                "verse_reference": verse_reference,
-                "book": book,
-                "chapter": chapter,
-                "verse": verse_num,
-            }
-        )
-    return records
+        yield (text, revision_id, verse_reference, book, chapter, verse_num)
+
+
+def _build_verse_records(verses: Iterable, revision_id: int) -> List[dict]:
+    """Pair the cached vref skeleton with the uploaded verse strings, dropping
+    rows where the verse is empty/whitespace or the vref slot is a non-canonical
+    line (e.g. range marker). Returns a list of dicts ready for executemany.
+
+    `verses` must be the same length as the vref skeleton (41,899 entries) —
+    callers pad missing/empty verses with empty strings or None.
+    """
+    verses = list(verses)
+    _check_upload_length(verses)
+    return [
+        dict(zip(_VERSE_COLUMNS, row)) for row in _iter_verse_rows(verses, revision_id)
+    ]
 
 
 async def async_text_dataframe(verses, bible_revision):
@@ -152,6 +173,37 @@ async def text_loading(verse_records, db):
         await db.execute(insert(VerseText), batch)
 
 
+async def copy_verse_rows(verses: Sequence, revision_id: int, db) -> int:
+    """Stream an upload into `verse_text` with COPY, without committing.
+
+    Runs on the asyncpg connection underlying `db`, so the rows land in the
+    session's open transaction and commit or roll back with the rest of the
+    request, exactly like `text_loading`. The session must already be inside
+    a transaction that has issued at least one statement (the upload route's
+    `flush()` of the BibleRevision row does this); otherwise the driver
+    connection is still in autocommit and the COPY would commit on its own,
+    so that case is refused rather than silently breaking atomicity.
+
+    Returns the number of rows copied.
+    """
+    _check_upload_length(verses)
+    conn = await db.connection()
+    raw_conn = await conn.get_raw_connection()
+    driver_conn = raw_conn.driver_connection
+    if not driver_conn.is_in_transaction():
+        raise RuntimeError(
+            "copy_verse_rows requires an open transaction on the session; "
+            "flush or execute a statement first"
+        )
+    status_msg = await driver_conn.copy_records_to_table(
+        VerseText.__tablename__,
+        records=_iter_verse_rows(verses, revision_id),
+        columns=_VERSE_COLUMNS,
+    )
+    # asyncpg returns the server's command tag, e.g. "COPY 31102".
+    return int(status_msg.rsplit(" ", 1)[-1])
+
+
 async def upload_bible(verses, bible_revision, db):
     verse_records = await async_text_dataframe(verses, bible_revision)
     await text_loading(verse_records, db)
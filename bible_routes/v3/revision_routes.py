@@ -7,12 +7,14 @@ from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bible_loading import async_text_dataframe, text_loading
+import background_jobs
+import revision_text_cache
+from bible_loading import copy_verse_rows
 from database.dependencies import get_db
 from database.models import BibleRevision as BibleRevisionModel
 from database.models import BibleVersion as BibleVersionModel
 from database.models import UserDB as UserModel
-from models import RevisionIn
+from models import JobHandle, RevisionIn
 from models import RevisionOut_v3 as RevisionOut
 from security_routes.auth_routes import get_current_user
 from security_routes.utilities import (
@@ -37,6 +39,9 @@ UPLOAD_READ_CHUNK_BYTES = 1024 * 1024
 # else (images, archives, HTML, etc.) is rejected with 415.
 ALLOWED_CONTENT_TYPES = {"text/plain", "application/octet-stream"}
 
+# background_jobs kind of a backgrounded POST /revision.
+UPLOAD_JOB = "revision.upload"
+
 
 async def read_upload_with_limit(file: UploadFile, max_bytes: int) -> bytes:
     """Read ``file`` fully into memory, aborting if it exceeds ``max_bytes``.
@@ -198,14 +203,60 @@ async def process_and_upload_revision(
     if not has_text:
         raise ValueError("File has no text.")
 
-    verse_records = await async_text_dataframe(verses, revision_id)
-    await text_loading(verse_records, db)
+    # COPY straight from the parsed lines; the caller's flush of the revision
+    # row has already opened the transaction these rows join.
+    await copy_verse_rows(verses, revision_id, db)
+
+
+async def _create_revision(
+    db: AsyncSession, revision: RevisionIn, contents: bytes
+) -> RevisionOut:
+    """Create the revision and load its verses from ``contents``, atomically."""
+    new_revision = BibleRevisionModel(
+        bible_version_id=revision.version_id,
+        name=revision.name,
+        date=date.today(),
+        published=revision.published,
+        back_translation_id=revision.backTranslation,
+        machine_translation=revision.machineTranslation,
+    )
+    db.add(new_revision)
+    # Flush (to assign new_revision.id for the verse FK) but don't commit
+    # yet — keep the revision row and its verses in one transaction so
+    # rollback on a parse error leaves no orphaned revision behind, and the
+    # whole upload pays one WAL fsync at the end instead of one per batch.
+    await db.flush()
+
+    try:
+        await process_and_upload_revision(contents, new_revision.id, db)
+        # One commit covers the BibleRevision row + all VerseText inserts.
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    version = await db.scalar(
+        select(BibleVersionModel).where(
+            BibleVersionModel.id == new_revision.bible_version_id
+        )
+    )
+    version_map = {new_revision.bible_version_id: version} if version else {}
+    return create_revision_out(new_revision, version_map)
+
+
+@background_jobs.handler(UPLOAD_JOB)
+async def _create_revision_job(db, params, payload, progress):
+    await progress(0.0, "Loading verses")
+    return await _create_revision(db, RevisionIn(**params), payload)
 
 
-@router.post("/revision", response_model=RevisionOut)
+@router.post(
+    "/revision", response_model=RevisionOut, responses={202: {"model": JobHandle}}
+)
 async def upload_revision(
     revision: RevisionIn = Depends(),
     file: UploadFile = File(...),
+    background: bool = False,
     db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user),
 ):
@@ -226,6 +277,9 @@ async def upload_revision(
     Description: The id of the machine translation revision.
     - file: UploadFile
     Description: The file containing the revision text.
+    - background: bool = False
+    Description: If true, answer 202 with a job handle at once and load the
+    revision in a background job; poll GET /jobs/{id} for the revision.
     """
     start_time = time.time()
 
@@ -275,43 +329,17 @@ async def upload_revision(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Version is deleted"
         )
 
-    new_revision = BibleRevisionModel(
-        bible_version_id=revision.version_id,
-        name=revision.name,
-        date=date.today(),
-        published=revision.published,
-        back_translation_id=revision.backTranslation,
-        machine_translation=revision.machineTranslation,
-    )
-    db.add(new_revision)
-    # Flush (to assign new_revision.id for the verse FK) but don't commit
-    # yet — keep the revision row and its verses in one transaction so
-    # rollback on a parse error leaves no orphaned revision behind, and the
-    # whole upload pays one WAL fsync at the end instead of one per batch.
-    await db.flush()
-
-    try:
-        # Stream the upload with a byte-count cap; this enforces the limit
-        # even when the client didn't send a Content-Length / file.size is
-        # unset, so a chunked oversize body still fails fast.
-        contents = await read_upload_with_limit(file, MAX_UPLOAD_BYTES)
-        await process_and_upload_revision(contents, new_revision.id, db)
-        # One commit covers the BibleRevision row + all VerseText inserts.
-        await db.commit()
-    except HTTPException:
-        await db.rollback()
-        raise
-    except Exception as e:
-        await db.rollback()
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-
-    version = await db.scalar(
-        select(BibleVersionModel).where(
-            BibleVersionModel.id == new_revision.bible_version_id
+    # Stream the upload with a byte-count cap; this enforces the limit even
+    # when the client didn't send a Content-Length / file.size is unset, so
+    # a chunked oversize body still fails fast.
+    contents = await read_upload_with_limit(file, MAX_UPLOAD_BYTES)
+    if background:
+        job = await background_jobs.enqueue(
+            db, UPLOAD_JOB, revision.model_dump(), current_user.id, payload=contents
         )
-    )
-    version_map = {new_revision.bible_version_id: version} if version else {}
-    revision_out = create_revision_out(new_revision, version_map)
+        return background_jobs.accepted(job)
+
+    revision_out = await _create_revision(db, revision, contents)
 
     end_time = time.time()
     processing_time = end_time - start_time
@@ -367,6 +395,7 @@ async def delete_revision(
     revision.deleted = True
     revision.deletedAt = date.today()
     await db.commit()
+    revision_text_cache.invalidate(id)
     end_time = time.time()  # End timer
     processing_time = end_time - start_time
     logging.info(
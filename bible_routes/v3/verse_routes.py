@@ -13,6 +13,7 @@ from fastapi.responses import PlainTextResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+import revision_text_cache
 from database.dependencies import get_db
 from database.models import BookReference as BookReferenceModel
 from database.models import ChapterReference as ChapterReferenceModel
@@ -587,16 +588,18 @@ async def get_words(
         )
 
     if first_verse is None:
-        verses_in_range = await _fetch_revision_verses(db, revision_id)
+        revision_text = await revision_text_cache.get(db, revision_id)
+        texts = [text for _, _, text in revision_text.rows()]
     else:
         verses_in_range = await _fetch_verses_in_range(
             db, revision_id, first_verse, last_verse
         )
+        texts = [verse.text for verse in verses_in_range]
 
     counts = Counter()
-    for verse in verses_in_range:
-        if verse.text and not _is_range_marker(verse.text):
-            counts.update(_tokenize_words(verse.text))
+    for text in texts:
+        if text and not _is_range_marker(text):
+            counts.update(_tokenize_words(text))
 
     ranked = sorted(counts.items(), key=lambda wc: (-wc[1], wc[0]))
     if top_n is not None:
@@ -607,12 +610,6 @@ async def get_words(
     return sorted(w for w, _ in ranked)
 
 
-async def _fetch_revision_verses(db: AsyncSession, revision_id: int):
-    stmt = select(VerseModel).where(VerseModel.revision_id == revision_id)
-    result = await db.execute(stmt)
-    return result.scalars().all()
-
-
 async def _fetch_verses_in_range(
     db: AsyncSession, revision_id: int, first_verse: str, last_verse: str
 ):
@@ -871,57 +868,18 @@ async def get_texts(
                 detail="User not authorized to access this revision.",
             )
 
-    # Fetch all verses for all revision_ids in a single query
-    stmt = (
-        select(
-            VerseModel.id,
-            VerseModel.text,
-            VerseModel.verse_reference,
-            VerseModel.revision_id,
-            VerseModel.book,
-            VerseModel.chapter,
-            VerseModel.verse,
-        )
-        .join(
-            VerseReferenceModel,
-            VerseModel.verse_reference == VerseReferenceModel.full_verse_id,
-        )
-        .join(
-            ChapterReferenceModel,
-            VerseReferenceModel.chapter == ChapterReferenceModel.full_chapter_id,
-        )
-        .join(
-            BookReferenceModel,
-            VerseReferenceModel.book_reference == BookReferenceModel.abbreviation,
-        )
-        .where(VerseModel.revision_id.in_(revision_ids))
-        .order_by(
-            BookReferenceModel.number,
-            ChapterReferenceModel.number,
-            VerseReferenceModel.number,
-        )
-    )
-    result = await db.execute(stmt)
-    all_verses = result.all()
-
-    # Group by verse_reference: {vref -> {revision_id -> verse_row}}
-    vref_to_revisions: Dict[str, Dict[int, Any]] = {}
-    # Track ordering of vrefs from the query (canonical order)
-    queried_vref_order: List[str] = []
-
-    for verse in all_verses:
-        vref = verse.verse_reference
-        if vref not in vref_to_revisions:
-            vref_to_revisions[vref] = {}
-            queried_vref_order.append(vref)
-        vref_to_revisions[vref][verse.revision_id] = verse
+    # Each revision's verses, aligned to the canonical vref order.
+    revision_texts = {
+        rev_id: await revision_text_cache.get(db, rev_id) for rev_id in revision_ids
+    }
 
     # Determine verse ordering based on include_verses mode
     if include_verses == IncludeVerses.all:
         # Use the canonical vref list loaded at module startup
         vref_order = _VREF_LIST
     else:
-        vref_order = queried_vref_order
+        # Verses at least one revision has a row for, in canonical order
+        vref_order = revision_text_cache.vrefs_with_rows(revision_texts.values())
 
     # Create combined records with text field per revision
     # Each record: {"vrefs": ["GEN 1:1"], "text_123": "...", "text_456": "..."}
@@ -933,19 +891,19 @@ async def get_texts(
         # Return exactly 41,899 rows per revision — no merging,
         # <range> markers replaced with empty strings
         vrefs_to_emit = _sample_items(_VREF_LIST, limit, random, seed)
+        texts_by_revision = {
+            rev_id: revision_text.texts_by_vref(vrefs_to_emit)
+            for rev_id, revision_text in revision_texts.items()
+        }
         for vref in vrefs_to_emit:
-            rev_verses = vref_to_revisions.get(vref, {})
             book, cv = vref.split(" ", 1)
             chapter_str, verse_str = cv.split(":")
             chapter = int(chapter_str)
             verse_num = int(verse_str)
 
             for rev_id, rev_id_str in zip(revision_ids, rev_id_strs):
-                if rev_id in rev_verses:
-                    text = rev_verses[rev_id].text or ""
-                    text = "" if text == "<range>" else text
-                else:
-                    text = ""
+                text = texts_by_revision[rev_id].get(vref) or ""
+                text = "" if text == "<range>" else text
                 result_dict[rev_id_str].append(
                     VerseText(
                         id=None,
@@ -964,17 +922,16 @@ async def get_texts(
 
     # union / intersection: merge <range> markers, then filter
     combined_records: List[Dict] = []
+    texts_by_revision = {
+        rev_id: revision_text.texts_by_vref(vref_order)
+        for rev_id, revision_text in revision_texts.items()
+    }
 
     for vref in vref_order:
-        rev_verses = vref_to_revisions.get(vref, {})
         record = {"vrefs": [vref]}
-        for rev_id in revision_ids:
-            field_name = f"text_{rev_id}"
-            if rev_id in rev_verses:
-                record[field_name] = rev_verses[rev_id].text or ""
-            else:
-                # Verse doesn't exist in this revision - use empty string
-                record[field_name] = ""
+        for rev_id, field_name in zip(revision_ids, text_fields):
+            # A verse missing from this revision gets an empty string
+            record[field_name] = texts_by_revision[rev_id].get(vref) or ""
         combined_records.append(record)
 
     # Run merge_verse_ranges - check ALL text fields for <range> markers
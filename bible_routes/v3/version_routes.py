@@ -17,6 +17,7 @@ from database.models import UserGroup
 from models import VersionIn
 from models import VersionOut_v3 as VersionOut
 from models import VersionUpdate
+from security_routes import access_cache
 from security_routes.auth_routes import get_current_user
 from utils.datetime_utils import as_naive_utc
 
@@ -352,6 +353,8 @@ async def modify_version(
                 for access in access_rows:
                     await db.delete(access)
         await db.commit()
+        # Every member of the removed groups may have lost this version.
+        access_cache.invalidate_all_users()
 
     if "remove_from_groups" in version_data:
         del version_data["remove_from_groups"]
@@ -125,6 +125,94 @@ class Settings(BaseSettings):
     missing_words_missing_threshold: float = 0.15
     missing_words_match_threshold: float = 0.2
 
+    # --- Authorization cache --------------------------------------------
+    # Per-worker cache of each user's authorized versions/revisions (see
+    # security_routes.access_cache). The TTL bounds how long a revoked grant
+    # can linger on a worker that didn't handle the revocation; 0 disables
+    # the cache. The size cap bounds memory (LRU eviction).
+    auth_cache_ttl_s: float = Field(default=60.0, ge=0)
+    auth_cache_max_users: int = Field(default=10_000, gt=0)
+    # Opt-in: resolve get_current_user from the JWT's uid/is_admin/gen claims
+    # instead of loading the user (and groups) on every request. A token's
+    # revocation generation is re-checked against the DB at most once per
+    # auth_cache_ttl_s per worker.
+    auth_token_claims: bool = False
+    # Verified JWTs remembered per worker so repeat requests with the same
+    # token skip signature verification (security_routes.utilities
+    # .decode_token). 0 disables.
+    jwt_cache_max_tokens: int = Field(default=4096, ge=0)
+    # Threads per worker for bcrypt hashing/verification (/token, admin user
+    # routes). Small on purpose: a login burst queues instead of saturating
+    # the container's CPUs.
+    password_hash_workers: int = Field(default=2, gt=0)
+
+    # --- Results export -------------------------------------------------
+    # Rows fetched per round trip (and written per chunk) by the streaming
+    # /result/export and /alignmentscores/export routes. Bounds a worker's
+    # memory per export regardless of assessment size.
+    results_export_batch_size: int = Field(default=2000, gt=0)
+
+    # --- Verse text -----------------------------------------------------
+    # Per-worker RAM for whole revisions' verse text, which /words, /texts,
+    # the tokenizer indexers and verse-text hydration read instead of
+    # verse_text (revision_text_cache). A full Bible is ~6MB in a Latin
+    # script, more in scripts Python stores at 2-4 bytes per character;
+    # LRU-evicted past the cap. 0 disables (always read verse_text).
+    revision_text_cache_mb: int = Field(default=256, ge=0)
+
+    # --- Morpheme segmentation ------------------------------------------
+    # Processes per worker that /tokenizer/index and /tokenizer/word-index
+    # segment a revision's uncached words on
+    # (agent_routes.v3.morpheme_segmentation). Started on first use; 0 runs
+    # segmentation on a thread instead.
+    morpheme_segment_workers: int = Field(default=2, ge=0)
+    # Per-worker RAM for memoized word segmentations, per language and
+    # morpheme inventory (~300 bytes per word, so a Bible's distinct words
+    # are a few MB); LRU-evicted past the cap. 0 disables.
+    morpheme_segment_cache_mb: int = Field(default=32, ge=0)
+
+    # --- Background jobs ------------------------------------------------
+    # Jobs each worker runs at once from the background_jobs queue (requests
+    # sent with background=true; see background_jobs). 0 runs none here:
+    # jobs wait for a worker that does.
+    background_job_workers: int = Field(default=1, ge=0)
+    # Seconds an idle runner waits before checking the queue again. Jobs
+    # queued on the same worker wake it at once.
+    background_job_poll_s: float = Field(default=5.0, gt=0)
+    # Seconds without a heartbeat after which a running job is marked failed
+    # (its worker died). Runners beat every third of this.
+    background_job_stale_s: int = Field(default=300, ge=30)
+
+    # --- Baseline comparison --------------------------------------------
+    # Per-worker RAM for the baseline mean/stddev per verse/chapter/book that
+    # /compareresults scores against (assessment_routes.v3.baseline_stats).
+    # A whole-Bible verse-level entry is ~8MB; LRU-evicted past the cap.
+    # 0 disables (always aggregate in SQL).
+    compare_baseline_cache_mb: int = Field(default=64, ge=0)
+
+    # --- TF-IDF similarity ----------------------------------------------
+    # Per-worker RAM for finished assessments' TF-IDF corpus matrices, which
+    # /tfidf_result and /tfidf_result/by_* rank against in memory instead of
+    # in SQL (assessment_routes.v3.tfidf_corpus). A typical corpus is ~40MB;
+    # LRU-evicted past the cap. 0 disables (always rank in SQL).
+    tfidf_corpus_cache_mb: int = Field(default=256, ge=0)
+    # Lists of tfidf_pca_vector_ivfflat_idx (100 in total) to probe when
+    # ranking in SQL. 0 keeps the ranking exact: the ORDER BY is written so
+    # the planner can't pick the approximate index. N > 0 orders by the bare
+    # `<#>` distance so it can, and sets ivfflat.probes = N for the query;
+    # recall then depends on how well the corpus clusters, and filtered
+    # neighbours can come back short of `limit`.
+    tfidf_ivfflat_probes: int = Field(default=0, ge=0, le=100)
+    # Local directory the /tfidf_result/by_text* encoders are written to, once
+    # per host, and memory-mapped from by every worker
+    # (assessment_routes.v3.tfidf_encoder). Empty means a directory under the
+    # system temp dir.
+    tfidf_encoder_dir: str = ""
+    # Milliseconds an encode call waits for others on the same encoder to
+    # batch with (one pass on one thread for all of them). 0 encodes each
+    # call on its own.
+    tfidf_encode_batch_ms: float = Field(default=2.0, ge=0)
+
     # --- Observability / Loki -------------------------------------------
     # A real bool so pydantic parses "true"/"false"/"1"/"0" correctly, instead
     # of the bool(os.getenv(...)) footgun where any non-empty string is truthy.
@@ -1,4 +1,3 @@
-from pgvector.sqlalchemy import Vector
 from sqlalchemy import (
     DDL,
     TIMESTAMP,
@@ -23,6 +22,8 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import backref, relationship
 from sqlalchemy.sql import func, text
 
+from database.vector import Vector
+
 Base = declarative_base()
 
 
@@ -30,7 +31,8 @@ class AlignmentThresholdScores(Base):
     __tablename__ = "alignment_threshold_scores"
 
     id = Column(Integer, primary_key=True)
-    assessment_id = Column(Integer, ForeignKey("assessment.id"), index=True)
+    # Indexed by the (assessment_id, id) composite below.
+    assessment_id = Column(Integer, ForeignKey("assessment.id"))
     score = Column(Numeric)
     flag = Column(Boolean, default=False, server_default="false")
     note = Column(Text)
@@ -42,12 +44,20 @@ class AlignmentThresholdScores(Base):
     chapter = Column(Integer)
     verse = Column(Integer)
 
+    # /v3/alignmentscores pages in id order, by OFFSET or by cursor
+    # (`WHERE assessment_id = :id AND id > :last`); the composite serves
+    # both as one index walk with no sort step.
+    __table_args__ = (
+        Index("ix_alignment_threshold_scores_assessment_id_id", "assessment_id", "id"),
+    )
+
 
 class AlignmentTopSourceScores(Base):
     __tablename__ = "alignment_top_source_scores"
 
     id = Column(Integer, primary_key=True)
-    assessment_id = Column(Integer, ForeignKey("assessment.id"), index=True)
+    # Indexed by the (assessment_id, id) composite below.
+    assessment_id = Column(Integer, ForeignKey("assessment.id"))
     score = Column(Numeric)
     flag = Column(Boolean, default=False, server_default="false")
     vref = Column(Text, ForeignKey("verse_reference.full_verse_id"))
@@ -64,6 +74,8 @@ class AlignmentTopSourceScores(Base):
     __table_args__ = (
         Index("ix_alignment_scores_assessment_score", "assessment_id", "score"),
         Index("ix_alignment_scores_grouping", "book", "chapter", "verse", "source"),
+        # See AlignmentThresholdScores.
+        Index("ix_alignment_top_source_scores_assessment_id_id", "assessment_id", "id"),
     )
 
 
@@ -274,6 +286,46 @@ class AssessmentResult(Base):
     )
 
 
+class AssessmentResultRollup(Base):
+    """Precomputed /result?aggregate=chapter|book|text rows for a finished
+    assessment.
+
+    Written once when the assessment transitions to ``finished`` (see
+    ``results_query_routes.refresh_result_rollups``) and dropped whenever its
+    ``assessment_result`` rows are pushed or deleted, in which case reads fall
+    back to grouping ``assessment_result`` live. Each row mirrors one group of
+    that live query: ``result_id`` is the group's ``min(id)`` (the reported
+    id and sort key), and ``book``/``chapter`` are NULL above their level.
+    ``source_not_null`` marks the variant restricted to non-null sources,
+    which the missing-words types serve when ``reverse`` is false.
+    """
+
+    __tablename__ = "assessment_result_rollup"
+
+    id = Column(Integer, primary_key=True)
+    assessment_id = Column(
+        Integer, ForeignKey("assessment.id", ondelete="CASCADE"), nullable=False
+    )
+    level = Column(Text, nullable=False)
+    source_not_null = Column(Boolean, nullable=False)
+    book = Column(Text)
+    chapter = Column(Integer)
+    result_id = Column(Integer, nullable=False)
+    score = Column(Numeric)
+    flag = Column(Boolean)
+    hide = Column(Boolean)
+
+    __table_args__ = (
+        Index(
+            "ix_assessment_result_rollup_lookup",
+            "assessment_id",
+            "level",
+            "source_not_null",
+            "result_id",
+        ),
+    )
+
+
 class BibleRevision(Base):
     __tablename__ = "bible_revision"
 
@@ -484,6 +536,286 @@ class VerseText(Base):
     )
 
 
+# A write to a revision's verses is a change to the revision: bump its
+# updated_at (via set_updated_at), so delta-sync mirrors see it and
+# revision_text_cache, which keys entries on updated_at, reloads it.
+# Installed here for create_all schemas (tests) and by migration
+# a7e3c9d5b2f8 for alembic-managed databases — keep the two definitions in
+# sync. Statement-level, so a whole-revision COPY touches the row once.
+_TOUCH_REVISION_ON_VERSE_CHANGE_FN = DDL(
+    """
+    CREATE OR REPLACE FUNCTION touch_revision_on_verse_change()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE bible_revision SET updated_at = clock_timestamp()
+            WHERE id IN (SELECT revision_id FROM new_rows);
+        ELSIF TG_OP = 'UPDATE' THEN
+            UPDATE bible_revision SET updated_at = clock_timestamp()
+            WHERE id IN (
+                SELECT revision_id FROM old_rows
+                UNION
+                SELECT revision_id FROM new_rows
+            );
+        ELSE
+            UPDATE bible_revision SET updated_at = clock_timestamp()
+            WHERE id IN (SELECT revision_id FROM old_rows);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+)
+
+# trigger name -> definition. One statement per DDL (asyncpg rejects
+# multi-statement prepared queries).
+_TOUCH_REVISION_TRIGGERS = {
+    "trg_verse_text_touch_revision_insert": (
+        "AFTER INSERT ON verse_text "
+        "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT "
+        "EXECUTE FUNCTION touch_revision_on_verse_change()"
+    ),
+    "trg_verse_text_touch_revision_update": (
+        "AFTER UPDATE ON verse_text "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION touch_revision_on_verse_change()"
+    ),
+    "trg_verse_text_touch_revision_delete": (
+        "AFTER DELETE ON verse_text "
+        "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT "
+        "EXECUTE FUNCTION touch_revision_on_verse_change()"
+    ),
+}
+
+event.listen(VerseText.__table__, "after_create", _TOUCH_REVISION_ON_VERSE_CHANGE_FN)
+for _trigger, _definition in _TOUCH_REVISION_TRIGGERS.items():
+    event.listen(
+        VerseText.__table__,
+        "after_create",
+        DDL(f"DROP TRIGGER IF EXISTS {_trigger} ON verse_text"),
+    )
+    event.listen(
+        VerseText.__table__,
+        "after_create",
+        DDL(f"CREATE TRIGGER {_trigger} {_definition}"),
+    )
+
+
+class VersionLatestVerse(Base):
+    """The current text of each verse of a version: the verse_text row of
+    its latest non-deleted revision (``date`` DESC, NULLs first, then ``id``
+    DESC) with non-empty text.
+
+    Version-scoped /textsearch reads this instead of ranking every revision
+    of the version per request. Triggers on ``verse_text`` and
+    ``bible_revision`` maintain it in the writing transaction, so every
+    write path (uploads, COPY, raw SQL, soft deletes) keeps it current;
+    ``revision_date`` is the picked revision's date so an insert can tell
+    whether it supersedes the current pick. Verse rows without a
+    book/chapter/verse are not projected.
+    """
+
+    __tablename__ = "version_latest_verse"
+
+    version_id = Column(
+        Integer,
+        ForeignKey("bible_version.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    book = Column(Text, primary_key=True)
+    chapter = Column(Integer, primary_key=True)
+    verse = Column(Integer, primary_key=True)
+    verse_reference = Column(Text)
+    verse_text_id = Column(
+        Integer, ForeignKey("verse_text.id", ondelete="CASCADE"), nullable=False
+    )
+    revision_id = Column(Integer, nullable=False)
+    revision_date = Column(DateTime)
+
+    __table_args__ = (
+        Index(
+            "ix_version_latest_verse_verse_reference", "version_id", "verse_reference"
+        ),
+        Index("ix_version_latest_verse_verse_text_id", "verse_text_id", unique=True),
+    )
+
+
+# version_latest_verse maintenance. Installed here for create_all schemas
+# (tests) and by migration f2a6c8e4d1b7 for alembic-managed databases — keep
+# the two definitions in sync. Inserts upsert their rows when they supersede
+# the current pick; updates, deletes and revision changes (soft delete, date,
+# version) recompute the affected verses. Statement-level triggers with
+# transition tables keep a whole-revision COPY to one recompute.
+_VERSION_LATEST_VERSE_FUNCTIONS = [
+    DDL(
+        """
+        CREATE OR REPLACE FUNCTION refresh_version_latest_verse(
+            version_ids integer[], books text[], chapters integer[], verses integer[]
+        ) RETURNS void AS $$
+        BEGIN
+            DELETE FROM version_latest_verse p
+            USING unnest(version_ids, books, chapters, verses)
+                AS k(version_id, book, chapter, verse)
+            WHERE p.version_id = k.version_id AND p.book = k.book
+              AND p.chapter = k.chapter AND p.verse = k.verse;
+            INSERT INTO version_latest_verse (
+                version_id, book, chapter, verse, verse_reference,
+                verse_text_id, revision_id, revision_date
+            )
+            SELECT DISTINCT ON (br.bible_version_id, vt.book, vt.chapter, vt.verse)
+                br.bible_version_id, vt.book, vt.chapter, vt.verse,
+                vt.verse_reference, vt.id, br.id, br.date
+            FROM (
+                SELECT DISTINCT * FROM unnest(version_ids, books, chapters, verses)
+                    AS u(version_id, book, chapter, verse)
+            ) k
+            JOIN bible_revision br
+              ON br.bible_version_id = k.version_id AND br.deleted IS FALSE
+            JOIN verse_text vt
+              ON vt.revision_id = br.id AND vt.book = k.book
+             AND vt.chapter = k.chapter AND vt.verse = k.verse
+            WHERE vt.text <> ''
+            ORDER BY br.bible_version_id, vt.book, vt.chapter, vt.verse,
+                     br.date DESC, br.id DESC;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    ),
+    DDL(
+        """
+        CREATE OR REPLACE FUNCTION version_latest_verse_on_insert()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO version_latest_verse AS p (
+                version_id, book, chapter, verse, verse_reference,
+                verse_text_id, revision_id, revision_date
+            )
+            SELECT DISTINCT ON (br.bible_version_id, n.book, n.chapter, n.verse)
+                br.bible_version_id, n.book, n.chapter, n.verse,
+                n.verse_reference, n.id, br.id, br.date
+            FROM new_rows n
+            JOIN bible_revision br ON br.id = n.revision_id
+            WHERE br.deleted IS FALSE AND n.text <> ''
+              AND n.book IS NOT NULL AND n.chapter IS NOT NULL
+              AND n.verse IS NOT NULL
+            ORDER BY br.bible_version_id, n.book, n.chapter, n.verse,
+                     br.date DESC, br.id DESC
+            ON CONFLICT (version_id, book, chapter, verse) DO UPDATE SET
+                verse_reference = EXCLUDED.verse_reference,
+                verse_text_id = EXCLUDED.verse_text_id,
+                revision_id = EXCLUDED.revision_id,
+                revision_date = EXCLUDED.revision_date
+            -- DESC sorts NULL dates first, so they rank as the latest.
+            WHERE (EXCLUDED.revision_date IS NULL,
+                   COALESCE(EXCLUDED.revision_date, '-infinity'),
+                   EXCLUDED.revision_id)
+                > (p.revision_date IS NULL,
+                   COALESCE(p.revision_date, '-infinity'),
+                   p.revision_id);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    ),
+    DDL(
+        """
+        CREATE OR REPLACE FUNCTION version_latest_verse_on_change()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                PERFORM refresh_version_latest_verse(
+                    array_agg(br.bible_version_id), array_agg(c.book),
+                    array_agg(c.chapter), array_agg(c.verse)
+                )
+                FROM (
+                    SELECT revision_id, book, chapter, verse FROM old_rows
+                    UNION
+                    SELECT revision_id, book, chapter, verse FROM new_rows
+                ) c
+                JOIN bible_revision br ON br.id = c.revision_id;
+            ELSE
+                PERFORM refresh_version_latest_verse(
+                    array_agg(br.bible_version_id), array_agg(c.book),
+                    array_agg(c.chapter), array_agg(c.verse)
+                )
+                FROM old_rows c
+                JOIN bible_revision br ON br.id = c.revision_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    ),
+    DDL(
+        """
+        CREATE OR REPLACE FUNCTION version_latest_verse_on_revision_change()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM refresh_version_latest_verse(
+                array_agg(v.version_id), array_agg(vt.book),
+                array_agg(vt.chapter), array_agg(vt.verse)
+            )
+            FROM verse_text vt
+            CROSS JOIN (
+                VALUES (OLD.bible_version_id), (NEW.bible_version_id)
+            ) v(version_id)
+            WHERE vt.revision_id = NEW.id AND v.version_id IS NOT NULL;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    ),
+]
+
+# One statement per DDL (asyncpg rejects multi-statement prepared queries).
+_VERSION_LATEST_VERSE_TRIGGERS = [
+    ("verse_text", "trg_verse_text_latest_insert"),
+    ("verse_text", "trg_verse_text_latest_update"),
+    ("verse_text", "trg_verse_text_latest_delete"),
+    ("bible_revision", "trg_bible_revision_latest_verse"),
+]
+_VERSION_LATEST_VERSE_TRIGGER_CREATES = [
+    DDL(
+        "CREATE TRIGGER trg_verse_text_latest_insert AFTER INSERT ON verse_text "
+        "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT "
+        "EXECUTE FUNCTION version_latest_verse_on_insert()"
+    ),
+    DDL(
+        "CREATE TRIGGER trg_verse_text_latest_update AFTER UPDATE ON verse_text "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION version_latest_verse_on_change()"
+    ),
+    DDL(
+        "CREATE TRIGGER trg_verse_text_latest_delete AFTER DELETE ON verse_text "
+        "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT "
+        "EXECUTE FUNCTION version_latest_verse_on_change()"
+    ),
+    DDL(
+        "CREATE TRIGGER trg_bible_revision_latest_verse "
+        "AFTER UPDATE OF deleted, date, bible_version_id ON bible_revision "
+        "FOR EACH ROW WHEN ("
+        "OLD.deleted IS DISTINCT FROM NEW.deleted "
+        "OR OLD.date IS DISTINCT FROM NEW.date "
+        "OR OLD.bible_version_id IS DISTINCT FROM NEW.bible_version_id) "
+        "EXECUTE FUNCTION version_latest_verse_on_revision_change()"
+    ),
+]
+
+# Listener order matters: functions first, then trigger drops, then creates.
+# The table's foreign keys make create_all build it after verse_text and
+# bible_revision, so both exist by now.
+for _ddl in _VERSION_LATEST_VERSE_FUNCTIONS:
+    event.listen(VersionLatestVerse.__table__, "after_create", _ddl)
+for _table_name, _trigger in _VERSION_LATEST_VERSE_TRIGGERS:
+    event.listen(
+        VersionLatestVerse.__table__,
+        "after_create",
+        DDL(f"DROP TRIGGER IF EXISTS {_trigger} ON {_table_name}"),
+    )
+for _ddl in _VERSION_LATEST_VERSE_TRIGGER_CREATES:
+    event.listen(VersionLatestVerse.__table__, "after_create", _ddl)
+
+
 class UserDB(Base):
     __tablename__ = "users"
 
@@ -492,6 +824,10 @@ class UserDB(Base):
     email = Column(String(50), unique=False, nullable=True, default=None)
     hashed_password = Column(String(100), nullable=False)
     is_admin = Column(Boolean, default=False)
+    # Bumped whenever a user's existing tokens must stop working (password
+    # change, group removal). Tokens carry the value they were issued with as
+    # the `gen` claim; see security_routes.auth_routes.get_current_user.
+    token_generation = Column(Integer, nullable=False, server_default="0", default=0)
     # Relationship with UserGroups
     groups = relationship("UserGroup", back_populates="user", cascade="all, delete")
     owner_of = relationship("BibleVersion", back_populates="owner")
@@ -820,12 +1156,14 @@ class AgentWordAlignment(Base):
             "target_version_id",
             "target_word",
         ),
-        # Index for efficient score-ordered queries
+        # Index for efficient score-ordered queries; `id` is the tiebreak
+        # that /agent/word-alignment/all orders and keyset-paginates by.
         Index(
-            "ix_agent_word_alignments_version_score",
+            "ix_agent_word_alignments_version_score_id",
             "source_version_id",
             "target_version_id",
             score.desc(),
+            "id",
         ),
     )
 
@@ -1289,6 +1627,29 @@ class VerseMorphemeIndex(Base):
     )
 
 
+class VerseMorphemeIndexBuild(Base):
+    """What a revision's verse_morpheme_index rows were last built from.
+
+    ``morphemes`` is the language's inventory at the time (normalized text
+    -> language_morphemes.id) and ``revision_updated_at`` the revision's
+    ``updated_at``. While the stamp still matches, /tokenizer/index diffs the
+    inventory against ``morphemes`` and re-indexes only the verses the
+    difference can affect.
+    """
+
+    __tablename__ = "verse_morpheme_index_build"
+
+    revision_id = Column(
+        Integer,
+        ForeignKey("bible_revision.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    iso_639_3 = Column(String(3), nullable=False)
+    revision_updated_at = Column(TIMESTAMP, nullable=False)
+    morphemes = Column(JSONB, nullable=False)
+    built_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+
 class WordMorphemeIndex(Base):
     __tablename__ = "word_morpheme_index"
 
@@ -1393,6 +1754,36 @@ class TfidfSvd(Base):
     dtype = Column(Text, nullable=False, server_default="float32")
 
 
+class TfidfSvdVariant(Base):
+    """The SVD components of a run re-encoded in a pull's wire dtype.
+
+    Built by the first pull that asks for a dtype the matrix isn't stored
+    in, then served as-is to every later one. ``run_created_at`` is the
+    run's ``created_at`` it was built from; a re-push cascades the rows
+    away, and a variant a pull stores while a re-push lands is ignored.
+    """
+
+    __tablename__ = "tfidf_svd_variants"
+
+    assessment_id = Column(
+        Integer,
+        ForeignKey("tfidf_artifact_runs.assessment_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    dtype = Column(Text, primary_key=True)
+    run_created_at = Column(TIMESTAMP, nullable=False)
+    components_npy = Column(LargeBinary, nullable=False)
+    int8_scale = Column(Float)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+    __table_args__ = (
+        CheckConstraint(
+            "dtype IN ('float32', 'float16', 'int8')",
+            name="ck_tfidf_svd_variant_dtype",
+        ),
+    )
+
+
 class TfidfSvdStaging(Base):
     """In-flight chunked upload of TF-IDF artifacts. Dropped after commit/abort."""
 
@@ -1431,7 +1822,7 @@ class TfidfSvdStaging(Base):
 
 
 class TfidfSvdChunk(Base):
-    """One staged slice of an SVD components matrix. vstacked on commit."""
+    """One staged slice of an SVD components matrix. Concatenated on commit."""
 
     __tablename__ = "tfidf_svd_chunk"
 
@@ -1483,6 +1874,59 @@ class PredictJob(Base):
     )
 
 
+class BackgroundJob(Base):
+    """A long-running request run by the API's own job runner.
+
+    /tokenizer/index, /tokenizer/word-index, /agent/lexeme-card/deduplicate
+    and POST /revision take ``background=true``: the request is validated
+    and authorized synchronously, then queued here and answered with a job
+    handle. Runners on every API worker claim queued rows with
+    ``FOR UPDATE SKIP LOCKED`` (background_jobs), record progress and a
+    heartbeat while they work, and store the response body the synchronous
+    call would have returned; callers poll ``GET /jobs/{id}``.
+    """
+
+    __tablename__ = "background_jobs"
+
+    id = Column(Text, primary_key=True)
+    kind = Column(Text, nullable=False)
+    status = Column(Text, nullable=False, server_default="queued")
+    params = Column(JSONB, nullable=False)
+    # Request body the job needs beyond its params (a revision upload's
+    # file); cleared once the job finishes.
+    payload = Column(LargeBinary, nullable=True)
+    progress = Column(Float, nullable=True)
+    progress_detail = Column(Text, nullable=True)
+    result = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True)
+    # HTTP status the synchronous call would have failed with.
+    error_status = Column(Integer, nullable=True)
+    worker = Column(Text, nullable=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(
+        TIMESTAMP(timezone=True), server_default=func.now(), nullable=False
+    )
+    started_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    heartbeat_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    completed_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    owner = relationship("UserDB")
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('queued', 'running', 'complete', 'failed')",
+            name="ck_background_jobs_status",
+        ),
+        # The runners' claim query: oldest queued job first.
+        Index(
+            "ix_background_jobs_queued",
+            "created_at",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        Index("ix_background_jobs_owner_created", "owner_id", "created_at"),
+    )
+
+
 class PivotCandidate(Base):
     """Curated whitelist of pivot languages used for routing translations.
 
@@ -0,0 +1,56 @@
+"""pgvector columns bound in pgvector's binary wire format under asyncpg.
+
+``pgvector.sqlalchemy.Vector`` renders every bound vector as ``'[x,...]'``
+text, so each similarity query shipped ~3KB of decimal text that Postgres
+re-parsed, and callers that spliced the literal into ``text()`` also defeated
+asyncpg's prepared-statement cache (every statement was unique). Here asyncpg
+connections get pgvector's binary codec registered on connect, and ``Vector``
+hands them float32 arrays instead of text; the statement text no longer
+depends on the vector, and values arrive exactly as float32 (no ``%.6f``
+rounding). Other drivers (the tests' sync psycopg2 engine) keep the text form.
+
+The listener is registered on ``Pool`` itself rather than on the app engine so
+that every asyncpg engine in the process (tests, scripts, Alembic) binds the
+same way ``Vector`` expects.
+"""
+
+import numpy as np
+from pgvector.asyncpg import register_vector
+from pgvector.sqlalchemy import Vector as _TextVector
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql.asyncpg import AsyncAdapt_asyncpg_connection
+from sqlalchemy.pool import Pool
+
+
+class Vector(_TextVector):
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        if dialect.driver != "asyncpg":
+            return super().bind_processor(dialect)
+
+        def process(value):
+            if value is None:
+                return None
+            value = np.asarray(value, dtype=np.float32)
+            if value.ndim != 1:
+                raise ValueError("expected ndim to be 1")
+            if self.dim is not None and value.shape[0] != self.dim:
+                raise ValueError(
+                    "expected %d dimensions, not %d" % (self.dim, value.shape[0])
+                )
+            return value
+
+        return process
+
+
+@event.listens_for(Pool, "connect")
+def _register_vector_codec(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, AsyncAdapt_asyncpg_connection):
+        return
+    try:
+        dbapi_connection.run_async(register_vector)
+    except ValueError:
+        # The vector extension isn't installed yet (a fresh database before
+        # its first migration); there are no vector columns to bind either.
+        pass
@@ -0,0 +1,59 @@
+__version__ = "v3"
+
+import fastapi
+from fastapi import Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
+
+from background_jobs import JOB_POLL_INTERVAL_S
+from database.dependencies import get_db
+from database.models import BackgroundJob
+from database.models import UserDB as UserModel
+from models import JobStatusResponse
+from security_routes.auth_routes import get_current_user
+
+router = fastapi.APIRouter()
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(
+    job_id: str,
+    response: Response,
+    current_user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> JobStatusResponse:
+    """Poll a job queued by a ``background=true`` request.
+
+    ``progress`` (0 to 1) and ``progress_detail`` report how far a running
+    job has got. A complete job's ``result`` is the body the synchronous
+    request would have returned; a failed job's ``error`` and
+    ``error_status`` are the detail and HTTP status it would have failed
+    with.
+    """
+    job = await db.scalar(
+        select(BackgroundJob)
+        .options(defer(BackgroundJob.payload))
+        .where(BackgroundJob.id == job_id)
+    )
+    # 404 (not 403) for other users' jobs, so their existence doesn't leak.
+    if job is None or (job.owner_id != current_user.id and not current_user.is_admin):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+
+    if job.status in ("queued", "running"):
+        response.headers["Retry-After"] = str(JOB_POLL_INTERVAL_S)
+    return JobStatusResponse(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        progress=job.progress,
+        progress_detail=job.progress_detail,
+        result=job.result,
+        error=job.error,
+        error_status=job.error_status,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at,
+    )
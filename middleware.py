@@ -4,9 +4,9 @@ import socket
 import time
 import traceback
 
-from jose import JWTError, jwt
+from jose import JWTError
 
-from security_routes.utilities import ALGORITHM, SECRET_KEY
+from security_routes.utilities import REQUEST_CLAIMS_STATE_KEY, decode_token
 from utils.logging_config import setup_logger
 
 
@@ -25,13 +25,18 @@ class LoggingMiddleware:
             __name__, container_id=container_id, enable_json=True
         )
 
-    def extract_username_from_token(self, authorization_header):
+    def extract_username_from_token(self, authorization_header, state=None):
+        """Username for the log line. When ``state`` (the scope's state dict)
+        is given, the verified claims are left in it so the auth dependencies
+        don't verify the same token again."""
         if not authorization_header or not authorization_header.startswith("Bearer "):
             return "anonymous"
 
         try:
             token = authorization_header.replace("Bearer ", "")
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = decode_token(token)
+            if state is not None:
+                state[REQUEST_CLAIMS_STATE_KEY] = (token, payload)
             username = payload.get("sub")
             return username if username else "anonymous"
         except JWTError:
@@ -51,7 +56,9 @@ class LoggingMiddleware:
         authorization_header = headers.get(b"authorization", b"").decode(
             errors="replace"
         )
-        username = self.extract_username_from_token(authorization_header)
+        username = self.extract_username_from_token(
+            authorization_header, scope.setdefault("state", {})
+        )
 
         sensitive_paths = ["/token", "/users", "/change-password"]
         is_sensitive_path = any(p in url for p in sensitive_paths)
@@ -0,0 +1,187 @@
+"""Per-worker cache of whole revisions' verse text, aligned to the vref skeleton.
+
+Many read paths (``/words``, ``/texts``, the tokenizer index builders, train
+results and TF-IDF text hydration) re-read a revision's ``verse_text`` rows on
+every call, either all of them or a handful of vrefs at a time. A revision's
+verses are written in the upload transaction that creates it and rarely
+change afterwards, so this module keeps each revision as two arrays indexed
+by ``bible_loading._VREF_SKELETON`` slot: verse_text ids and texts. A whole
+revision is then a walk over the arrays, and a set of vrefs is one dict lookup
+each.
+
+Texts are ``sys.intern``-ed, so revisions of one version — which share most
+of their verses — share the strings in memory. The skeleton is vref.txt in
+canonical (book, chapter, verse) order, the same order the verse_reference
+tables give, so slot order stands in for ``ORDER BY`` on those tables.
+
+Each entry is stamped with the revision's ``updated_at``, which the
+``verse_text`` triggers bump on any insert, update or delete of its verses
+(migration a7e3c9d5b2f8), and every call re-reads that stamp by primary key:
+an entry is served only while it matches, so there is no TTL and writes from
+any worker (or raw SQL) are seen on the next call. ``invalidate`` drops a
+revision when it is deleted, to return the memory early.
+``settings.revision_text_cache_mb`` caps the cache (LRU); 0 disables it and
+every call loads from the DB. No lock: concurrent cold requests for a
+revision each load it and store identical values. A revision with no rows is
+returned but never stored.
+"""
+
+import datetime
+import sys
+from typing import (
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bible_loading import _VREF_SKELETON
+from config import settings
+from database.models import BibleRevision, VerseText
+
+# verse_reference -> its slot in the skeleton.
+_SLOT_BY_VREF: Dict[str, int] = {
+    slot[3]: i for i, slot in enumerate(_VREF_SKELETON) if slot is not None
+}
+
+# (verse_text id, verse_reference, text)
+VerseRow = Tuple[int, Optional[str], Optional[str]]
+
+
+class RevisionText(NamedTuple):
+    ids: np.ndarray  # int64 (n_slots,), 0 where the revision has no row
+    texts: List[Optional[str]]  # (n_slots,), None where no row
+    # Rows without a slot of their own: a vref outside the skeleton, or a
+    # second row for a vref. Ascending id. Uploads never produce these.
+    extra_rows: Tuple[VerseRow, ...]
+    nbytes: int
+
+    def rows(self) -> Iterator[VerseRow]:
+        """Every row of the revision: slotted rows in canonical order, then
+        ``extra_rows``."""
+        for slot in np.flatnonzero(self.ids):
+            yield int(self.ids[slot]), _VREF_SKELETON[slot][3], self.texts[slot]
+        yield from self.extra_rows
+
+    def texts_by_vref(self, vrefs: Collection[str]) -> Dict[str, Optional[str]]:
+        """vref -> text for each of ``vrefs`` the revision has a row for, as
+        ``SELECT verse_reference, text ... WHERE verse_reference IN (...)``
+        returns them."""
+        texts = {}
+        for vref in vrefs:
+            slot = _SLOT_BY_VREF.get(vref)
+            if slot is not None and self.ids[slot]:
+                texts[vref] = self.texts[slot]
+        if self.extra_rows:
+            wanted = set(vrefs)
+            for _, vref, text in self.extra_rows:
+                if vref in wanted:
+                    texts[vref] = text
+        return texts
+
+
+def vrefs_with_rows(revision_texts: Iterable[RevisionText]) -> List[str]:
+    """Skeleton vrefs that any of ``revision_texts`` has a row for, in
+    canonical order."""
+    present = np.zeros(len(_VREF_SKELETON), dtype=bool)
+    for revision_text in revision_texts:
+        present |= revision_text.ids != 0
+    return [_VREF_SKELETON[slot][3] for slot in np.flatnonzero(present)]
+
+
+# revision id -> (bible_revision.updated_at when loaded, its texts), LRU order.
+_REVISION_TEXT_CACHE: Dict[int, Tuple[datetime.datetime, RevisionText]] = {}
+
+
+def _max_bytes() -> int:
+    return settings.revision_text_cache_mb * 1024 * 1024
+
+
+def _build(rows: List) -> RevisionText:
+    ids = np.zeros(len(_VREF_SKELETON), dtype=np.int64)
+    texts: List[Optional[str]] = [None] * len(_VREF_SKELETON)
+    extra_rows = []
+    nbytes = ids.nbytes + sys.getsizeof(texts)
+    for verse_id, vref, text in rows:
+        if text is not None:
+            text = sys.intern(text)
+            # Shared strings are counted once per revision holding them.
+            nbytes += sys.getsizeof(text)
+        slot = _SLOT_BY_VREF.get(vref)
+        if slot is None or ids[slot]:
+            extra_rows.append((verse_id, vref, text))
+            nbytes += 100
+            continue
+        ids[slot] = verse_id
+        texts[slot] = text
+    return RevisionText(ids, texts, tuple(extra_rows), nbytes)
+
+
+async def _load(db: AsyncSession, revision_id: int) -> RevisionText:
+    rows = (
+        await db.execute(
+            select(VerseText.id, VerseText.verse_reference, VerseText.text)
+            .where(VerseText.revision_id == revision_id)
+            .order_by(VerseText.id)
+        )
+    ).all()
+    return _build(rows)
+
+
+def _store(
+    revision_id: int, updated_at: datetime.datetime, revision_text: RevisionText
+) -> None:
+    _REVISION_TEXT_CACHE.pop(revision_id, None)
+    if revision_text.nbytes > _max_bytes():
+        return
+    while _REVISION_TEXT_CACHE and (
+        sum(entry.nbytes for _, entry in _REVISION_TEXT_CACHE.values())
+        + revision_text.nbytes
+        > _max_bytes()
+    ):
+        _REVISION_TEXT_CACHE.pop(next(iter(_REVISION_TEXT_CACHE)), None)
+    _REVISION_TEXT_CACHE[revision_id] = (updated_at, revision_text)
+
+
+async def get(db: AsyncSession, revision_id: int) -> RevisionText:
+    """The texts of ``revision_id``, loading them on ``db`` if not cached.
+
+    Callers check the user's access to the revision first; this only reads.
+    """
+    if settings.revision_text_cache_mb <= 0:
+        return await _load(db, revision_id)
+    # Read the stamp before the rows: a write landing in between leaves the
+    # entry stamped older than its rows, which only costs a reload next call.
+    updated_at = (
+        await db.execute(
+            select(BibleRevision.updated_at).where(BibleRevision.id == revision_id)
+        )
+    ).scalar_one_or_none()
+    entry = _REVISION_TEXT_CACHE.get(revision_id)
+    if entry is not None and updated_at is not None and entry[0] == updated_at:
+        # Re-insert so dict order tracks recency and eviction drops the LRU.
+        _REVISION_TEXT_CACHE[revision_id] = _REVISION_TEXT_CACHE.pop(revision_id)
+        return entry[1]
+    revision_text = await _load(db, revision_id)
+    if updated_at is not None and (revision_text.ids.any() or revision_text.extra_rows):
+        _store(revision_id, updated_at, revision_text)
+    else:
+        _REVISION_TEXT_CACHE.pop(revision_id, None)
+    return revision_text
+
+
+def invalidate(revision_id: int) -> None:
+    """Drop a revision's texts (it was deleted on this worker)."""
+    _REVISION_TEXT_CACHE.pop(revision_id, None)
+
+
+def clear() -> None:
+    _REVISION_TEXT_CACHE.clear()
@@ -21,6 +21,7 @@ from . import (
     assessment,
     bible,
     eflomal,
+    jobs,
     pivot,
     predict,
     security,
@@ -34,6 +35,7 @@ from .agent import *  # noqa: F401,F403
 from .assessment import *  # noqa: F401,F403
 from .bible import *  # noqa: F401,F403
 from .eflomal import *  # noqa: F401,F403
+from .jobs import *  # noqa: F401,F403
 from .pivot import *  # noqa: F401,F403
 from .predict import *  # noqa: F401,F403
 from .security import *  # noqa: F401,F403
@@ -50,6 +52,7 @@ __all__ = [
     *assessment.__all__,
     *bible.__all__,
     *eflomal.__all__,
+    *jobs.__all__,
     *pivot.__all__,
     *predict.__all__,
     *security.__all__,
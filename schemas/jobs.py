@@ -0,0 +1,40 @@
+"""Background job schemas: the handle a ``background=true`` request is
+answered with, and ``GET /jobs/{id}``'s status."""
+
+from datetime import datetime
+from typing import Any, Literal, Optional
+
+from pydantic import BaseModel
+
+JobStatus = Literal["queued", "running", "complete", "failed"]
+
+
+class JobHandle(BaseModel):
+    id: str
+    kind: str
+    status: JobStatus
+    poll_url: str
+
+
+class JobStatusResponse(BaseModel):
+    id: str
+    kind: str
+    status: JobStatus
+    # Fraction done in [0, 1] and what the job is doing, while it runs.
+    progress: Optional[float] = None
+    progress_detail: Optional[str] = None
+    # The body the synchronous call would have returned, once complete.
+    result: Optional[Any] = None
+    # On failure: the detail and HTTP status the synchronous call would
+    # have failed with.
+    error: Optional[str] = None
+    error_status: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
+__all__ = [
+    "JobHandle",
+    "JobStatusResponse",
+]
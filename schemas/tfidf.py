@@ -39,7 +39,9 @@ class TfidfSvdPayload(TfidfSvdMeta):
 # overridden to widen the Literal.
 class TfidfSvdPullPayload(TfidfSvdMeta):
     dtype: Literal["float32", "float64", "float16", "int8"] = "float32"
-    components_b64: str
+    # None when pulled with include_components=false: the matrix then comes
+    # from GET /assessment/tfidf/artifacts/svd, and dtype is the stored one.
+    components_b64: Optional[str] = None
     int8_scale: Optional[float] = None
 
     @model_validator(mode="after")
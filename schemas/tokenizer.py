@@ -131,11 +131,16 @@ class TokenizerRunCommitResponse(BaseModel):
 class IndexRequest(BaseModel):
     iso_639_3: str
     revision_id: int
+    # Re-segment every verse even when the last build can be updated in place.
+    full_rebuild: bool = False
 
 
 class IndexResponse(BaseModel):
     verses_indexed: int
     unique_morpheme_verse_pairs: int
+    # Verses re-segmented by this call: all of them on a full build, only
+    # those the morpheme changes since the last build can affect otherwise.
+    verses_reindexed: int
 
 
 class WordIndexRequest(BaseModel):
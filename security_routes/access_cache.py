@@ -0,0 +1,182 @@
+"""Per-worker cache of the bible versions and revisions each user can reach.
+
+The authorization helpers in ``security_routes.utilities`` run on nearly every
+request (``predict`` calls them up to three times), and each call used to
+re-select the ``UserDB`` row and then join groups → version access. This
+module keeps, per user, the admin flag plus the authorized version and
+revision id sets, so a repeated check is a set-membership test.
+
+Consistency model — grants are never stale, revocations are bounded:
+
+- Only *positive* answers are served from the cache. A membership miss (e.g.
+  a version created or a revision uploaded on another worker since the entry
+  was loaded) falls back to a fresh load from the DB before answering no.
+- Entries expire after ``settings.auth_cache_ttl_s`` seconds, which bounds how
+  long a revoked grant can survive on a worker that never saw the change.
+- Routes that revoke access on this worker (admin user/group routes, removing
+  a version from a group) call the ``invalidate_*`` hooks so the local cache
+  drops affected entries immediately.
+
+The second half of the module caches which JWTs have had their revocation
+generation (``UserDB.token_generation``) checked against the DB, for the
+opt-in claims-based ``get_current_user`` path; it follows the same model.
+
+``auth_cache_ttl_s=0`` disables caching entirely. No lock: every operation is
+synchronous dict work on the event-loop thread, and concurrent loaders for the
+same user store equivalent entries.
+"""
+
+import time
+from typing import Dict, FrozenSet, NamedTuple, Optional, Tuple
+
+from config import settings
+
+
+class UserAccess(NamedTuple):
+    """Snapshot of one user's authorization state."""
+
+    is_admin: bool
+    version_ids: FrozenSet[int]
+    revision_ids: FrozenSet[int]
+    loaded_at: float
+
+
+_USER_ACCESS_CACHE: Dict[int, UserAccess] = {}
+
+# assessment id -> (revision_id, reference_id). Both columns are fixed when the
+# assessment row is created, so entries never go stale and need no TTL; the cap
+# only bounds memory.
+_ASSESSMENT_REVISIONS_CACHE: Dict[int, Tuple[int, Optional[int]]] = {}
+_ASSESSMENT_REVISIONS_MAXSIZE = 50_000
+
+
+def _enabled() -> bool:
+    return settings.auth_cache_ttl_s > 0
+
+
+def get_user_access(user_id: int) -> Optional[UserAccess]:
+    """Return the cached entry for ``user_id`` if present and not expired."""
+    if not _enabled():
+        return None
+    entry = _USER_ACCESS_CACHE.get(user_id)
+    if entry is None:
+        return None
+    if time.monotonic() - entry.loaded_at > settings.auth_cache_ttl_s:
+        _USER_ACCESS_CACHE.pop(user_id, None)
+        return None
+    # Re-insert so dict order tracks recency and eviction drops the LRU user.
+    _USER_ACCESS_CACHE[user_id] = _USER_ACCESS_CACHE.pop(user_id)
+    return entry
+
+
+def put_user_access(
+    user_id: int,
+    is_admin: bool,
+    version_ids: FrozenSet[int],
+    revision_ids: FrozenSet[int],
+) -> UserAccess:
+    """Store (and return) a freshly loaded entry for ``user_id``."""
+    entry = UserAccess(is_admin, version_ids, revision_ids, time.monotonic())
+    if not _enabled():
+        return entry
+    _USER_ACCESS_CACHE.pop(user_id, None)
+    while len(_USER_ACCESS_CACHE) >= settings.auth_cache_max_users:
+        _USER_ACCESS_CACHE.pop(next(iter(_USER_ACCESS_CACHE)), None)
+    _USER_ACCESS_CACHE[user_id] = entry
+    return entry
+
+
+def get_assessment_revisions(assessment_id: int) -> Optional[Tuple[int, Optional[int]]]:
+    """Return the cached (revision_id, reference_id) pair for an assessment."""
+    if not _enabled():
+        return None
+    return _ASSESSMENT_REVISIONS_CACHE.get(assessment_id)
+
+
+def put_assessment_revisions(
+    assessment_id: int, revision_id: int, reference_id: Optional[int]
+) -> None:
+    if not _enabled():
+        return
+    if (
+        assessment_id not in _ASSESSMENT_REVISIONS_CACHE
+        and len(_ASSESSMENT_REVISIONS_CACHE) >= _ASSESSMENT_REVISIONS_MAXSIZE
+    ):
+        # Evict the oldest entry (dicts preserve insertion order).
+        _ASSESSMENT_REVISIONS_CACHE.pop(next(iter(_ASSESSMENT_REVISIONS_CACHE)), None)
+    _ASSESSMENT_REVISIONS_CACHE[assessment_id] = (revision_id, reference_id)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop one user's entry (group membership changed, user deleted)."""
+    _USER_ACCESS_CACHE.pop(user_id, None)
+
+
+def invalidate_all_users() -> None:
+    """Drop every user entry.
+
+    Used when a change can affect many users at once, e.g. a version being
+    removed from a group.
+    """
+    _USER_ACCESS_CACHE.clear()
+
+
+# (username, iat) -> (token generation, loaded_at) for tokens whose generation
+# matched the user's row when last checked.
+_VERIFIED_TOKENS: Dict[Tuple[str, int], Tuple[int, float]] = {}
+
+# user id -> lowest token generation this worker knows to still be valid.
+# Raised by local revocations and by every DB check, so a revoked token is
+# refused here even while its own verification entry is still fresh.
+_MIN_TOKEN_GENERATION: Dict[int, int] = {}
+
+
+def is_token_verified(username: str, iat: int, user_id: int, generation: int) -> bool:
+    """True if this token's generation was checked recently and hasn't been
+    revoked since, i.e. it can be trusted without a DB round trip."""
+    if not _enabled():
+        return False
+    entry = _VERIFIED_TOKENS.get((username, iat))
+    if entry is None:
+        return False
+    verified_generation, loaded_at = entry
+    if time.monotonic() - loaded_at > settings.auth_cache_ttl_s:
+        _VERIFIED_TOKENS.pop((username, iat), None)
+        return False
+    return (
+        verified_generation == generation
+        and generation >= _MIN_TOKEN_GENERATION.get(user_id, 0)
+    )
+
+
+def mark_token_verified(username: str, iat: int, user_id: int, generation: int) -> None:
+    """Record that the token's generation matched the user's row."""
+    _MIN_TOKEN_GENERATION[user_id] = max(
+        generation, _MIN_TOKEN_GENERATION.get(user_id, 0)
+    )
+    if not _enabled():
+        return
+    key = (username, iat)
+    if (
+        key not in _VERIFIED_TOKENS
+        and len(_VERIFIED_TOKENS) >= settings.auth_cache_max_users
+    ):
+        # Evict the oldest entry (dicts preserve insertion order).
+        _VERIFIED_TOKENS.pop(next(iter(_VERIFIED_TOKENS)), None)
+    _VERIFIED_TOKENS[key] = (generation, time.monotonic())
+
+
+def revoke_tokens(user_id: int, min_generation: int) -> None:
+    """Refuse this user's tokens below ``min_generation`` on this worker."""
+    _MIN_TOKEN_GENERATION[user_id] = max(
+        min_generation, _MIN_TOKEN_GENERATION.get(user_id, 0)
+    )
+
+
+def clear() -> None:
+    """Drop all cached state, including the assessment → revision map and
+    token verifications."""
+    _USER_ACCESS_CACHE.clear()
+    _ASSESSMENT_REVISIONS_CACHE.clear()
+    _VERIFIED_TOKENS.clear()
+    _MIN_TOKEN_GENERATION.clear()
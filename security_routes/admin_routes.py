@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import jwt
 from sqlalchemy import select
@@ -9,14 +9,17 @@ from database.models import Group as GroupDB
 from database.models import UserDB, UserGroup
 from models import Group, User
 
-from .utilities import ALGORITHM, SECRET_KEY, hash_password
+from . import access_cache
+from .utilities import hash_password_async, request_token_claims
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="latest/token")
 
 
 async def get_current_admin(
-    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -24,7 +27,7 @@ async def get_current_admin(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = request_token_claims(request, token)
         if payload is None:
             raise credentials_exception
         username: str = payload.get("sub")
@@ -62,7 +65,7 @@ async def create_user(
             status_code=400, detail="Admin users cannot be created using this endpoint"
         )
 
-    hashed_password = hash_password(password)
+    hashed_password = await hash_password_async(password)
 
     #  Ensure the user is not an admin
     db_user = UserDB(
@@ -157,6 +160,7 @@ async def link_user_to_group(
     new_link = UserGroup(user_id=user.id, group_id=group.id)
     db.add(new_link)
     await db.commit()
+    access_cache.invalidate_user(user.id)
     return {"message": f"User {username} successfully linked to group {groupname}"}
 
 
@@ -195,7 +199,11 @@ async def unlink_user_from_group(
         raise HTTPException(status_code=404, detail="User is not linked to this group")
 
     await db.delete(link)
+    # Tokens issued while the user was in the group stop working.
+    user.token_generation = (user.token_generation or 0) + 1
     await db.commit()
+    access_cache.invalidate_user(user.id)
+    access_cache.revoke_tokens(user.id, user.token_generation)
     return {"message": f"User {username} successfully unlinked from group {groupname}"}
 
 
@@ -237,8 +245,12 @@ async def delete_user(
 
     # Optional: Perform any cleanup or checks before deleting the user
 
+    user_id = user.id
+    revoked_generation = (user.token_generation or 0) + 1
     await db.delete(user)
     await db.commit()
+    access_cache.invalidate_user(user_id)
+    access_cache.revoke_tokens(user_id, revoked_generation)
     return {"message": f"User '{username}' successfully deleted"}
 
 
@@ -256,6 +268,9 @@ async def change_password(
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    user.hashed_password = hash_password(new_password)
+    user.hashed_password = await hash_password_async(new_password)
+    # Tokens issued under the old password stop working.
+    user.token_generation = (user.token_generation or 0) + 1
     await db.commit()
+    access_cache.revoke_tokens(user.id, user.token_generation)
     return {"message": f"Password for user '{username}' successfully changed"}
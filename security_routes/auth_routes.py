@@ -3,24 +3,27 @@ import socket
 from datetime import datetime, timedelta
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from config import settings
 from database.dependencies import get_db  # Function to get the database session
 from database.models import Group as GroupDB
 from database.models import UserDB, UserGroup
 from models import Group, Token, User
 from utils.logging_config import setup_logger
 
+from . import access_cache
 from .utilities import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     ALGORITHM,
     SECRET_KEY,
-    verify_password,
+    request_token_claims,
+    verify_password_async,
 )
 
 router = APIRouter()
@@ -34,24 +37,62 @@ async def authenticate_user(username: str, password: str, db: AsyncSession):
     stmt = select(UserDB).where(UserDB.username == username)
     result = await db.execute(stmt)
     user = result.scalars().first()
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await verify_password_async(password, user.hashed_password):
         return False
     return user
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
+    now = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+        expire = now + timedelta(minutes=15)
+    to_encode.update({"exp": expire, "iat": now})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+# Claims a token must carry for get_current_user to skip the user lookup.
+_USER_CLAIMS = ("sub", "uid", "is_admin", "gen", "iat")
+
+
+async def _user_from_claims(payload: dict, db: AsyncSession) -> Optional[UserDB]:
+    """Build the current user from verified JWT claims (AUTH_TOKEN_CLAIMS).
+
+    The only DB access is a scalar read of the user's token generation, and
+    only the first time a worker sees a token within the auth cache TTL;
+    after that, requests carrying it resolve with no round trip (and no pool
+    checkout). Returns None if the user is gone or the token was revoked.
+
+    The returned UserDB is transient (never attached to a session): it has
+    id, username and is_admin, which is all handlers read. Authorization
+    still goes through security_routes.utilities, so the `groups` claim is
+    informational only.
+    """
+    username = payload["sub"]
+    user_id = payload["uid"]
+    generation = payload["gen"]
+    iat = payload["iat"]
+    if not access_cache.is_token_verified(username, iat, user_id, generation):
+        current_generation = await db.scalar(
+            select(UserDB.token_generation).where(
+                UserDB.id == user_id, UserDB.username == username
+            )
+        )
+        if current_generation is None:
+            return None
+        access_cache.mark_token_verified(username, iat, user_id, current_generation)
+        if current_generation != generation:
+            return None
+    return UserDB(id=user_id, username=username, is_admin=payload["is_admin"])
+
+
 async def get_current_user(
-    db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -59,16 +100,20 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = request_token_claims(request, token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
-        result = await db.execute(
-            select(UserDB)
-            .options(selectinload(UserDB.groups))
-            .where(UserDB.username == username)
-        )
-        user = result.scalars().first()
+        if settings.auth_token_claims and all(c in payload for c in _USER_CLAIMS):
+            user = await _user_from_claims(payload, db)
+        else:
+            # Default path, and tokens issued before the claims existed.
+            result = await db.execute(
+                select(UserDB)
+                .options(selectinload(UserDB.groups))
+                .where(UserDB.username == username)
+            )
+            user = result.scalars().first()
         if user is None:
             raise credentials_exception
         logger.debug(
@@ -96,9 +141,19 @@ async def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    group_ids = (
+        await db.scalars(select(UserGroup.group_id).where(UserGroup.user_id == user.id))
+    ).all()
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username, "is_admin": user.is_admin},
+        data={
+            "sub": user.username,
+            "is_admin": user.is_admin,
+            # Read by get_current_user when AUTH_TOKEN_CLAIMS is enabled.
+            "uid": user.id,
+            "groups": list(group_ids),
+            "gen": user.token_generation,
+        },
         expires_delta=access_token_expires,
     )
     return {"access_token": access_token, "token_type": "bearer"}
@@ -1,19 +1,25 @@
 # utilities.py
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple
+
 import bcrypt
-from sqlalchemy import or_
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import aliased
 from sqlalchemy.sql import select
 
-from config import Settings
+from config import Settings, settings
 from database.models import (  # Your SQLAlchemy model
     Assessment,
     BibleRevision,
-    BibleVersion,
     BibleVersionAccess,
     UserDB,
     UserGroup,
 )
+from security_routes import access_cache
 
 # Read a fresh Settings() (rather than the shared `settings` singleton) so the
 # fail-fast check re-evaluates the *current* environment every time this module
@@ -29,6 +35,51 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 
+# JWT verification
+#
+# token -> verified claims. A token's signature can't change, so once it has
+# verified, a later request carrying it (clients poll with the same token for
+# its whole 30-minute life) only needs its `exp` re-checked, not another
+# HMAC + base64/JSON decode. Dict order tracks recency for LRU eviction.
+# Failed verifications are not cached.
+_VERIFIED_JWT_CACHE: Dict[str, dict] = {}
+
+# Key under which LoggingMiddleware leaves (token, claims) in the ASGI scope's
+# "state" dict (i.e. `request.state`) for the auth dependencies to reuse.
+REQUEST_CLAIMS_STATE_KEY = "jwt_claims"
+
+
+def decode_token(token: str) -> dict:
+    """`jwt.decode` with this app's key, served from the verified-token cache
+    when possible. Raises JWTError like `jwt.decode`; callers must treat the
+    returned dict as read-only."""
+    claims = _VERIFIED_JWT_CACHE.get(token)
+    if claims is not None:
+        exp = claims.get("exp")
+        if exp is not None and exp < time.time():
+            del _VERIFIED_JWT_CACHE[token]
+            raise ExpiredSignatureError("Signature has expired.")
+        _VERIFIED_JWT_CACHE[token] = _VERIFIED_JWT_CACHE.pop(token)
+        return claims
+
+    claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    max_tokens = settings.jwt_cache_max_tokens
+    if max_tokens > 0:
+        while len(_VERIFIED_JWT_CACHE) >= max_tokens:
+            _VERIFIED_JWT_CACHE.pop(next(iter(_VERIFIED_JWT_CACHE)), None)
+        _VERIFIED_JWT_CACHE[token] = claims
+    return claims
+
+
+def request_token_claims(request, token: str) -> dict:
+    """Claims for ``token``, reusing the ones LoggingMiddleware already
+    verified for this request if it was the same token."""
+    shared = request.scope.get("state", {}).get(REQUEST_CLAIMS_STATE_KEY)
+    if shared is not None and shared[0] == token:
+        return shared[1]
+    return decode_token(token)
+
+
 # Password hashing and verification
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     hashed_password_bytes = hashed_password.encode()
@@ -39,129 +90,141 @@ def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
 
-# Authorization utilities
-async def is_user_authorized_for_bible_version(user_id, bible_version_id, db):
-    # Admins have access to all versions
-    result = await db.execute(select(UserDB).where(UserDB.id == user_id))
-    user = result.scalars().first()
-    if user and user.is_admin:
-        return True
-    # Fetch the groups the user belongs to
-    user_groups = (
-        select(UserGroup.group_id).where(UserGroup.user_id == user_id)
-    ).subquery()
-
-    # Check if the Bible version is accessible by one of the user's groups
+# bcrypt is deliberately slow (~250ms per check at the default cost) and would
+# block the worker's event loop — stalling every other in-flight request — if
+# called inline from an async handler. The async wrappers below run it on this
+# dedicated pool instead (bcrypt releases the GIL while hashing). The pool is
+# small on purpose: a login burst queues here rather than eating every core of
+# the container, and it can't starve the default executor other code uses.
+_PASSWORD_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers, thread_name_prefix="password-hash"
+)
 
-    stmt = (
-        select(BibleVersion)
-        .join(
-            BibleVersionAccess, BibleVersion.id == BibleVersionAccess.bible_version_id
+# In-flight verifications keyed by (stored hash, digest of the attempted
+# password). The stored hash is salted, so it identifies the user; identical
+# concurrent attempts — a client retrying a slow login — await one bcrypt call
+# instead of each queueing their own. Entries are removed on completion, so
+# nothing is cached past the check itself and a later attempt always re-hashes.
+_INFLIGHT_PASSWORD_CHECKS: Dict[Tuple[str, bytes], asyncio.Future] = {}
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """`verify_password` on the password pool, coalescing identical attempts."""
+    loop = asyncio.get_running_loop()
+    key = (hashed_password, hashlib.sha256(plain_password.encode()).digest())
+    future = _INFLIGHT_PASSWORD_CHECKS.get(key)
+    # Futures belong to one event loop; never await one from another loop.
+    if future is None or future.get_loop() is not loop:
+        future = loop.run_in_executor(
+            _PASSWORD_EXECUTOR, verify_password, plain_password, hashed_password
         )
-        .where(
-            BibleVersion.id == bible_version_id,
-            BibleVersionAccess.group_id.in_(user_groups),
-        )
-    )
-    result = await db.execute(stmt)
-    accessible = result.scalars().first()
+        _INFLIGHT_PASSWORD_CHECKS[key] = future
 
-    return accessible is not None
+        def _forget(done: asyncio.Future) -> None:
+            if _INFLIGHT_PASSWORD_CHECKS.get(key) is done:
+                del _INFLIGHT_PASSWORD_CHECKS[key]
 
+        future.add_done_callback(_forget)
+    # Shield so one cancelled waiter (client disconnect) doesn't cancel the
+    # shared check out from under the others.
+    return await asyncio.shield(future)
 
-async def is_user_authorized_for_revision(user_id, revision_id, db):
-    # Admins have access to all revisions
-    result = await db.execute(select(UserDB).where(UserDB.id == user_id))
-    user = result.scalars().first()
-    if user and user.is_admin:
-        return True
 
-    # Fetch the groups the user belongs to
-    user_groups = (
-        select(UserGroup.group_id).where(UserGroup.user_id == user_id)
-    ).subquery()
+async def hash_password_async(password: str) -> str:
+    """`hash_password` on the password pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_PASSWORD_EXECUTOR, hash_password, password)
 
-    # Check if the revision's Bible version is accessible by one of the user's groups
 
+# Authorization utilities
+#
+# Every check below answers from the per-worker cache in
+# `security_routes.access_cache` when it can. Only grants are served from the
+# cache: on a miss the user's access is reloaded from the DB before answering
+# no, so a version/revision created on another worker is visible immediately.
+async def _load_user_access(user_id: int, db: AsyncSession) -> access_cache.UserAccess:
+    """Read a user's admin flag and authorized version/revision ids from the
+    DB (two round trips) and store the result in the access cache."""
+    result = await db.execute(select(UserDB.is_admin).where(UserDB.id == user_id))
+    is_admin = bool(result.scalar())
+    if is_admin:
+        # Admins are authorized for everything; no need to enumerate sets.
+        return access_cache.put_user_access(user_id, True, frozenset(), frozenset())
+
+    # One query yields both sets: each accessible version, plus (outer-joined)
+    # every revision under it.
     stmt = (
-        select(BibleVersion)
-        .join(BibleRevision, BibleVersion.id == BibleRevision.bible_version_id)
-        .join(
-            BibleVersionAccess,
-            BibleVersionAccess.bible_version_id == BibleVersion.id,
-        )
-        .where(
-            BibleRevision.id == revision_id,
-            BibleVersionAccess.group_id.in_(user_groups),
+        select(BibleVersionAccess.bible_version_id, BibleRevision.id)
+        .join(UserGroup, UserGroup.group_id == BibleVersionAccess.group_id)
+        .outerjoin(
+            BibleRevision,
+            BibleRevision.bible_version_id == BibleVersionAccess.bible_version_id,
         )
+        .where(UserGroup.user_id == user_id)
     )
-    result = await db.execute(stmt)
-    accessible = result.scalars().first()
-
-    return accessible is not None
+    rows = (await db.execute(stmt)).all()
+    version_ids = frozenset(version_id for version_id, _ in rows)
+    revision_ids = frozenset(rev_id for _, rev_id in rows if rev_id is not None)
+    return access_cache.put_user_access(user_id, False, version_ids, revision_ids)
 
 
-async def get_authorized_revision_ids(user_id: int, db: AsyncSession) -> set[int]:
-    result = await db.execute(select(UserDB).where(UserDB.id == user_id))
-    user = result.scalars().first()
-    if user and user.is_admin:
-        result = await db.execute(select(BibleRevision.id))
-        return set(result.scalars().all())
+async def _check_user_access(user_id: int, db: AsyncSession, granted) -> bool:
+    """Evaluate ``granted(access)`` against the cached entry, reloading from
+    the DB once if the cached entry doesn't grant it."""
+    access = access_cache.get_user_access(user_id)
+    if access is not None and (access.is_admin or granted(access)):
+        return True
+    access = await _load_user_access(user_id, db)
+    return access.is_admin or granted(access)
 
-    user_groups_subq = (
-        select(UserGroup.group_id).where(UserGroup.user_id == user_id)
-    ).subquery()
 
-    stmt = (
-        select(BibleRevision.id)
-        .join(BibleVersion, BibleVersion.id == BibleRevision.bible_version_id)
-        .join(
-            BibleVersionAccess,
-            BibleVersionAccess.bible_version_id == BibleVersion.id,
-        )
-        .where(BibleVersionAccess.group_id.in_(user_groups_subq))
+async def is_user_authorized_for_bible_version(user_id, bible_version_id, db):
+    # Admins have access to all versions; others through a group's access row.
+    return await _check_user_access(
+        user_id, db, lambda access: bible_version_id in access.version_ids
     )
 
-    result = await db.execute(stmt)
-    return set(result.scalars().all())
 
+async def is_user_authorized_for_revision(user_id, revision_id, db):
+    # Admins have access to all revisions; others when the revision's Bible
+    # version is accessible by one of their groups.
+    return await _check_user_access(
+        user_id, db, lambda access: revision_id in access.revision_ids
+    )
 
-async def is_user_authorized_for_assessment(user_id, assessment_id, db):
-    # Admins have access to all assessments
-    user_result = await db.execute(select(UserDB).where(UserDB.id == user_id))
-    user = user_result.scalars().first()
-    if user and user.is_admin:
-        return True
 
-    user_groups = (
-        select(UserGroup.group_id).where(UserGroup.user_id == user.id)
-    ).subquery()
+async def get_authorized_revision_ids(user_id: int, db: AsyncSession) -> set[int]:
+    # Callers use the full set to filter listings, where a revision missing
+    # from a stale entry can't be told apart from an unauthorized one, so
+    # always reload (refreshing the cache for the membership checks as well).
+    access = await _load_user_access(user_id, db)
+    if access.is_admin:
+        result = await db.execute(select(BibleRevision.id))
+        return set(result.scalars().all())
+    return set(access.revision_ids)
 
-    # Get versions the user has access to through their access to groups
-    version_ids = (
-        select(BibleVersionAccess.bible_version_id).where(
-            BibleVersionAccess.group_id.in_(user_groups)
-        )
-    ).subquery()
-
-    ReferenceRevision = aliased(BibleRevision)
-
-    # Check if the specific assessment is accessible
-    assessment_query = (
-        select(Assessment)
-        .join(BibleRevision, BibleRevision.id == Assessment.revision_id)
-        .outerjoin(ReferenceRevision, ReferenceRevision.id == Assessment.reference_id)
-        .where(Assessment.id == assessment_id)
-        .filter(
-            BibleRevision.bible_version_id.in_(version_ids),
-            or_(
-                Assessment.reference_id.is_(None),
-                ReferenceRevision.bible_version_id.in_(version_ids),
-            ),
+
+async def is_user_authorized_for_assessment(user_id, assessment_id, db):
+    revisions = access_cache.get_assessment_revisions(assessment_id)
+    if revisions is None:
+        result = await db.execute(
+            select(Assessment.revision_id, Assessment.reference_id).where(
+                Assessment.id == assessment_id
+            )
         )
+        row = result.first()
+        if row is None:
+            # Admins have access to all assessments, even unknown ids.
+            return await _check_user_access(user_id, db, lambda access: False)
+        revisions = tuple(row)
+        access_cache.put_assessment_revisions(assessment_id, *revisions)
+    revision_id, reference_id = revisions
+
+    # Both the assessed revision and (if any) the reference must belong to
+    # versions the user can reach through their groups.
+    return await _check_user_access(
+        user_id,
+        db,
+        lambda access: revision_id in access.revision_ids
+        and (reference_id is None or reference_id in access.revision_ids),
     )
-
-    assessment_result = await db.execute(assessment_query)
-    accessible = assessment_result.scalars().first()
-
-    return accessible is not None
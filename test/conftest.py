@@ -33,7 +33,14 @@ from sqlalchemy import create_engine, select  # noqa: E402
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
 from sqlalchemy.orm import sessionmaker  # noqa: E402
 
+import revision_text_cache  # noqa: E402
+from agent_routes.v3 import morpheme_segmentation  # noqa: E402
 from app import app  # noqa: E402
+from assessment_routes.v3 import (  # noqa: E402
+    baseline_stats,
+    tfidf_corpus,
+    tfidf_encoder,
+)
 from database.models import (  # noqa: E402
     Assessment,
     Base,
@@ -49,6 +56,7 @@ from database.models import (  # noqa: E402
     UserGroup,
     VerseReference,
 )
+from security_routes import access_cache  # noqa: E402
 
 # Fixture engines must point at the same database as the app under test, so
 # derive them from AQUA_DB (defaulted above) instead of hardcoding the URL —
@@ -721,6 +729,13 @@ def teardown_database(db_session):
                 connection.execute(table_name.delete())
             connection.execute("SET session_replication_role = DEFAULT;")
             transaction.commit()
+    # Ids are reused once tables are recreated; drop per-worker caches.
+    access_cache.clear()
+    baseline_stats.clear()
+    morpheme_segmentation.clear()
+    revision_text_cache.clear()
+    tfidf_corpus.clear()
+    tfidf_encoder.clear()
 
 
 async def teardown_database_async(session):
@@ -733,6 +748,12 @@ async def teardown_database_async(session):
         await session.execute(table.delete())
     await session.execute("SET session_replication_role = DEFAULT;")
     await session.commit()
+    access_cache.clear()
+    baseline_stats.clear()
+    morpheme_segmentation.clear()
+    revision_text_cache.clear()
+    tfidf_corpus.clear()
+    tfidf_encoder.clear()
 
 
 if __name__ == "__main__":
@@ -690,6 +690,51 @@ def test_get_all_word_alignments_with_pagination(
     assert data[0]["score"] >= data[1]["score"]
 
 
+def test_get_all_word_alignments_cursor_walk_matches_offset_pages(
+    client, regular_token1, test_version_id, test_version_id_2
+):
+    """Walking with X-Next-Cursor yields the same rows, in the same order, as
+    OFFSET pages, including across rows that tie on score."""
+    bulk_data = {
+        "source_version_id": test_version_id,
+        "target_version_id": test_version_id_2,
+        "alignments": [
+            {"source_word": f"cursor_{i}", "target_word": f"kiashiria_{i}", "score": s}
+            for i, s in enumerate([0.81, 0.8, 0.8, 0.8, 0.79])
+        ],
+    }
+    response = client.post(
+        f"{prefix}/agent/word-alignment/bulk",
+        json=bulk_data,
+        headers={"Authorization": f"Bearer {regular_token1}"},
+    )
+    assert response.status_code == 200
+
+    url = f"{prefix}/agent/word-alignment/all"
+    params = {
+        "source_version_id": test_version_id,
+        "target_version_id": test_version_id_2,
+    }
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    everything = client.get(url, params=params, headers=headers).json()
+
+    walked = []
+    response = client.get(
+        url, params={**params, "page": 1, "page_size": 2}, headers=headers
+    )
+    while True:
+        assert response.status_code == 200
+        walked.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        response = client.get(
+            url, params={**params, "cursor": cursor, "page_size": 2}, headers=headers
+        )
+
+    assert [a["id"] for a in walked] == [a["id"] for a in everything]
+
+
 def test_get_all_word_alignments_invalid_page(
     client, regular_token1, test_version_id, test_version_id_2
 ):
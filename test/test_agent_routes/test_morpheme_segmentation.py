@@ -0,0 +1,103 @@
+"""Unit tests for morpheme_segmentation: the deduplicating, memoizing engine
+that /tokenizer/index and /tokenizer/word-index segment words through.
+
+The routes are covered by test_tokenizer_routes; these check that the engine
+agrees with viterbi_segment on both the thread and process-pool paths, and
+its memo bookkeeping.
+"""
+
+import pytest
+
+from agent_routes.v3 import morpheme_segmentation
+from config import settings
+from utils.morpheme_tokenizer import viterbi_segment
+
+MORPHEMES = ["wa", "na", "ku", "pend", "a", "ni", "m", "tu"]
+WORDS = ["wanakupenda", "mtu", "watu", "xyz", "nina", "wanakupenda", ""]
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    morpheme_segmentation.clear()
+    yield
+    morpheme_segmentation.clear()
+
+
+def _expected(words, morphemes):
+    max_len = max(len(m) for m in morphemes)
+    return {w: tuple(viterbi_segment(w, set(morphemes), max_len)) for w in words}
+
+
+@pytest.mark.asyncio
+async def test_segments_each_distinct_word_once():
+    inventory = morpheme_segmentation.inventory("swh", MORPHEMES)
+
+    segmented = await morpheme_segmentation.segment(inventory, iter(WORDS))
+
+    assert segmented == _expected(WORDS, MORPHEMES)
+    assert list(segmented) == list(dict.fromkeys(WORDS))
+
+
+@pytest.mark.asyncio
+async def test_pool_agrees_with_the_thread_path(monkeypatch):
+    monkeypatch.setattr(morpheme_segmentation, "_POOL_MIN_WORDS", 1)
+    monkeypatch.setattr(settings, "morpheme_segment_workers", 1)
+    monkeypatch.setattr(morpheme_segmentation, "_POOL", None)
+    inventory = morpheme_segmentation.inventory("swh", MORPHEMES)
+    words = [f"{w}{i % 7}" for i, w in enumerate(WORDS * 20)]
+
+    try:
+        segmented = await morpheme_segmentation.segment(inventory, words)
+    finally:
+        morpheme_segmentation._pool().shutdown()
+
+    assert segmented == _expected(words, MORPHEMES)
+
+
+@pytest.mark.asyncio
+async def test_memo_is_keyed_by_the_inventory(monkeypatch):
+    inventory = morpheme_segmentation.inventory("swh", MORPHEMES)
+    await morpheme_segmentation.segment(inventory, ["watu"])
+
+    calls = []
+
+    async def _segment_uncached(inv, words):
+        calls.append(words)
+        return [()] * len(words)
+
+    monkeypatch.setattr(morpheme_segmentation, "_segment_uncached", _segment_uncached)
+
+    # Same inventory, in any order: only the new word is segmented.
+    same = morpheme_segmentation.inventory("swh", reversed(MORPHEMES))
+    segmented = await morpheme_segmentation.segment(same, ["watu", "mtu"])
+    assert calls == [["mtu"]]
+    assert segmented["watu"] == (("morph", "wa"), ("morph", "tu"))
+
+    # A grown inventory segments everything again.
+    grown = morpheme_segmentation.inventory("swh", MORPHEMES + ["watu"])
+    await morpheme_segmentation.segment(grown, ["watu"])
+    assert calls == [["mtu"], ["watu"]]
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_inventory_is_evicted(monkeypatch):
+    monkeypatch.setattr(morpheme_segmentation, "_BYTES_PER_WORD", 1024 * 1024 // 3)
+    monkeypatch.setattr(settings, "morpheme_segment_cache_mb", 1)
+    inventories = [
+        morpheme_segmentation.inventory(iso, MORPHEMES) for iso in ("aaa", "bbb")
+    ]
+
+    await morpheme_segmentation.segment(inventories[0], ["watu", "mtu"])
+    await morpheme_segmentation.segment(inventories[1], ["nina"])
+    assert set(morpheme_segmentation._SEGMENT_CACHE) == {
+        ("aaa", inventories[0].digest),
+        ("bbb", inventories[1].digest),
+    }
+
+    # Room for three words: a fourth evicts the other inventory, and past
+    # that, words are segmented but not remembered.
+    await morpheme_segmentation.segment(inventories[1], ["a", "ku", "m"])
+    assert list(morpheme_segmentation._SEGMENT_CACHE) == [
+        ("bbb", inventories[1].digest)
+    ]
+    assert len(morpheme_segmentation._SEGMENT_CACHE["bbb", inventories[1].digest]) == 3
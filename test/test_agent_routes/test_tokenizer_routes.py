@@ -1,8 +1,11 @@
 """Tests for morpheme tokenizer storage API endpoints."""
 
+import asyncio
 import unicodedata
 
+import background_jobs
 from database.models import (
+    BackgroundJob,
     BibleRevision,
     BibleVersion,
     LanguageMorpheme,
@@ -10,6 +13,7 @@ from database.models import (
     TokenizerRun,
     TrainingArtifact,
     VerseMorphemeIndex,
+    VerseMorphemeIndexBuild,
     VerseText,
     WordMorphemeIndex,
 )
@@ -37,6 +41,9 @@ def _cleanup(db_session):
         db_session.query(WordMorphemeIndex).filter(
             WordMorphemeIndex.iso_639_3 == iso
         ).delete()
+        db_session.query(VerseMorphemeIndexBuild).filter(
+            VerseMorphemeIndexBuild.iso_639_3 == iso
+        ).delete()
         db_session.query(TokenizerRun).filter(TokenizerRun.iso_639_3 == iso).delete()
         db_session.query(LanguageMorpheme).filter(
             LanguageMorpheme.iso_639_3 == iso
@@ -629,6 +636,149 @@ def test_index_idempotency(client, regular_token1, test_revision_id, db_session)
     _cleanup(db_session)
 
 
+def _index_rows(db_session, vt_objs):
+    db_session.expire_all()
+    return {
+        (row.verse_text_id, row.morpheme_id): (row.id, row.count, row.surface_forms)
+        for row in db_session.query(VerseMorphemeIndex).filter(
+            VerseMorphemeIndex.verse_text_id.in_([vt.id for vt in vt_objs])
+        )
+    }
+
+
+def _without_ids(rows):
+    return {key: value[1:] for key, value in rows.items()}
+
+
+def test_incremental_index_matches_full_rebuild(
+    client, regular_token1, test_revision_id, db_session
+):
+    """After morphemes are added or removed, a re-index re-segments only the
+    verses containing them and leaves the index a full rebuild would."""
+    _cleanup(db_session)
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+
+    verses = [
+        ("GEN 4:1", "GEN", 4, 1, "Umumanyizyi bhabhomba"),
+        ("GEN 4:2", "GEN", 4, 2, "Akabhabhomba"),
+        ("GEN 4:3", "GEN", 4, 3, "Umumanyizyi"),
+    ]
+    vt_objs = _setup_morphemes_and_verses(
+        db_session, client, headers, test_revision_id, verses
+    )
+    body = {"iso_639_3": INDEX_ISO, "revision_id": test_revision_id}
+    index_url = f"/{prefix}/tokenizer/index"
+
+    first = client.post(index_url, json=body, headers=headers)
+    assert first.status_code == 200, first.text
+    assert first.json()["verses_reindexed"] == 3
+
+    # Nothing changed: nothing re-segmented or rewritten.
+    before = _index_rows(db_session, vt_objs)
+    again = client.post(index_url, json=body, headers=headers).json()
+    assert again["verses_reindexed"] == 0
+    assert (
+        again["unique_morpheme_verse_pairs"]
+        == first.json()["unique_morpheme_verse_pairs"]
+    )
+    assert _index_rows(db_session, vt_objs) == before
+
+    # A new morpheme occurring only in GEN 4:2.
+    resp = client.post(
+        f"/{prefix}/tokenizer/runs",
+        json=_index_run_payload(
+            test_revision_id, [{"morpheme": "aka", "morpheme_class": "GRAMMATICAL"}]
+        ),
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+    added = client.post(index_url, json=body, headers=headers).json()
+    assert added["verses_reindexed"] == 1
+    incremental = _index_rows(db_session, vt_objs)
+    # Rows of the untouched verses were left as they were.
+    assert {
+        key: value for key, value in incremental.items() if key[0] != vt_objs[1].id
+    } == {key: value for key, value in before.items() if key[0] != vt_objs[1].id}
+
+    full = client.post(index_url, json={**body, "full_rebuild": True}, headers=headers)
+    assert full.json()["verses_reindexed"] == 3
+    assert full.json()["unique_morpheme_verse_pairs"] == (
+        added["unique_morpheme_verse_pairs"]
+    )
+    assert _without_ids(_index_rows(db_session, vt_objs)) == _without_ids(incremental)
+
+    # A removed morpheme: only the verses containing "bha" are re-indexed.
+    db_session.query(LanguageMorpheme).filter(
+        LanguageMorpheme.iso_639_3 == INDEX_ISO, LanguageMorpheme.morpheme == "bha"
+    ).delete()
+    db_session.commit()
+    removed = client.post(index_url, json=body, headers=headers).json()
+    assert removed["verses_reindexed"] == 2
+    incremental = _index_rows(db_session, vt_objs)
+    full = client.post(index_url, json={**body, "full_rebuild": True}, headers=headers)
+    assert full.json()["unique_morpheme_verse_pairs"] == (
+        removed["unique_morpheme_verse_pairs"]
+    )
+    assert _without_ids(_index_rows(db_session, vt_objs)) == _without_ids(incremental)
+
+    # Editing a verse invalidates the build: the next index is a full one.
+    db_session.query(VerseText).filter(VerseText.id == vt_objs[2].id).update(
+        {"text": "Umumanyizyi bhomba"}
+    )
+    db_session.commit()
+    edited = client.post(index_url, json=body, headers=headers).json()
+    assert edited["verses_reindexed"] == 3
+
+    _cleanup_verses(db_session, vt_objs)
+    _cleanup(db_session)
+
+
+def test_index_in_background(client, regular_token1, test_revision_id, db_session):
+    """background=true queues both indexers; the jobs' results are the
+    synchronous responses."""
+    _cleanup(db_session)
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+
+    verses = [
+        ("GEN 3:1", "GEN", 3, 1, "Umumanyizyi bhabhomba"),
+    ]
+    vt_objs = _setup_morphemes_and_verses(
+        db_session, client, headers, test_revision_id, verses
+    )
+
+    # A full rebuild each time, so both calls do the same work.
+    body = {
+        "iso_639_3": INDEX_ISO,
+        "revision_id": test_revision_id,
+        "full_rebuild": True,
+    }
+    for path in ("index", "word-index"):
+        expected = client.post(
+            f"/{prefix}/tokenizer/{path}", json=body, headers=headers
+        )
+        queued = client.post(
+            f"/{prefix}/tokenizer/{path}?background=true", json=body, headers=headers
+        )
+        assert queued.status_code == 202, queued.text
+
+        assert asyncio.run(background_jobs.run_pending()) == 1
+        job = client.get(f"/{prefix}/jobs/{queued.json()['id']}", headers=headers)
+        assert job.json()["status"] == "complete"
+        assert job.json()["result"] == expected.json()
+
+    # Authorization and validation still answer synchronously.
+    wrong_iso = client.post(
+        f"/{prefix}/tokenizer/index?background=true",
+        json={"iso_639_3": TEST_ISO, "revision_id": test_revision_id},
+        headers=headers,
+    )
+    assert wrong_iso.status_code == 422
+
+    db_session.query(BackgroundJob).delete()
+    _cleanup_verses(db_session, vt_objs)
+    _cleanup(db_session)
+
+
 def test_cross_revision_search(
     client, regular_token1, test_revision_id, test_revision_id_2, db_session
 ):
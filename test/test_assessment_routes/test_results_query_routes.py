@@ -1,4 +1,8 @@
+import csv
 import dataclasses
+import io
+import json
+import statistics
 from datetime import date, datetime
 
 import pandas as pd
@@ -9,6 +13,7 @@ from database.models import (
     AlignmentTopSourceScores,
     Assessment,
     AssessmentResult,
+    AssessmentResultRollup,
     BibleRevision,
     BibleVersion,
     BibleVersionAccess,
@@ -1772,6 +1777,87 @@ def test_ngrams_result_pagination_covers_corpus_without_overlap(
         assert seen_vrefs_by_ngram[ngram] == set(vrefs), ngram
 
 
+def test_ngrams_result_cursor_walk_matches_offset_pages(
+    client, regular_token1, ngrams_dataset
+):
+    assessment_id, seeds = ngrams_dataset
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    params = {"assessment_id": assessment_id, "page_size": 3}
+
+    offset_ids = []
+    page = 1
+    while True:
+        data = client.get(
+            "/v3/ngrams_result", params={**params, "page": page}, headers=headers
+        ).json()
+        if not data["results"]:
+            break
+        offset_ids.extend(r["id"] for r in data["results"])
+        page += 1
+
+    cursor_ids = []
+    data = client.get(
+        "/v3/ngrams_result", params={**params, "page": 1}, headers=headers
+    ).json()
+    while True:
+        assert data["total_count"] == len(seeds)
+        cursor_ids.extend(r["id"] for r in data["results"])
+        if data["next_cursor"] is None:
+            break
+        data = client.get(
+            "/v3/ngrams_result",
+            params={**params, "cursor": data["next_cursor"]},
+            headers=headers,
+        ).json()
+
+    assert cursor_ids == offset_ids
+    assert len(cursor_ids) == len(seeds)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"cursor": "not-a-cursor", "page_size": 5},
+        {"cursor": "WyJ4Il0", "page_size": 5},  # ["x"]
+        {"cursor": "WzFd"},  # [1], no page_size
+        {"cursor": "WzFd", "page": 1, "page_size": 5},
+    ],
+    ids=["garbage", "wrong_key_type", "no_page_size", "with_page"],
+)
+def test_result_routes_reject_bad_cursor_params(
+    client, regular_token1, ngrams_dataset, params
+):
+    assessment_id, _ = ngrams_dataset
+    for path in ("/v3/result", "/v3/ngrams_result", "/v3/alignmentscores"):
+        response = client.get(
+            path,
+            params={"assessment_id": assessment_id, **params},
+            headers={"Authorization": f"Bearer {regular_token1}"},
+        )
+        assert response.status_code == 400, path
+
+
+@pytest.mark.parametrize("page_size", [0, -5])
+def test_result_routes_reject_cursor_with_non_positive_page_size(
+    client, regular_token1, ngrams_dataset, page_size
+):
+    """Without the check, page_size reaches Postgres as LIMIT 0 or LIMIT -5 (a
+    500)."""
+    assessment_id, _ = ngrams_dataset
+    for path in ("/v3/result", "/v3/alignmentscores"):
+        response = client.get(
+            path,
+            params={
+                "assessment_id": assessment_id,
+                "cursor": "WzFd",  # [1]
+                "page_size": page_size,
+            },
+            headers={"Authorization": f"Bearer {regular_token1}"},
+        )
+        assert response.status_code == 400, path
+        assert response.json()["detail"] == "Page size must be >= 1", path
+
+
 def test_ngrams_result_unauthorized_assessment_returns_403(
     client, regular_token2, ngrams_dataset
 ):
@@ -2548,3 +2634,709 @@ def test_textalignmentmatches_use_eflomal_false_is_fastalign(
     sources = {row["source_word"] for row in response.json()["results"]}
     assert "alpha" in sources
     assert "beta" not in sources
+
+
+def _result_pages(client, token, assessment_id):
+    """Every aggregate /result response the rollups can serve."""
+    responses = {}
+    for aggregate in ("chapter", "book", "text"):
+        for reverse in (False, True):
+            params = {
+                "assessment_id": assessment_id,
+                "aggregate": aggregate,
+                "reverse": reverse,
+            }
+            responses[(aggregate, reverse)] = client.get(
+                "/v3/result",
+                params=params,
+                headers={"Authorization": f"Bearer {token}"},
+            ).json()
+        params = {"assessment_id": assessment_id, "aggregate": aggregate}
+        if aggregate == "chapter":
+            params.update(book="luk", chapter=1)
+        elif aggregate == "book":
+            params.update(page=2, page_size=1)
+        responses[(aggregate, "filtered")] = client.get(
+            "/v3/result",
+            params=params,
+            headers={"Authorization": f"Bearer {token}"},
+        ).json()
+    return responses
+
+
+def test_result_aggregates_served_from_rollups_after_finish(
+    client, regular_token1, test_db_session, assessments_dataset
+):
+    """Finishing an assessment writes rollups that answer the aggregate views
+    exactly as the live grouping does; pushing results drops them again."""
+    assessment = Assessment(
+        revision_id=assessments_dataset.revision_id,
+        reference_id=assessments_dataset.reference_id,
+        type="word-alignment",
+        status="running",
+    )
+    test_db_session.add(assessment)
+    test_db_session.flush()
+    source_rows = (
+        test_db_session.query(AssessmentResult)
+        .filter(AssessmentResult.assessment_id == assessments_dataset.assessment_id)
+        .order_by(AssessmentResult.id)
+        .all()
+    )
+    for i, row in enumerate(source_rows):
+        test_db_session.add(
+            AssessmentResult(
+                assessment_id=assessment.id,
+                score=row.score,
+                flag=i % 7 == 0,
+                hide=i % 11 == 0,
+                vref=row.vref,
+                source=f"word{i}" if i % 3 else None,
+                book=row.book,
+                chapter=row.chapter,
+                verse=row.verse,
+            )
+        )
+    test_db_session.commit()
+    assessment_id = assessment.id
+
+    live = _result_pages(client, regular_token1, assessment_id)
+
+    response = client.patch(
+        f"/v3/assessment/{assessment_id}/status",
+        json={"status": "finished"},
+        headers={"Authorization": f"Bearer {regular_token1}"},
+    )
+    assert response.status_code == 200
+    rollup_levels = {
+        (r.level, r.source_not_null)
+        for r in test_db_session.query(AssessmentResultRollup).filter(
+            AssessmentResultRollup.assessment_id == assessment_id
+        )
+    }
+    assert rollup_levels == {
+        ("chapter", False),
+        ("book", False),
+        ("text", False),
+    }
+
+    assert _result_pages(client, regular_token1, assessment_id) == live
+
+    response = client.post(
+        f"/v3/assessment/{assessment_id}/results",
+        json=[{"vref": "LUK 1:1", "score": 0.5}],
+        headers={"Authorization": f"Bearer {regular_token1}"},
+    )
+    assert response.status_code == 200
+    test_db_session.expire_all()
+    assert (
+        test_db_session.query(AssessmentResultRollup)
+        .filter(AssessmentResultRollup.assessment_id == assessment_id)
+        .count()
+        == 0
+    )
+
+
+def test_rollup_total_count_matches_live_for_all_null_source_group(
+    client, regular_token1, test_db_session, assessments_dataset
+):
+    """A word-tests chapter whose sources are all null drops out of the
+    non-reverse rows but, as in the live grouping, still counts towards
+    ``total_count``."""
+    import asyncio
+
+    from assessment_routes.v3.results_query_routes import refresh_result_rollups
+    from database.dependencies import AsyncSessionLocal
+
+    assessment = Assessment(
+        revision_id=assessments_dataset.revision_id,
+        reference_id=assessments_dataset.reference_id,
+        type="word-tests",
+        status="running",
+    )
+    test_db_session.add(assessment)
+    test_db_session.flush()
+    source_rows = (
+        test_db_session.query(AssessmentResult)
+        .filter(AssessmentResult.assessment_id == assessments_dataset.assessment_id)
+        .order_by(AssessmentResult.id)
+        .all()
+    )
+    null_chapter = (source_rows[0].book, source_rows[0].chapter)
+    assert any((row.book, row.chapter) != null_chapter for row in source_rows)
+    for i, row in enumerate(source_rows):
+        test_db_session.add(
+            AssessmentResult(
+                assessment_id=assessment.id,
+                score=row.score,
+                vref=row.vref,
+                source=None if (row.book, row.chapter) == null_chapter else f"w{i}",
+                book=row.book,
+                chapter=row.chapter,
+                verse=row.verse,
+            )
+        )
+    test_db_session.commit()
+    assessment_id = assessment.id
+
+    live = _result_pages(client, regular_token1, assessment_id)
+    chapters = live[("chapter", False)]
+    assert "{} {}".format(*null_chapter) not in {r["vref"] for r in chapters["results"]}
+    assert chapters["total_count"] == live[("chapter", True)]["total_count"]
+    assert chapters["total_count"] == len(chapters["results"]) + 1
+
+    # word-tests isn't an AssessmentOut type, so write the rollups the
+    # status route would directly.
+    async def refresh():
+        async with AsyncSessionLocal() as db:
+            await refresh_result_rollups(assessment_id, "word-tests", db)
+            await db.commit()
+
+    asyncio.run(refresh())
+    assert (
+        test_db_session.query(AssessmentResultRollup)
+        .filter(
+            AssessmentResultRollup.assessment_id == assessment_id,
+            AssessmentResultRollup.source_not_null.is_(True),
+        )
+        .count()
+        > 0
+    )
+    assert _result_pages(client, regular_token1, assessment_id) == live
+
+
+@pytest.mark.parametrize("aggregate", [None, "chapter"])
+def test_result_cursor_walk_matches_offset_pages(
+    client, regular_token1, assessments_dataset, aggregate
+):
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    params = {"assessment_id": assessments_dataset.assessment_id, "page_size": 250}
+    if aggregate:
+        params["aggregate"] = aggregate
+        params["page_size"] = 2
+    everything = client.get(
+        "/v3/result",
+        params={k: v for k, v in params.items() if k != "page_size"},
+        headers=headers,
+    ).json()
+    assert everything["next_cursor"] is None
+
+    walked = []
+    data = client.get("/v3/result", params={**params, "page": 1}, headers=headers)
+    data = data.json()
+    while True:
+        assert data["total_count"] == everything["total_count"]
+        walked.extend(data["results"])
+        if data["next_cursor"] is None:
+            break
+        data = client.get(
+            "/v3/result",
+            params={**params, "cursor": data["next_cursor"]},
+            headers=headers,
+        ).json()
+
+    assert walked == everything["results"]
+
+
+def test_alignmentscores_cursor_walk_matches_offset_pages(
+    client, regular_token1, alignment_data
+):
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    assessment_id = alignment_data.assessment_id
+    everything = client.get(
+        "/v3/alignmentscores",
+        params={"assessment_id": assessment_id},
+        headers=headers,
+    ).json()["results"]
+    assert len(everything) > 3
+
+    walked = []
+    params = {"assessment_id": assessment_id, "page_size": 3}
+    data = client.get(
+        "/v3/alignmentscores", params={**params, "page": 1}, headers=headers
+    ).json()
+    while True:
+        walked.extend(data["results"])
+        if data["next_cursor"] is None:
+            break
+        data = client.get(
+            "/v3/alignmentscores",
+            params={**params, "cursor": data["next_cursor"]},
+            headers=headers,
+        ).json()
+
+    assert walked == everything
+    assert [r["id"] for r in walked] == sorted(r["id"] for r in walked)
+
+
+@pytest.mark.parametrize("aggregate", [None, "chapter"])
+def test_result_export_ndjson_matches_result(
+    client, regular_token1, assessments_dataset, aggregate
+):
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    params = {"assessment_id": assessments_dataset.assessment_id}
+    if aggregate:
+        params["aggregate"] = aggregate
+    expected = client.get("/v3/result", params=params, headers=headers).json()
+    assert expected["total_count"] > 0
+
+    response = client.get("/v3/result/export", params=params, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "attachment" in response.headers["content-disposition"]
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert exported == expected["results"]
+
+
+def test_result_export_csv(client, regular_token1, assessments_dataset):
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    params = {"assessment_id": assessments_dataset.assessment_id}
+    expected = client.get("/v3/result", params=params, headers=headers).json()
+
+    response = client.get(
+        "/v3/result/export", params={**params, "format": "csv"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == len(expected["results"])
+    assert [int(row["id"]) for row in rows] == [r["id"] for r in expected["results"]]
+    assert [row["vref"] for row in rows] == [r["vref"] for r in expected["results"]]
+    assert [float(row["score"]) for row in rows] == pytest.approx(
+        [r["score"] for r in expected["results"]]
+    )
+
+
+def test_result_export_streams_in_batches(
+    client, regular_token1, assessments_dataset, monkeypatch
+):
+    """A batch size smaller than the result set still exports every row."""
+    from config import settings
+
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    params = {"assessment_id": assessments_dataset.assessment_id}
+    expected = client.get("/v3/result", params=params, headers=headers).json()
+    monkeypatch.setattr(settings, "results_export_batch_size", 7)
+
+    response = client.get("/v3/result/export", params=params, headers=headers)
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert exported == expected["results"]
+
+
+def test_result_export_unauthorized_returns_403(
+    client, regular_token2, assessments_dataset
+):
+    response = client.get(
+        "/v3/result/export",
+        params={"assessment_id": assessments_dataset.assessment_id},
+        headers={"Authorization": f"Bearer {regular_token2}"},
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("score_type", ["top", "threshold"])
+def test_alignmentscores_export_matches_alignmentscores(
+    client, regular_token1, alignment_data, score_type
+):
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    params = {"assessment_id": alignment_data.assessment_id, "score_type": score_type}
+    expected = client.get("/v3/alignmentscores", params=params, headers=headers)
+    expected = expected.json()["results"]
+
+    response = client.get("/v3/alignmentscores/export", params=params, headers=headers)
+    assert response.status_code == 200
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert exported == expected
+
+    response = client.get(
+        "/v3/alignmentscores/export",
+        params={**params, "format": "csv"},
+        headers=headers,
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["source"], row["target"]) for row in rows] == [
+        (r["source"], r["target"]) for r in expected
+    ]
+
+
+# Verse-level scores for /compareresults: the main revision and three
+# baselines. GEN 2:1 has identical baseline scores (stddev 0, so no z-score),
+# GEN 1:2 is missing from one baseline and GEN 2:2 from all of them.
+_COMPARE_SCORES = {
+    "main": {"GEN 1:1": 0.5, "GEN 1:2": 0.8, "GEN 2:1": 0.3, "GEN 2:2": 0.4},
+    "b1": {"GEN 1:1": 0.4, "GEN 1:2": 0.6, "GEN 2:1": 0.2},
+    "b2": {"GEN 1:1": 0.6, "GEN 2:1": 0.2},
+    "b3": {"GEN 1:1": 0.45, "GEN 1:2": 0.9, "GEN 2:1": 0.2},
+}
+# (source, target, score) per assessment for /missingwords, all in GEN 1:1.
+_MISSING_WORD_SCORES = {
+    "main": [("alpha", "a", 0.05), ("beta", "b", 0.01), ("gamma", "g", 0.9)],
+    "b1": [("alpha", "a1", 0.8)],
+    "b2": [("alpha", "a2", 0.6), ("beta", "b2", 0.1)],
+    "b3": [("gamma", "g3", 0.9)],
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class BaselineCompareDataset:
+    revision_id: int
+    reference_id: int
+    baseline_revision_ids: dict  # "b1" -> revision id
+
+
+@pytest.fixture(scope="module")
+def baseline_compare_dataset(test_db_session):
+    """A revision/reference pair plus three baseline revisions, each with a
+    finished word-alignment assessment carrying `_COMPARE_SCORES` results and
+    `_MISSING_WORD_SCORES` top source scores."""
+    group = test_db_session.query(Group).first()
+    revisions = {}
+    for i, name in enumerate(["main", "reference", "b1", "b2", "b3"]):
+        version = BibleVersion(
+            name=f"baseline_compare_{name}",
+            iso_language="eng",
+            iso_script="Latn",
+            abbreviation=f"bc-{name}",
+        )
+        test_db_session.add(version)
+        test_db_session.flush()
+        test_db_session.add(
+            BibleVersionAccess(bible_version_id=version.id, group_id=group.id)
+        )
+        revision = BibleRevision(
+            date=date(2023, 2, 1 + i), bible_version_id=version.id, published=False
+        )
+        test_db_session.add(revision)
+        test_db_session.flush()
+        revisions[name] = revision.id
+
+    for name in ["main", "b1", "b2", "b3"]:
+        assessment = Assessment(
+            revision_id=revisions[name],
+            reference_id=revisions["reference"],
+            type="word-alignment",
+            status="finished",
+            end_time=datetime(2024, 1, 1),
+        )
+        test_db_session.add(assessment)
+        test_db_session.flush()
+        for vref, score in _COMPARE_SCORES[name].items():
+            book, chapter_verse = vref.split(" ")
+            chapter, verse = map(int, chapter_verse.split(":"))
+            test_db_session.add(
+                AssessmentResult(
+                    assessment_id=assessment.id,
+                    vref=vref,
+                    score=score,
+                    book=book,
+                    chapter=chapter,
+                    verse=verse,
+                    flag=False,
+                    hide=False,
+                )
+            )
+        for source, target, score in _MISSING_WORD_SCORES[name]:
+            test_db_session.add(
+                AlignmentTopSourceScores(
+                    assessment_id=assessment.id,
+                    source=source,
+                    target=target,
+                    score=score,
+                    vref="GEN 1:1",
+                    book="GEN",
+                    chapter=1,
+                    verse=1,
+                    flag=False,
+                    hide=False,
+                )
+            )
+    test_db_session.commit()
+
+    return BaselineCompareDataset(
+        revision_id=revisions["main"],
+        reference_id=revisions["reference"],
+        baseline_revision_ids={n: revisions[n] for n in ["b1", "b2", "b3"]},
+    )
+
+
+def _expected_compare_results(aggregate):
+    """/compareresults rows computed directly from `_COMPARE_SCORES`."""
+
+    def key(vref):
+        book, chapter_verse = vref.split(" ")
+        chapter = chapter_verse.split(":")[0]
+        if aggregate == "chapter":
+            return f"{book} {chapter}"
+        if aggregate == "book":
+            return book
+        if aggregate == "text":
+            return None
+        return vref
+
+    def averages(scores):
+        groups = {}
+        for vref, score in scores.items():
+            groups.setdefault(key(vref), []).append(score)
+        return {k: statistics.mean(v) for k, v in groups.items()}
+
+    baselines = [averages(_COMPARE_SCORES[name]) for name in ["b1", "b2", "b3"]]
+    expected = []
+    for group_key, score in averages(_COMPARE_SCORES["main"]).items():
+        values = [b[group_key] for b in baselines if group_key in b]
+        mean = statistics.mean(values) if values else None
+        stdev = statistics.stdev(values) if len(values) > 1 else None
+        z_score = (score - mean) / stdev if stdev else None
+        expected.append((group_key, score, mean, stdev, z_score))
+    return expected
+
+
+@pytest.mark.parametrize("aggregate", [None, "chapter", "book", "text"])
+def test_compareresults_z_scores_against_baselines(
+    client, regular_token1, baseline_compare_dataset, aggregate
+):
+    params = {
+        "revision_id": baseline_compare_dataset.revision_id,
+        "reference_id": baseline_compare_dataset.reference_id,
+        "baseline_ids": list(baseline_compare_dataset.baseline_revision_ids.values()),
+    }
+    if aggregate:
+        params["aggregate"] = aggregate
+    response = client.get(
+        "/v3/compareresults",
+        params=params,
+        headers={"Authorization": f"Bearer {regular_token1}"},
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    expected = _expected_compare_results(aggregate)
+    assert body["total_count"] == len(expected)
+    got = [
+        (r["vref"], r["score"], r["mean_score"], r["stdev_score"], r["z_score"])
+        for r in body["results"]
+    ]
+    assert [g[0] for g in got] == [e[0] for e in expected]
+    for g, e in zip(got, expected):
+        for got_value, expected_value in zip(g[1:], e[1:]):
+            if expected_value is None:
+                assert got_value is None, (g, e)
+            else:
+                assert got_value == pytest.approx(expected_value, abs=1e-9), (g, e)
+    for r in body["results"]:
+        assert r["revision_id"] == baseline_compare_dataset.revision_id
+        assert r["reference_id"] == baseline_compare_dataset.reference_id
+
+
+def test_compareresults_paginates_main_results(
+    client, regular_token1, baseline_compare_dataset
+):
+    params = {
+        "revision_id": baseline_compare_dataset.revision_id,
+        "reference_id": baseline_compare_dataset.reference_id,
+        "baseline_ids": list(baseline_compare_dataset.baseline_revision_ids.values()),
+        "page_size": 3,
+    }
+    pages = []
+    for page in (1, 2):
+        response = client.get(
+            "/v3/compareresults",
+            params={**params, "page": page},
+            headers={"Authorization": f"Bearer {regular_token1}"},
+        )
+        assert response.status_code == 200, response.text
+        assert response.json()["total_count"] == 4
+        pages.append([r["vref"] for r in response.json()["results"]])
+
+    assert pages == [["GEN 1:1", "GEN 1:2", "GEN 2:1"], ["GEN 2:2"]]
+
+
+def _compare(client, token, dataset, **params):
+    response = client.get(
+        "/v3/compareresults",
+        params={
+            "revision_id": dataset.revision_id,
+            "reference_id": dataset.reference_id,
+            "baseline_ids": list(dataset.baseline_revision_ids.values()),
+            **params,
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 200, response.text
+    return {r["vref"]: r for r in response.json()["results"]}
+
+
+def test_compareresults_serves_baseline_stats_from_cache(
+    client, regular_token1, baseline_compare_dataset, monkeypatch
+):
+    from assessment_routes.v3 import baseline_stats, results_query_routes
+    from config import settings
+
+    baseline_stats.clear()
+    by_chapter = _compare(
+        client, regular_token1, baseline_compare_dataset, aggregate="chapter"
+    )
+    assert len(baseline_stats._STATS_CACHE) == 1
+
+    def _no_sql(*args, **kwargs):
+        raise AssertionError("baseline statistics should come from the cache")
+
+    # Filtered requests look their groups up in the same entry.
+    monkeypatch.setattr(
+        results_query_routes, "build_compare_results_baseline_query", _no_sql
+    )
+    filtered = _compare(
+        client,
+        regular_token1,
+        baseline_compare_dataset,
+        aggregate="chapter",
+        book="GEN",
+        chapter=2,
+    )
+    assert filtered == {"GEN 2": by_chapter["GEN 2"]}
+    monkeypatch.undo()
+    assert len(baseline_stats._STATS_CACHE) == 1
+
+    monkeypatch.setattr(settings, "compare_baseline_cache_mb", 0)
+    baseline_stats.clear()
+    assert (
+        _compare(client, regular_token1, baseline_compare_dataset, aggregate="chapter")
+        == by_chapter
+    )
+    assert not baseline_stats._STATS_CACHE
+
+
+def test_compareresults_baseline_stats_refresh_after_results_push(
+    client, admin_token, regular_token1, baseline_compare_dataset, test_db_session
+):
+    b1_assessment_id = (
+        test_db_session.query(Assessment.id)
+        .filter(
+            Assessment.revision_id
+            == baseline_compare_dataset.baseline_revision_ids["b1"]
+        )
+        .scalar()
+    )
+    before = _compare(client, regular_token1, baseline_compare_dataset)
+    assert before["GEN 2:2"]["mean_score"] is None
+
+    response = client.post(
+        f"/v3/assessment/{b1_assessment_id}/results",
+        json=[{"vref": "GEN 2:2", "score": 0.7}],
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 200, response.text
+    after_push = _compare(client, regular_token1, baseline_compare_dataset)
+    assert after_push["GEN 2:2"]["mean_score"] == pytest.approx(0.7)
+
+    pushed_ids = [
+        row.id
+        for row in test_db_session.query(AssessmentResult.id).filter(
+            AssessmentResult.assessment_id == b1_assessment_id,
+            AssessmentResult.vref == "GEN 2:2",
+        )
+    ]
+    response = client.request(
+        "DELETE",
+        f"/v3/assessment/{b1_assessment_id}/results",
+        json={"ids": pushed_ids},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 200, response.text
+    assert _compare(client, regular_token1, baseline_compare_dataset) == before
+
+
+def test_finished_assessment_invalidates_baseline_stats_for_reference(
+    client, admin_token, regular_token1, baseline_compare_dataset, test_db_session
+):
+    from assessment_routes.v3 import baseline_stats
+
+    _compare(client, regular_token1, baseline_compare_dataset)
+    assert any(
+        key.reference_id == baseline_compare_dataset.reference_id
+        for key in baseline_stats._STATS_CACHE
+    )
+
+    # A run of the reference against itself: not part of any comparison here.
+    assessment = Assessment(
+        revision_id=baseline_compare_dataset.reference_id,
+        reference_id=baseline_compare_dataset.reference_id,
+        type="word-alignment",
+        status="running",
+    )
+    test_db_session.add(assessment)
+    test_db_session.commit()
+    response = client.patch(
+        f"/v3/assessment/{assessment.id}/status",
+        json={"status": "finished"},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 200, response.text
+    assert not any(
+        key.reference_id == baseline_compare_dataset.reference_id
+        for key in baseline_stats._STATS_CACHE
+    )
+
+
+def test_missingwords_flags_and_baseline_targets(
+    client, regular_token1, baseline_compare_dataset
+):
+    baseline_ids = baseline_compare_dataset.baseline_revision_ids
+    response = client.get(
+        "/v3/missingwords",
+        params={
+            "revision_id": baseline_compare_dataset.revision_id,
+            "reference_id": baseline_compare_dataset.reference_id,
+            "baseline_ids": list(baseline_ids.values()),
+        },
+        headers={"Authorization": f"Bearer {regular_token1}"},
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    assert body["total_count"] == 2
+    results = {r["source"]: r for r in body["results"]}
+    assert [r["source"] for r in body["results"]] == ["alpha", "beta"]
+    for r in body["results"]:
+        assert r["vref"] == "GEN 1:1"
+
+    def targets(result):
+        return sorted((t["revision_id"], t["target"]) for t in result["target"])
+
+    # alpha: baselines average 0.7 > 0.35 and > 5 * 0.05.
+    assert results["alpha"]["flag"] is True
+    assert results["alpha"]["score"] == pytest.approx(0.05)
+    assert targets(results["alpha"]) == sorted(
+        [
+            (baseline_ids["b1"], "a1"),
+            (baseline_ids["b2"], "a2"),
+            (baseline_ids["b3"], None),
+        ]
+    )
+    # beta: only b2 has it, below the match threshold, so no target and no flag.
+    assert results["beta"]["flag"] is False
+    assert targets(results["beta"]) == sorted(
+        [
+            (baseline_ids["b1"], None),
+            (baseline_ids["b2"], None),
+            (baseline_ids["b3"], None),
+        ]
+    )
+
+
+def test_missingwords_without_baselines(
+    client, regular_token1, baseline_compare_dataset
+):
+    response = client.get(
+        "/v3/missingwords",
+        params={
+            "revision_id": baseline_compare_dataset.revision_id,
+            "reference_id": baseline_compare_dataset.reference_id,
+        },
+        headers={"Authorization": f"Bearer {regular_token1}"},
+    )
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [(r["source"], r["flag"], r["target"]) for r in results] == [
+        ("alpha", False, []),
+        ("beta", False, []),
+    ]
@@ -1238,6 +1238,28 @@ def test_search_version_id_picks_latest_revision_text(
     ), f"Expected newer revision wording at GEN 1:3; got {by_ref[('GEN', 1, 3)]!r}"
 
 
+def test_search_version_id_short_term_picks_latest_revision_text(
+    client, regular_token1, test_db_session
+):
+    """A two-letter prefix term in version_id mode returns each verse's
+    newest text."""
+    ids = setup_version_search_test_data(test_db_session)
+
+    response = client.get(
+        "/v3/textsearch",
+        params={"version_id": ids["eng_version"], "term": "Go*", "limit": 10},
+        headers={"Authorization": f"Bearer {regular_token1}"},
+    )
+
+    assert response.status_code == 200
+    by_ref = {
+        (r["book"], r["chapter"], r["verse"]): r["main_text"]
+        for r in response.json()["results"]
+    }
+    assert "made the heavens" in by_ref[("GEN", 1, 1)]
+    assert "Then God said" in by_ref[("GEN", 1, 3)]
+
+
 def test_search_version_id_falls_back_when_latest_empty(
     client, regular_token1, test_db_session
 ):
@@ -2,13 +2,15 @@
 /v3/tfidf_result/by_vector, and /v3/tfidf_result/by_vectors.
 """
 
+import asyncio
 import base64
 import io
 
 import numpy as np
 import pytest
+from sqlalchemy import select
 
-from database.models import Assessment, TfidfPcaVector
+from database.models import Assessment, TfidfPcaVector, TfidfSvdVariant
 
 prefix = "v3"
 
@@ -490,6 +492,189 @@ def test_tfidf_artifact_pull_unknown_dtype_rejected(
     assert resp.status_code == 422
 
 
+def test_tfidf_artifact_pull_without_components(
+    client, regular_token1, tfidf_assessment_id
+):
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    client.post(
+        f"{prefix}/assessment/{tfidf_assessment_id}/tfidf-artifacts",
+        json=_make_artifact_body(),
+        headers=headers,
+    )
+
+    resp = client.get(
+        f"{prefix}/assessment/tfidf/artifacts",
+        params={"assessment_id": tfidf_assessment_id, "include_components": False},
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+    svd = resp.json()["svd"]
+    assert svd["components_b64"] is None
+    assert svd["dtype"] == "float32"
+    assert (svd["n_components"], svd["n_features"]) == (5, 7)
+
+
+def test_tfidf_svd_download(client, regular_token1, tfidf_assessment_id, monkeypatch):
+    """The binary download is the stored .npy, read a few bytes per query
+    here, with ETag revalidation and single byte ranges."""
+    from assessment_routes.v3 import tfidf_artifact_routes
+
+    monkeypatch.setattr(tfidf_artifact_routes, "_SVD_STREAM_CHUNK_BYTES", 50)
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    body = _make_artifact_body()
+    client.post(
+        f"{prefix}/assessment/{tfidf_assessment_id}/tfidf-artifacts",
+        json=body,
+        headers=headers,
+    )
+    stored = base64.b64decode(body["svd"]["components_b64"])
+    url = f"{prefix}/assessment/tfidf/artifacts/svd"
+    params = {"assessment_id": tfidf_assessment_id}
+
+    resp = client.get(url, params=params, headers=headers)
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"] == "application/octet-stream"
+    assert resp.headers["accept-ranges"] == "bytes"
+    assert resp.content == stored
+    etag = resp.headers["etag"]
+
+    assert (
+        client.get(
+            url, params=params, headers={**headers, "If-None-Match": etag}
+        ).status_code
+        == 304
+    )
+
+    part = client.get(url, params=params, headers={**headers, "Range": "bytes=10-129"})
+    assert part.status_code == 206
+    assert part.headers["content-range"] == f"bytes 10-129/{len(stored)}"
+    assert part.content == stored[10:130]
+    tail = client.get(url, params=params, headers={**headers, "Range": "bytes=-30"})
+    assert tail.status_code == 206
+    assert tail.content == stored[-30:]
+    past_end = client.get(
+        url, params=params, headers={**headers, "Range": f"bytes={len(stored)}-"}
+    )
+    assert past_end.status_code == 416
+    assert past_end.headers["content-range"] == f"bytes */{len(stored)}"
+
+    # Re-pushing changes the ETag; a resume against the old one gets the
+    # whole new file.
+    client.post(
+        f"{prefix}/assessment/{tfidf_assessment_id}/tfidf-artifacts",
+        json=body,
+        headers=headers,
+    )
+    resumed = client.get(
+        url,
+        params=params,
+        headers={**headers, "Range": "bytes=10-", "If-Range": etag},
+    )
+    assert resumed.status_code == 200
+    assert resumed.headers["etag"] != etag
+    assert resumed.content == stored
+    assert (
+        client.get(
+            url, params=params, headers={**headers, "If-None-Match": etag}
+        ).status_code
+        == 200
+    )
+
+
+def test_tfidf_svd_download_int8(client, regular_token1, tfidf_assessment_id):
+    """A downcast download is the matrix the JSON pull embeds, with the
+    int8 scale in a header."""
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    client.post(
+        f"{prefix}/assessment/{tfidf_assessment_id}/tfidf-artifacts",
+        json=_make_artifact_body(),
+        headers=headers,
+    )
+    params = {"assessment_id": tfidf_assessment_id, "dtype": "int8"}
+
+    pulled = client.get(
+        f"{prefix}/assessment/tfidf/artifacts", params=params, headers=headers
+    ).json()
+    resp = client.get(
+        f"{prefix}/assessment/tfidf/artifacts/svd", params=params, headers=headers
+    )
+    assert resp.status_code == 200, resp.text
+    assert float(resp.headers["x-int8-scale"]) == pulled["svd"]["int8_scale"]
+    assert resp.content == base64.b64decode(pulled["svd"]["components_b64"])
+
+    part = client.get(
+        f"{prefix}/assessment/tfidf/artifacts/svd",
+        params=params,
+        headers={**headers, "Range": "bytes=0-9"},
+    )
+    assert part.status_code == 206
+    assert part.content == resp.content[:10]
+
+
+def test_tfidf_downcast_is_built_once_per_push(
+    client, regular_token1, tfidf_assessment_id, db_session, monkeypatch
+):
+    """A dtype's variant is built by the first pull that asks for it and read
+    back by every later JSON pull or download, until a re-push."""
+    from assessment_routes.v3 import tfidf_artifact_routes
+
+    builds = []
+    downcast = tfidf_artifact_routes._downcast_components
+
+    def counting_downcast(stored_bytes, stored_dtype, requested_dtype):
+        builds.append(requested_dtype)
+        return downcast(stored_bytes, stored_dtype, requested_dtype)
+
+    monkeypatch.setattr(
+        tfidf_artifact_routes, "_downcast_components", counting_downcast
+    )
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    push_url = f"{prefix}/assessment/{tfidf_assessment_id}/tfidf-artifacts"
+    client.post(push_url, json=_make_artifact_body(), headers=headers)
+    params = {"assessment_id": tfidf_assessment_id, "dtype": "float16"}
+
+    def pull():
+        return client.get(
+            f"{prefix}/assessment/tfidf/artifacts", params=params, headers=headers
+        ).json()["svd"]
+
+    first = pull()
+    assert builds == ["float16"]
+    assert pull() == first
+    download = client.get(
+        f"{prefix}/assessment/tfidf/artifacts/svd", params=params, headers=headers
+    )
+    assert download.content == base64.b64decode(first["components_b64"])
+    assert builds == ["float16"]
+    assert (
+        db_session.query(TfidfSvdVariant)
+        .filter(TfidfSvdVariant.assessment_id == tfidf_assessment_id)
+        .count()
+        == 1
+    )
+
+    # A re-push drops the variant; the next pull builds it from the new matrix.
+    client.post(push_url, json=_make_artifact_body(), headers=headers)
+    db_session.expire_all()
+    assert (
+        db_session.query(TfidfSvdVariant)
+        .filter(TfidfSvdVariant.assessment_id == tfidf_assessment_id)
+        .count()
+        == 0
+    )
+    assert pull() == first
+    assert builds == ["float16", "float16"]
+
+
+def test_tfidf_svd_download_unauthorized(client, regular_token2, tfidf_assessment_id):
+    resp = client.get(
+        f"{prefix}/assessment/tfidf/artifacts/svd",
+        params={"assessment_id": tfidf_assessment_id},
+        headers={"Authorization": f"Bearer {regular_token2}"},
+    )
+    assert resp.status_code == 403
+
+
 def test_tfidf_artifact_idempotency(client, regular_token1, tfidf_assessment_id):
     """Re-posting replaces the artifacts rather than creating duplicates."""
     headers = {"Authorization": f"Bearer {regular_token1}"}
@@ -1216,3 +1401,214 @@ def test_pull_by_source_version_isolates_versions_with_same_iso_language(
     )
     assert hit.status_code == 200, hit.text
     assert hit.json()["assessment_id"] == a_a.id
+
+
+# ---------------------------------------------------------------------------
+# In-memory corpus ranking (finished assessments)
+# ---------------------------------------------------------------------------
+
+_FINISHED_CORPUS_VREFS = [
+    "GEN 1:1",
+    "GEN 1:2",
+    "GEN 1:3",
+    "GEN 1:4",
+    "EXO 1:1",
+    "EXO 1:2",
+    "EXO 1:3",
+    "EXO 1:4",
+]
+
+
+@pytest.fixture(scope="module")
+def finished_tfidf_vector_assessment_id(
+    test_db_session, test_revision_id, test_revision_id_2
+):
+    """Finished tfidf assessment (so it ranks in memory) with seeded random
+    corpus vectors across two books."""
+    assessment = Assessment(
+        revision_id=test_revision_id,
+        reference_id=test_revision_id_2,
+        type="tfidf",
+        status="finished",
+    )
+    test_db_session.add(assessment)
+    test_db_session.commit()
+    test_db_session.refresh(assessment)
+
+    rng = np.random.default_rng(seed=7)
+    for vref in _FINISHED_CORPUS_VREFS:
+        test_db_session.add(
+            TfidfPcaVector(
+                assessment_id=assessment.id,
+                vref=vref,
+                vector=rng.standard_normal(300).tolist(),
+            )
+        )
+    test_db_session.commit()
+    return assessment.id
+
+
+def _by_vectors(client, token, assessment_id, vectors, limit):
+    resp = client.post(
+        f"{prefix}/tfidf_result/by_vectors",
+        json={"assessment_id": assessment_id, "vectors": vectors, "limit": limit},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()["results"]
+
+
+def test_finished_corpus_ranks_in_memory_like_sql(
+    client, regular_token1, finished_tfidf_vector_assessment_id, monkeypatch
+):
+    from assessment_routes.v3 import tfidf_corpus
+    from config import settings
+
+    rng = np.random.default_rng(seed=11)
+    vectors = rng.standard_normal((4, 300)).tolist()
+    assessment_id = finished_tfidf_vector_assessment_id
+
+    tfidf_corpus.clear()
+    in_memory = _by_vectors(client, regular_token1, assessment_id, vectors, 5)
+    assert assessment_id in tfidf_corpus._CORPUS_CACHE
+
+    monkeypatch.setattr(settings, "tfidf_corpus_cache_mb", 0)
+    in_sql = _by_vectors(client, regular_token1, assessment_id, vectors, 5)
+
+    for got, expected in zip(in_memory, in_sql):
+        assert [r["id"] for r in got] == [r["id"] for r in expected]
+        assert [r["similarity"] for r in got] == pytest.approx(
+            [r["similarity"] for r in expected], abs=1e-4
+        )
+
+
+def test_finished_corpus_by_vref_excludes_query_verse(
+    client, regular_token1, finished_tfidf_vector_assessment_id
+):
+    resp = client.get(
+        f"{prefix}/tfidf_result",
+        params={
+            "assessment_id": finished_tfidf_vector_assessment_id,
+            "vref": "GEN 1:2",
+            "limit": 20,
+        },
+        headers={"Authorization": f"Bearer {regular_token1}"},
+    )
+    assert resp.status_code == 200, resp.text
+    vrefs = [r["vref"] for r in resp.json()["results"]]
+    assert sorted(vrefs) == sorted(set(_FINISHED_CORPUS_VREFS) - {"GEN 1:2"})
+
+
+def test_finished_corpus_cache_refreshes_after_vector_push(
+    client, regular_token1, finished_tfidf_vector_assessment_id
+):
+    assessment_id = finished_tfidf_vector_assessment_id
+    target = _unit_vector(299)
+    before = _by_vectors(client, regular_token1, assessment_id, [target], 1)
+
+    resp = client.post(
+        f"{prefix}/assessment/{assessment_id}/tfidf-vectors",
+        json=[{"vref": "EXO 1:5", "vector": [10 * x for x in target]}],
+        headers={"Authorization": f"Bearer {regular_token1}"},
+    )
+    assert resp.status_code == 200, resp.text
+
+    after = _by_vectors(client, regular_token1, assessment_id, [target], 1)
+    assert before[0][0]["vref"] != "EXO 1:5"
+    assert after[0][0]["vref"] == "EXO 1:5"
+
+
+def test_corpus_rank_exclusions_and_ties():
+    from assessment_routes.v3.tfidf_corpus import TfidfCorpus
+
+    vrefs = np.array(["GEN 1:1", "GEN 1:2", "EXO 1:1", "EXO 1:2"], dtype=object)
+    matrix = np.zeros((4, 300), dtype=np.float32)
+    matrix[:, 0] = [1.0, 2.0, 2.0, 3.0]
+    corpus = TfidfCorpus(
+        ids=np.array([10, 20, 30, 40]),
+        vrefs=vrefs,
+        books=np.array([v.split(" ")[0] for v in vrefs], dtype=object),
+        matrix=matrix,
+        row_by_vref={v: i for i, v in enumerate(vrefs)},
+    )
+    query = np.array([_unit_vector(0)])
+
+    (ranked,) = corpus.rank(query, 10)
+    # Ties (GEN 1:2 / EXO 1:1) rank by id.
+    assert [r.id for r in ranked] == [40, 20, 30, 10]
+    (ranked,) = corpus.rank(query, 10, ["EXO 1:2"])
+    assert [r.id for r in ranked] == [20, 30, 10]
+    (ranked,) = corpus.rank(query, 10, ["EXO 1:9"], exclude_book=True)
+    assert [r.id for r in ranked] == [20, 10]
+    (ranked,) = corpus.rank(query, 2)
+    assert [r.id for r in ranked] == [40, 20]
+
+
+def test_sql_ranking_binds_query_vector_as_parameter():
+    from sqlalchemy.dialects.postgresql.asyncpg import dialect
+
+    from assessment_routes.v3.results_query_routes import tfidf_similarity_ordering
+
+    query_vector = np.full(300, 0.123456789, dtype=np.float32)
+    similarity, order_by = asyncio.run(tfidf_similarity_ordering(None, query_vector))
+    sql = str(select(similarity).order_by(order_by).compile(dialect=dialect()))
+
+    assert "<#>" in sql
+    assert "0.123" not in sql  # bound, not rendered into the statement
+
+
+def test_sql_ranking_with_ivfflat_probes_matches_exact(
+    client, regular_token1, finished_tfidf_vector_assessment_id, monkeypatch
+):
+    from config import settings
+
+    rng = np.random.default_rng(seed=13)
+    vectors = rng.standard_normal((3, 300)).tolist()
+    assessment_id = finished_tfidf_vector_assessment_id
+    monkeypatch.setattr(settings, "tfidf_corpus_cache_mb", 0)
+
+    exact = _by_vectors(client, regular_token1, assessment_id, vectors, 5)
+    # Probing all 100 lists makes an ivfflat scan exhaustive, so whichever
+    # plan Postgres picks, the ranking must not change.
+    monkeypatch.setattr(settings, "tfidf_ivfflat_probes", 100)
+    indexed = _by_vectors(client, regular_token1, assessment_id, vectors, 5)
+
+    for got, expected in zip(indexed, exact):
+        assert [r["id"] for r in got] == [r["id"] for r in expected]
+        assert [r["similarity"] for r in got] == pytest.approx(
+            [r["similarity"] for r in expected], abs=1e-5
+        )
+
+
+def test_sql_batch_ranking_matches_in_memory_with_exclusions(
+    finished_tfidf_vector_assessment_id, monkeypatch
+):
+    from assessment_routes.v3 import tfidf_corpus
+    from assessment_routes.v3.tfidf_artifact_routes import _rank_many
+    from config import settings
+    from database.dependencies import AsyncSessionLocal
+
+    rng = np.random.default_rng(seed=17)
+    vectors = rng.standard_normal((4, 300)).tolist()
+    excludes = ["GEN 1:2", None, "EXO 1:3", "GEN 9:9"]
+
+    async def rank(exclude_book):
+        async with AsyncSessionLocal() as db:
+            assessment = await db.get(Assessment, finished_tfidf_vector_assessment_id)
+            return await _rank_many(db, assessment, vectors, 3, excludes, exclude_book)
+
+    for exclude_book in (False, True):
+        tfidf_corpus.clear()
+        in_memory = asyncio.run(rank(exclude_book))
+        monkeypatch.setattr(settings, "tfidf_corpus_cache_mb", 0)
+        in_sql = asyncio.run(rank(exclude_book))
+        monkeypatch.undo()
+
+        assert len(in_sql) == len(vectors)
+        for got, expected in zip(in_sql, in_memory):
+            assert [r.id for r in got] == [r.id for r in expected]
+            assert [r.cosine_similarity for r in got] == pytest.approx(
+                [r.cosine_similarity for r in expected], abs=1e-4
+            )
+    # Book exclusion leaves only EXO for the GEN-excluded queries.
+    assert {r.vref.split(" ")[0] for r in in_sql[0]} == {"EXO"}
@@ -8,6 +8,7 @@ reproduce the stored vectors (self-match ≈ 1.0) and honour the exclusion
 semantics.
 """
 
+import asyncio
 import base64
 import io
 
@@ -562,3 +563,114 @@ def test_by_texts_exclude_book_without_vrefs_rejected(
     )
     assert resp.status_code == 422
     assert "exclude_book" in str(resp.json()["detail"])
+
+
+# ---------------------------------------------------------------------------
+# Shared encoder (assessment_routes.v3.tfidf_encoder)
+# ---------------------------------------------------------------------------
+
+
+def _small_encoder(tmp_path):
+    """A fitted word + char encoder, built by tfidf_encoder into ``tmp_path``,
+    and the sklearn pipeline it must reproduce."""
+    from assessment_routes.v3 import tfidf_encoder
+
+    rng = np.random.default_rng(1)
+    vocab = _VOCAB + ["Ångström", "naïve", "straße"]
+    corpus = [
+        " ".join(rng.choice(vocab, size=int(rng.integers(3, 9)))) for _ in range(80)
+    ]
+    word = TfidfVectorizer(analyzer="word", ngram_range=(1, 2)).fit(corpus)
+    char = TfidfVectorizer(analyzer="char_wb", ngram_range=(3, 6)).fit(corpus)
+    svd = TruncatedSVD(n_components=20, random_state=0).fit(
+        normalize(hstack([word.transform(corpus), char.transform(corpus)]), norm="l2")
+    )
+    svd.components_ = svd.components_.astype(np.float32)
+    buf = io.BytesIO()
+    np.save(buf, svd.components_, allow_pickle=False)
+    vectorizers = {
+        kind: (
+            payload["vocabulary"],
+            payload["idf"],
+            payload["params"],
+        )
+        for kind, payload in (
+            ("word", _vectorizer_payload(word, "word", (1, 2))),
+            ("char", _vectorizer_payload(char, "char_wb", (3, 6))),
+        )
+    }
+    encoder = tfidf_encoder._build(1, tmp_path / "1-x", vectorizers, buf.getvalue())
+
+    def reference(texts):
+        X = normalize(hstack([word.transform(texts), char.transform(texts)]), norm="l2")
+        return svd.transform(X)
+
+    return encoder, corpus, reference
+
+
+def test_encoder_matches_sklearn(tmp_path):
+    encoder, corpus, reference = _small_encoder(tmp_path)
+    # Files on disk, mapped rather than read.
+    assert isinstance(encoder.components_t, np.memmap)
+    assert isinstance(encoder.word.keys, np.memmap)
+
+    texts = corpus[:10] + ["", "nothing in the vocabulary", "ALPHA Beta", "NAÏVE"]
+    np.testing.assert_allclose(encoder.encode(texts), reference(texts), atol=1e-12)
+
+
+def test_encoder_files_are_shared_between_workers(
+    client, regular_token1, encoded_tfidf_assessment, tmp_path, monkeypatch
+):
+    """A worker maps the files another one wrote instead of reading the DB."""
+    from assessment_routes.v3 import tfidf_encoder
+    from config import settings
+
+    monkeypatch.setattr(settings, "tfidf_encoder_dir", str(tmp_path))
+    tfidf_encoder.clear()
+    assessment_id = encoded_tfidf_assessment["assessment_id"]
+    body = {"assessment_id": assessment_id, "text": "alpha beta", "limit": 5}
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    first = client.post(f"{prefix}/tfidf_result/by_text", json=body, headers=headers)
+    assert first.status_code == 200, first.text
+    assert [p.name.split("-")[0] for p in tmp_path.iterdir()] == [str(assessment_id)]
+
+    # A fresh worker: nothing cached, and the artifact tables can't be read.
+    tfidf_encoder.clear()
+
+    def no_db():
+        raise AssertionError("encoder was read from the database")
+
+    monkeypatch.setattr(tfidf_encoder, "AsyncSessionLocal", no_db)
+    second = client.post(f"{prefix}/tfidf_result/by_text", json=body, headers=headers)
+    assert second.status_code == 200, second.text
+    assert second.json() == first.json()
+    tfidf_encoder.clear()
+
+
+def test_concurrent_encodes_share_one_pass(tmp_path, monkeypatch):
+    from assessment_routes.v3 import tfidf_encoder
+    from config import settings
+
+    encoder, corpus, reference = _small_encoder(tmp_path)
+    passes = []
+    encode = tfidf_encoder.TfidfEncoder.encode
+
+    def counting_encode(self, texts):
+        passes.append(list(texts))
+        return encode(self, texts)
+
+    monkeypatch.setattr(tfidf_encoder.TfidfEncoder, "encode", counting_encode)
+    monkeypatch.setattr(settings, "tfidf_encode_batch_ms", 20.0)
+
+    async def run():
+        return await asyncio.gather(
+            tfidf_encoder.encode(encoder, corpus[:1]),
+            tfidf_encoder.encode(encoder, corpus[1:4]),
+            tfidf_encoder.encode(encoder, corpus[4:6]),
+        )
+
+    results = asyncio.run(run())
+    assert passes == [corpus[:6]]
+    for got, texts in zip(results, (corpus[:1], corpus[1:4], corpus[4:6])):
+        np.testing.assert_allclose(got, reference(texts), atol=1e-12)
+    tfidf_encoder.clear()
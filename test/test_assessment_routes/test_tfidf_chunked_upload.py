@@ -1012,3 +1012,102 @@ def test_init_continues_when_sweep_fails(
         json={"upload_id": new_upload_id},
         headers=headers,
     )
+
+
+def _commit_chunks(client, headers, assessment_id, slabs, payloads=None):
+    """Init, upload each slab (or raw .npy payload) and commit."""
+    n_components = sum(s.shape[0] for s in slabs)
+    upload_id = client.post(
+        f"{prefix}/assessment/{assessment_id}/tfidf-artifacts/init",
+        json=_init_body(n_components=n_components, total_chunks=len(slabs)),
+        headers=headers,
+    ).json()["upload_id"]
+    for i, slab in enumerate(slabs):
+        components_b64 = (
+            base64.b64encode(payloads[i]).decode("ascii")
+            if payloads is not None
+            else _chunk_b64(slab)
+        )
+        resp = client.post(
+            f"{prefix}/assessment/{assessment_id}/tfidf-artifacts/chunk",
+            json={
+                "upload_id": upload_id,
+                "chunk_index": i,
+                "components_b64": components_b64,
+            },
+            headers=headers,
+        )
+        assert resp.status_code == 200, resp.text
+    resp = client.post(
+        f"{prefix}/assessment/{assessment_id}/tfidf-artifacts/commit",
+        json={"upload_id": upload_id},
+        headers=headers,
+    )
+    return upload_id, resp
+
+
+def _stored_components(test_db_session, assessment_id) -> bytes:
+    test_db_session.expire_all()
+    return bytes(
+        test_db_session.execute(
+            text("SELECT components_npy FROM tfidf_svd WHERE assessment_id = :id"),
+            {"id": assessment_id},
+        ).scalar_one()
+    )
+
+
+def test_commit_stores_the_np_save_bytes_of_the_vstack(
+    client, regular_token1, chunk_tfidf_assessment_id, test_db_session
+):
+    """Chunks are concatenated without decoding; the result is what np.save
+    writes for the whole matrix, big-endian and Fortran-ordered chunks
+    included."""
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    arr = _build_components(9, 7, seed=11)
+    slabs = _split_components(arr, total_chunks=3)
+    payloads = []
+    for i, slab in enumerate(slabs):
+        if i == 1:
+            slab = slab.astype(">f4")
+        elif i == 2:
+            slab = np.asfortranarray(slab)
+        buf = io.BytesIO()
+        np.save(buf, slab, allow_pickle=False)
+        payloads.append(buf.getvalue())
+
+    _, resp = _commit_chunks(
+        client, headers, chunk_tfidf_assessment_id, slabs, payloads
+    )
+    assert resp.status_code == 200, resp.text
+
+    expected = io.BytesIO()
+    np.save(expected, arr, allow_pickle=False)
+    stored = _stored_components(test_db_session, chunk_tfidf_assessment_id)
+    assert stored == expected.getvalue()
+    assert resp.json()["components_bytes"] == len(stored)
+
+
+def test_truncated_chunk_rejected_on_commit(
+    client, regular_token1, chunk_tfidf_assessment_id
+):
+    """A chunk whose data section is shorter than its header declares."""
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    slabs = _split_components(_build_components(4, 7), total_chunks=2)
+    payloads = []
+    for slab in slabs:
+        buf = io.BytesIO()
+        np.save(buf, slab, allow_pickle=False)
+        payloads.append(buf.getvalue())
+    payloads[1] = payloads[1][:-4]
+
+    upload_id, resp = _commit_chunks(
+        client, headers, chunk_tfidf_assessment_id, slabs, payloads
+    )
+    assert resp.status_code == 422
+    assert "not a valid .npy payload" in resp.json()["detail"]
+
+    client.post(
+        f"{prefix}/assessment/{chunk_tfidf_assessment_id}/tfidf-artifacts/abort",
+        json={"upload_id": upload_id},
+        headers=headers,
+    )
@@ -0,0 +1,231 @@
+"""background=true requests: queued, run by background_jobs, polled at
+GET /jobs/{id}.
+
+Nothing runs the queue in tests (the app's lifespan isn't entered), so each
+test drains it with ``background_jobs.run_pending``.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import background_jobs
+from database.models import BackgroundJob, BibleRevision, Group, UserDB, VerseText
+
+prefix = "v3"
+
+
+def _create_version(client, headers, db_session):
+    group_1 = db_session.query(Group).filter_by(name="Group1").first()
+    response = client.post(
+        f"{prefix}/version",
+        json={
+            "name": "Background Version",
+            "iso_language": "eng",
+            "iso_script": "Latn",
+            "abbreviation": "BGV",
+            "rights": "Some Rights",
+            "machineTranslation": False,
+            "add_to_groups": [group_1.id],
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def _upload(client, headers, version_id, contents):
+    return client.post(
+        f"{prefix}/revision",
+        params={"version_id": version_id, "name": "Queued", "background": True},
+        files={"file": ("upload.txt", contents, "text/plain")},
+        headers=headers,
+    )
+
+
+def _cleanup(db_session):
+    db_session.query(BackgroundJob).delete()
+    db_session.commit()
+
+
+def test_background_upload_round_trip(client, regular_token1, db_session):
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    version_id = _create_version(client, headers, db_session)
+    with open("fixtures/uploadtest.txt", "rb") as f:
+        contents = f.read()
+
+    response = _upload(client, headers, version_id, contents)
+    assert response.status_code == 202, response.text
+    handle = response.json()
+    assert handle["kind"] == "revision.upload"
+    assert handle["status"] == "queued"
+    assert response.headers["location"] == f"/latest/jobs/{handle['id']}"
+
+    queued = client.get(f"{prefix}/jobs/{handle['id']}", headers=headers)
+    assert queued.status_code == 200
+    assert queued.json()["status"] == "queued"
+    assert queued.headers["retry-after"] == str(background_jobs.JOB_POLL_INTERVAL_S)
+
+    assert asyncio.run(background_jobs.run_pending()) == 1
+
+    done = client.get(f"{prefix}/jobs/{handle['id']}", headers=headers).json()
+    assert done["status"] == "complete"
+    assert done["progress"] == 1.0
+    revision = done["result"]
+    assert revision["bible_version_id"] == version_id
+    assert revision["name"] == "Queued"
+    db_session.expire_all()
+    assert db_session.get(BibleRevision, revision["id"]) is not None
+    assert (
+        db_session.query(VerseText)
+        .filter(VerseText.revision_id == revision["id"])
+        .count()
+        > 0
+    )
+    # The uploaded file isn't kept once the job is done.
+    assert db_session.get(BackgroundJob, handle["id"]).payload is None
+    _cleanup(db_session)
+
+
+def test_failed_job_reports_the_synchronous_error(client, regular_token1, db_session):
+    headers = {"Authorization": f"Bearer {regular_token1}"}
+    version_id = _create_version(client, headers, db_session)
+    revisions_before = (
+        db_session.query(BibleRevision)
+        .filter(BibleRevision.bible_version_id == version_id)
+        .count()
+    )
+
+    handle = _upload(client, headers, version_id, b"\n\n   \n").json()
+    asyncio.run(background_jobs.run_pending())
+
+    failed = client.get(f"{prefix}/jobs/{handle['id']}", headers=headers)
+    assert "retry-after" not in failed.headers
+    assert failed.json()["status"] == "failed"
+    assert failed.json()["error_status"] == 400
+    assert failed.json()["error"] == "File has no text."
+    db_session.expire_all()
+    assert (
+        db_session.query(BibleRevision)
+        .filter(BibleRevision.bible_version_id == version_id)
+        .count()
+        == revisions_before
+    )
+    _cleanup(db_session)
+
+
+def test_jobs_are_visible_to_their_owner_and_admins(
+    client, regular_token1, regular_token2, admin_token, db_session
+):
+    response = client.post(
+        f"{prefix}/agent/lexeme-card/deduplicate",
+        params={"source_version_id": 1, "target_version_id": 2, "background": True},
+        headers={"Authorization": f"Bearer {regular_token1}"},
+    )
+    assert response.status_code == 202, response.text
+    job_url = f"{prefix}/jobs/{response.json()['id']}"
+
+    other = client.get(job_url, headers={"Authorization": f"Bearer {regular_token2}"})
+    assert other.status_code == 404
+    admin = client.get(job_url, headers={"Authorization": f"Bearer {admin_token}"})
+    assert admin.status_code == 200
+
+    asyncio.run(background_jobs.run_pending())
+    done = client.get(job_url, headers={"Authorization": f"Bearer {regular_token1}"})
+    assert done.json()["status"] == "complete"
+    assert done.json()["result"] == {
+        "dry_run": True,
+        "duplicates_found": 0,
+        "cards_merged": 0,
+        "cards_deleted": 0,
+        "groups": [],
+    }
+    assert (
+        client.get(
+            f"{prefix}/jobs/job_missing",
+            headers={"Authorization": f"Bearer {regular_token1}"},
+        ).status_code
+        == 404
+    )
+    _cleanup(db_session)
+
+
+def test_job_without_a_heartbeat_is_marked_failed(db_session):
+    user = db_session.query(UserDB).filter_by(username="testuser1").first()
+    long_ago = datetime.now(timezone.utc) - timedelta(days=1)
+    db_session.add(
+        BackgroundJob(
+            id="job_stale",
+            kind="revision.upload",
+            status="running",
+            params={},
+            owner_id=user.id,
+            started_at=long_ago,
+            heartbeat_at=long_ago,
+        )
+    )
+    db_session.commit()
+
+    assert asyncio.run(background_jobs.run_pending()) == 0
+
+    db_session.expire_all()
+    job = db_session.get(BackgroundJob, "job_stale")
+    assert job.status == "failed"
+    assert job.error_status == 500
+    assert job.completed_at is not None
+    _cleanup(db_session)
+
+
+def test_runner_keeps_going_when_recording_a_job_fails(
+    regular_token1, db_session, monkeypatch
+):
+    user = db_session.query(UserDB).filter_by(username="testuser1").first()
+    now = datetime.now(timezone.utc)
+    for i, job_id in enumerate(["job_first", "job_second"]):
+        db_session.add(
+            BackgroundJob(
+                id=job_id,
+                kind="test.echo",
+                status="queued",
+                params={"n": i},
+                owner_id=user.id,
+                created_at=now + timedelta(seconds=i),
+            )
+        )
+    db_session.commit()
+
+    async def echo(db, params, payload, progress):
+        return params
+
+    update = background_jobs._update
+    failures = []
+
+    async def update_failing_once(job_id, **values):
+        if values.get("status") == "complete" and not failures:
+            failures.append(job_id)
+            raise ConnectionError("connection reset while recording the result")
+        await update(job_id, **values)
+
+    monkeypatch.setitem(background_jobs._HANDLERS, "test.echo", echo)
+    monkeypatch.setattr(background_jobs, "_update", update_failing_once)
+
+    async def run_until_second_completes():
+        monkeypatch.setattr(background_jobs, "_wake", asyncio.Event())
+        runner = asyncio.create_task(background_jobs._runner())
+        try:
+            for _ in range(100):
+                db_session.expire_all()
+                if db_session.get(BackgroundJob, "job_second").status == "complete":
+                    break
+                await asyncio.sleep(0.05)
+            assert not runner.done()
+        finally:
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+
+    asyncio.run(run_until_second_completes())
+
+    db_session.expire_all()
+    assert failures == ["job_first"]
+    assert db_session.get(BackgroundJob, "job_second").status == "complete"
+    assert db_session.get(BackgroundJob, "job_second").result == {"n": 1}
+    _cleanup(db_session)
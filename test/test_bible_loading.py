@@ -10,7 +10,12 @@ test/test_bible_routes/test_revision_routes.py.
 
 import pytest
 
-from bible_loading import _VREF_SKELETON, _build_verse_records
+from bible_loading import (
+    _VERSE_COLUMNS,
+    _VREF_SKELETON,
+    _build_verse_records,
+    _iter_verse_rows,
+)
 
 
 def _blank_upload():
@@ -77,3 +82,22 @@ def test_strips_newlines_from_text():
 def test_rejects_input_of_wrong_length():
     with pytest.raises(ValueError, match="one per vref"):
         _build_verse_records(["only one line"], revision_id=1)
+
+
+def test_iter_verse_rows_matches_records():
+    """The COPY row stream and the executemany dicts must describe the same
+    rows, in `_VERSE_COLUMNS` order, so the two loaders stay interchangeable."""
+    verses = _blank_upload()
+    verses[_index_of("GEN 1:1")] = "In the beginning"
+    verses[_index_of("GEN 1:2")] = "   "
+    verses[_index_of("REV 22:21")] = "Amen"
+
+    rows = list(_iter_verse_rows(verses, revision_id=3))
+
+    assert rows == [
+        ("In the beginning", 3, "GEN 1:1", "GEN", 1, 1),
+        ("Amen", 3, "REV 22:21", "REV", 22, 21),
+    ]
+    assert [dict(zip(_VERSE_COLUMNS, r)) for r in rows] == _build_verse_records(
+        verses, revision_id=3
+    )
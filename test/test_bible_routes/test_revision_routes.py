@@ -6,8 +6,10 @@ from pathlib import Path
 
 import aiofiles
 import pytest
+from sqlalchemy import delete, func
 from sqlalchemy.future import select
 
+from bible_loading import _VREF_SKELETON, copy_verse_rows
 from bible_routes.v3.revision_routes import process_and_upload_revision
 from database.models import BibleRevision as BibleRevisionModel
 from database.models import BibleVersion as BibleVersionModel
@@ -52,23 +54,68 @@ async def test_process_and_upload_revision(async_test_db_session, test_db_sessio
         test_file_path = Path("fixtures/uploadtest.txt")
         async with aiofiles.open(test_file_path, "rb") as file:
             file_content = await file.read()
-        _ = sum(
-            1 for line in file_content.splitlines() if line.strip()
-        )  # Non empty line count
-
-        # Process and upload revision using the async database session
-        await process_and_upload_revision(file_content, test_revision.id, db)
-        # TODO - Fix this test to work with async database session
-        # Verify that verses were correctly uploaded
-        # result = await db.execute(select(VerseText).where(VerseText.revision_id == test_revision.id))
-        # uploaded_verses = result.scalars().all()
-        # assert len(uploaded_verses) == non_empty_line_count
-
-        # # Clean up: delete the test revision, its verses, and the test version
-        # await db.execute(delete(VerseText).where(VerseText.revision_id == test_revision.id))
-        # await db.delete(test_revision)
-        # await db.delete(test_version)
-        # await db.commit()
+
+        # Process and upload revision using the async database session. The
+        # refresh above opened the transaction the COPY joins.
+        revision_id = test_revision.id
+        await process_and_upload_revision(file_content, revision_id, db)
+        await db.commit()
+
+        # Every non-empty canonical line lands as one verse_text row.
+        expected = sum(
+            1
+            for slot, line in zip(_VREF_SKELETON, file_content.decode().splitlines())
+            if slot is not None and line.strip()
+        )
+        uploaded = await db.scalar(
+            select(func.count(VerseText.id)).where(VerseText.revision_id == revision_id)
+        )
+        assert uploaded == expected
+
+        first = await db.scalar(
+            select(VerseText)
+            .where(VerseText.revision_id == revision_id)
+            .order_by(VerseText.id)
+            .limit(1)
+        )
+        assert first.verse_reference == f"{first.book} {first.chapter}:{first.verse}"
+
+        await db.execute(delete(VerseText).where(VerseText.revision_id == revision_id))
+        await db.delete(test_revision)
+        await db.delete(test_version)
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_copy_verse_rows_rolls_back_with_session(async_test_db_session):
+    """COPY runs inside the session's transaction, so a rollback discards the
+    copied verses together with the revision row."""
+    async for db in async_test_db_session:
+        version = BibleVersionModel(
+            name="Copy Rollback Version",
+            iso_language="eng",
+            iso_script="Latn",
+            abbreviation="CRV",
+        )
+        db.add(version)
+        await db.flush()
+        revision = BibleRevisionModel(
+            bible_version_id=version.id, name="Copy Rollback", date=datetime.now()
+        )
+        db.add(revision)
+        await db.flush()
+        revision_id = revision.id
+
+        verses = [""] * len(_VREF_SKELETON)
+        verses[0] = "In the beginning"
+        copied = await copy_verse_rows(verses, revision_id, db)
+        assert copied == 1
+        await db.rollback()
+
+        remaining = await db.scalar(
+            select(func.count(VerseText.id)).where(VerseText.revision_id == revision_id)
+        )
+        assert remaining == 0
 
 
 prefix = "v3"
@@ -1,10 +1,16 @@
+import asyncio
 import importlib
 import os
 
+import numpy as np
+import pytest
 import sqlalchemy.ext.asyncio as sa_async
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
 
 import config
 import database.dependencies as deps
+from database.vector import Vector
 
 
 def test_pooled_engine_wires_statement_timeout(monkeypatch):
@@ -54,3 +60,27 @@ def test_pooled_engine_wires_statement_timeout(monkeypatch):
         config.settings = real_settings
         os.environ["AQUA_DB_POOLCLASS"] = "null"
         importlib.reload(deps)
+
+
+def test_vector_round_trips_in_binary_format():
+    """Vectors bind and decode through pgvector's asyncpg binary codec
+    (database.vector) rather than as decimal text, so float32 values survive
+    exactly."""
+    vector = np.linspace(-1, 1, 300, dtype=np.float32) / 3
+
+    async def _run():
+        async with deps.AsyncSessionLocal() as db:
+            query = (
+                text("SELECT CAST(:v AS vector) AS v")
+                .bindparams(bindparam("v", vector, type_=Vector(300)))
+                .columns(v=Vector(300))
+            )
+            return await db.scalar(query)
+
+    result = asyncio.run(_run())
+
+    assert result.dtype == np.float32
+    np.testing.assert_array_equal(result, vector)
+    process = Vector(300).bind_processor(asyncpg_dialect())
+    with pytest.raises(ValueError, match="expected 300 dimensions"):
+        process([0.0] * 299)
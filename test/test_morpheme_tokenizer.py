@@ -0,0 +1,72 @@
+"""viterbi_segment_trie must segment exactly as viterbi_segment does."""
+
+import random
+
+import pytest
+
+from utils.morpheme_tokenizer import (
+    compile_morphemes,
+    contains_morpheme,
+    segment_words,
+    viterbi_segment,
+    viterbi_segment_trie,
+)
+
+
+def _reference(word, morphemes):
+    max_len = max((len(m) for m in morphemes), default=0)
+    return viterbi_segment(word, morphemes, max_len)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_viterbi_segment_on_random_inventories(seed):
+    rng = random.Random(seed)
+    alphabet = "abcdeñé"[: rng.randint(2, 7)]
+    morphemes = {
+        "".join(rng.choices(alphabet, k=rng.randint(1, 6)))
+        for _ in range(rng.randint(1, 40))
+    }
+    trie = compile_morphemes(morphemes)
+    # Mostly morpheme concatenations, with stray characters mixed in, up to
+    # the length of long agglutinative words.
+    pieces = sorted(morphemes) + list(alphabet)
+    words = [
+        "".join(rng.choices(pieces, k=rng.randint(1, 12)))[: rng.randint(1, 60)]
+        for _ in range(300)
+    ]
+
+    for word in words:
+        assert viterbi_segment_trie(word, trie) == _reference(word, morphemes), word
+
+
+def test_ties_break_as_viterbi_segment_does():
+    # Equal-cost alternatives: "ab" as one morpheme (2.0) or as "a" + gap
+    # "b" (1.5 + 2.0); "aa" as two "a" (3.0) or one gap (3.0).
+    morphemes = {"a", "ab", "b", "ba"}
+    trie = compile_morphemes(morphemes)
+    for word in ["aa", "ab", "aab", "abab", "bbb", "xax", "aaaa", "x"]:
+        assert viterbi_segment_trie(word, trie) == _reference(word, morphemes)
+
+
+def test_words_without_any_morpheme():
+    trie = compile_morphemes(set())
+
+    assert viterbi_segment_trie("", trie) == []
+    assert viterbi_segment_trie("word", trie) == [("gap", "word")]
+    assert segment_words(["kaka", ""], compile_morphemes({"ka"})) == [
+        (("morph", "ka"), ("morph", "ka")),
+        (),
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_contains_morpheme_matches_substring_search(seed):
+    rng = random.Random(seed)
+    morphemes = {
+        "".join(rng.choices("abcd", k=rng.randint(1, 4)))
+        for _ in range(rng.randint(1, 8))
+    }
+    trie = compile_morphemes(morphemes)
+    for _ in range(300):
+        word = "".join(rng.choices("abcd", k=rng.randint(0, 12)))
+        assert contains_morpheme(word, trie) == any(m in word for m in morphemes), word
@@ -0,0 +1,176 @@
+"""Unit tests for revision_text_cache: the per-worker whole-revision text cache
+that /words, /texts, the tokenizer indexers and verse-text hydration read.
+
+These exercise the slot alignment and the LRU bookkeeping directly, plus the
+updated_at stamp that keeps entries fresh; the routes reading through the
+cache are covered by their own tests.
+"""
+
+import datetime
+
+import pytest
+from sqlalchemy import delete, update
+
+import revision_text_cache
+from bible_loading import _VREF_SKELETON
+from config import settings
+from database.models import BibleRevision, BibleVersion, VerseText
+
+
+def _slot(verse_reference):
+    return revision_text_cache._SLOT_BY_VREF[verse_reference]
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    revision_text_cache.clear()
+    yield
+    revision_text_cache.clear()
+
+
+def test_rows_land_in_their_skeleton_slots():
+    revision_text = revision_text_cache._build(
+        [(12, "EXO 1:1", "exodus"), (10, "GEN 1:2", "second"), (11, "GEN 1:1", "")]
+    )
+
+    assert revision_text.ids[_slot("GEN 1:1")] == 11
+    assert revision_text.texts[_slot("GEN 1:2")] == "second"
+    assert revision_text.texts[_slot("GEN 1:3")] is None
+    # Canonical order, whatever order the rows arrived in.
+    assert list(revision_text.rows()) == [
+        (11, "GEN 1:1", ""),
+        (10, "GEN 1:2", "second"),
+        (12, "EXO 1:1", "exodus"),
+    ]
+    assert revision_text.extra_rows == ()
+
+
+def test_rows_without_a_slot_are_kept():
+    revision_text = revision_text_cache._build(
+        [(1, "GEN 1:1", "first"), (2, "GEN 1:1", "again"), (3, "XYZ 1:1", "odd")]
+    )
+
+    assert revision_text.ids[_slot("GEN 1:1")] == 1
+    assert list(revision_text.rows())[1:] == [
+        (2, "GEN 1:1", "again"),
+        (3, "XYZ 1:1", "odd"),
+    ]
+    # The later duplicate wins, as it would in a dict built from the rows.
+    assert revision_text.texts_by_vref(["GEN 1:1", "XYZ 1:1", "GEN 1:2"]) == {
+        "GEN 1:1": "again",
+        "XYZ 1:1": "odd",
+    }
+
+
+def test_equal_texts_are_shared_across_revisions():
+    text = "In the beginning"
+    first = revision_text_cache._build([(1, "GEN 1:1", "".join(text))])
+    second = revision_text_cache._build([(2, "GEN 1:1", text[:3] + text[3:])])
+
+    assert first.texts[_slot("GEN 1:1")] is second.texts[_slot("GEN 1:1")]
+
+
+def test_vrefs_with_rows_is_the_canonical_union():
+    first = revision_text_cache._build([(1, "EXO 1:1", "a"), (2, "GEN 1:2", "b")])
+    second = revision_text_cache._build([(3, "GEN 1:1", "c"), (4, "GEN 1:2", "d")])
+
+    assert revision_text_cache.vrefs_with_rows([first, second]) == [
+        "GEN 1:1",
+        "GEN 1:2",
+        "EXO 1:1",
+    ]
+    assert len(_VREF_SKELETON) == len(first.ids)
+
+
+def test_least_recently_used_revision_is_evicted(monkeypatch):
+    entries = {
+        revision_id: revision_text_cache._build(
+            [(revision_id, "GEN 1:1", f"text {revision_id}")]
+        )
+        for revision_id in (1, 2, 3)
+    }
+    size_mb = entries[1].nbytes / (1024 * 1024)
+    monkeypatch.setattr(settings, "revision_text_cache_mb", 2.5 * size_mb)
+
+    stamp = datetime.datetime(2026, 1, 1)
+    revision_text_cache._store(1, stamp, entries[1])
+    revision_text_cache._store(2, stamp, entries[2])
+    # Re-storing refreshes recency, as a hit does.
+    revision_text_cache._store(1, stamp, entries[1])
+    revision_text_cache._store(3, stamp, entries[3])
+
+    assert set(revision_text_cache._REVISION_TEXT_CACHE) == {1, 3}
+
+    revision_text_cache.invalidate(1)
+    assert set(revision_text_cache._REVISION_TEXT_CACHE) == {3}
+
+
+def _verse(revision_id, verse, text):
+    return VerseText(
+        text=text,
+        revision_id=revision_id,
+        verse_reference=f"GEN 1:{verse}",
+        book="GEN",
+        chapter=1,
+        verse=verse,
+    )
+
+
+@pytest.mark.asyncio
+async def test_verse_writes_reload_the_revision(async_test_db_session, test_db_session):
+    async for db in async_test_db_session:
+        version = BibleVersion(
+            name="Text Cache Version",
+            iso_language="eng",
+            iso_script="Latn",
+            abbreviation="TCV",
+        )
+        db.add(version)
+        await db.flush()
+        version_id = version.id
+        revision = BibleRevision(bible_version_id=version_id, published=False)
+        db.add(revision)
+        await db.flush()
+        revision_id = revision.id
+        db.add(_verse(revision_id, 1, "first"))
+        await db.commit()
+
+        try:
+            cached = await revision_text_cache.get(db, revision_id)
+            assert await revision_text_cache.get(db, revision_id) is cached
+
+            db.add(_verse(revision_id, 2, "second"))
+            await db.commit()
+            added = await revision_text_cache.get(db, revision_id)
+            assert added is not cached
+            assert added.texts_by_vref(["GEN 1:1", "GEN 1:2"]) == {
+                "GEN 1:1": "first",
+                "GEN 1:2": "second",
+            }
+
+            await db.execute(
+                update(VerseText)
+                .where(VerseText.verse_reference == "GEN 1:1")
+                .where(VerseText.revision_id == revision_id)
+                .values(text="changed")
+            )
+            await db.commit()
+            changed = await revision_text_cache.get(db, revision_id)
+            assert changed.texts_by_vref(["GEN 1:1"]) == {"GEN 1:1": "changed"}
+
+            await db.execute(
+                delete(VerseText).where(VerseText.revision_id == revision_id)
+            )
+            await db.commit()
+            assert not (await revision_text_cache.get(db, revision_id)).ids.any()
+            assert revision_id not in revision_text_cache._REVISION_TEXT_CACHE
+        finally:
+            await db.rollback()
+            await db.execute(
+                delete(VerseText).where(VerseText.revision_id == revision_id)
+            )
+            await db.execute(
+                delete(BibleRevision).where(BibleRevision.id == revision_id)
+            )
+            await db.execute(delete(BibleVersion).where(BibleVersion.id == version_id))
+            await db.commit()
@@ -2,6 +2,7 @@ from fastapi import status
 
 from database.models import Group as GroupDB
 from database.models import UserDB, UserGroup
+from security_routes import access_cache
 from security_routes.utilities import verify_password
 
 prefix = "/latest"
@@ -199,13 +200,19 @@ def test_admin_flow(client, regular_token1, admin_token, test_db_session):
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert response.json()["detail"] == "Group is linked to users and cannot be deleted"
 
-    # send a post request to unlink the user from the group as an admin
+    # send a post request to unlink the user from the group as an admin; the
+    # user's cached access must be dropped so the revocation applies at once
+    testuser1 = (
+        test_db_session.query(UserDB).filter(UserDB.username == "testuser1").first()
+    )
+    access_cache.put_user_access(testuser1.id, False, frozenset({1}), frozenset())
     response = client.post(
         f"{prefix}/unlink-user-group",
         headers={"Authorization": f"Bearer {admin_token}"},
         params={"username": "testuser1", "groupname": "Group1"},
     )
     assert response.status_code == 204
+    assert access_cache.get_user_access(testuser1.id) is None
 
     # send a post request to delete the user as a regular user
     response = client.delete(
@@ -1,8 +1,12 @@
 # test_auth_routes.py
 
 from fastapi.testclient import TestClient
+from jose import jwt
 
 from app import app  # Import your FastAPI application instance
+from config import settings
+from database.models import UserDB
+from security_routes import access_cache, utilities
 
 client = TestClient(app)
 prefix = "/latest"
@@ -52,3 +56,105 @@ def test_read_current_user_groups(test_db_session):
     assert response.status_code == 200
     groups = response.json()
     assert groups[0].get("name") == "Group1"
+
+
+def _login(username, password):
+    response = client.post(
+        f"{prefix}/token", data={"username": username, "password": password}
+    )
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def test_token_carries_user_claims(test_db_session):
+    token = _login("testuser1", "password1")
+    claims = jwt.get_unverified_claims(token)
+    user = test_db_session.query(UserDB).filter(UserDB.username == "testuser1").one()
+
+    assert claims["uid"] == user.id
+    assert claims["is_admin"] is False
+    assert claims["gen"] == user.token_generation
+    assert claims["groups"] == [g.group_id for g in user.groups]
+    assert "iat" in claims
+
+
+def test_claims_mode_resolves_user_and_honours_revocation(monkeypatch, test_db_session):
+    monkeypatch.setattr(settings, "auth_token_claims", True)
+    access_cache.clear()
+    token = _login("testuser1", "password1")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get(f"{prefix}/users/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["username"] == "testuser1"
+
+    # Another worker revokes the user's tokens. This worker verified the token
+    # within the TTL, so it keeps serving it from the cache...
+    user = test_db_session.query(UserDB).filter(UserDB.username == "testuser1").one()
+    user.token_generation += 1
+    test_db_session.commit()
+    try:
+        assert client.get(f"{prefix}/users/me", headers=headers).status_code == 200
+
+        # ...until the verification expires and the DB check refuses it.
+        access_cache.clear()
+        assert client.get(f"{prefix}/users/me", headers=headers).status_code == 401
+
+        # A fresh login carries the new generation.
+        fresh = {"Authorization": f"Bearer {_login('testuser1', 'password1')}"}
+        assert client.get(f"{prefix}/users/me", headers=fresh).status_code == 200
+    finally:
+        access_cache.clear()
+
+
+def test_claims_mode_password_change_revokes_locally(
+    monkeypatch, test_db_session, admin_token
+):
+    monkeypatch.setattr(settings, "auth_token_claims", True)
+    access_cache.clear()
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    response = client.post(
+        f"{prefix}/users",
+        params={"username": "claims_user", "is_admin": False},
+        data={"username": "claims_user", "password": "first-password"},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    try:
+        headers = {"Authorization": f"Bearer {_login('claims_user', 'first-password')}"}
+        assert client.get(f"{prefix}/users/me", headers=headers).status_code == 200
+
+        response = client.post(
+            f"{prefix}/change-password",
+            data={"username": "claims_user", "password": "second-password"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 200
+
+        # The verification is still cached, but the revocation applies at once.
+        assert client.get(f"{prefix}/users/me", headers=headers).status_code == 401
+    finally:
+        client.delete(
+            f"{prefix}/users", params={"username": "claims_user"}, headers=admin_headers
+        )
+        access_cache.clear()
+
+
+def test_token_verified_once_per_request(monkeypatch, regular_token1):
+    # With the verified-token cache off, every decode_token call verifies;
+    # the middleware's verification must still be the only one per request.
+    monkeypatch.setattr(settings, "jwt_cache_max_tokens", 0)
+    calls = []
+    real_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(utilities.jwt, "decode", counting_decode)
+    response = client.get(
+        f"{prefix}/users/me", headers={"Authorization": f"Bearer {regular_token1}"}
+    )
+
+    assert response.status_code == 200
+    assert calls == [regular_token1]
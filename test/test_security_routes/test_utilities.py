@@ -1,18 +1,28 @@
 # tests/utilities/test_verify_password.py
 
+import asyncio
 import importlib
 import sys
 from datetime import date
 
 import bcrypt
 import pytest
+from jose import JWTError, jwt
 from sqlalchemy import select
 
+from config import settings
 from database.models import BibleRevision, BibleVersion, UserDB
+from security_routes import access_cache, utilities
 from security_routes.utilities import (
+    ALGORITHM,
+    SECRET_KEY,
+    decode_token,
     get_authorized_revision_ids,
+    hash_password_async,
+    is_user_authorized_for_bible_version,
     is_user_authorized_for_revision,
     verify_password,
+    verify_password_async,
 )
 
 
@@ -43,6 +53,83 @@ def test_verify_password():
     assert not verify_password("wrongpassword", hashed_password)
 
 
+@pytest.mark.asyncio
+async def test_password_helpers_run_off_loop():
+    hashed = await hash_password_async("test123")
+
+    assert await verify_password_async("test123", hashed)
+    assert not await verify_password_async("wrongpassword", hashed)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_logins_share_one_bcrypt_call(monkeypatch):
+    hashed = bcrypt.hashpw(b"test123", bcrypt.gensalt()).decode()
+    calls = []
+
+    def counting_verify(plain, stored):
+        calls.append(plain)
+        return verify_password(plain, stored)
+
+    monkeypatch.setattr(utilities, "verify_password", counting_verify)
+
+    results = await asyncio.gather(
+        *(verify_password_async("test123", hashed) for _ in range(5)),
+        verify_password_async("other", hashed),
+    )
+
+    assert results == [True] * 5 + [False]
+    # Five identical attempts coalesce; the different password is its own check.
+    assert sorted(calls) == ["other", "test123"]
+    assert utilities._INFLIGHT_PASSWORD_CHECKS == {}
+
+
+def test_decode_token_caches_verified_tokens(monkeypatch):
+    monkeypatch.setattr(settings, "jwt_cache_max_tokens", 2)
+    monkeypatch.setattr(utilities, "_VERIFIED_JWT_CACHE", {})
+    now = [1_000_000.0]
+    monkeypatch.setattr(utilities.time, "time", lambda: now[0])
+    calls = []
+    real_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(utilities.jwt, "decode", counting_decode)
+    token = jwt.encode({"sub": "u", "exp": 2_000_000_000}, SECRET_KEY, ALGORITHM)
+
+    assert decode_token(token)["sub"] == "u"
+    assert decode_token(token)["sub"] == "u"
+    assert len(calls) == 1
+
+    # Failed verifications are never cached.
+    forged = jwt.encode({"sub": "u"}, "not-the-key", ALGORITHM)
+    for _ in range(2):
+        with pytest.raises(JWTError):
+            decode_token(forged)
+    assert calls.count(forged) == 2
+
+    # A cached token still expires.
+    now[0] = 2_000_000_001.0
+    with pytest.raises(JWTError):
+        decode_token(token)
+    assert token not in utilities._VERIFIED_JWT_CACHE
+
+    # LRU eviction at the cap; 0 disables the cache.
+    now[0] = 1_000_000.0
+    tokens = [
+        jwt.encode({"sub": str(i), "exp": 2_000_000_000}, SECRET_KEY, ALGORITHM)
+        for i in range(3)
+    ]
+    for t in tokens:
+        decode_token(t)
+    assert list(utilities._VERIFIED_JWT_CACHE) == tokens[1:]
+    monkeypatch.setattr(settings, "jwt_cache_max_tokens", 0)
+    utilities._VERIFIED_JWT_CACHE.clear()
+    decode_token(tokens[0])
+    assert utilities._VERIFIED_JWT_CACHE == {}
+
+
 @pytest.mark.asyncio
 async def test_get_revisions(async_test_db_session_2):
     async for db in async_test_db_session_2:
@@ -147,3 +234,71 @@ async def test_is_user_authorized_for_revision_denies_unauthorized_version(
             await db.delete(unauthorized_revision)
             await db.delete(unauthorized_version)
             await db.commit()
+
+
+def test_access_cache_expires_and_evicts(monkeypatch):
+    monkeypatch.setattr(settings, "auth_cache_ttl_s", 60.0)
+    monkeypatch.setattr(settings, "auth_cache_max_users", 2)
+    access_cache.clear()
+    try:
+        clock = [1000.0]
+        monkeypatch.setattr(access_cache.time, "monotonic", lambda: clock[0])
+
+        access_cache.put_user_access(1, False, frozenset({10}), frozenset({100}))
+        access_cache.put_user_access(2, False, frozenset(), frozenset())
+        # Touch user 1 so user 2 is the least recently used.
+        assert access_cache.get_user_access(1).version_ids == {10}
+        access_cache.put_user_access(3, False, frozenset(), frozenset())
+        assert access_cache.get_user_access(2) is None
+        assert access_cache.get_user_access(1) is not None
+
+        clock[0] += 61
+        assert access_cache.get_user_access(1) is None
+
+        monkeypatch.setattr(settings, "auth_cache_ttl_s", 0)
+        access_cache.put_user_access(4, True, frozenset(), frozenset())
+        assert access_cache.get_user_access(4) is None
+    finally:
+        access_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_cached_grant_skips_db_and_miss_reloads(async_test_db_session_2):
+    """A repeated grant is answered from the cache without touching the
+    session; a miss reloads, so access granted after the entry was cached is
+    still seen."""
+    async for db in async_test_db_session_2:
+        result = await db.execute(select(UserDB).where(UserDB.username == "testuser1"))
+        user = result.scalars().first()
+        access_cache.clear()
+
+        revision_ids = await get_authorized_revision_ids(user.id, db)
+        revision_id = next(iter(revision_ids))
+        version_id = await db.scalar(
+            select(BibleRevision.bible_version_id).where(
+                BibleRevision.id == revision_id
+            )
+        )
+
+        # db=None: any DB access would raise, so these must be cache hits.
+        assert await is_user_authorized_for_revision(user.id, revision_id, None)
+        assert await is_user_authorized_for_bible_version(user.id, version_id, None)
+
+        # A revision uploaded after the entry was cached is not in it yet;
+        # the miss must fall through to the DB rather than deny.
+        new_revision = BibleRevision(
+            date=date.today(),
+            bible_version_id=version_id,
+            published=False,
+            machine_translation=False,
+        )
+        db.add(new_revision)
+        await db.commit()
+        await db.refresh(new_revision)
+        try:
+            assert await is_user_authorized_for_revision(user.id, new_revision.id, db)
+            assert new_revision.id in access_cache.get_user_access(user.id).revision_ids
+        finally:
+            await db.delete(new_revision)
+            await db.commit()
+            access_cache.clear()
@@ -0,0 +1,124 @@
+"""The version_latest_verse triggers keep each version's current verse text."""
+
+from datetime import date
+
+import pytest
+
+from database.models import (
+    BibleRevision,
+    BibleVersion,
+    VerseText,
+    VersionLatestVerse,
+)
+
+
+@pytest.fixture
+def version_id(test_db_session):
+    version = BibleVersion(
+        name="Latest Verse Version",
+        iso_language="eng",
+        iso_script="Latn",
+        abbreviation="LVV",
+    )
+    test_db_session.add(version)
+    test_db_session.commit()
+    yield version.id
+    test_db_session.rollback()
+    test_db_session.query(BibleVersion).filter(BibleVersion.id == version.id).delete()
+    test_db_session.commit()
+
+
+def _add_revision(db, version_id, revision_date, texts):
+    revision = BibleRevision(
+        bible_version_id=version_id, date=revision_date, published=False
+    )
+    db.add(revision)
+    db.flush()
+    db.add_all(
+        VerseText(
+            text=text,
+            revision_id=revision.id,
+            verse_reference=f"GEN 1:{verse}",
+            book="GEN",
+            chapter=1,
+            verse=verse,
+        )
+        for verse, text in texts.items()
+    )
+    db.commit()
+    return revision.id
+
+
+def _current(db, version_id):
+    db.expire_all()
+    rows = (
+        db.query(VersionLatestVerse.verse, VerseText.text)
+        .join(VerseText, VerseText.id == VersionLatestVerse.verse_text_id)
+        .filter(VersionLatestVerse.version_id == version_id)
+        .all()
+    )
+    return dict(rows)
+
+
+def _cleanup(db, revision_ids):
+    db.query(VerseText).filter(VerseText.revision_id.in_(revision_ids)).delete(
+        synchronize_session=False
+    )
+    db.query(BibleRevision).filter(BibleRevision.id.in_(revision_ids)).delete(
+        synchronize_session=False
+    )
+    db.commit()
+
+
+def test_newest_non_empty_revision_wins(test_db_session, version_id):
+    db = test_db_session
+    old = _add_revision(db, version_id, date(2024, 1, 1), {1: "old one", 2: "old two"})
+    new = _add_revision(db, version_id, date(2024, 6, 1), {1: "new one", 2: ""})
+    # Inserted later but dated earlier: supersedes nothing.
+    older = _add_revision(db, version_id, date(2023, 1, 1), {1: "older one"})
+
+    assert _current(db, version_id) == {1: "new one", 2: "old two"}
+    _cleanup(db, [old, new, older])
+
+
+def test_undated_revision_ranks_latest(test_db_session, version_id):
+    db = test_db_session
+    dated = _add_revision(db, version_id, date(2024, 1, 1), {1: "dated"})
+    undated = _add_revision(db, version_id, None, {1: "undated"})
+
+    assert _current(db, version_id) == {1: "undated"}
+    _cleanup(db, [dated, undated])
+
+
+def test_soft_delete_and_restore_recompute(test_db_session, version_id):
+    db = test_db_session
+    old = _add_revision(db, version_id, date(2024, 1, 1), {1: "old one"})
+    new = _add_revision(db, version_id, date(2024, 6, 1), {1: "new one", 2: "new"})
+
+    db.query(BibleRevision).filter(BibleRevision.id == new).update({"deleted": True})
+    db.commit()
+    assert _current(db, version_id) == {1: "old one"}
+
+    db.query(BibleRevision).filter(BibleRevision.id == new).update({"deleted": False})
+    db.commit()
+    assert _current(db, version_id) == {1: "new one", 2: "new"}
+    _cleanup(db, [old, new])
+
+
+def test_text_edits_and_deletes_recompute(test_db_session, version_id):
+    db = test_db_session
+    old = _add_revision(db, version_id, date(2024, 1, 1), {1: "old one"})
+    new = _add_revision(db, version_id, date(2024, 6, 1), {1: "new one"})
+
+    db.query(VerseText).filter(VerseText.revision_id == new).update({"text": ""})
+    db.commit()
+    assert _current(db, version_id) == {1: "old one"}
+
+    db.query(VerseText).filter(VerseText.revision_id == new).update({"text": "edited"})
+    db.commit()
+    assert _current(db, version_id) == {1: "edited"}
+
+    db.query(VerseText).filter(VerseText.revision_id == new).delete()
+    db.commit()
+    assert _current(db, version_id) == {1: "old one"}
+    _cleanup(db, [old, new])
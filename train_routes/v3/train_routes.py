@@ -15,6 +15,7 @@ from sqlalchemy import Integer, bindparam, func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased, selectinload
 
+import revision_text_cache
 from assessment_routes.v3.results_query_routes import validate_parameters
 from config import settings
 from database.dependencies import get_db
@@ -295,13 +296,9 @@ async def _load_verse_text_by_vref(
     """Bulk-fetch verse text under `revision_id` for the given vrefs."""
     if not vrefs:
         return {}
-    rows = await db.execute(
-        select(VerseText.verse_reference, VerseText.text).where(
-            VerseText.revision_id == revision_id,
-            VerseText.verse_reference.in_(vrefs),
-        )
-    )
-    return {row[0]: row[1] for row in rows.all() if row[1] is not None}
+    revision_text = await revision_text_cache.get(db, revision_id)
+    texts = revision_text.texts_by_vref(vrefs)
+    return {vref: verse for vref, verse in texts.items() if verse is not None}
 
 
 async def _gather_ngram_buckets(
@@ -407,22 +404,18 @@ async def _build_lexeme_card_matches_by_vref(
             },
         )
 
-    # Bulk-load source + target verse text for the page in two queries.
-    # `vref` on the per-app result tables matches `verse_reference` in
-    # verse_text (both are the canonical "BOOK C:V" string).
-    target_text_q = select(VerseText.verse_reference, VerseText.text).where(
-        VerseText.revision_id == target_revision_id,
-        VerseText.verse_reference.in_(page_vrefs),
-    )
-    source_text_q = select(VerseText.verse_reference, VerseText.text).where(
-        VerseText.revision_id == source_revision_id,
-        VerseText.verse_reference.in_(page_vrefs),
-    )
+    # Source + target verse text for the page. `vref` on the per-app result
+    # tables matches `verse_reference` in verse_text (both are the canonical
+    # "BOOK C:V" string).
+    target_text = await revision_text_cache.get(db, target_revision_id)
+    source_text = await revision_text_cache.get(db, source_revision_id)
     target_text_by_vref = {
-        row[0]: row[1] or "" for row in (await db.execute(target_text_q)).all()
+        vref: verse or ""
+        for vref, verse in target_text.texts_by_vref(page_vrefs).items()
     }
     source_text_by_vref = {
-        row[0]: row[1] or "" for row in (await db.execute(source_text_q)).all()
+        vref: verse or ""
+        for vref, verse in source_text.texts_by_vref(page_vrefs).items()
     }
 
     # Pre-tokenize each verse once; per-vref matching is a set lookup.
@@ -0,0 +1,77 @@
+"""Chunked NDJSON / CSV encoding for the streaming export routes.
+
+The export routes read rows in batches over a server-side cursor and hand
+each batch here as a list of dicts; every batch becomes one text chunk of a
+``StreamingResponse``, so a worker only ever holds one batch in memory no
+matter how large the assessment is.
+"""
+
+import csv
+import io
+import json
+from decimal import Decimal
+from enum import Enum
+from typing import AsyncIterator, Dict, List, Sequence
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+def _json_default(value):
+    # Numeric columns (scores, averages) come back as Decimal.
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default)
+    return value
+
+
+async def encode_export(
+    batches: AsyncIterator[List[Dict]],
+    fieldnames: Sequence[str],
+    export_format: ExportFormat,
+) -> AsyncIterator[str]:
+    """Yield one text chunk per batch of records (plus a CSV header first).
+
+    NDJSON lines carry exactly ``fieldnames``, like the objects the JSON
+    routes return; CSV cells render None as empty and nested values as JSON.
+    """
+    if export_format == ExportFormat.csv:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(fieldnames)
+        yield buffer.getvalue()
+        async for records in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(
+                [_csv_value(record.get(name)) for name in fieldnames]
+                for record in records
+            )
+            yield buffer.getvalue()
+    else:
+        async for records in batches:
+            yield "".join(
+                json.dumps(
+                    {name: record.get(name) for name in fieldnames},
+                    default=_json_default,
+                )
+                + "\n"
+                for record in records
+            )
@@ -10,6 +10,7 @@ Ported from aqua-assessments/shared/morpheme_tokenizer.py.
 from __future__ import annotations
 
 import unicodedata
+from typing import Iterable
 
 
 def strip_punct(word: str) -> str:
@@ -73,3 +74,109 @@ def viterbi_segment(
         segments.append((kind, word[j:i]))
         i = j
     return list(reversed(segments))
+
+
+# Trie key marking a node that completes a morpheme; never a character.
+_END = ""
+
+
+def compile_morphemes(morpheme_set: Iterable[str]) -> dict:
+    """A trie of the morphemes, for `viterbi_segment_trie`.
+
+    Nested dicts keyed by character, with `_END` on nodes that complete a
+    morpheme. The morphemes are inserted reversed, so walking back from an
+    end position meets the candidates ending there shortest first — the
+    order `viterbi_segment` tries them in — and stops as soon as no
+    morpheme continues.
+    """
+    root: dict = {}
+    for morpheme in morpheme_set:
+        node = root
+        for char in reversed(morpheme):
+            node = node.setdefault(char, {})
+        node[_END] = True
+    return root
+
+
+def viterbi_segment_trie(word: str, trie: dict) -> list[tuple[str, str]]:
+    """`viterbi_segment` against a `compile_morphemes` trie.
+
+    Same costs, tie-breaking and result. Morpheme candidates come from one
+    trie walk per end position instead of a slice and set lookup per
+    length, and the best gap is kept as a running minimum instead of
+    rescanning every gap length, so a word costs O(n * longest match)
+    rather than O(n**2).
+    """
+    n = len(word)
+    if n == 0:
+        return []
+    best = [0.0] * (n + 1)
+    back = [0] * (n + 1)
+    is_morph = [False] * (n + 1)
+    # Start of the cheapest gap ending at the next position: the j < i
+    # minimizing best[j] - GAP_CHAR_COST * j, ties going to the largest j
+    # (the shortest gap, which viterbi_segment tries first).
+    gap_start = 0
+    gap_key = 0.0
+
+    for i in range(1, n + 1):
+        cost_i = float("inf")
+        node = trie
+        j = i
+        while j > 0:
+            node = node.get(word[j - 1])
+            if node is None:
+                break
+            j -= 1
+            if _END in node:
+                cost = best[j] + MORPH_CHAR_COST * (i - j) + TOKEN_COST
+                if cost < cost_i:
+                    cost_i = cost
+                    back[i] = j
+                    is_morph[i] = True
+        cost = best[gap_start] + GAP_CHAR_COST * (i - gap_start) + TOKEN_COST
+        if cost < cost_i:
+            cost_i = cost
+            back[i] = gap_start
+            is_morph[i] = False
+        best[i] = cost_i
+        key = cost_i - GAP_CHAR_COST * i
+        if key <= gap_key:
+            gap_start = i
+            gap_key = key
+
+    segments: list[tuple[str, str]] = []
+    i = n
+    while i > 0:
+        j = back[i]
+        segments.append(("morph" if is_morph[i] else "gap", word[j:i]))
+        i = j
+    return list(reversed(segments))
+
+
+def contains_morpheme(word: str, trie: dict) -> bool:
+    """Whether any morpheme of a `compile_morphemes` trie occurs in `word`.
+
+    Only such a word's segmentation can change when those morphemes are
+    added to or removed from the inventory: every other candidate and gap
+    cost is the same either way.
+    """
+    for i in range(len(word), 0, -1):
+        node = trie
+        j = i
+        while j > 0:
+            node = node.get(word[j - 1])
+            if node is None:
+                break
+            j -= 1
+            if _END in node:
+                return True
+    return False
+
+
+def segment_words(words: list[str], trie: dict) -> list[tuple[tuple[str, str], ...]]:
+    """`viterbi_segment_trie` for each of `words`, as tuples, in order.
+
+    Module-level and free of app imports so process-pool workers can run it.
+    """
+    return [tuple(viterbi_segment_trie(w, trie)) for w in words]
@@ -0,0 +1,78 @@
+"""Opaque keyset-pagination cursors.
+
+A cursor carries the sort key of the last row a client received, so the next
+page is a ``WHERE key > :last ORDER BY key LIMIT :n`` index walk instead of an
+``OFFSET`` that re-reads every earlier row. Clients treat the token as opaque:
+it is URL-safe base64 of a JSON array, and only ever round-trips through the
+``next_cursor`` a previous response returned.
+"""
+
+import base64
+import binascii
+import json
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*key) -> str:
+    """Encode a row's sort key (e.g. its id) as a cursor token."""
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Tuple[type, ...]) -> tuple:
+    """Decode a cursor into a key whose parts have the given ``types``.
+
+    Raises a 400 for anything that isn't a cursor this API issued with that
+    key shape.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (binascii.Error, ValueError):
+        key = None
+    if (
+        not isinstance(key, list)
+        or len(key) != len(types)
+        # bool is an int subclass; a cursor never legitimately holds one.
+        or any(isinstance(k, bool) for k in key)
+        or not all(
+            isinstance(k, (int, float) if t is float else t) for k, t in zip(key, types)
+        )
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        )
+    return tuple(key)
+
+
+def validate_cursor_params(
+    cursor: Optional[str], page: Optional[int], page_size: Optional[int]
+) -> None:
+    """A cursor replaces ``page``, and needs a positive ``page_size`` to bound
+    the page."""
+    if cursor is None:
+        return
+    if page is not None or page_size is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'cursor' requires 'page_size' and cannot be combined with 'page'.",
+        )
+    if page_size < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Page size must be >= 1",
+        )
+
+
+def next_cursor(rows, page_size: Optional[int], key) -> Optional[str]:
+    """Cursor for the page after ``rows``, or None if this was the last page.
+
+    ``key`` maps a row to its sort key tuple. A full page may still be the
+    last one; the client then gets one empty page, which is the usual keyset
+    trade-off for not counting ahead.
+    """
+    if page_size is None or not rows or len(rows) < page_size:
+        return None
+    return encode_cursor(*key(rows[-1]))